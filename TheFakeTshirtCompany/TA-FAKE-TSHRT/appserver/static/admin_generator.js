@@ -35,6 +35,118 @@ require([
         $('#clean-btn').prop('disabled', !enabled);
     }
 
+    var GENERATE_URL = Splunk.util.make_url('/splunkd/__raw/services/ta_fake_tshrt/generate');
+    var POLL_INTERVAL_MS = 2000;
+    var pollTimer = null;
+
+    // The dashboard only defines Generate/Clean; add Cancel next to them
+    if (!$('#cancel-btn').length) {
+        $('<button id="cancel-btn" class="btn">Cancel</button>')
+            .css('margin-left', '10px').hide().insertAfter('#clean-btn');
+    }
+
+    function formatEps(eps) {
+        if (eps >= 1000000) return (eps / 1000000).toFixed(1) + 'M/s';
+        if (eps >= 1000) return Math.round(eps / 1000) + 'K/s';
+        return Math.round(eps || 0) + '/s';
+    }
+
+    function formatEta(seconds) {
+        if (seconds === null || seconds === undefined) return '--';
+        if (seconds < 60) return Math.round(seconds) + 's';
+        var s = Math.round(seconds % 60);
+        return Math.floor(seconds / 60) + 'm' + (s < 10 ? '0' : '') + s + 's';
+    }
+
+    function errorText(xhr, status, error) {
+        try {
+            var resp = JSON.parse(xhr.responseText);
+            return resp.payload?.error || resp.messages?.[0]?.text || xhr.responseText;
+        } catch(e) {
+            return xhr.responseText || error || status;
+        }
+    }
+
+    function describeProgress(progress) {
+        if (!progress) return 'Waiting for the generator to start...';
+        var lines = [
+            Math.round(progress.fraction * 100) + '%  ' +
+            progress.events.toLocaleString() + ' events  ' +
+            formatEps(progress.events_per_sec) + '  ETA ' + formatEta(progress.eta_seconds),
+            (progress.phase || ''),
+            ''
+        ];
+        $.each(progress.generators || {}, function(name, g) {
+            var line;
+            if (g.status === 'done' || g.status === 'failed') {
+                line = (g.status === 'done' ? '✓ ' : '✗ ') + name + '  ' +
+                       g.events.toLocaleString() + ' events (' + g.duration_seconds + 's)';
+            } else if (g.status === 'running') {
+                line = '▸ ' + name + '  day ' + g.day + '/' + g.days +
+                       (g.hour ? ' ' + g.hour + 'h' : '') + '  ' +
+                       formatEps(g.events_per_sec) + '  ~' + formatEta(g.eta_seconds);
+            } else {
+                line = '· ' + name + '  ' + g.status;
+            }
+            lines.push(line);
+        });
+        return lines.join('\n');
+    }
+
+    function showJob(job) {
+        var progress = describeProgress(job.progress);
+        if (job.state === 'running' || job.state === 'cancelling') {
+            var title = job.state === 'running' ? '⏳ GENERATING (job ' : '⏳ CANCELLING (job ';
+            setStatus(title + job.job_id + ')\n\n' + progress, 'progress');
+            return false;
+        }
+        if (job.state === 'done') {
+            setStatus('✅ SUCCESS!\n\n' +
+                     'Sources: ' + job.params.sources + ', ' + job.params.days + ' days\n' +
+                     'Files deleted: ' + (job.deleted_files || 0) + '\n\n' +
+                     progress, 'success');
+        } else if (job.state === 'cancelled') {
+            setStatus('⏹ CANCELLED\n\nPartial output stays in output/tmp/.\n\n' + progress, 'error');
+        } else {
+            setStatus('❌ FAILED\n\n' + progress + '\n\nOutput:\n' + (job.output || '(none)'), 'error');
+        }
+        return true;
+    }
+
+    function stopPolling() {
+        if (pollTimer) {
+            clearTimeout(pollTimer);
+            pollTimer = null;
+        }
+        $('#cancel-btn').hide().data('job-id', null);
+        setButtonsEnabled(true);
+    }
+
+    function pollJob(jobId) {
+        setButtonsEnabled(false);
+        $('#cancel-btn').data('job-id', jobId).prop('disabled', false).show();
+
+        $.ajax({
+            url: GENERATE_URL,
+            method: 'GET',
+            data: {job_id: jobId, output_mode: 'json'},
+            success: function(response) {
+                var job = response.payload || response;
+                if (showJob(job)) {
+                    console.log('[TA-FAKE-TSHRT] Job finished:', job.state);
+                    stopPolling();
+                } else {
+                    pollTimer = setTimeout(function() { pollJob(jobId); }, POLL_INTERVAL_MS);
+                }
+            },
+            error: function(xhr, status, error) {
+                console.log('[TA-FAKE-TSHRT] Poll error:', status, error);
+                // Transient (e.g. splunkd restarting the handler): keep polling
+                pollTimer = setTimeout(function() { pollJob(jobId); }, POLL_INTERVAL_MS * 2);
+            }
+        });
+    }
+
     function collectParams() {
         return {
             sources: tokens.get('sources') || 'all',
@@ -50,6 +162,7 @@ require([
             no_mr_health: $('#opt-no-mr-health').is(':checked') ? 'true' : 'false',
             no_ms_health: $('#opt-no-ms-health').is(':checked') ? 'true' : 'false',
             parallel: $('#opt-parallel').val() || '4',
+            compress: $('#opt-compress').val() || 'none',
             output_mode: 'json'
         };
     }
@@ -69,7 +182,7 @@ require([
             '2. Generate ' + params.days + ' days of new logs\n' +
             '3. Sources: ' + params.sources + '\n' +
             '4. Scenarios: ' + params.scenarios + '\n\n' +
-            'This may take several minutes. Continue?';
+            'Generation runs in the background; progress is shown below. Continue?';
 
         if (!confirm(confirmMsg)) {
             console.log('[TA-FAKE-TSHRT] User cancelled');
@@ -80,46 +193,57 @@ require([
         setStatus('Starting log generation...\n\nSources: ' + params.sources +
                  '\nDays: ' + params.days +
                  '\nScenarios: ' + params.scenarios +
-                 '\n\nPlease wait, this may take several minutes...', 'progress');
-
-        var url = Splunk.util.make_url('/splunkd/__raw/services/ta_fake_tshrt/generate');
-        console.log('[TA-FAKE-TSHRT] AJAX URL:', url);
+                 '\n\nSubmitting job...', 'progress');
 
         $.ajax({
-            url: url,
+            url: GENERATE_URL,
             method: 'POST',
             data: params,
-            timeout: 660000,  // 11 minute timeout
             success: function(response) {
-                console.log('[TA-FAKE-TSHRT] Success:', response);
+                console.log('[TA-FAKE-TSHRT] Job started:', response);
                 var payload = response.payload || response;
-
-                if (payload.status === 'success') {
-                    setStatus('✅ SUCCESS!\n\n' +
-                             'Message: ' + (payload.message || 'Logs generated') + '\n' +
-                             'Files deleted: ' + (payload.deleted_files || 0) + '\n\n' +
-                             'Output:\n' + (payload.output || '(none)'), 'success');
-                } else {
-                    setStatus('❌ FAILED\n\n' +
-                             'Error: ' + (payload.error || 'Unknown error'), 'error');
-                }
-                setButtonsEnabled(true);
+                pollJob(payload.job_id);
             },
             error: function(xhr, status, error) {
                 console.log('[TA-FAKE-TSHRT] Error:', status, error, xhr.responseText);
-                var errorMsg = 'Request failed';
-                try {
-                    var resp = JSON.parse(xhr.responseText);
-                    errorMsg = resp.payload?.error || resp.messages?.[0]?.text || xhr.responseText;
-                } catch(e) {
-                    errorMsg = xhr.responseText || error || status;
+                var resp = null;
+                try { resp = JSON.parse(xhr.responseText); } catch(e) {}
+                if (xhr.status === 409 && resp && resp.payload && resp.payload.job) {
+                    // Another run is in progress: follow it instead
+                    pollJob(resp.payload.job.job_id);
+                    return;
                 }
-                setStatus('❌ ERROR\n\n' + errorMsg, 'error');
+                setStatus('❌ ERROR\n\n' + errorText(xhr, status, error), 'error');
                 setButtonsEnabled(true);
             }
         });
     });
 
+    // ========================================================================
+    // Cancel Button Click Handler
+    // ========================================================================
+
+    $(document).on('click', '#cancel-btn', function() {
+        var jobId = $(this).data('job-id');
+        if (!jobId || !confirm('Cancel the running generation job?')) {
+            return;
+        }
+        $(this).prop('disabled', true);
+
+        $.ajax({
+            url: GENERATE_URL,
+            method: 'POST',
+            data: {action: 'cancel', job_id: jobId, output_mode: 'json'},
+            success: function(response) {
+                console.log('[TA-FAKE-TSHRT] Cancel requested:', response);
+            },
+            error: function(xhr, status, error) {
+                console.log('[TA-FAKE-TSHRT] Cancel error:', status, error);
+                $('#cancel-btn').prop('disabled', false);
+            }
+        });
+    });
+
     // ========================================================================
     // Clean Button Click Handler
     // ========================================================================
@@ -135,10 +259,8 @@ require([
         setButtonsEnabled(false);
         setStatus('Cleaning log files...', 'progress');
 
-        var url = Splunk.util.make_url('/splunkd/__raw/services/ta_fake_tshrt/generate');
-
         $.ajax({
-            url: url,
+            url: GENERATE_URL,
             method: 'POST',
             data: {
                 clean_only: 'true',
@@ -156,11 +278,28 @@ require([
             },
             error: function(xhr, status, error) {
                 console.log('[TA-FAKE-TSHRT] Clean error:', status, error);
-                setStatus('❌ ERROR\n\n' + (xhr.responseText || error), 'error');
+                setStatus('❌ ERROR\n\n' + errorText(xhr, status, error), 'error');
                 setButtonsEnabled(true);
             }
         });
     });
 
+    // ========================================================================
+    // Resume a job that is still running (page reload, second browser tab)
+    // ========================================================================
+
+    $.ajax({
+        url: GENERATE_URL,
+        method: 'GET',
+        data: {output_mode: 'json'},
+        success: function(response) {
+            var payload = response.payload || response;
+            if (payload.status === 'running' && payload.last_job) {
+                console.log('[TA-FAKE-TSHRT] Resuming job', payload.last_job.job_id);
+                pollJob(payload.last_job.job_id);
+            }
+        }
+    });
+
     console.log('[TA-FAKE-TSHRT] Event handlers attached');
 });
@@ -0,0 +1 @@
+# Benchmark suite (see run_bench.py)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the hour-level emitters that dominate generator runtime.
+
+Each case is a setup function that imports its generator and returns a
+zero-argument callable producing one unit of work (usually one hour of
+events). run_bench.py seeds random before every repetition, so each case
+emits the same events every time and timings are comparable run to run.
+
+Adding a case:
+    @case("name", "what one call produces")
+    def _setup_name():
+        from generators.generate_x import hot_function
+        return lambda: hot_function(BENCH_DATE, BENCH_DAY, BENCH_HOUR, ...)
+
+The callable must return a list (or dict of lists) of events so the harness
+can report events/sec.
+"""
+
+from typing import Callable, Dict, Tuple
+
+# Fixed inputs: a Tuesday at 10:00 (peak hour, weekday volume)
+BENCH_DATE = "2026-01-06"
+BENCH_DAY = 0
+BENCH_HOUR = 10
+
+# {name: (setup, description)}
+CASES: Dict[str, Tuple[Callable[[], Callable], str]] = {}
+
+
+def case(name: str, description: str):
+    """Register a micro-benchmark setup function."""
+    def register(setup):
+        CASES[name] = (setup, description)
+        return setup
+    return register
+
+
+def count_events(result) -> int:
+    """Count events in a hot-path return value (list or dict of lists)."""
+    if isinstance(result, dict):
+        return sum(len(v) for v in result.values())
+    return len(result)
+
+
+# =============================================================================
+# NETWORK
+# =============================================================================
+
+@case("asa.generate_baseline_hour", "1 peak hour, 2000 events, no registry")
+def _setup_asa_hour():
+    from generators.generate_asa import generate_baseline_hour
+    return lambda: generate_baseline_hour(BENCH_DATE, BENCH_DAY, BENCH_HOUR, 2000)
+
+
+@case("asa.generate_baseline_hour_registry", "1 peak hour, 2000 events, 600 access registry sessions")
+def _setup_asa_hour_registry():
+    import random
+    from generators.generate_asa import generate_baseline_hour
+    rng = random.Random(BENCH_HOUR)
+    sessions = []
+    for _ in range(600):
+        start = rng.randrange(3600)
+        end = start + rng.randint(1, 300)
+        sessions.append({
+            "ip": f"73.158.42.{rng.randint(1, 254)}", "dst": "172.16.1.10", "dst_port": 443,
+            "bytes": rng.randint(1000, 500000),
+            "start_ts": f"{BENCH_DATE}T{BENCH_HOUR:02d}:{start // 60:02d}:{start % 60:02d}Z",
+            "end_ts": f"{BENCH_DATE}T{BENCH_HOUR + end // 3600:02d}:{end // 60 % 60:02d}:{end % 60:02d}Z",
+        })
+    registry_index = {(BENCH_DAY, BENCH_HOUR): sessions}
+    return lambda: generate_baseline_hour(BENCH_DATE, BENCH_DAY, BENCH_HOUR, 2000,
+                                          registry_index=registry_index)
+
+
+@case("meraki.generate_mx_baseline_hour", "1 hour at Boston, 80 MX events")
+def _setup_meraki_mx_hour():
+    from generators.generate_meraki import generate_mx_baseline_hour
+    return lambda: generate_mx_baseline_hour(BENCH_DATE, BENCH_DAY, BENCH_HOUR, "BOS", 80)
+
+
+@case("meraki.generate_ms_port_health", "1 hour at Boston, 5-minute interval")
+def _setup_meraki_ms_health():
+    from generators.generate_meraki import generate_ms_port_health
+    return lambda: generate_ms_port_health(BENCH_DATE, BENCH_DAY, BENCH_HOUR, "BOS", 5)
+
+
+# =============================================================================
+# WEB / CLOUD
+# =============================================================================
+
+@case("access.generate_sessions_hour", "1 peak hour at --orders-per-day=3000, 4000 sessions")
+def _setup_access_sessions_hour():
+    import generators.generate_access as access
+
+    def run():
+        # generate_sessions_hour() appends to module-level registries; start clean
+        access.ORDER_SEQUENCE = 0
+        access.ORDER_REGISTRY = []
+        access.WEB_SESSION_REGISTRY = []
+        return access.generate_sessions_hour(BENCH_DATE, BENCH_DAY, BENCH_HOUR, 4000)
+    return run
+
+
+@case("catalyst_center._generate_device_health", "1 hour (12 polls) for all managed devices")
+def _setup_catalyst_device_health():
+    from generators.generate_catalyst_center import _generate_device_health, MANAGED_DEVICES
+    return lambda: [_generate_device_health(BENCH_DATE, BENCH_DAY, BENCH_HOUR, minute, device)
+                    for minute in range(0, 60, 5) for device in MANAGED_DEVICES]
+
+
+@case("aws.generate_baseline_hour", "1 hour, 500 CloudTrail events, built and serialized")
+def _setup_aws_hour():
+    from generators.generate_aws import generate_baseline_hour
+    from shared.json_templates import serialize
+    return lambda: [serialize(e) for e in generate_baseline_hour(BENCH_DATE, BENCH_DAY, BENCH_HOUR, 500)]
+
+
+@case("gcp.generate_baseline_hour", "1 hour, 500 audit entries, built and serialized")
+def _setup_gcp_hour():
+    from generators.generate_gcp import generate_baseline_hour
+    from shared.json_templates import serialize
+    return lambda: [serialize(e) for e in generate_baseline_hour(BENCH_DATE, BENCH_DAY, BENCH_HOUR, 500)]
+
+
+@case("secure_access._generate_dns_event", "2000 DNS rows in one hour")
+def _setup_secure_access_dns():
+    from generators.generate_secure_access import _generate_dns_event
+    return lambda: [_generate_dns_event(BENCH_DATE, BENCH_DAY, BENCH_HOUR) for _ in range(2000)]
+
+
+@case("secure_access.hour_rows", "1 peak hour of batch rows: 4375 DNS, 1400 proxy, 350 firewall")
+def _setup_secure_access_hour_rows():
+    from generators.generate_secure_access import (
+        _dns_rows, _firewall_rows, _hour_timestamps, _proxy_rows)
+
+    def hour():
+        timestamps = _hour_timestamps(BENCH_DATE, BENCH_DAY, BENCH_HOUR)
+        return {"dns": _dns_rows(timestamps, 4375), "proxy": _proxy_rows(timestamps, 1400),
+                "firewall": _firewall_rows(timestamps, 350)}
+    return hour
+
+
+# =============================================================================
+# HOST METRICS / WINDOWS
+# =============================================================================
+
+@case("perfmon.generate_host_interval", "1 hour (12 intervals) for all Windows servers")
+def _setup_perfmon_interval():
+    from shared.company import WINDOWS_SERVERS, SERVERS
+    from generators.generate_perfmon import (
+        generate_host_interval, SERVER_RAM_MB, SERVER_DISK_GB, INTERVALS_PER_HOUR,
+    )
+
+    def run():
+        out = []
+        for interval in range(INTERVALS_PER_HOUR):
+            for host in WINDOWS_SERVERS:
+                metrics = generate_host_interval(
+                    BENCH_DATE, BENCH_DAY, BENCH_HOUR, interval * 5, host, SERVERS[host], 1.0,
+                    SERVER_RAM_MB.get(host, 16384), SERVER_DISK_GB.get(host, 256))
+                for lines in metrics.values():
+                    out.extend(lines)
+        return out
+    return run
+
+
+@case("linux.generate_host_interval", "1 hour (12 intervals) for all Linux servers")
+def _setup_linux_interval():
+    from shared.company import LINUX_SERVERS, SERVERS
+    from generators.generate_linux import generate_host_interval, INTERVALS_PER_HOUR
+
+    def run():
+        out = []
+        for interval in range(INTERVALS_PER_HOUR):
+            for host in LINUX_SERVERS:
+                metrics = generate_host_interval(
+                    BENCH_DATE, BENCH_DAY, BENCH_HOUR, interval * 5, host, SERVERS[host], 1.0)
+                for lines in metrics.values():
+                    out.extend(lines)
+        return out
+    return run
+
+
+def _wineventlog_clients(num_clients: int):
+    from generators.generate_wineventlog import generate_client_hour, build_wineventlog_client_list
+    clients = build_wineventlog_client_list(num_clients)
+
+    def run():
+        out = []
+        for client in clients:
+            events = generate_client_hour(BENCH_DATE, BENCH_DAY, BENCH_HOUR, client, 1.0)
+            for lines in events.values():
+                out.extend(lines)
+        return out
+    return run
+
+
+@case("wineventlog.generate_client_hour", "1 hour for 5 client workstations")
+def _setup_wineventlog_client():
+    return _wineventlog_clients(5)
+
+
+@case("wineventlog.generate_client_hour_175", "1 peak hour for 175 client workstations (--clients=175)")
+def _setup_wineventlog_clients_175():
+    return _wineventlog_clients(175)
+
+
+@case("sysmon.generate_client_sysmon_hour", "1 peak hour for 175 client workstations (--clients=175)")
+def _setup_sysmon_clients():
+    from generators.generate_sysmon import generate_client_sysmon_hour
+    from generators.generate_wineventlog import build_wineventlog_client_list
+    clients = build_wineventlog_client_list(175)
+
+    def run():
+        out = []
+        for client in clients:
+            out.extend(generate_client_sysmon_hour(BENCH_DATE, BENCH_DAY, BENCH_HOUR, client, 1.0))
+        return out
+    return run
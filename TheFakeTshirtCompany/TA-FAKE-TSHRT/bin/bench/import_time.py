@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Startup-time check for main_generate.py using python -X importtime.
+
+Each repetition runs a fresh interpreter, so nothing is cached in
+sys.modules between runs (.pyc files are, as they would be in normal use).
+Reports the median cumulative import time of main_generate, the modules
+that contribute most to it, the wall time of "main_generate.py --help",
+and the extra import time of looking up one generator in the lazy
+GENERATORS registry.
+
+Usage:
+    python3 bench/import_time.py                   # 5 runs, top 15 modules
+    python3 bench/import_time.py --repeat=10 --top=25
+    python3 bench/import_time.py --source=meraki   # cost of loading one generator
+    python3 bench/import_time.py --max-ms=100      # exit 1 if the import is slower
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BIN_DIR = Path(__file__).parent.parent
+
+
+def importtime(code: str) -> Dict[str, Tuple[int, int, int]]:
+    """Run code under -X importtime; {module: (depth, self_us, cumulative_us)}."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BIN_DIR,
+                          capture_output=True, text=True, check=True)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (depth, int(self_us), int(cumulative_us))
+    return modules
+
+
+def total_ms(run: Dict[str, Tuple[int, int, int]]) -> float:
+    """Import time of everything the snippet imported (sum of top-level entries)."""
+    return sum(cumulative for depth, _, cumulative in run.values() if depth == 0) / 1000
+
+
+def after_ms(run: Dict[str, Tuple[int, int, int]], module: str) -> float:
+    """Import time of the top-level entries that come after `module` finished."""
+    names = list(run)
+    later = names[names.index(module) + 1:]
+    return sum(run[name][2] for name in later if run[name][0] == 0) / 1000
+
+
+def wall_seconds(args: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=BIN_DIR, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure main_generate.py startup time")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement (median)")
+    parser.add_argument("--top", type=int, default=15, help="Modules to list by cumulative time")
+    parser.add_argument("--source", default="asa", help="Generator to look up in GENERATORS (default: asa)")
+    parser.add_argument("--max-ms", type=float, help="Fail (exit 1) if importing main_generate takes longer")
+    args = parser.parse_args()
+
+    # Compile first so every run loads .pyc files, even with
+    # PYTHONDONTWRITEBYTECODE set
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "."], cwd=BIN_DIR, check=True)
+
+    runs = [importtime("import main_generate") for _ in range(args.repeat)]
+    totals = [total_ms(r) for r in runs]
+    median_ms = statistics.median(totals)
+
+    lookup = f"import main_generate; main_generate.GENERATORS[{args.source!r}]"
+    lookup_ms = statistics.median(after_ms(importtime(lookup), "main_generate")
+                                  for _ in range(args.repeat))
+
+    help_s = statistics.median(wall_seconds(["main_generate.py", "--help"]) for _ in range(args.repeat))
+
+    print(f"import main_generate      {median_ms:>8.1f} ms  (median of {args.repeat}, "
+          f"min {min(totals):.1f}, max {max(totals):.1f})")
+    print(f"  + GENERATORS[{args.source!r}]".ljust(26) + f"{lookup_ms:>8.1f} ms")
+    print(f"main_generate.py --help   {help_s * 1000:>8.1f} ms  (wall, including interpreter start)")
+
+    # Modules by cumulative time in the median run
+    median_run = sorted(runs, key=total_ms)[len(runs) // 2]
+    print(f"\nTop {args.top} modules by cumulative import time:")
+    print(f"  {'module':40} {'self ms':>9} {'cumul ms':>9}")
+    ranked = sorted(median_run.items(), key=lambda kv: -kv[1][2])
+    for name, (_, self_us, cumulative_us) in ranked[:args.top]:
+        print(f"  {name:40} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+
+    loaded = [m for m in median_run if m.startswith(("generators.", "scenarios."))]
+    print(f"\nGenerator/scenario modules imported at startup: {len(loaded)}")
+    for name in loaded:
+        print(f"  {name}")
+
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"\nFAIL: import main_generate took {median_ms:.1f} ms (> {args.max_ms:.0f} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the record types a run holds in bulk.
+
+Runs the generators that produce them (meeting schedule, ServiceNow,
+access, Meraki) for --days/--scale into a temporary directory, captures
+their records, and measures bytes per record with tracemalloc in two
+representations:
+
+    before  dict / __dict__-backed dataclass instances (the old layout)
+    after   slotted dataclasses, tuples, serialized lines (the current one)
+
+Field values that both layouts share (strings, datetimes, participant
+lists) are not counted; containers built per record are. At most --sample
+records per type are measured; totals extrapolate to the whole run.
+
+Usage:
+    python3 bench/record_memory.py                     # 31 days, --scale=2
+    python3 bench/record_memory.py --days=7 --scale=1
+"""
+
+import argparse
+import dataclasses
+import gc
+import json
+import random
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add bin/ for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+SEED = 1337
+
+
+def bytes_per_record(records: List, build: Callable) -> float:
+    """Average traced allocation of build(record), excluding the holding list."""
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    held = [build(r) for r in records]
+    size = tracemalloc.get_traced_memory()[0] - start - sys.getsizeof(held)
+    tracemalloc.stop()
+    del held
+    return size / len(records) if records else 0.0
+
+
+def _sample(records: List, limit: int) -> List:
+    return records if len(records) <= limit else random.sample(records, limit)
+
+
+def _dataclass_builders(cls):
+    """(before, after) builders: an equivalent plain dataclass vs the slotted one."""
+    names = [f.name for f in dataclasses.fields(cls)]
+    legacy = dataclasses.make_dataclass(cls.__name__, names)
+
+    def before(record):
+        return legacy(**{name: getattr(record, name) for name in names})
+
+    def after(record):
+        return cls(**{name: getattr(record, name) for name in names})
+    return before, after
+
+
+# =============================================================================
+# RECORD CAPTURE
+# =============================================================================
+
+def capture_records(days: int, scale: float, limit: int) -> Dict[str, Dict]:
+    """Run the generators and collect {record type: {"count", "records", "before", "after"}}."""
+    from shared.config import DEFAULT_START_DATE, set_output_base
+    from shared.output_writer import OrderedWriter
+    from shared.meeting_schedule import (
+        RECURRING_MEETINGS, RecurringMeetingTemplate, ScheduledMeeting,
+        _meeting_schedule, _walkin_schedule, build_meeting_schedule,
+    )
+    import generators.generate_access as access
+    import generators.generate_meraki as meraki
+    import generators.generate_servicenow as servicenow
+
+    captured = {"incident": [], "order": [], "web_session": [], "meraki_event": []}
+    event_count = [0]
+
+    lifecycle = servicenow.generate_incident_lifecycle
+
+    def capture_incident(incident, base_date):
+        captured["incident"].append(incident)
+        return lifecycle(incident, base_date)
+
+    write_lines = access.write_lines
+
+    def capture_registry(f, records, serialize=None):
+        if serialize is access.order_record_json:
+            captured["order"].extend(records)
+        elif serialize is access.web_session_record_json:
+            captured["web_session"].extend(records)
+        return write_lines(f, records, serialize)
+
+    add = OrderedWriter.add
+
+    def capture_events(writer, events):
+        events = list(events)
+        add(writer, events)
+        if writer._serialize is None:
+            return
+        # Reservoir sample of `limit` (key, line) pairs over the whole run
+        keep = captured["meraki_event"]
+        for pair in writer._buffer[len(writer._buffer) - len(events):]:
+            event_count[0] += 1
+            if len(keep) < limit:
+                keep.append(pair)
+            elif random.random() < limit / event_count[0]:
+                keep[random.randrange(limit)] = pair
+
+    servicenow.generate_incident_lifecycle = capture_incident
+    access.write_lines = capture_registry
+    OrderedWriter.add = capture_events
+    try:
+        with tempfile.TemporaryDirectory(prefix="tshrt_mem_") as tmp:
+            set_output_base(Path(tmp))
+            random.seed(SEED)
+            build_meeting_schedule(start_date=DEFAULT_START_DATE, days=days, scale=scale, quiet=True)
+            print("  servicenow ...", file=sys.stderr)
+            servicenow.generate_servicenow_logs(DEFAULT_START_DATE, days, scale, quiet=True)
+            print("  access ...", file=sys.stderr)
+            access.generate_access_logs(DEFAULT_START_DATE, days, scale, quiet=True)
+            print("  meraki ...", file=sys.stderr)
+            meraki.generate_meraki_logs(DEFAULT_START_DATE, days, scale, workers=1, quiet=True)
+            meetings = [m for rooms in (_meeting_schedule, _walkin_schedule)
+                        for room in rooms.values() for m in room]
+    finally:
+        servicenow.generate_incident_lifecycle = lifecycle
+        access.write_lines = write_lines
+        OrderedWriter.add = add
+
+    meeting_before, meeting_after = _dataclass_builders(ScheduledMeeting)
+    template_before, template_after = _dataclass_builders(RecurringMeetingTemplate)
+    incident_before, incident_after = _dataclass_builders(servicenow.Incident)
+
+    def order_before(record):
+        order = dict(zip(access.ORDER_FIELDS, record))
+        order["products"] = [{"slug": s, "price": p, "qty": q} for s, p, q in record[6]]
+        return order
+
+    def order_after(record):
+        return (*record[:6], tuple([*record[6]]), *record[7:])
+
+    return {
+        "ScheduledMeeting": {"count": len(meetings), "records": meetings,
+                             "before": meeting_before, "after": meeting_after},
+        "RecurringMeetingTemplate": {"count": len(RECURRING_MEETINGS), "records": RECURRING_MEETINGS,
+                                     "before": template_before, "after": template_after},
+        "Incident": {"count": len(captured["incident"]), "records": captured["incident"],
+                     "before": incident_before, "after": incident_after},
+        "order registry": {"count": len(captured["order"]), "records": captured["order"],
+                           "before": order_before, "after": order_after},
+        "web session registry": {"count": len(captured["web_session"]), "records": captured["web_session"],
+                                 "before": lambda r: dict(zip(access.WEB_SESSION_FIELDS, r)),
+                                 "after": lambda r: tuple([*r])},
+        # Buffered in OrderedWriter: (key, event dict) before, (key, JSON line) after
+        "Meraki event": {"count": event_count[0], "records": captured["meraki_event"],
+                         "before": lambda r: (r[0], json.loads(r[1])),
+                         "after": lambda r: (r[0], r[1].encode().decode())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bytes per record for bulk record types")
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--scale", type=float, default=2.0)
+    parser.add_argument("--sample", type=int, default=50_000,
+                        help="Records measured per type (default: 50000)")
+    parser.add_argument("--json", help="Also write results to this path")
+    args = parser.parse_args()
+
+    print(f"Capturing records ({args.days} days, scale {args.scale})", file=sys.stderr)
+    types = capture_records(args.days, args.scale, args.sample)
+
+    results = {}
+    print(f"\n  {'record':26} {'count':>11} {'before B/rec':>13} {'after B/rec':>12} "
+          f"{'saved':>6} {'before MB':>10} {'after MB':>9}")
+    for name, info in types.items():
+        sample = _sample(info["records"], args.sample)
+        before = bytes_per_record(sample, info["before"])
+        after = bytes_per_record(sample, info["after"])
+        count = info["count"]
+        results[name] = {"count": count, "before_bytes": round(before), "after_bytes": round(after)}
+        saved = 1 - after / before if before else 0.0
+        print(f"  {name:26} {count:>11,} {before:>13,.0f} {after:>12,.0f} {saved:>6.0%} "
+              f"{count * before / 1e6:>10,.1f} {count * after / 1e6:>9,.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"days": args.days, "scale": args.scale, "records": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for generator hot paths and full 1-day generator runs.
+
+Two suites:
+    micro  - hour-level emitters registered in bench/hot_paths.py
+    full   - each generator in main_generate.GENERATORS for 1 day, no scenarios
+
+Both report events/sec. Results are compared against bench/baseline.json and
+the run fails (exit 1) if any benchmark is slower than its baseline by more
+than --threshold.
+
+Absolute events/sec depend on the machine and on how busy it is, so each
+repetition of a benchmark is paired with a short run of a fixed pure-Python
+calibration workload (dicts, string formatting, json.dumps, random). Every
+result carries the best calibration speed seen next to it. The baseline
+keeps the calibration its figure was recorded with, and the comparison
+scales the baseline by current / baseline calibration, so the gate tracks
+the code rather than the box or a burst of load. Re-record the baseline with
+--update-baseline whenever a change makes a case faster on purpose, so the
+stale figure does not hide a later regression. Cases that look slower are
+measured once more before the run fails, so one noisy reading on a shared
+machine does not fail the gate.
+
+Usage:
+    python3 bench/run_bench.py                         # micro + full, compare to baseline
+    python3 bench/run_bench.py --suite=micro           # hot paths only (~10s)
+    python3 bench/run_bench.py --only=asa,meraki       # filter by generator name
+    python3 bench/run_bench.py --update-baseline       # record new baseline
+    python3 bench/run_bench.py --suite=full --print-eps-table
+                                                       # suggest main_generate._THROUGHPUT_EPS
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add bin/ for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.hot_paths import CASES, count_events
+
+BENCH_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+SEED = 1337
+CALIBRATION_OPS = 5000
+
+
+def _matches(name: str, only: List[str]) -> bool:
+    """True if the benchmark is in `only` or belongs to one of its generators."""
+    if not only:
+        return True
+    return name in only or name.split(".", 1)[0] in only
+
+
+# =============================================================================
+# CALIBRATION
+# =============================================================================
+
+def _calibration_workload(n: int) -> int:
+    """Generator-shaped work that does not depend on this repo's code."""
+    rng = random.Random(SEED)
+    size = 0
+    for i in range(n):
+        event = {
+            "ts": f"2026-01-06T10:{i % 60:02d}:{rng.randint(0, 59):02d}Z",
+            "src": f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            "port": rng.choice((80, 443, 53, 22)),
+            "bytes": int(rng.random() * 100000),
+        }
+        size += len(json.dumps(event))
+    return size
+
+
+def calibrate() -> float:
+    """Calibration speed of this machine right now, in ops/sec."""
+    t0 = time.perf_counter()
+    _calibration_workload(CALIBRATION_OPS)
+    return round(CALIBRATION_OPS / (time.perf_counter() - t0))
+
+
+# =============================================================================
+# MICRO BENCHMARKS
+# =============================================================================
+
+def run_micro(only: List[str] = None, repeat: int = 5, quiet: bool = False) -> Dict[str, Dict]:
+    """Time each hot-path case `repeat` times with a fixed seed.
+
+    Returns:
+        {case: {"events", "best_seconds", "median_seconds", "eps", "calibration"}}
+    """
+    results = {}
+    for name, (setup, description) in CASES.items():
+        if not _matches(name, only):
+            continue
+        func = setup()
+
+        # Warm-up call (lazy module state, caches)
+        random.seed(SEED)
+        func()
+
+        timings = []
+        calibration = 0
+        events = 0
+        for _ in range(repeat):
+            calibration = max(calibration, calibrate())
+            random.seed(SEED)
+            t0 = time.perf_counter()
+            events = count_events(func())
+            timings.append(time.perf_counter() - t0)
+
+        best = min(timings)
+        results[name] = {
+            "events": events,
+            "best_seconds": round(best, 6),
+            "median_seconds": round(statistics.median(timings), 6),
+            "eps": round(events / best) if best > 0 else 0,
+            "calibration": calibration,
+        }
+        if not quiet:
+            print(f"  {name:40} {events:>7,} ev  {best * 1000:>9.2f} ms  "
+                  f"{results[name]['eps']:>10,} ev/s   ({description})")
+    return results
+
+
+# =============================================================================
+# FULL 1-DAY RUNS
+# =============================================================================
+
+def run_full(only: List[str] = None, days: int = 1, repeat: int = 3,
+             quiet: bool = False) -> Dict[str, Dict]:
+    """Run each generator for `days` days into a temporary directory.
+
+    Dependencies (access before orders/servicebus/asa) run first so the
+    dependents read a real registry. The meeting schedule is built once.
+    Each benchmarked generator runs `repeat` times and reports its best run:
+    a single sub-second run is too noisy for the regression gate.
+
+    Returns:
+        {generator: {"events", "seconds", "eps", "calibration"}}
+    """
+    from main_generate import GENERATORS, GENERATOR_DEPENDENCIES
+    from shared.config import DEFAULT_START_DATE, set_output_base
+    from shared.meeting_schedule import build_meeting_schedule
+
+    names = [g for g in GENERATORS if _matches(g, only)]
+    deps = [d for g in names for d in GENERATOR_DEPENDENCIES.get(g, []) if d not in names]
+    ordered = list(dict.fromkeys(deps + sorted(names, key=lambda g: g in GENERATOR_DEPENDENCIES)))
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="tshrt_bench_") as tmp:
+        set_output_base(Path(tmp))
+        random.seed(SEED)
+        build_meeting_schedule(start_date=DEFAULT_START_DATE, days=days, scenarios="none", quiet=True)
+
+        for name in ordered:
+            seconds = None
+            calibration = 0
+            for _ in range(repeat if name in names else 1):
+                calibration = max(calibration, calibrate())
+                random.seed(SEED)
+                t0 = time.perf_counter()
+                result = GENERATORS[name](start_date=DEFAULT_START_DATE, days=days,
+                                          scenarios="none", quiet=True)
+                elapsed = time.perf_counter() - t0
+                seconds = elapsed if seconds is None else min(seconds, elapsed)
+            if name not in names:
+                continue
+            events = result.get("total", 0) if isinstance(result, dict) else result
+            results[name] = {
+                "events": events,
+                "seconds": round(seconds, 3),
+                "eps": round(events / seconds) if seconds > 0 else 0,
+                "calibration": calibration,
+            }
+            if not quiet:
+                print(f"  {name:20} {events:>9,} ev  {seconds:>7.2f} s  "
+                      f"{results[name]['eps']:>10,} ev/s")
+    return results
+
+
+# =============================================================================
+# BASELINE COMPARISON
+# =============================================================================
+
+def compare(results: Dict[str, Dict[str, Dict]], baseline: Dict,
+            threshold: float) -> List[Tuple[str, str, str]]:
+    """Return (suite, name, message) per benchmark whose eps dropped more than `threshold`.
+
+    Each baseline figure is first scaled by the calibration measured next to
+    the result over the calibration it was recorded with.
+    """
+    regressions = []
+    for suite, suite_results in results.items():
+        base_suite = baseline.get(suite, {})
+        for name, r in suite_results.items():
+            base = base_suite.get(name)
+            if not base:
+                continue
+            scale = r["calibration"] / base["calibration"]
+            expected = base["eps"] * scale
+            change = (r["eps"] - expected) / expected
+            if change < -threshold:
+                regressions.append((suite, name,
+                    f"{suite}/{name}: {r['eps']:,} ev/s vs {round(expected):,} expected "
+                    f"(baseline {base['eps']:,} x {scale:.2f}) ({change:+.0%})"))
+    return regressions
+
+
+def _is_calibrated(baseline: Dict) -> bool:
+    entries = [e for suite in ("micro", "full") for e in baseline.get(suite, {}).values()]
+    return bool(entries) and all(isinstance(e, dict) for e in entries)
+
+
+def _baseline_doc(results: Dict[str, Dict[str, Dict]], previous: Dict) -> Dict:
+    keep = previous if _is_calibrated(previous) else {}
+    doc = {
+        "machine": f"{platform.system()} {platform.machine()}",
+        "python": platform.python_version(),
+        "created": time.strftime("%Y-%m-%d"),
+        "micro": dict(keep.get("micro", {})),
+        "full": dict(keep.get("full", {})),
+    }
+    for suite, suite_results in results.items():
+        for name, r in suite_results.items():
+            doc[suite][name] = {"eps": r["eps"], "calibration": r["calibration"]}
+    return doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generator hot paths")
+    parser.add_argument("--suite", choices=["all", "micro", "full"], default="all")
+    parser.add_argument("--only", default="", help="Comma-separated generator names")
+    parser.add_argument("--repeat", type=int, default=5, help="Micro-benchmark repetitions (best-of)")
+    parser.add_argument("--full-repeat", type=int, default=3, help="Full-run repetitions (best-of)")
+    parser.add_argument("--days", type=int, default=1, help="Days per full generator run")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON path")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown before failing (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--json", help="Also write raw results to this path")
+    parser.add_argument("--print-eps-table", action="store_true",
+                        help="Print measured full-run eps as a _THROUGHPUT_EPS table")
+    parser.add_argument("--quiet", "-q", action="store_true")
+    args = parser.parse_args()
+
+    only = [s.strip() for s in args.only.split(",") if s.strip()]
+    results = {}
+
+    if args.suite in ("all", "micro"):
+        if not args.quiet:
+            print("Micro benchmarks (hot paths)")
+        results["micro"] = run_micro(only, args.repeat, args.quiet)
+    if args.suite in ("all", "full"):
+        if not args.quiet:
+            print(f"Full runs ({args.days} day, no scenarios)")
+        results["full"] = run_full(only, args.days, args.full_repeat, args.quiet)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.print_eps_table and results.get("full"):
+        print("_THROUGHPUT_EPS = {")
+        for name, r in results["full"].items():
+            key = f'"{name}":'
+            print(f"    {key:18}{r['eps']:>8_},")
+        print("}")
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(_baseline_doc(results, baseline), f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {baseline_path}")
+        return
+
+    if not _is_calibrated(baseline):
+        print(f"No calibrated baseline at {baseline_path} (run with --update-baseline)")
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        # Confirm before failing: measure only the flagged cases again
+        flagged = {}
+        for suite, name, _ in regressions:
+            flagged.setdefault(suite, []).append(name)
+        if not args.quiet:
+            print(f"\nRe-measuring {len(regressions)} slower case(s)")
+        rerun = {}
+        if "micro" in flagged:
+            rerun["micro"] = run_micro(flagged["micro"], args.repeat, quiet=True)
+        if "full" in flagged:
+            rerun["full"] = {name: r for name, r in
+                             run_full(flagged["full"], args.days, args.full_repeat, quiet=True).items()
+                             if name in flagged["full"]}
+        regressions = compare(rerun, baseline, args.threshold)
+    if regressions:
+        print(f"\nREGRESSIONS (> {args.threshold:.0%} slower than baseline):")
+        for _, _, msg in regressions:
+            print(f"  {msg}")
+        sys.exit(1)
+    if not args.quiet:
+        print(f"\nNo regressions beyond {args.threshold:.0%} "
+              f"(baseline: {baseline.get('machine', '?')}, {baseline.get('created', '?')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Throughput check for the --syslog network sink against a local listener.
+
+Runs the ASA generator (or any syslog source) for --days/--scale into a
+temporary directory with a SyslogSink attached, receives the messages on a
+listener thread on 127.0.0.1, and reports generation time, send rate and
+drops. Every message received is checked for its framing and PRI.
+
+Usage:
+    python3 bench/syslog_sink.py                          # ASA, 1 day, UDP
+    python3 bench/syslog_sink.py --protocol=tcp --framing=octet --days=3
+    python3 bench/syslog_sink.py --sources=asa,linux,aci --eps=20000
+"""
+
+import argparse
+import random
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add bin/ for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+SEED = 1337
+_MESSAGE_RE = re.compile(rb"<\d{1,3}>")
+
+
+class Listener(threading.Thread):
+    """Local syslog receiver counting well-formed and malformed messages."""
+
+    def __init__(self, protocol: str, framing: str):
+        super().__init__(daemon=True)
+        self.protocol = protocol
+        self.framing = framing
+        self.received = 0
+        self.malformed = 0
+        self.bytes = 0
+        if protocol == "udp":
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 16 << 20)
+            self.sock.bind(("127.0.0.1", 0))
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.bind(("127.0.0.1", 0))
+            self.sock.listen(1)
+        self.port = self.sock.getsockname()[1]
+        self._done = threading.Event()
+
+    def _count(self, message: bytes):
+        self.received += 1
+        if not _MESSAGE_RE.match(message):
+            self.malformed += 1
+
+    def run(self):
+        if self.protocol == "udp":
+            self.sock.settimeout(0.2)
+            while not self._done.is_set():
+                try:
+                    data = self.sock.recv(65535)
+                except socket.timeout:
+                    continue
+                self.bytes += len(data)
+                self._count(data)
+            return
+        conn, _ = self.sock.accept()
+        buf = b""
+        while True:
+            data = conn.recv(1 << 20)
+            if not data:
+                break
+            self.bytes += len(data)
+            buf += data
+            buf = self._split(buf)
+        conn.close()
+
+    def _split(self, buf: bytes) -> bytes:
+        """Count complete frames in buf and return the partial remainder."""
+        if self.framing == "lf":
+            *messages, rest = buf.split(b"\n")
+            for message in messages:
+                self._count(message)
+            return rest
+        pos = 0
+        while True:
+            space = buf.find(b" ", pos)
+            if space < 0:
+                break
+            length = int(buf[pos:space])
+            if space + 1 + length > len(buf):
+                break
+            self._count(buf[space + 1:space + 1 + length])
+            pos = space + 1 + length
+        return buf[pos:]
+
+    def stop(self):
+        self._done.set()
+        self.join(5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure --syslog send rate against a local listener")
+    parser.add_argument("--sources", default="asa", help="Syslog sources to run (default: asa)")
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--protocol", choices=["udp", "tcp"], default="udp")
+    parser.add_argument("--framing", choices=["lf", "octet"], default="lf")
+    parser.add_argument("--eps", type=float, default=0, help="Events/sec ceiling (default: unpaced)")
+    parser.add_argument("--backlog", type=int, default=1_000_000)
+    parser.add_argument("--wait", type=float, default=30.0,
+                        help="Seconds a final write waits for backlog room (default: 30)")
+    args = parser.parse_args()
+
+    from main_generate import GENERATORS
+    from shared.config import DEFAULT_START_DATE, set_output_base
+    from shared.syslog_sink import SyslogSink
+    from shared import output_writer
+
+    listener = Listener(args.protocol, args.framing)
+    listener.start()
+    sink = SyslogSink(f"{args.protocol}://127.0.0.1:{listener.port}", framing=args.framing,
+                      eps=args.eps, backlog=args.backlog, wait=args.wait)
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+    print(f"Sending {', '.join(sink.attach(sources))} to {sink.url}", file=sys.stderr)
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="tshrt_syslog_") as tmp:
+            set_output_base(Path(tmp))
+            random.seed(SEED)
+            gen_start = time.perf_counter()
+            for source in sources:
+                print(f"  {source} ...", file=sys.stderr)
+                GENERATORS[source](start_date=DEFAULT_START_DATE, days=args.days,
+                                   scale=args.scale, quiet=True)
+            gen_seconds = time.perf_counter() - gen_start
+            backlog = sink.backlog()
+            sink.close()
+    finally:
+        output_writer.clear_taps()
+    time.sleep(0.5)   # let the UDP listener drain its receive buffer
+    listener.stop()
+
+    stats = sink.stats()
+    print(f"\n  generation        {gen_seconds:>10.2f} s (backlog at end: {backlog:,})")
+    print(f"  sent              {stats['sent']:>10,} in {stats['seconds']:.2f} s "
+          f"({stats['events_per_sec']:,}/s, {stats['bytes'] / 1e6:.1f} MB)")
+    print(f"  received          {listener.received:>10,} ({listener.malformed:,} malformed)")
+    print(f"  dropped           {stats['dropped']:>10,} (peak backlog {stats['peak_backlog']:,})")
+    print(f"  writers waited    {stats['wait_seconds']:>10.2f} s")
+    print(f"  send errors       {stats['errors']:>10,}")
+    if listener.received != stats["sent"] or listener.malformed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
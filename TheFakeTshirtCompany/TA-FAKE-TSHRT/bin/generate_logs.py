@@ -5,7 +5,15 @@ REST handler for generating demo logs from Splunk UI.
 This handler uses PersistentServerConnectionApplication for proper REST support.
 
 Endpoint: /services/ta_fake_tshrt/generate
-Methods: GET (status), POST (generate)
+Methods: GET (status), POST (start or cancel a generation job)
+
+Generation runs as a background job: POST returns a job_id at once and
+GET ?job_id=<id> returns its live progress (per-generator events/sec, ETA)
+from the progress file main_generate.py keeps up to date. One job runs at
+a time; submitting while one is running returns 409.
+
+GET Parameters:
+  - job_id: Job to report on (default: options, plus the active/last job)
 
 POST Parameters:
   - sources: Comma-separated list (default: "all")
@@ -21,14 +29,22 @@ POST Parameters:
   - no_mr_health: Disable MR health (default: "false")
   - no_ms_health: Disable MS health (default: "false")
   - parallel: Number of parallel workers (default: "4")
+  - compress: Output compression, "none" or "gzip" (default: "none")
   - clean_only: Only delete files, don't generate (default: "false")
+  - action: "cancel" to stop the job given by job_id (default: generate)
+  - job_id: Job to cancel (default: the running job)
 """
 
 import os
 import sys
 import json
 import glob
+import time
+import uuid
+import shutil
+import signal
 import subprocess
+import threading
 import logging
 
 # Setup logging
@@ -47,15 +63,22 @@ except ImportError:
     HAS_SPLUNK = False
     PersistentServerConnectionApplication = object
 
+# Serializes "is a job running?" with starting one, across request threads
+_job_start_lock = threading.Lock()
+
 
 class GenerateHandler(PersistentServerConnectionApplication):
     """REST handler for log generation using persistent connection."""
 
+    # Job directories kept under bin/output/jobs/
+    MAX_JOBS_KEPT = 10
+
     def __init__(self, command_line, command_arg):
         if HAS_SPLUNK:
             super().__init__()
         self.command_line = command_line
         self.command_arg = command_arg
+        self._processes = {}  # {job_id: Popen} for jobs started by this process
 
     def handle(self, in_string):
         """
@@ -98,12 +121,33 @@ class GenerateHandler(PersistentServerConnectionApplication):
 
     def handle_get(self, request):
         """
-        Handle GET request - return available options and status.
+        Handle GET request.
+
+        With job_id: that job's state and live progress. Otherwise: available
+        options, status, the most recent job and the run manifest (phase
+        timings, throughput) of the last generation.
         """
+        query = self._parse_form(request.get('query', []))
+        job_id = query.get('job_id')
+        if job_id:
+            job = self._load_job(job_id)
+            if not job:
+                return {'status': 404, 'payload': {'error': f'No such job: {job_id}'}}
+            return {'status': 200, 'payload': self._job_status(job)}
+
+        output_dir = os.path.join(self._app_home(), 'bin/output')
+        job_ids = self._job_ids()
+        last_job = self._load_job(job_ids[-1]) if job_ids else None
+        if last_job:
+            last_job = self._job_status(last_job)
+        running = bool(last_job) and last_job['state'] in ('running', 'cancelling')
+
         return {
             'status': 200,
             'payload': {
-                'status': 'ready',
+                'status': 'running' if running else 'ready',
+                'last_job': last_job,
+                'last_run': self._load_run_manifest(output_dir),
                 'sources': {
                     'individual': [
                         'asa', 'meraki', 'aws', 'gcp', 'entraid', 'exchange',
@@ -129,18 +173,26 @@ class GenerateHandler(PersistentServerConnectionApplication):
                     'start_date': '2026-01-01',
                     'scale': '1.0',
                     'clients': '5',
-                    'parallel': '4'
+                    'parallel': '4',
+                    'compress': 'none'
                 }
             }
         }
 
     def handle_post(self, request):
         """
-        Handle POST request - generate logs.
+        Handle POST request - start a generation job, cancel one, or clean.
+
+        Generation runs in a detached main_generate.py process; the response
+        carries the job id to poll with GET. Only one job runs at a time:
+        a second submission (or clean_only) while one is active gets 409.
         """
         # Parse form data
         form_data = self._parse_form(request.get('form', []))
 
+        if form_data.get('action') == 'cancel':
+            return self.cancel_job(form_data.get('job_id'))
+
         # Extract parameters with defaults
         sources = form_data.get('sources', 'all')
         days = form_data.get('days', '14')
@@ -155,102 +207,113 @@ class GenerateHandler(PersistentServerConnectionApplication):
         no_mr_health = form_data.get('no_mr_health', 'false').lower() == 'true'
         no_ms_health = form_data.get('no_ms_health', 'false').lower() == 'true'
         parallel = form_data.get('parallel', '4')
+        compress = form_data.get('compress', 'none')
         clean_only = form_data.get('clean_only', 'false').lower() == 'true'
 
         logger.info(f"Parameters: sources={sources}, days={days}, scenarios={scenarios}")
 
         # Paths
-        splunk_home = os.environ.get('SPLUNK_HOME', '/opt/splunk')
-        app_home = os.path.join(splunk_home, 'etc/apps/TA-FAKE-TSHRT')
+        app_home = self._app_home()
         output_dir = os.path.join(app_home, 'bin/output')
         script = os.path.join(app_home, 'bin/main_generate.py')
 
         try:
-            # Step 1: Delete old files
-            deleted_count = self._clean_output_directory(output_dir)
-            logger.info(f"Deleted {deleted_count} old files")
-
-            if clean_only:
-                return {
-                    'status': 200,
-                    'payload': {
-                        'status': 'success',
-                        'message': f'Cleaned {deleted_count} files',
-                        'deleted_files': deleted_count
+            # The check and the start are one step: a concurrent POST must
+            # see this job (job.json) before it looks for an active one
+            with _job_start_lock:
+                # Never delete files out from under a running job
+                active = self._active_job()
+                if active:
+                    return {
+                        'status': 409,
+                        'payload': {
+                            'status': 'busy',
+                            'error': f"Job {active['job_id']} is still running",
+                            'job': active
+                        }
                     }
-                }
 
-            # Step 2: Build command
-            cmd = [
-                sys.executable or 'python3',
-                script,
-                f'--sources={sources}',
-                f'--days={days}',
-                f'--scenarios={scenarios}',
-                f'--start-date={start_date}',
-                f'--scale={scale}',
-                f'--clients={clients}',
-                f'--client-interval={client_interval}',
-                f'--orders-per-day={orders_per_day}',
-                f'--meraki-health-interval={meraki_health_interval}',
-                f'--parallel={parallel}',
-                '--no-test',
-                '--quiet'
-            ]
-
-            # Add boolean flags
-            if full_metrics:
-                cmd.append('--full-metrics')
-            if no_mr_health:
-                cmd.append('--no-mr-health')
-            if no_ms_health:
-                cmd.append('--no-ms-health')
-
-            logger.info(f"Running: {' '.join(cmd)}")
-
-            # Step 3: Execute
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=600,  # 10 minute timeout
-                cwd=os.path.join(app_home, 'bin')
-            )
-
-            if result.returncode == 0:
-                # Extract last few lines of output
-                output_lines = []
-                if result.stdout:
-                    output_lines = result.stdout.strip().split('\n')[-10:]
-
-                return {
-                    'status': 200,
-                    'payload': {
-                        'status': 'success',
-                        'message': f'Generated {days} days of logs for {sources}',
-                        'deleted_files': deleted_count,
-                        'output': '\n'.join(output_lines)
-                    }
-                }
-            else:
-                error_msg = result.stderr[:1000] if result.stderr else 'Unknown error'
-                logger.error(f"Generation failed: {error_msg}")
-                return {
-                    'status': 200,  # Return 200 but with error in payload
-                    'payload': {
-                        'status': 'failed',
-                        'error': error_msg,
-                        'deleted_files': deleted_count
+                # Step 1: Delete old files
+                deleted_count = self._clean_output_directory(output_dir)
+                logger.info(f"Deleted {deleted_count} old files")
+
+                if clean_only:
+                    return {
+                        'status': 200,
+                        'payload': {
+                            'status': 'success',
+                            'message': f'Cleaned {deleted_count} files',
+                            'deleted_files': deleted_count
+                        }
                     }
+
+                # Step 2: Build command
+                job_id = time.strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+                job_dir = os.path.join(self._jobs_dir(), job_id)
+                os.makedirs(job_dir)
+                cmd = [
+                    sys.executable or 'python3',
+                    script,
+                    f'--sources={sources}',
+                    f'--days={days}',
+                    f'--scenarios={scenarios}',
+                    f'--start-date={start_date}',
+                    f'--scale={scale}',
+                    f'--clients={clients}',
+                    f'--client-interval={client_interval}',
+                    f'--orders-per-day={orders_per_day}',
+                    f'--meraki-health-interval={meraki_health_interval}',
+                    f'--parallel={parallel}',
+                    f'--compress={compress}',
+                    f'--progress-file={os.path.join(job_dir, "progress.json")}',
+                    '--quiet'
+                ]
+
+                # Add boolean flags
+                if full_metrics:
+                    cmd.append('--full-metrics')
+                if no_mr_health:
+                    cmd.append('--no-mr-health')
+                if no_ms_health:
+                    cmd.append('--no-ms-health')
+
+                logger.info(f"Starting job {job_id}: {' '.join(cmd)}")
+
+                # Step 3: Start detached (own session/process group, so cancel
+                # can signal Meraki worker processes too)
+                with open(os.path.join(job_dir, 'generate.log'), 'w') as log:
+                    proc = subprocess.Popen(
+                        cmd,
+                        stdout=log,
+                        stderr=subprocess.STDOUT,
+                        stdin=subprocess.DEVNULL,
+                        cwd=os.path.join(app_home, 'bin'),
+                        start_new_session=True
+                    )
+                self._processes[job_id] = proc
+
+                job = {
+                    'job_id': job_id,
+                    'pid': proc.pid,
+                    'submitted_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                    'params': {
+                        'sources': sources, 'days': days, 'scenarios': scenarios,
+                        'start_date': start_date, 'scale': scale, 'parallel': parallel,
+                        'compress': compress
+                    },
+                    'deleted_files': deleted_count,
+                    'cancel_requested': False
                 }
+                self._save_job(job)
+                self._prune_jobs()
 
-        except subprocess.TimeoutExpired:
-            logger.error("Generation timed out after 10 minutes")
             return {
-                'status': 200,
+                'status': 202,
                 'payload': {
-                    'status': 'timeout',
-                    'error': 'Generation took longer than 10 minutes'
+                    'status': 'started',
+                    'message': f'Generating {days} days of logs for {sources}',
+                    'job_id': job_id,
+                    'deleted_files': deleted_count
                 }
             }
 
@@ -264,6 +327,157 @@ class GenerateHandler(PersistentServerConnectionApplication):
                 }
             }
 
+    def cancel_job(self, job_id):
+        """
+        Cancel a running job by sending SIGTERM to its process group.
+
+        main_generate.py records "cancelled" in its progress file on SIGTERM;
+        files generated so far stay in output/tmp/.
+        """
+        job = self._load_job(job_id) if job_id else self._active_job()
+        if not job:
+            return {'status': 404, 'payload': {'error': f'No such job: {job_id}'}}
+        if not self._job_running(job):
+            return {
+                'status': 409,
+                'payload': {'status': 'finished', 'error': f"Job {job['job_id']} is not running",
+                            'job': self._job_status(job)}
+            }
+
+        job['cancel_requested'] = True
+        self._save_job(job)
+        try:
+            if hasattr(os, 'killpg'):
+                os.killpg(job['pid'], signal.SIGTERM)
+            else:
+                os.kill(job['pid'], signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        logger.info(f"Cancelled job {job['job_id']} (pid {job['pid']})")
+        return {
+            'status': 200,
+            'payload': {'status': 'cancelling', 'job_id': job['job_id']}
+        }
+
+    # ------------------------------------------------------------------
+    # Job state
+    #
+    # Each job is a directory under bin/output/jobs/<job_id>/ holding
+    # job.json (parameters, pid), progress.json (written by
+    # main_generate.py --progress-file) and generate.log (its output).
+    # State lives on disk so GET keeps working after Splunk restarts the
+    # persistent handler process.
+    # ------------------------------------------------------------------
+
+    def _app_home(self):
+        splunk_home = os.environ.get('SPLUNK_HOME', '/opt/splunk')
+        return os.path.join(splunk_home, 'etc/apps/TA-FAKE-TSHRT')
+
+    def _jobs_dir(self):
+        return os.path.join(self._app_home(), 'bin/output/jobs')
+
+    def _job_ids(self):
+        """Job ids, oldest first (ids start with their submit time)."""
+        if not os.path.isdir(self._jobs_dir()):
+            return []
+        return sorted(d for d in os.listdir(self._jobs_dir())
+                      if os.path.isfile(os.path.join(self._jobs_dir(), d, 'job.json')))
+
+    def _read_json(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_job(self, job_id):
+        # Job ids are generated here; refuse anything that could escape jobs/
+        if os.path.basename(job_id) != job_id or job_id.startswith('.'):
+            return None
+        return self._read_json(os.path.join(self._jobs_dir(), job_id, 'job.json'))
+
+    def _save_job(self, job):
+        path = os.path.join(self._jobs_dir(), job['job_id'], 'job.json')
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(job, f, indent=2)
+        os.replace(tmp, path)
+
+    def _prune_jobs(self):
+        """Keep the directories of the last MAX_JOBS_KEPT jobs."""
+        for job_id in self._job_ids()[:-self.MAX_JOBS_KEPT]:
+            shutil.rmtree(os.path.join(self._jobs_dir(), job_id), ignore_errors=True)
+            self._processes.pop(job_id, None)
+
+    def _job_running(self, job):
+        proc = self._processes.get(job['job_id'])
+        if proc is not None:
+            # poll() also reaps the child once it exits
+            return proc.poll() is None
+        # Started by an earlier handler process: check the pid, unless the
+        # progress file already holds a final state (the pid may be reused)
+        progress = self._read_json(
+            os.path.join(self._jobs_dir(), job['job_id'], 'progress.json')) or {}
+        if progress.get('state', 'running') != 'running':
+            return False
+        try:
+            os.kill(job['pid'], 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _active_job(self):
+        """Status of the running job, or None."""
+        job_ids = self._job_ids()
+        if job_ids:
+            job = self._load_job(job_ids[-1])
+            if job and self._job_running(job):
+                return self._job_status(job)
+        return None
+
+    def _job_status(self, job):
+        """
+        Combine job.json, the progress file and the process state.
+
+        state is running, cancelling, done, failed or cancelled. A process
+        that exited without writing a final state crashed (failed) or was
+        killed after a cancel request (cancelled).
+        """
+        job_dir = os.path.join(self._jobs_dir(), job['job_id'])
+        progress = self._read_json(os.path.join(job_dir, 'progress.json'))
+        running = self._job_running(job)
+        final = progress.get('state') if progress else None
+
+        if running:
+            state = 'cancelling' if job.get('cancel_requested') else 'running'
+        elif final and final != 'running':
+            state = final
+        else:
+            state = 'cancelled' if job.get('cancel_requested') else 'failed'
+
+        status = dict(job, state=state, progress=progress)
+        proc = self._processes.get(job['job_id'])
+        if proc is not None and proc.returncode is not None:
+            status['exit_code'] = proc.returncode
+        if not running:
+            status['output'] = self._log_tail(os.path.join(job_dir, 'generate.log'))
+            if state == 'done':
+                status['manifest'] = self._load_run_manifest(
+                    os.path.join(self._app_home(), 'bin/output'))
+        return status
+
+    def _log_tail(self, path, lines=20, max_bytes=16384):
+        try:
+            with open(path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(f.tell() - max_bytes, 0))
+                text = f.read().decode('utf-8', errors='replace')
+        except OSError:
+            return ''
+        return '\n'.join(text.strip().split('\n')[-lines:])
+
     def _parse_form(self, form_list):
         """
         Parse form data from request.
@@ -284,6 +498,23 @@ class GenerateHandler(PersistentServerConnectionApplication):
                 result[key] = value
         return result
 
+    def _load_run_manifest(self, output_dir):
+        """
+        Load run_manifest.json written by main_generate.py.
+
+        Production runs leave it in output/, test runs in output/tmp/.
+        Returns None if no run has completed yet.
+        """
+        for path in (os.path.join(output_dir, 'run_manifest.json'),
+                     os.path.join(output_dir, 'tmp', 'run_manifest.json')):
+            if os.path.isfile(path):
+                try:
+                    with open(path) as f:
+                        return json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not read {path}: {e}")
+        return None
+
     def _clean_output_directory(self, output_dir):
         """
         Delete all files in output subdirectories.
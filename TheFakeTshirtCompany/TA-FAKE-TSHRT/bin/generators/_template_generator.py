@@ -9,14 +9,13 @@ INSTRUCTIONS:
    - CATEGORY with output category ("network", "cloud", "windows", "linux", "web", "retail", "itsm")
 3. Implement generate_single_event() for your log format
 4. Register in main_generate.py:
-   - Import: from generators.generate_xxx import generate_xxx_logs
-   - Add to GENERATORS dict
+   - Add "xxx": "generators.generate_xxx:generate_xxx_logs" to GENERATOR_MODULES
+     (imported on first use, not at startup)
    - Add to appropriate SOURCE_GROUPS
 5. Test: python3 generators/generate_xxx.py --days=1 --quiet
 """
 
 import argparse
-import json
 import random
 import sys
 from pathlib import Path
@@ -26,6 +25,7 @@ from typing import List, Dict, Any, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from shared.config import DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path
+from shared.output_writer import json_line, write_events
 from shared.time_utils import (
     ts_iso,           # "2026-01-05T14:30:45Z" - for JSON logs
     ts_iso_ms,        # "2026-01-05T14:30:45.123Z" - for JSON with milliseconds
@@ -136,15 +136,9 @@ def generate_SOURCENAME_logs(
     all_events.sort(key=lambda x: x.get("timestamp", "") if isinstance(x, dict) else x)
     # For string events (syslog), they sort naturally if timestamp is at start
 
-    # Write to file
-    with open(output_path, "w") as f:
-        for event in all_events:
-            if isinstance(event, dict):
-                # JSON lines format
-                f.write(json.dumps(event) + "\n")
-            else:
-                # Plain text (syslog, etc.)
-                f.write(event + "\n")
+    # Write to file (one line per event: JSON for dicts, as-is for strings).
+    # Always go through shared.output_writer so --compress applies.
+    write_events(output_path, all_events, serialize=json_line)
 
     # Final summary
     if not quiet:
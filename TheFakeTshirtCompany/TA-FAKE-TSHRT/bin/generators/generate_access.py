@@ -12,6 +12,9 @@ Session Types:
   - browser (35%): 3-10 pages, browses but doesn't buy
   - abandoned (15%): adds to cart, starts checkout, leaves
   - purchase (10%): completes full checkout
+
+Sessions are synthesized an hour at a time by generate_sessions_hour() and
+streamed to disk in timestamp order.
 """
 
 import argparse
@@ -20,15 +23,18 @@ import sys
 import json
 import os
 from pathlib import Path
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Optional
 from datetime import datetime
+from functools import lru_cache
+from itertools import accumulate
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from shared.config import DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path
 from shared.time_utils import date_add, calc_natural_events
-from shared.company import US_IP_PFX, get_customer_ip, get_visitor_ip
+from shared.company import US_IP_PFX, get_customer_ip, get_visitor_ip, get_visitor_ips
 from shared.products import PRODUCTS, PRODUCT_CATEGORIES
+from shared.output_writer import OrderedWriter, write_lines
 from scenarios.network import CertificateExpiryScenario
 from scenarios.network.firewall_misconfig import FirewallMisconfigScenario
 from scenarios.registry import expand_scenarios
@@ -89,12 +95,25 @@ CART_SIZE_WEIGHTS = [40, 30, 15, 10, 5]
 # Quantity distribution: 80% qty=1, 20% qty=2
 QTY_WEIGHTS = [80, 20]
 
-# Order tracking
+# Site search terms used by browsing sessions
+SEARCH_TERMS = ["coffee", "code", "linux", "developer", "security"]
+
+# Web servers behind the ASA (a session sticks to one)
+WEB_SERVERS = ["172.16.1.10", "172.16.1.11"]
+
+# Order tracking. Registry entries are compact tuples in ORDER_FIELDS /
+# WEB_SESSION_FIELDS order; order_record_json() / web_session_record_json()
+# turn them into the JSONL lines read by the orders, servicebus and ASA
+# generators.
 ORDER_SEQUENCE = 0
-ORDER_REGISTRY: List[Dict] = []
+ORDER_FIELDS = ("order_id", "tshirtcid", "customer_id", "customer_ip", "session_id",
+                "timestamp", "products", "cart_total", "scenario")
+ORDER_REGISTRY: List[Tuple] = []
 
 # Web session registry for ASA 1:1 correlation
-WEB_SESSION_REGISTRY: List[Dict] = []
+WEB_SESSION_FIELDS = ("ip", "start_ts", "end_ts", "bytes", "dst", "dst_port",
+                      "session_id", "pages")
+WEB_SESSION_REGISTRY: List[Tuple] = []
 
 
 # =============================================================================
@@ -105,32 +124,10 @@ WEB_SESSION_REGISTRY: List[Dict] = []
 # NOTE: get_customer_ip() is now imported from shared.company (deterministic per customer_id)
 
 
-def get_user_agent() -> str:
-    """Get random user agent (95% browsers, 5% bots)."""
-    if random.randint(1, 100) <= 95:
-        return random.choice(USER_AGENTS)
-    return random.choice(BOT_AGENTS)
-
-
-def get_customer_id(pool_total: int = 10000, pool_vip: int = 500) -> str:
-    """Get customer ID with Pareto distribution (30% from top VIPs, 70% from rest).
-
-    Pool size scales dynamically with order volume to maintain ~4 orders/customer.
-    VIP customers (top 5%) drive 30% of traffic (Pareto distribution).
-    """
-    if random.randint(1, 100) <= 30:
-        return f"CUST-{random.randint(1, pool_vip):05d}"
-    return f"CUST-{random.randint(pool_vip + 1, pool_total):05d}"
-
-
-def generate_session_id() -> str:
-    """Generate unique session ID."""
-    return f"sess_{random.randint(0, 0xFFFFFFFF):08x}"
-
-
 def generate_tshirtcid() -> str:
     """Generate tracking cookie ID (UUID v4 format)."""
-    return f"{random.randint(0, 0xFFFF):04x}{random.randint(0, 0xFFFF):04x}-{random.randint(0, 0xFFFF):04x}-4{random.randint(0, 0xFFF):03x}-{random.randint(0x8000, 0xBFFF):04x}-{random.randint(0, 0xFFFF):04x}{random.randint(0, 0xFFFF):04x}{random.randint(0, 0xFFFF):04x}"
+    bits = random.getrandbits
+    return f"{bits(32):08x}-{bits(16):04x}-4{bits(12):03x}-{0x8000 | bits(14):04x}-{bits(48):012x}"
 
 
 def get_method_for_url(url: str) -> str:
@@ -140,8 +137,8 @@ def get_method_for_url(url: str) -> str:
     return "GET"
 
 
-def get_response_size(url: str, status: int = 200) -> int:
-    """Get response size based on URL type and HTTP status code.
+def response_size_range(url: str, status: int = 200) -> Tuple[int, int]:
+    """(min, max) response size in bytes for a URL type and HTTP status code.
 
     Non-200 status codes return realistic error/redirect response sizes:
     - 301/302: 0 (redirect, body is empty or minimal)
@@ -153,90 +150,57 @@ def get_response_size(url: str, status: int = 200) -> int:
     """
     # Non-200 status codes have standard error response sizes
     if status == 304:
-        return 0  # Not Modified — no body
+        return 0, 0  # Not Modified — no body
     elif status in (301, 302):
-        return random.randint(0, 230)  # Redirect — minimal or empty body
+        return 0, 230  # Redirect — minimal or empty body
     elif status in (401, 403):
-        return random.randint(200, 800)  # Auth error page
+        return 200, 800  # Auth error page
     elif status == 404:
-        return random.randint(500, 1500)  # Not found error page
+        return 500, 1500  # Not found error page
     elif status == 429:
-        return random.randint(200, 500)  # Rate limit response
+        return 200, 500  # Rate limit response
     elif status >= 500:
-        return random.randint(500, 2000)  # Server error page
+        return 500, 2000  # Server error page
 
     # 200 OK — size depends on content type
     if url == "/":
-        return random.randint(8000, 13000)
+        return 8000, 13000
     elif url.startswith("/products/category/"):
-        return random.randint(7000, 11000)
+        return 7000, 11000
     elif url.startswith("/products/"):
-        return random.randint(6000, 9000)
+        return 6000, 9000
     elif url == "/cart":
-        return random.randint(4000, 6000)
+        return 4000, 6000
     elif url.startswith("/cart/add"):
-        return random.randint(200, 700)
+        return 200, 700
     elif url == "/checkout":
-        return random.randint(5000, 7000)
+        return 5000, 7000
     elif url == "/checkout/complete":
-        return random.randint(1500, 2500)
+        return 1500, 2500
     elif url.startswith("/api/"):
-        return random.randint(500, 2500)
+        return 500, 2500
     elif url.startswith("/static/") or url.startswith("/css/") or url.startswith("/js/"):
-        return random.randint(10000, 60000)
+        return 10000, 60000
     else:
-        return random.randint(2000, 5000)
+        return 2000, 5000
 
 
-def get_response_time(url: str, multiplier: int = 100) -> int:
-    """Get response time in ms based on URL type."""
+def response_time_range(url: str) -> Tuple[int, int]:
+    """(min, max) base response time in ms for a URL type (before scenario scaling)."""
     if url.startswith("/api/"):
-        base_rt = random.randint(20, 70)
+        return 20, 70
     elif url.startswith("/static/"):
-        base_rt = random.randint(5, 15)
+        return 5, 15
     elif url.startswith("/cart/add"):
-        base_rt = random.randint(40, 120)
+        return 40, 120
     elif url == "/checkout/complete":
-        base_rt = random.randint(150, 350)
+        return 150, 350
     elif url == "/checkout":
-        base_rt = random.randint(100, 250)
+        return 100, 250
     elif url.startswith("/products/"):
-        base_rt = random.randint(40, 120)
-    else:
-        base_rt = random.randint(30, 90)
-
-    jitter = random.randint(-base_rt // 4, base_rt // 4)
-    return max(1, base_rt * multiplier // 100 + jitter)
-
-
-def get_status_code(error_rate: int = 0) -> int:
-    """Get HTTP status code with optional error injection."""
-    if error_rate > 0 and random.randint(1, 100) <= error_rate:
-        roll = random.randint(1, 100)
-        if roll <= 60:
-            return 503
-        elif roll <= 90:
-            return 504
-        else:
-            return 500
-
-    roll = random.randint(1, 1000)
-    if roll <= 940:
-        return 200
-    elif roll <= 958:
-        return 304
-    elif roll <= 972:
-        return 301
-    elif roll <= 984:
-        return 404
-    elif roll <= 989:
-        return 401    # Unauthorized (expired session, bad API key)
-    elif roll <= 994:
-        return 403    # Forbidden (access denied)
-    elif roll <= 997:
-        return 429    # Too Many Requests (rate limiting)
+        return 40, 120
     else:
-        return 500
+        return 30, 90
 
 
 def format_apache_time(dt: datetime) -> str:
@@ -244,6 +208,18 @@ def format_apache_time(dt: datetime) -> str:
     return dt.strftime("[%d/%b/%Y:%H:%M:%S +0000]")
 
 
+@lru_cache(maxsize=None)
+def _apache_date_key(apache_date: str) -> str:
+    """'06/Jan/2026' -> '2026-01-06', so dates sort chronologically."""
+    return datetime.strptime(apache_date, "%d/%b/%Y").strftime("%Y-%m-%d")
+
+
+def apache_sort_key(line: str) -> str:
+    """Chronological sort key ('2026-01-06:14:30:45') of an Apache log line."""
+    i = line.index(" [") + 2
+    return _apache_date_key(line[i:i + 11]) + line[i + 11:i + 20]
+
+
 # Monitoring server IP (MON-ATL-01) for health check probes
 HEALTH_CHECK_IP = "10.20.20.30"
 HEALTH_CHECK_UA = "Nagios/4.4.6 (health_check)"
@@ -344,15 +320,145 @@ def generate_bot_crawl_events(
 
 
 # =============================================================================
-# SESSION GENERATION
+# BATCH SESSION ENGINE
 # =============================================================================
-
-def generate_session(
+# Drawing every field of every page one randint() at a time would dominate the
+# run once --orders-per-day reaches the thousands (~40K sessions a day at
+# 3000). generate_sessions_hour() synthesizes all sessions that start in one
+# hour together: session shapes are drawn column-wise from the weighted
+# tables below, per-URL attributes come from a cache, and timestamps are
+# sliced from a per-day table of format_apache_time() strings.
+
+# (session_type, page_count), each SESSION_TYPES weight spread over its page range
+_SESSION_SHAPES = [(stype, pages) for stype, _, (low, high) in SESSION_TYPES
+                   for pages in range(low, high + 1)]
+_SESSION_SHAPE_CUM = list(accumulate(
+    weight / (high - low + 1) for _, weight, (low, high) in SESSION_TYPES
+    for _ in range(low, high + 1)))
+
+# Bounce/browser sessions: 95% browsers, 5% bots
+_BROWSE_AGENTS = USER_AGENTS + BOT_AGENTS
+_BROWSE_AGENT_CUM = list(accumulate(
+    [95 / len(USER_AGENTS)] * len(USER_AGENTS) + [5 / len(BOT_AGENTS)] * len(BOT_AGENTS)))
+
+# Landing page: home 40%, product 35%, category 20%, info page 5%
+_PRODUCT_URLS = [f"/products/{slug}" for slug in PRODUCT_SLUGS]
+_CATEGORY_URLS = [f"/products/category/{cat}" for cat in CATEGORIES]
+_INFO_URLS = ["/about", "/faq", "/shipping"]
+_LANDING_URLS = ["/"] + _PRODUCT_URLS + _CATEGORY_URLS + _INFO_URLS
+_LANDING_CUM = list(accumulate(
+    [40] + [35 / len(_PRODUCT_URLS)] * len(_PRODUCT_URLS)
+    + [20 / len(_CATEGORY_URLS)] * len(_CATEGORY_URLS) + [5 / len(_INFO_URLS)] * len(_INFO_URLS)))
+
+# Browser sessions after landing: product 50%, category 30%, search 20%
+_SEARCH_URLS = [f"/api/v1/search?q={term}" for term in SEARCH_TERMS]
+_BROWSE_URLS = _PRODUCT_URLS + _CATEGORY_URLS + _SEARCH_URLS
+_BROWSE_URL_CUM = list(accumulate(
+    [50 / len(_PRODUCT_URLS)] * len(_PRODUCT_URLS) + [30 / len(_CATEGORY_URLS)] * len(_CATEGORY_URLS)
+    + [20 / len(_SEARCH_URLS)] * len(_SEARCH_URLS)))
+
+# Referer of the landing page (REFERRERS order)
+_ENTRY_REFERER_CUM = list(accumulate([40, 20, 15, 10, 10, 5]))
+
+_CART_SIZES = [1, 2, 3, 4, 5]
+_CART_SIZE_CUM = list(accumulate(CART_SIZE_WEIGHTS))
+_QTY_CUM = list(accumulate(QTY_WEIGHTS))
+
+# Funnel pages after the added items
+_CHECKOUT_PAGES = {
+    "abandoned": ["/cart", "/checkout"],
+    "purchase": ["/cart", "/checkout", "/checkout/complete"],
+}
+
+# Customer IPs are a SHA-256 of the customer ID; repeat customers are common
+_customer_ip = lru_cache(maxsize=None)(get_customer_ip)
+
+_HOUR_SECONDS = range(3600)
+_PAGE_GAPS = range(8, 181)  # 8s to 3min between pages
+
+# Status outcomes: per-mille when healthy; error_rate% of requests instead fail
+# with 503/504/500 at 60/30/10
+_STATUS_CODES = (200, 304, 301, 404, 401, 403, 429, 500)
+_STATUS_PER_MILLE = (940, 18, 14, 12, 5, 5, 3, 3)
+
+
+@lru_cache(maxsize=None)
+def _status_table(error_rate: int) -> Tuple[Tuple[int, ...], List[int]]:
+    """(codes, cum_weights) for the status of a request at `error_rate` percent errors."""
+    codes = (503, 504, 500) + _STATUS_CODES
+    weights = [error_rate * 600, error_rate * 300, error_rate * 100]
+    weights += [(100 - error_rate) * w for w in _STATUS_PER_MILLE]
+    return codes, list(accumulate(weights))
+
+
+@lru_cache(maxsize=None)
+def _error_size(status: int) -> Tuple[int, int]:
+    """(min, span) of the response size for a non-200 status."""
+    low, high = response_size_range("", status)
+    return low, high - low + 1
+
+
+@lru_cache(maxsize=None)
+def _url_profile(url: str) -> Tuple:
+    """Everything about a page that depends only on its URL.
+
+    Returns (method, rt_min, rt_span, size_min, size_span, extra_fields,
+    cart_add, shows_cart, is_checkout), where cart_add is (slug, price, qty)
+    for /cart/add and None otherwise.
+    """
+    rt_low, rt_high = response_time_range(url)
+    size_low, size_high = response_size_range(url, 200)
+    extra = ""
+    cart_add = None
+    if url.startswith("/products/") and not url.startswith("/products/category/"):
+        extra = f" product_price={PRODUCT_PRICES.get(url[10:], 299)}"
+    elif url.startswith("/cart/add"):
+        url_parts = url.replace("/cart/add?product=", "").split("&qty=")
+        qty = int(url_parts[1]) if len(url_parts) > 1 else 1
+        price = PRODUCT_PRICES.get(url_parts[0], 299)
+        cart_add = (url_parts[0], price, qty)
+        extra = f" product_price={price} qty={qty}"
+    return (get_method_for_url(url), rt_low, rt_high - rt_low + 1,
+            size_low, size_high - size_low + 1, extra, cart_add,
+            url in ("/cart", "/checkout", "/checkout/complete"), url.startswith("/checkout"))
+
+
+@lru_cache(maxsize=2)
+def _apache_day_stamps(base_date: str, day: int) -> List[str]:
+    """format_apache_time() for every second of a day, indexed by second of day."""
+    prefix = format_apache_time(date_add(base_date, day))[:13]  # "[06/Jan/2026:"
+    return [f"{prefix}{h:02d}:{m:02d}:{s:02d} +0000]"
+            for h in range(24) for m in range(60) for s in range(60)]
+
+
+def _session_urls(session_type: str, pages: int, landing: str) -> List[str]:
+    """Page URLs of one session: the landing page, then navigation by session type."""
+    rest = pages - 1
+    if session_type == "bounce":
+        return [landing] + random.choices(_PRODUCT_URLS, k=rest)
+    if session_type == "browser":
+        return [landing] + random.choices(_BROWSE_URLS, cum_weights=_BROWSE_URL_CUM, k=rest)
+
+    # abandoned/purchase: view + add for each planned item, then the checkout
+    # pages; a session too short for the whole funnel keeps only its tail
+    num_items = random.choices(_CART_SIZES, cum_weights=_CART_SIZE_CUM)[0]
+    slugs = random.sample(PRODUCT_SLUGS, min(num_items, len(PRODUCT_SLUGS)))
+    qtys = random.choices((1, 2), cum_weights=_QTY_CUM, k=len(slugs))
+    funnel = []
+    for slug, qty in zip(slugs, qtys):
+        funnel.append(f"/products/{slug}")
+        funnel.append(f"/cart/add?product={slug}&qty={qty}")
+    funnel += _CHECKOUT_PAGES[session_type]
+    if rest <= len(funnel):
+        return [landing] + funnel[len(funnel) - rest:]
+    return [landing] + random.choices(_PRODUCT_URLS, k=rest - len(funnel)) + funnel
+
+
+def generate_sessions_hour(
     base_date: str,
     day: int,
-    start_hour: int,
-    start_min: int,
-    start_sec: int,
+    hour: int,
+    count: int,
     response_mult: int = 100,
     error_rate: int = 0,
     demo_id: Optional[str] = None,
@@ -360,310 +466,146 @@ def generate_session(
     pool_vip: int = 500,
     order_year: str = "2026",
 ) -> List[str]:
-    """Generate a complete user session with full tracking."""
+    """Generate `count` sessions starting at random times within one hour.
+
+    Each session gets a shape from SESSION_TYPES, its page URLs, one log
+    line per page and a WEB_SESSION_REGISTRY record; purchases also add an
+    ORDER_REGISTRY record. The random draws are batched per hour instead of
+    made field by field.
+    """
     global ORDER_SEQUENCE
 
-    events = []
+    rand = random.random
+    bits = random.getrandbits
+    choices = random.choices
+    stamps = _apache_day_stamps(base_date, day)
+    iso_date = date_add(base_date, day).strftime("%Y-%m-%dT")
+    demo_suffix = f" demo_id={demo_id}" if demo_id else ""
+    order_registry = ORDER_REGISTRY
+    session_registry = WEB_SESSION_REGISTRY
+
+    # Session-level columns
+    shapes = choices(_SESSION_SHAPES, cum_weights=_SESSION_SHAPE_CUM, k=count)
+    starts = choices(_HOUR_SECONDS, k=count)
+    landings = choices(_LANDING_URLS, cum_weights=_LANDING_CUM, k=count)
+    entry_referers = choices(REFERRERS, cum_weights=_ENTRY_REFERER_CUM, k=count)
+    browse_agents = choices(_BROWSE_AGENTS, cum_weights=_BROWSE_AGENT_CUM, k=count)
+    web_servers = choices(WEB_SERVERS, k=count)
+    buyers = sum(1 for stype, _ in shapes if stype in ("abandoned", "purchase"))
+    visitor_ips = iter(get_visitor_ips(count - buyers))
+
+    # Page-level columns (pages past midnight are drawn but dropped)
+    total_pages = sum(pages for _, pages in shapes)
+    codes, code_cum = _status_table(error_rate)
+    statuses = choices(codes, cum_weights=code_cum, k=total_pages)
+    gaps = choices(_PAGE_GAPS, k=total_pages)
+    page = 0
 
-    # Session identifiers
-    session_id = generate_session_id()
-    tshirtcid = generate_tshirtcid()
-
-    # Pick session type
-    roll = random.randint(1, 100)
-    cumulative = 0
-    session_type = "bounce"
-    page_range = (1, 2)
-
-    for stype, weight, prange in SESSION_TYPES:
-        cumulative += weight
-        if roll <= cumulative:
-            session_type = stype
-            page_range = prange
-            break
-
-    # User agent: bots only for bounce/browser sessions (bots don't purchase)
-    if session_type in ("purchase", "abandoned"):
-        ua = random.choice(USER_AGENTS)
-    else:
-        ua = get_user_agent()
+    events = []
+    append = events.append
+    for (session_type, pages), start, landing, entry_referer, browse_agent, web_server in zip(
+            shapes, starts, landings, entry_referers, browse_agents, web_servers):
+        session_id = f"sess_{bits(32):08x}"
+        tshirtcid = generate_tshirtcid()
+
+        if session_type in ("abandoned", "purchase"):
+            ua = USER_AGENTS[int(rand() * len(USER_AGENTS))]
+            if rand() < 0.3:
+                customer_id = f"CUST-{1 + int(rand() * pool_vip):05d}"
+            else:
+                customer_id = f"CUST-{pool_vip + 1 + int(rand() * (pool_total - pool_vip)):05d}"
+            ip = _customer_ip(customer_id)
+        else:
+            ua = browse_agent
+            customer_id = "-"
+            ip = next(visitor_ips)
+
+        head = f"{ip} - "
+        tail = f'" "{ua}" response_time='
+        ids = f" session_id={session_id} tshirtcid={tshirtcid} customer_id={customer_id} order_id="
+
+        sec = first_sec = hour * 3600 + start
+        last_sec = sec
+        previous_url = "-"
+        order_id = "-"
+        cart_items = cart_total = 0
+        cart_products = []
+        total_bytes = 0
+        emitted = 0
+
+        for url in _session_urls(session_type, pages, landing):
+            if sec >= 86400:
+                break
+            (method, rt_low, rt_span, size_low, size_span, extra,
+             cart_add, shows_cart, is_checkout) = _url_profile(url)
+            status = statuses[page]
+
+            base_rt = rt_low + int(rand() * rt_span)
+            quarter = base_rt // 4
+            response_time = max(1, base_rt * response_mult // 100 + int(rand() * (2 * quarter + 1)) - quarter)
+            if status != 200:
+                size_low, size_span = _error_size(status)
+            size = size_low + int(rand() * size_span)
+
+            if cart_add:
+                cart_items += cart_add[2]
+                cart_total += cart_add[1] * cart_add[2]
+                cart_products.append(cart_add)
+            if shows_cart:
+                extra = f" cart_items={cart_items} cart_total={cart_total}"
+
+            this_order_id = order_id
+            if status == 200 and url == "/checkout/complete":
+                ORDER_SEQUENCE += 1
+                this_order_id = order_id = f"ORD-{order_year}-{ORDER_SEQUENCE:05d}"
+                order_registry.append((
+                    order_id, tshirtcid, customer_id, ip, session_id,
+                    f"{iso_date}{stamps[sec][13:21]}Z", tuple(cart_products), cart_total, demo_id,
+                ))
 
-    page_count = random.randint(*page_range)
+            referer = entry_referer if previous_url == "-" else f"https://theFakeTshirtCompany.com{previous_url}"
+            user = customer_id if is_checkout else "-"
+            append(f'{head}{user} {stamps[sec]} "{method} {url} HTTP/1.1" {status} {size} "{referer}'
+                   f'{tail}{response_time}{ids}{this_order_id}{extra}{demo_suffix}')
+
+            total_bytes += size
+            last_sec = sec
+            emitted += 1
+            # POST endpoints redirect (PRG), so they never become the Referer
+            if method != "POST":
+                previous_url = url
+            sec += gaps[page]
+            page += 1
+
+        page += pages - emitted
+        if emitted:
+            session_registry.append((
+                ip, f"{iso_date}{stamps[first_sec][13:21]}Z", f"{iso_date}{stamps[last_sec][13:21]}Z",
+                total_bytes, web_server, 443, session_id, emitted,
+            ))
 
-    # Customer ID for purchase/abandoned sessions (assigned BEFORE IP for deterministic mapping)
-    customer_id = "-"
-    if session_type in ("abandoned", "purchase"):
-        customer_id = get_customer_id(pool_total, pool_vip)
+    return events
 
-    # IP assignment: deterministic for customers, random international for visitors
-    if customer_id != "-":
-        ip = get_customer_ip(customer_id)
-    else:
-        ip = get_visitor_ip()
-
-    # Cart tracking
-    cart_items = 0
-    cart_total = 0
-    cart_products: List[Tuple[str, int, int]] = []  # (slug, price, qty)
-
-    # Plan cart for purchase/abandoned sessions (multi-item support)
-    planned_cart: List[Tuple[str, int]] = []  # [(slug, qty), ...]
-    if session_type in ("purchase", "abandoned"):
-        # Determine number of unique items (1-5, weighted distribution)
-        num_items = random.choices([1, 2, 3, 4, 5], weights=CART_SIZE_WEIGHTS)[0]
-        # Select unique products
-        selected_slugs = random.sample(PRODUCT_SLUGS, min(num_items, len(PRODUCT_SLUGS)))
-        for slug in selected_slugs:
-            # 20% chance of qty=2, otherwise qty=1
-            qty = random.choices([1, 2], weights=QTY_WEIGHTS)[0]
-            planned_cart.append((slug, qty))
-
-    # Web server for this session (consistent throughout)
-    web_server = random.choice(["172.16.1.10", "172.16.1.11"])
-    web_port = 443  # HTTPS only — modern e-commerce site
-
-    # Time tracking
-    dt = date_add(base_date, day)
-    current_sec = start_hour * 3600 + start_min * 60 + start_sec
-    first_event_sec = current_sec  # Track for session registry
-
-    # Landing page selection
-    landing_roll = random.randint(1, 100)
-    if landing_roll <= 40:
-        current_url = "/"
-    elif landing_roll <= 75:
-        current_url = f"/products/{random.choice(PRODUCT_SLUGS)}"
-    elif landing_roll <= 95:
-        current_url = f"/products/category/{random.choice(CATEGORIES)}"
-    else:
-        current_url = random.choice(["/about", "/faq", "/shipping"])
-
-    previous_url = "-"
-    order_id = "-"
-    pages_generated = 0
-    last_event_sec = first_event_sec  # Track actual last event timestamp
-
-    while pages_generated < page_count:
-        hour = current_sec // 3600
-        minute = (current_sec % 3600) // 60
-        sec = current_sec % 60
-
-        if hour >= 24:
-            break
-
-        # Referer
-        if previous_url == "-":
-            ref_roll = random.randint(1, 100)
-            if ref_roll <= 40:
-                referer = "https://www.google.com/"
-            elif ref_roll <= 60:
-                referer = "https://www.google.com/search?q=funny+it+tshirts"
-            elif ref_roll <= 75:
-                referer = "https://www.reddit.com/r/ProgrammerHumor/"
-            elif ref_roll <= 85:
-                referer = "https://www.facebook.com/"
-            elif ref_roll <= 95:
-                referer = "https://twitter.com/"
-            else:
-                referer = "-"
-        else:
-            referer = f"https://theFakeTshirtCompany.com{previous_url}"
-
-        # Status, response time, method, size
-        status = get_status_code(error_rate)
-        response_time = get_response_time(current_url, response_mult)
-        method = get_method_for_url(current_url)
-        size = get_response_size(current_url, status)
-
-        # Extra fields
-        extra_fields = ""
-
-        # Product page: add product_price
-        if current_url.startswith("/products/") and not current_url.startswith("/products/category/"):
-            url_slug = current_url.replace("/products/", "")
-            price = PRODUCT_PRICES.get(url_slug, 299)
-            extra_fields += f" product_price={price}"
-
-        # Cart add: update cart
-        if current_url.startswith("/cart/add"):
-            # Parse slug and qty from URL
-            url_parts = current_url.replace("/cart/add?product=", "").split("&qty=")
-            url_slug = url_parts[0]
-            qty = int(url_parts[1]) if len(url_parts) > 1 else 1
-            price = PRODUCT_PRICES.get(url_slug, 299)
-            cart_items += qty
-            cart_total += price * qty
-            cart_products.append((url_slug, price, qty))
-            extra_fields += f" product_price={price} qty={qty}"
-
-        # Cart/checkout pages: add cart info
-        if current_url in ("/cart", "/checkout", "/checkout/complete"):
-            extra_fields += f" cart_items={cart_items} cart_total={cart_total}"
-
-        # Order completion
-        this_order_id = order_id
-        if current_url == "/checkout/complete" and status == 200:
-            ORDER_SEQUENCE += 1
-            this_order_id = f"ORD-{order_year}-{ORDER_SEQUENCE:05d}"
-            order_id = this_order_id
-
-            # Add to order registry
-            iso_timestamp = dt.replace(hour=hour, minute=minute, second=sec).strftime("%Y-%m-%dT%H:%M:%SZ")
-            ORDER_REGISTRY.append({
-                "order_id": this_order_id,
-                "tshirtcid": tshirtcid,
-                "customer_id": customer_id,
-                "customer_ip": ip,
-                "session_id": session_id,
-                "timestamp": iso_timestamp,
-                "products": [{"slug": s, "price": p, "qty": q} for s, p, q in cart_products],
-                "cart_total": cart_total,
-                "scenario": demo_id,
-            })
-
-        # User field (customer ID at checkout)
-        user = "-"
-        if current_url.startswith("/checkout") and customer_id != "-":
-            user = customer_id
-
-        # Format timestamp
-        ts = dt.replace(hour=hour, minute=minute, second=sec)
-        timestamp = format_apache_time(ts)
-
-        # Build log line
-        line = f'{ip} - {user} {timestamp} "{method} {current_url} HTTP/1.1" {status} {size} "{referer}" "{ua}" response_time={response_time} session_id={session_id} tshirtcid={tshirtcid} customer_id={customer_id} order_id={this_order_id}'
-        line += extra_fields
-        if demo_id:
-            line += f" demo_id={demo_id}"
 
-        events.append(line)
-        last_event_sec = current_sec  # Track timestamp of this actual event
-
-        # Prepare for next page
-        pages_generated += 1
-        # POST endpoints (cart/add, checkout/complete) should not appear as Referer.
-        # In real browsers, POST responses redirect (PRG pattern), so the Referer
-        # for the next page is the page before the POST, not the POST endpoint.
-        if not current_url.startswith("/cart/add") and current_url != "/checkout/complete":
-            previous_url = current_url
-        # else: keep previous_url unchanged (the product page or checkout page)
-        current_sec += random.randint(8, 180)  # 8s to 3min between pages
-
-        # Determine next URL based on session type and progress
-        remaining = page_count - pages_generated
-        if remaining <= 0:
-            break
-
-        if session_type == "bounce":
-            current_url = f"/products/{random.choice(PRODUCT_SLUGS)}"
-
-        elif session_type == "browser":
-            browse_roll = random.randint(1, 100)
-            if browse_roll <= 50:
-                current_url = f"/products/{random.choice(PRODUCT_SLUGS)}"
-            elif browse_roll <= 80:
-                current_url = f"/products/category/{random.choice(CATEGORIES)}"
-            else:
-                search_terms = ["coffee", "code", "linux", "developer", "security"]
-                current_url = f"/api/v1/search?q={random.choice(search_terms)}"
-
-        elif session_type == "abandoned":
-            # Pages needed: product view + cart add for each item, then /cart, /checkout
-            items_remaining = len(planned_cart)
-            checkout_pages = 2  # /cart and /checkout
-            item_pages = items_remaining * 2  # view + add per item
-
-            if remaining <= 1:
-                current_url = "/checkout"
-            elif remaining <= 2:
-                current_url = "/cart"
-            elif items_remaining > 0 and remaining <= checkout_pages + item_pages:
-                # Time to add items to cart
-                page_offset = remaining - checkout_pages - 1  # 0-indexed position in item sequence
-                if page_offset >= 0 and page_offset < item_pages:
-                    item_idx = (item_pages - 1 - page_offset) // 2
-                    is_view = (item_pages - 1 - page_offset) % 2 == 0
-                    if item_idx < items_remaining:
-                        slug, qty = planned_cart[item_idx]
-                        if is_view:
-                            current_url = f"/products/{slug}"
-                        else:
-                            current_url = f"/cart/add?product={slug}&qty={qty}"
-                    else:
-                        current_url = f"/products/{random.choice(PRODUCT_SLUGS)}"
-                else:
-                    current_url = f"/products/{random.choice(PRODUCT_SLUGS)}"
-            else:
-                current_url = f"/products/{random.choice(PRODUCT_SLUGS)}"
-
-        elif session_type == "purchase":
-            # Pages needed: product view + cart add for each item, then /cart, /checkout, /checkout/complete
-            items_remaining = len(planned_cart)
-            checkout_pages = 3  # /cart, /checkout, /checkout/complete
-            item_pages = items_remaining * 2  # view + add per item
-
-            if remaining <= 1:
-                current_url = "/checkout/complete"
-            elif remaining <= 2:
-                current_url = "/checkout"
-            elif remaining <= 3:
-                current_url = "/cart"
-            elif items_remaining > 0 and remaining <= checkout_pages + item_pages:
-                # Time to add items to cart
-                page_offset = remaining - checkout_pages - 1  # 0-indexed position in item sequence
-                if page_offset >= 0 and page_offset < item_pages:
-                    item_idx = (item_pages - 1 - page_offset) // 2
-                    is_view = (item_pages - 1 - page_offset) % 2 == 0
-                    if item_idx < items_remaining:
-                        slug, qty = planned_cart[item_idx]
-                        if is_view:
-                            current_url = f"/products/{slug}"
-                        else:
-                            current_url = f"/cart/add?product={slug}&qty={qty}"
-                    else:
-                        current_url = f"/products/{random.choice(PRODUCT_SLUGS)}"
-                else:
-                    current_url = f"/products/{random.choice(PRODUCT_SLUGS)}"
-            else:
-                current_url = f"/products/{random.choice(PRODUCT_SLUGS)}"
+def order_record_json(record: Tuple) -> str:
+    """Serialize an ORDER_REGISTRY record (ORDER_FIELDS order) as a JSON line.
 
-    # Record session in web session registry for ASA 1:1 correlation
-    if events:
-        # last_event_sec was tracked inside the loop (set after each event append)
-        # Sum response bytes from access log lines (format: ... "METHOD /path HTTP/1.1" STATUS BYTES ...)
-        total_bytes = 0
-        for e in events:
-            try:
-                # After closing quote of request: status and bytes
-                after_req = e.split('" ')[1]
-                total_bytes += int(after_req.split(' ')[1])
-            except (IndexError, ValueError):
-                total_bytes += 5000  # Fallback estimate
-
-        # Format timestamps as ISO 8601
-        start_dt = dt.replace(
-            hour=min(23, first_event_sec // 3600),
-            minute=min(59, (first_event_sec % 3600) // 60),
-            second=min(59, first_event_sec % 60),
-        )
-        end_dt = dt.replace(
-            hour=min(23, last_event_sec // 3600),
-            minute=min(59, (last_event_sec % 3600) // 60),
-            second=min(59, last_event_sec % 60),
-        )
+    Same output as json.dumps() of the equivalent dict; all string fields
+    are generated IDs, IPs and slugs that need no escaping.
+    """
+    order_id, tshirtcid, customer_id, customer_ip, session_id, timestamp, products, cart_total, scenario = record
+    items = ", ".join(f'{{"slug": "{slug}", "price": {price}, "qty": {qty}}}'
+                      for slug, price, qty in products)
+    return (f'{{"order_id": "{order_id}", "tshirtcid": "{tshirtcid}", "customer_id": "{customer_id}", '
+            f'"customer_ip": "{customer_ip}", "session_id": "{session_id}", "timestamp": "{timestamp}", '
+            f'"products": [{items}], "cart_total": {cart_total}, "scenario": {json.dumps(scenario)}}}')
 
-        WEB_SESSION_REGISTRY.append({
-            "ip": ip,
-            "start_ts": start_dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "end_ts": end_dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "bytes": total_bytes,
-            "dst": web_server,
-            "dst_port": web_port,
-            "session_id": session_id,
-            "pages": len(events),
-        })
 
-    return events
+def web_session_record_json(record: Tuple) -> str:
+    """Serialize a WEB_SESSION_REGISTRY record (WEB_SESSION_FIELDS order) as a JSON line."""
+    ip, start_ts, end_ts, total_bytes, dst, dst_port, session_id, pages = record
+    return (f'{{"ip": "{ip}", "start_ts": "{start_ts}", "end_ts": "{end_ts}", "bytes": {total_bytes}, '
+            f'"dst": "{dst}", "dst_port": {dst_port}, "session_id": "{session_id}", "pages": {pages}}}')
 
 
 def generate_ssl_error_event(
@@ -812,7 +754,15 @@ def generate_access_logs(
     # Derive order year from start_date (not hardcoded)
     order_year = start_date[:4]
 
-    all_events = []
+    # Sessions last under an hour, so once hour H is generated nothing
+    # earlier than H can still arrive: the writer flushes everything before
+    # the current hour and holds at most ~2 hours of lines in memory.
+    writer = OrderedWriter(output_path, key=apache_sort_key)
+    registry_file = open(registry_path, "w")
+    session_registry_file = open(session_registry_path, "w")
+    generated = 0
+    order_count = 0
+    web_session_count = 0
 
     for day in range(days):
         if progress_callback:
@@ -822,6 +772,8 @@ def generate_access_logs(
             print(f"  [Access] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})...", file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("access", day + 1, days, hour=hour, events=generated)
             # Check if we're in SSL outage period (certificate_expiry scenario)
             is_ssl_outage = include_cert_expiry and cert_expiry_scenario.is_outage_period(day, hour)
 
@@ -888,22 +840,19 @@ def generate_access_logs(
             # errors via error_rate (applied to EVERY page in the session),
             # not by reducing session count. Orders drop naturally because
             # /checkout/complete only registers when status == 200.
-            for _ in range(sessions):
-                minute = random.randint(0, 59)
-                second = random.randint(0, 59)
-                all_events.extend(generate_session(
-                    start_date, day, hour, minute, second,
-                    response_mult=response_mult,
-                    error_rate=error_rate,
-                    demo_id=demo_id if error_rate > 0 else None,
-                    pool_total=pool_total,
-                    pool_vip=pool_vip,
-                    order_year=order_year,
-                ))
+            hour_events = generate_sessions_hour(
+                start_date, day, hour, sessions,
+                response_mult=response_mult,
+                error_rate=error_rate,
+                demo_id=demo_id if error_rate > 0 else None,
+                pool_total=pool_total,
+                pool_vip=pool_vip,
+                order_year=order_year,
+            )
 
             # Health check probes from MON-ATL-01 (every 30s, all hours)
             # These traverse the same network path as users, so they see scenario effects
-            all_events.extend(generate_health_check_events(
+            hour_events.extend(generate_health_check_events(
                 start_date, day, hour,
                 error_rate=error_rate, response_mult=response_mult,
                 demo_id=demo_id if error_rate > 0 else None,
@@ -911,54 +860,33 @@ def generate_access_logs(
 
             # Search engine bot crawls (2-5 per hour)
             # Bots come through the internet/firewall, affected by same scenarios
-            all_events.extend(generate_bot_crawl_events(
+            hour_events.extend(generate_bot_crawl_events(
                 start_date, day, hour,
                 error_rate=error_rate, response_mult=response_mult,
                 demo_id=demo_id if error_rate > 0 else None,
             ))
 
+            writer.add(hour_events)
+            generated += len(hour_events)
+            writer.release(f"{date_add(start_date, day):%Y-%m-%d}:{hour:02d}")
+
+        # Registries are appended in generation order, so they can go out daily
+        order_count += write_lines(registry_file, ORDER_REGISTRY, order_record_json)
+        web_session_count += write_lines(session_registry_file, WEB_SESSION_REGISTRY, web_session_record_json)
+        ORDER_REGISTRY.clear()
+        WEB_SESSION_REGISTRY.clear()
+
         if not quiet:
             print(f"  [Access] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
 
-    # Sort events by timestamp (extract datetime from Apache log format)
-    # Format: "... [DD/Mon/YYYY:HH:MM:SS +0000] ..." — need to parse the bracketed timestamp
-    import re
-    _TS_RE = re.compile(r'\[(\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2}) \+0000\]')
-
-    def _sort_key(line: str) -> str:
-        """Extract ISO-sortable timestamp from Apache log line."""
-        m = _TS_RE.search(line)
-        if m:
-            # Convert "01/Jan/2026:14:30:45" to "2026-01-01T14:30:45" for correct sorting
-            raw = m.group(1)
-            try:
-                dt_parsed = datetime.strptime(raw, "%d/%b/%Y:%H:%M:%S")
-                return dt_parsed.strftime("%Y-%m-%dT%H:%M:%S")
-            except ValueError:
-                return raw
-        return line  # Fallback: sort by full line
-
-    all_events.sort(key=_sort_key)
-
-    # Write output
-    with open(output_path, "w") as f:
-        for event in all_events:
-            f.write(event + "\n")
-
-    # Write order registry as JSONL (one JSON object per line for Splunk)
-    with open(registry_path, "w") as f:
-        for entry in ORDER_REGISTRY:
-            f.write(json.dumps(entry) + "\n")
-
-    # Write web session registry as JSONL (for ASA 1:1 correlation)
-    with open(session_registry_path, "w") as f:
-        for entry in WEB_SESSION_REGISTRY:
-            f.write(json.dumps(entry) + "\n")
+    count = writer.close()
+    registry_file.close()
+    session_registry_file.close()
 
     if not quiet:
-        print(f"  [Access] Complete! {len(all_events):,} events, {len(ORDER_REGISTRY)} orders, {len(WEB_SESSION_REGISTRY):,} web sessions", file=sys.stderr)
+        print(f"  [Access] Complete! {count:,} events, {order_count} orders, {web_session_count:,} web sessions", file=sys.stderr)
 
-    return len(all_events)
+    return count
 
 
 def main():
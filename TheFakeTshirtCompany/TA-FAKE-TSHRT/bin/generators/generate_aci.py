@@ -39,6 +39,8 @@ from shared.company import (
     TENANT,
     get_mac_for_ip,
 )
+from shared.output_writer import write_events
+from shared import telemetry
 from scenarios.registry import expand_scenarios, is_scenario_active_day
 
 # =============================================================================
@@ -730,6 +732,9 @@ def generate_aci_logs(
                   file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("aci", day + 1, days, hour=hour,
+                                  events=len(fault_events) + len(event_events) + len(audit_events))
             # Faults
             fault_count = calc_natural_events(fault_base, start_date, day, hour, "cloud")
             for _ in range(fault_count):
@@ -765,15 +770,14 @@ def generate_aci_logs(
                 demo_id_count += len(cpu_f)
 
     # Sort by timestamp key
-    fault_events.sort(key=lambda x: x[0])
-    event_events.sort(key=lambda x: x[0])
-    audit_events.sort(key=lambda x: x[0])
+    with telemetry.phase("sort"):
+        fault_events.sort(key=lambda x: x[0])
+        event_events.sort(key=lambda x: x[0])
+        audit_events.sort(key=lambda x: x[0])
 
     # Write files
     def _write_json(path: Path, events: List[tuple]):
-        with open(path, "w") as f:
-            for _, ev in events:
-                f.write(json.dumps(ev) + "\n")
+        write_events(path, events, serialize=lambda item: json.dumps(item[1]))
 
     _write_json(fault_path, fault_events)
     _write_json(event_path, event_events)
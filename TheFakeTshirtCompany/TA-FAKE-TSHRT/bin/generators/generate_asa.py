@@ -46,30 +46,30 @@ import hashlib
 import json
 import random
 import sys
+from collections import Counter
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from typing import List, Dict, TextIO
+from typing import List, Dict, TextIO, Tuple
 
 # Add parent directory for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from shared.config import Config, DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path, init_cid_allocator, next_cid
+from shared.config import Config, DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path, init_cid_allocator, next_cid, next_cids
 from shared.time_utils import TimeUtils, ts_syslog, date_add, calc_natural_events
 from shared.company import Company, ASA_PERIMETER, DNS_SERVERS, THREAT_IP, TENANT
 from shared.company import (
     ASA_WEB_PORTS, ASA_SCAN_PORTS, ASA_TEARDOWN_REASONS, ASA_EXT_ACLS, ASA_INT_ACLS,
     ASA_NAT_POOL, ASA_STATIC_NAT,
-    VPN_USERS, USERS, SERVERS, INTERNAL_DNS_SERVERS,
-    get_internal_ip, get_us_ip, get_external_ip, get_dmz_ip, get_world_ip,
-    get_random_user,
+    VPN_USERS, USERS, SERVERS, INTERNAL_DNS_SERVERS, US_IP_PFX, EXT_SERVICE_IPS, WORLD_IP_PREFIXES,
+    get_internal_ip, get_dmz_ip, get_world_ip,
 )
+from shared.output_writer import write_events
+from shared import telemetry
 
 # Use the perimeter ASA hostname consistently
 ASA_HOSTNAME = ASA_PERIMETER["hostname"]  # FW-EDGE-01
 
-# Web suppression context: set per-hour by generate_baseline_hour() so that
-# asa_tcp_session() can reduce its outside->dmz Built events during scenarios
-_web_suppression_ctx = 0.0
-
 # =============================================================================
 # ZONE SECURITY LEVELS & DIRECTION HELPER
 # =============================================================================
@@ -131,6 +131,27 @@ def asa_pri(severity: int) -> str:
     return f"<{pri}>"
 
 
+_MONTH_NUM = {m: f"{i:02d}" for i, m in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)}
+
+
+def event_sort_key(line: str) -> str:
+    """Time sort key for "<PRI>Jan 05 2026 14:30:45.123 ..." lines.
+
+    A plain string sort orders by PRI and month name first; this gives
+    "2026" "01" "05" "14:30:45.123" so the file is in time order. Lines
+    without a PRI (ransomware cross-site events) sort the same way.
+    """
+    ts = line[line.find(">") + 1:]
+    return f"{ts[7:11]}{_MONTH_NUM[ts[:3]]}{ts[4:6]}{ts[12:24]}"
+
+
+@lru_cache(maxsize=None)
+def get_pat_address(src_ip: str) -> str:
+    """Public PAT address for an inside source IP (deterministic per src_ip via hash)."""
+    return ASA_NAT_POOL[int(hashlib.md5(src_ip.encode()).hexdigest(), 16) % len(ASA_NAT_POOL)]
+
+
 def get_nat_addresses(src_ip: str, dst_ip: str, src_zone: str, dst_zone: str,
                       src_port: int, dst_port: int) -> tuple:
     """Compute post-NAT (translated) addresses for ASA Built events.
@@ -163,8 +184,7 @@ def get_nat_addresses(src_ip: str, dst_ip: str, src_zone: str, dst_zone: str,
     if dst_zone == "outside":
         # Outbound: PAT the source to a public IP from the NAT pool
         # Use hash for deterministic mapping (same src_ip always maps to same NAT IP)
-        pool_index = int(hashlib.md5(src_ip.encode()).hexdigest(), 16) % len(ASA_NAT_POOL)
-        src_nat_ip = ASA_NAT_POOL[pool_index]
+        src_nat_ip = get_pat_address(src_ip)
         # Port stays the same (PAT overload uses original ephemeral port)
 
     elif src_zone == "outside" and dst_zone == "dmz":
@@ -176,10 +196,7 @@ def get_nat_addresses(src_ip: str, dst_ip: str, src_zone: str, dst_zone: str,
     return (src_nat_ip, src_nat_port, dst_nat_ip, dst_nat_port)
 
 
-# Import scenarios
-from scenarios.security import ExfilScenario, RansomwareAttemptScenario
-from scenarios.ops import MemoryLeakScenario, CpuRunawayScenario
-from scenarios.network import FirewallMisconfigScenario, CertificateExpiryScenario, DdosAttackScenario
+# Import scenarios (scenario classes are imported in init_scenarios, active ones only)
 from scenarios.registry import expand_scenarios, source_needed_for_scenarios
 
 
@@ -206,224 +223,6 @@ def init_vpn_pool():
         }
 
 
-# =============================================================================
-# BASELINE EVENT GENERATORS
-# =============================================================================
-
-def asa_tcp_session(base_date: str, day: int, hour: int, minute: int, second: int) -> List[str]:
-    """Generate a complete TCP session (Built + Teardown with same connection ID)."""
-    events = []
-
-    cid = next_cid()
-    employee = get_random_user()
-    src = employee.ip_address  # Deterministic employee IP for cross-generator correlation
-    sp = random.randint(49152, 65535)
-    dst = get_external_ip()
-    dp = random.choice(ASA_WEB_PORTS)
-    reason = weighted_teardown_reason()
-
-    # Realistic byte distribution:
-    # 40% small (1-50 KB), 35% medium (50-500 KB), 20% large (500 KB-5 MB), 5% downloads (5-50 MB)
-    category = random.randint(1, 100)
-    if category <= 40:
-        bytes_val = random.randint(1000, 50000)
-    elif category <= 75:
-        bytes_val = random.randint(50000, 500000)
-    elif category <= 95:
-        bytes_val = random.randint(500000, 5000000)
-    else:
-        bytes_val = random.randint(5000000, 50000000)
-
-    # Calculate duration based on bytes (~500 Mbps throughput)
-    bytes_per_sec = 62500000
-    base_duration = max(1, bytes_val // bytes_per_sec)
-    min_duration = random.randint(1, 30)
-    jitter = base_duration * random.randint(-20, 20) // 100
-    duration_secs = max(1, base_duration + min_duration + jitter)
-
-    # Fix zero-duration with bytes: impossible to transfer data in 0 seconds
-    if bytes_val > 0 and duration_secs == 0:
-        duration_secs = 1
-
-    # Calculate teardown time
-    total_start_secs = minute * 60 + second
-    total_end_secs = total_start_secs + duration_secs
-    end_min = min(59, total_end_secs // 60)
-    end_sec = total_end_secs % 60 if end_min < 59 else 59
-
-    # Format duration
-    dur_mins = duration_secs // 60
-    dur_secs = duration_secs % 60
-    dur = f"0:{dur_mins}:{dur_secs}"
-
-    start_ts = ts_syslog(base_date, day, hour, minute, second)
-    teardown_ts = ts_syslog(base_date, day, hour, end_min, end_sec)
-
-    # 50% outbound (inside->outside), 50% inbound to DMZ (outside->dmz)
-    # When web_suppression is active, reduce the inbound DMZ fraction
-    # since scenarios suppress external->DMZ traffic
-    dmz_probability = 0.5 * (1.0 - _web_suppression_ctx)
-    pri6 = asa_pri(6)  # info
-    if random.random() >= dmz_probability:
-        direction = get_built_direction("inside", "outside")
-        sni, snp, dni, dnp = get_nat_addresses(src, dst, "inside", "outside", sp, dp)
-        events.append(f"{pri6}{start_ts} {ASA_HOSTNAME} %ASA-6-302013: Built {direction}TCP connection {cid} for inside:{src}/{sp} ({sni}/{snp}) to outside:{dst}/{dp} ({dni}/{dnp})")
-        events.append(f"{pri6}{teardown_ts} {ASA_HOSTNAME} %ASA-6-302014: Teardown TCP connection {cid} for inside:{src}/{sp} to outside:{dst}/{dp} duration {dur} bytes {bytes_val} {reason}")
-    else:
-        us = get_us_ip()
-        dmz = random.choice(WEB_SERVERS)  # Only WEB-01/WEB-02 exist in DMZ
-        dmz_dp = random.choice(WEB_PORTS)  # HTTPS only for DMZ web servers
-        direction = get_built_direction("outside", "dmz")
-        sni, snp, dni, dnp = get_nat_addresses(us, dmz, "outside", "dmz", sp, dmz_dp)
-        events.append(f"{pri6}{start_ts} {ASA_HOSTNAME} %ASA-6-302013: Built {direction}TCP connection {cid} for outside:{us}/{sp} ({sni}/{snp}) to dmz:{dmz}/{dmz_dp} ({dni}/{dnp})")
-        events.append(f"{pri6}{teardown_ts} {ASA_HOSTNAME} %ASA-6-302014: Teardown TCP connection {cid} for outside:{us}/{sp} to dmz:{dmz}/{dmz_dp} duration {dur} bytes {bytes_val} {reason}")
-
-    return events
-
-
-def asa_dns_query(base_date: str, day: int, hour: int, minute: int, second: int) -> List[str]:
-    """Generate DNS query (UDP Built + Teardown).
-
-    Split: 70% internal client -> DC DNS, 30% DC forwarding to external DNS.
-    Real networks resolve via AD-integrated DNS first; DCs forward externally
-    only for domains they don't own.
-    """
-    events = []
-
-    cid = next_cid()
-    sp = random.randint(49152, 65535)
-
-    if random.random() < 0.70:
-        # Internal client -> DC DNS
-        employee = get_random_user()
-        src_ip = employee.ip_address
-        src_zone = "inside"
-        dst_ip = random.choice(["10.10.20.10", "10.10.20.11", "10.20.20.10"])
-        dst_zone = "inside"
-    else:
-        # DC forwarding to external DNS
-        src_ip = random.choice(["10.10.20.10", "10.10.20.11", "10.20.20.10"])
-        src_zone = "inside"
-        dst_ip = random.choice(DNS_SERVERS)  # 8.8.8.8 / 1.1.1.1
-        dst_zone = "outside"
-
-    duration_secs = random.randint(0, 2)
-    bytes_val = random.randint(64, 464)
-
-    # Fix zero-duration with bytes: impossible to transfer data in 0 seconds
-    if bytes_val > 0 and duration_secs == 0:
-        duration_secs = 1
-
-    end_sec = second + duration_secs
-    end_min = minute
-    if end_sec >= 60:
-        end_min = min(59, minute + 1)
-        end_sec = end_sec - 60
-
-    start_ts = ts_syslog(base_date, day, hour, minute, second)
-    teardown_ts = ts_syslog(base_date, day, hour, end_min, end_sec)
-
-    pri6 = asa_pri(6)  # info
-    direction = get_built_direction(src_zone, dst_zone)
-    sni, snp, dni, dnp = get_nat_addresses(src_ip, dst_ip, src_zone, dst_zone, sp, 53)
-    events.append(f"{pri6}{start_ts} {ASA_HOSTNAME} %ASA-6-302015: Built {direction}UDP connection {cid} for {src_zone}:{src_ip}/{sp} ({sni}/{snp}) to {dst_zone}:{dst_ip}/53 ({dni}/{dnp})")
-    events.append(f"{pri6}{teardown_ts} {ASA_HOSTNAME} %ASA-6-302016: Teardown UDP connection {cid} for {dst_zone}:{dst_ip}/53 to {src_zone}:{src_ip}/{sp} duration 0:0:{duration_secs} bytes {bytes_val}")
-
-    return events
-
-
-def asa_nat(base_date: str, day: int, hour: int, minute: int, second: int) -> str:
-    """Generate NAT translation event."""
-    ts = ts_syslog(base_date, day, hour, minute, second)
-    employee = get_random_user()
-    src = employee.ip_address  # Deterministic employee IP for cross-generator correlation
-    sp = random.randint(49152, 65535)
-    nat = f"203.0.113.{random.randint(1, 10)}"
-
-    pri5 = asa_pri(5)  # notice - NAT events use severity 5
-    if random.random() < 0.5:
-        return f"{pri5}{ts} {ASA_HOSTNAME} %ASA-5-305011: Built dynamic TCP translation from inside:{src}/{sp} to outside:{nat}/{sp}"
-    else:
-        dur = f"0:{random.randint(0, 10)}:{random.randint(0, 59)}"
-        return f"{pri5}{ts} {ASA_HOSTNAME} %ASA-5-305012: Teardown dynamic TCP translation from inside:{src}/{sp} to outside:{nat}/{sp} duration {dur}"
-
-
-def asa_vpn(base_date: str, day: int, hour: int, minute: int, second: int) -> str:
-    """Generate VPN session event.
-
-    Uses deterministic VPN IPs from company.py for cross-generator correlation.
-    The IP field in ASA VPN logs is the assigned VPN pool IP (10.250.0.x),
-    which matches InternalIp in Secure Access logs for remote users.
-    """
-    ts = ts_syslog(base_date, day, hour, minute, second)
-    username = random.choice(VPN_USERS)
-    pool_entry = VPN_POOL.get(username, {"vpn_ip": f"10.250.0.{random.randint(10, 209)}", "home_ip": get_us_ip()})
-    vpn_ip = pool_entry["vpn_ip"]
-
-    pri6 = asa_pri(6)  # info
-    if random.random() > 0.33:
-        return f"{pri6}{ts} {ASA_HOSTNAME} %ASA-6-722022: Group <Remote-Workers> User <{username}@{TENANT}> IP <{vpn_ip}> TCP connection established without compression"
-    else:
-        dur = f"0:{random.randint(0, 59)}:{random.randint(0, 59)}"
-        xmt = random.randint(1000000, 20000000)
-        rcv = random.randint(1000000, 50000000)
-        return f"{pri6}{ts} {ASA_HOSTNAME} %ASA-6-722023: Group <Remote-Workers> User <{username}@{TENANT}> IP <{vpn_ip}> Session disconnected. Session Type: SSL, Duration: {dur}, Bytes xmt: {xmt}, Bytes rcv: {rcv}"
-
-
-def asa_ssl(base_date: str, day: int, hour: int, minute: int, second: int) -> str:
-    """Generate SSL handshake event."""
-    ts = ts_syslog(base_date, day, hour, minute, second)
-    ip = get_us_ip()
-    port = random.randint(49152, 65535)
-
-    pri6 = asa_pri(6)  # info
-    if random.random() < 0.5:
-        return f"{pri6}{ts} {ASA_HOSTNAME} %ASA-6-725001: Starting SSL handshake with client outside:{ip}/{port} for TLSv1.2 session."
-    else:
-        return f"{pri6}{ts} {ASA_HOSTNAME} %ASA-6-725002: Device completed SSL handshake with client outside:{ip}/{port}"
-
-
-def asa_admin(base_date: str, day: int, hour: int, minute: int, second: int) -> str:
-    """Generate admin command event."""
-    ts = ts_syslog(base_date, day, hour, minute, second)
-    cmds = ["show version", "show conn count", "show cpu usage", "show memory"]
-    admins = ["noc-admin", "backup-svc", "monitor-svc"]
-
-    pri5 = asa_pri(5)  # notice
-    return f"{pri5}{ts} {ASA_HOSTNAME} %ASA-5-111008: User '{random.choice(admins)}' executed the '{random.choice(cmds)}' command"
-
-
-def asa_deny_external(base_date: str, day: int, hour: int, minute: int, second: int) -> str:
-    """Generate denied external connection.
-
-    External scanners can only reach public-facing IPs and DMZ servers.
-    They cannot reach internal 10.x.x.x IPs through the perimeter firewall.
-    Distribution: 60% NAT pool/public IPs, 30% DMZ servers, 10% ASA outside interface.
-    """
-    ts = ts_syslog(base_date, day, hour, minute, second)
-    srcip = get_world_ip()
-    acl = random.choice(ASA_EXT_ACLS)
-    port = random.choice(ASA_SCAN_PORTS)
-    sport = random.randint(40000, 50000)
-
-    roll = random.random()
-    if roll < 0.60:
-        # NAT pool / public IPs (what scanners see as live hosts)
-        tgt = f"203.0.113.{random.randint(1, 10)}" if random.random() < 0.8 else random.choice(["203.0.113.50", "203.0.113.51"])
-        dst_zone = "outside"
-    elif roll < 0.90:
-        # DMZ servers (WEB-01, WEB-02)
-        tgt = random.choice(["172.16.1.10", "172.16.1.11"])
-        dst_zone = "dmz"
-    else:
-        # ASA outside interface itself
-        tgt = "203.0.113.1"
-        dst_zone = "outside"
-
-    pri4 = asa_pri(4)  # warning
-    return f'{pri4}{ts} {ASA_HOSTNAME} %ASA-4-106023: Deny tcp src outside:{srcip}/{sport} dst {dst_zone}:{tgt}/{port} by access-group "{acl}" [0x0, 0x0]'
-
-
 # =============================================================================
 # DC-SPECIFIC TRAFFIC (Kerberos, LDAP, DNS, SMB)
 # =============================================================================
@@ -449,63 +248,6 @@ DC_SERVICES = [
 DC_SERVICE_WEIGHTS = [30, 25, 10, 15, 10, 5, 5]
 
 
-def asa_dc_traffic(base_date: str, day: int, hour: int, minute: int, second: int) -> List[str]:
-    """Generate domain controller traffic (Kerberos, LDAP, DNS, SMB).
-
-    Workstations and servers constantly talk to DCs for authentication,
-    group policy, and DNS resolution. This is the backbone of AD traffic.
-    """
-    events = []
-
-    # Pick a source (any internal host) and destination DC
-    src_site = random.choices(["BOS", "ATL", "AUS"], weights=[60, 25, 15])[0]
-    src = get_internal_ip(src_site)
-    sp = random.randint(49152, 65535)
-
-    # DCs are mostly in BOS, some traffic goes to ATL DC
-    if src_site == "ATL" and random.random() < 0.7:
-        dc_ip = random.choice(DC_IPS["ATL"])
-        dst_site = "ATL"
-    else:
-        dc_ip = random.choice(DC_IPS["BOS"])
-        dst_site = "BOS"
-
-    service = random.choices(DC_SERVICES, weights=DC_SERVICE_WEIGHTS)[0]
-    dp, proto, svc_name = service
-
-    cid = next_cid()
-
-    # DC traffic is generally small and fast
-    bytes_val = random.randint(200, 50000)
-    duration_secs = random.randint(0, 5)
-
-    total_start_secs = minute * 60 + second
-    total_end_secs = total_start_secs + duration_secs
-    end_min = min(59, total_end_secs // 60)
-    end_sec = total_end_secs % 60 if end_min < 59 else 59
-
-    start_ts = ts_syslog(base_date, day, hour, minute, second)
-    teardown_ts = ts_syslog(base_date, day, hour, end_min, end_sec)
-
-    # Fix zero-duration with bytes: impossible to transfer data in 0 seconds
-    if bytes_val > 0 and duration_secs == 0:
-        duration_secs = 1
-
-    pri6 = asa_pri(6)
-    direction = get_built_direction("inside", "inside")  # same-zone = no direction
-
-    if proto == "UDP":
-        events.append(f"{pri6}{start_ts} {ASA_HOSTNAME} %ASA-6-302015: Built {direction}UDP connection {cid} for inside:{src}/{sp} ({src}/{sp}) to inside:{dc_ip}/{dp} ({dc_ip}/{dp})")
-        events.append(f"{pri6}{teardown_ts} {ASA_HOSTNAME} %ASA-6-302016: Teardown UDP connection {cid} for inside:{dc_ip}/{dp} to inside:{src}/{sp} duration 0:0:{duration_secs} bytes {bytes_val}")
-    else:
-        dur = f"0:0:{duration_secs}"
-        reason = weighted_teardown_reason()
-        events.append(f"{pri6}{start_ts} {ASA_HOSTNAME} %ASA-6-302013: Built {direction}TCP connection {cid} for inside:{src}/{sp} ({src}/{sp}) to inside:{dc_ip}/{dp} ({dc_ip}/{dp})")
-        events.append(f"{pri6}{teardown_ts} {ASA_HOSTNAME} %ASA-6-302014: Teardown TCP connection {cid} for inside:{src}/{sp} to inside:{dc_ip}/{dp} duration {dur} bytes {bytes_val} {reason}")
-
-    return events
-
-
 # =============================================================================
 # INTERNAL ACL DENY EVENTS
 # =============================================================================
@@ -576,145 +318,6 @@ APP_SERVER_IP = "10.10.20.40"   # APP-BOS-01
 SQL_SERVER_IP = "10.10.20.30"   # SQL-PROD-01
 
 
-def asa_new_server_traffic(base_date: str, day: int, hour: int, minute: int, second: int) -> List[str]:
-    """Generate traffic to/from new infrastructure servers."""
-    events = []
-
-    server_entry = random.choice(NEW_SERVER_TRAFFIC)
-    hostname, ports, desc = server_entry
-    server = SERVERS.get(hostname)
-    if not server:
-        return events
-
-    port_info = random.choice(ports)
-    dp, proto = port_info
-
-    # Source: internal workstation or server
-    src_site = random.choice(["BOS", "ATL", "AUS"])
-    src = get_internal_ip(src_site)
-    sp = random.randint(49152, 65535)
-    dst = server.ip
-
-    cid = next_cid()
-    bytes_val = random.randint(1000, 200000)
-    duration_secs = random.randint(1, 30)
-
-    total_start_secs = minute * 60 + second
-    total_end_secs = total_start_secs + duration_secs
-    end_min = min(59, total_end_secs // 60)
-    end_sec = total_end_secs % 60 if end_min < 59 else 59
-
-    # Fix zero-duration with bytes: impossible to transfer data in 0 seconds
-    if bytes_val > 0 and duration_secs == 0:
-        duration_secs = 1
-
-    dur = f"0:0:{duration_secs}"
-    reason = weighted_teardown_reason()
-
-    start_ts = ts_syslog(base_date, day, hour, minute, second)
-    teardown_ts = ts_syslog(base_date, day, hour, end_min, end_sec)
-
-    # Bastion traffic gets special naming (management zone)
-    if hostname.startswith("BASTION"):
-        src_zone = "inside"
-        dst_zone = "management"
-    else:
-        src_zone = "inside"
-        dst_zone = "inside"
-
-    pri6 = asa_pri(6)
-    direction = get_built_direction(src_zone, dst_zone)
-    events.append(f"{pri6}{start_ts} {ASA_HOSTNAME} %ASA-6-302013: Built {direction}TCP connection {cid} for {src_zone}:{src}/{sp} ({src}/{sp}) to {dst_zone}:{dst}/{dp} ({dst}/{dp})")
-    events.append(f"{pri6}{teardown_ts} {ASA_HOSTNAME} %ASA-6-302014: Teardown TCP connection {cid} for {src_zone}:{src}/{sp} to {dst_zone}:{dst}/{dp} duration {dur} bytes {bytes_val} {reason}")
-
-    return events
-
-
-def asa_internal_app_traffic(base_date: str, day: int, hour: int, minute: int, second: int) -> List[str]:
-    """Generate internal 3-tier e-commerce traffic: WEB -> APP-BOS-01 -> SQL-PROD-01.
-
-    Simulates the realistic data flow where web servers in the DMZ call the
-    internal API server, which then queries the database. Generates a correlated
-    pair of connections (WEB->APP + APP->SQL) to make the 3-tier architecture
-    visible in Splunk.
-    """
-    events = []
-    pri6 = asa_pri(6)
-
-    # --- Leg 1: WEB-01/02 (DMZ) -> APP-BOS-01 (inside) on 443/8443 ---
-    web_src = random.choice(WEB_SERVERS)  # 172.16.1.10 or .11
-    web_sp = random.randint(49152, 65535)
-    app_dp = random.choice([443, 8443])
-
-    cid1 = next_cid()
-    bytes1 = random.randint(2000, 100000)  # API call (request + response)
-    duration1 = random.randint(1, 5)  # Fast internal call
-
-    # Fix zero-duration with bytes
-    if bytes1 > 0 and duration1 == 0:
-        duration1 = 1
-
-    total_start = minute * 60 + second
-    total_end1 = total_start + duration1
-    end_min1 = min(59, total_end1 // 60)
-    end_sec1 = total_end1 % 60 if end_min1 < 59 else 59
-
-    ts1_start = ts_syslog(base_date, day, hour, minute, second)
-    ts1_end = ts_syslog(base_date, day, hour, end_min1, end_sec1)
-
-    direction1 = get_built_direction("dmz", "inside")  # dmz(50) -> inside(100) = inbound
-    events.append(f"{pri6}{ts1_start} {ASA_HOSTNAME} %ASA-6-302013: Built {direction1}TCP connection {cid1} for dmz:{web_src}/{web_sp} ({web_src}/{web_sp}) to inside:{APP_SERVER_IP}/{app_dp} ({APP_SERVER_IP}/{app_dp})")
-    events.append(f"{pri6}{ts1_end} {ASA_HOSTNAME} %ASA-6-302014: Teardown TCP connection {cid1} for dmz:{web_src}/{web_sp} to inside:{APP_SERVER_IP}/{app_dp} duration 0:0:{duration1} bytes {bytes1} TCP FINs")
-
-    # --- Leg 2: APP-BOS-01 (inside) -> SQL-PROD-01 (inside) on 1433 ---
-    app_sp = random.randint(49152, 65535)
-
-    cid2 = next_cid()
-    bytes2 = random.randint(500, 50000)  # DB query (smaller)
-    duration2 = random.randint(1, 3)  # DB call is fast
-
-    # Fix zero-duration with bytes
-    if bytes2 > 0 and duration2 == 0:
-        duration2 = 1
-
-    # Starts slightly after leg 1 (staggered by 1 second)
-    second2 = min(59, second + 1)
-    total_end2 = minute * 60 + second2 + duration2
-    end_min2 = min(59, total_end2 // 60)
-    end_sec2 = total_end2 % 60 if end_min2 < 59 else 59
-
-    ts2_start = ts_syslog(base_date, day, hour, minute, second2)
-    ts2_end = ts_syslog(base_date, day, hour, end_min2, end_sec2)
-
-    direction2 = get_built_direction("inside", "inside")  # same-zone = no direction
-    events.append(f"{pri6}{ts2_start} {ASA_HOSTNAME} %ASA-6-302013: Built {direction2}TCP connection {cid2} for inside:{APP_SERVER_IP}/{app_sp} ({APP_SERVER_IP}/{app_sp}) to inside:{SQL_SERVER_IP}/1433 ({SQL_SERVER_IP}/1433)")
-    events.append(f"{pri6}{ts2_end} {ASA_HOSTNAME} %ASA-6-302014: Teardown TCP connection {cid2} for inside:{APP_SERVER_IP}/{app_sp} to inside:{SQL_SERVER_IP}/1433 duration 0:0:{duration2} bytes {bytes2} TCP FINs")
-
-    return events
-
-
-# =============================================================================
-# ICMP BASELINE (Monitoring Health Checks)
-# =============================================================================
-
-def asa_icmp_ping(base_date: str, day: int, hour: int, minute: int, second: int) -> str:
-    """Generate ICMP ping event (monitoring server health checks).
-
-    MON-ATL-01 pings critical infrastructure. ASA logs permitted ICMP.
-    """
-    ts = ts_syslog(base_date, day, hour, minute, second)
-
-    mon_ip = SERVERS["MON-ATL-01"].ip
-
-    # Ping targets: critical servers (all except MON-ATL-01 itself)
-    targets = [s.ip for s in SERVERS.values() if s.hostname != "MON-ATL-01"]
-    dst = random.choice(targets)
-
-    pri6 = asa_pri(6)
-    direction = get_built_direction("inside", "inside")  # same-zone = no direction
-    return f"{pri6}{ts} {ASA_HOSTNAME} %ASA-6-302020: Built {direction}ICMP connection for inside:{mon_ip}/0 ({mon_ip}/0) to inside:{dst}/0 ({dst}/0)"
-
-
 # =============================================================================
 # WEB-CORRELATED TRAFFIC (DMZ)
 # =============================================================================
@@ -723,72 +326,6 @@ def asa_icmp_ping(base_date: str, day: int, hour: int, minute: int, second: int)
 WEB_SERVERS = [s.ip for s in SERVERS.values() if s.hostname.startswith("WEB-")]
 WEB_PORTS = [443]  # HTTPS only — e-commerce DMZ servers
 
-def asa_web_session(base_date: str, day: int, hour: int, minute: int, second: int) -> List[str]:
-    """Generate web server session (inbound to DMZ)."""
-    events = []
-
-    cid = next_cid()
-    src = get_us_ip()  # External US visitor
-    sp = random.randint(49152, 65535)
-    dst = random.choice(WEB_SERVERS)
-    dp = random.choice(WEB_PORTS)
-
-    # Web traffic byte distribution:
-    # 50% small (HTML/API): 1-50 KB
-    # 30% medium (images): 50-500 KB
-    # 15% large (assets): 500 KB-2 MB
-    # 5% downloads: 2-10 MB
-    category = random.randint(1, 100)
-    if category <= 50:
-        bytes_val = random.randint(1000, 50000)
-    elif category <= 80:
-        bytes_val = random.randint(50000, 500000)
-    elif category <= 95:
-        bytes_val = random.randint(500000, 2000000)
-    else:
-        bytes_val = random.randint(2000000, 10000000)
-
-    # Duration based on bytes
-    duration_secs = max(1, bytes_val // 500000 + random.randint(1, 10))
-
-    # Fix zero-duration with bytes: impossible to transfer data in 0 seconds
-    if bytes_val > 0 and duration_secs == 0:
-        duration_secs = 1
-
-    total_start_secs = minute * 60 + second
-    total_end_secs = total_start_secs + duration_secs
-    end_min = min(59, total_end_secs // 60)
-    end_sec = total_end_secs % 60 if end_min < 59 else 59
-
-    dur_mins = duration_secs // 60
-    dur_secs = duration_secs % 60
-    dur = f"0:{dur_mins}:{dur_secs}"
-
-    start_ts = ts_syslog(base_date, day, hour, minute, second)
-    teardown_ts = ts_syslog(base_date, day, hour, end_min, end_sec)
-
-    reason = weighted_teardown_reason()
-
-    pri6 = asa_pri(6)
-    direction = get_built_direction("outside", "dmz")
-    sni, snp, dni, dnp = get_nat_addresses(src, dst, "outside", "dmz", sp, dp)
-    events.append(f"{pri6}{start_ts} {ASA_HOSTNAME} %ASA-6-302013: Built {direction}TCP connection {cid} for outside:{src}/{sp} ({sni}/{snp}) to dmz:{dst}/{dp} ({dni}/{dnp})")
-    events.append(f"{pri6}{teardown_ts} {ASA_HOSTNAME} %ASA-6-302014: Teardown TCP connection {cid} for outside:{src}/{sp} to dmz:{dst}/{dp} duration {dur} bytes {bytes_val} {reason}")
-
-    return events
-
-
-def asa_web_nat(base_date: str, day: int, hour: int, minute: int, second: int) -> str:
-    """Generate NAT for web server (public IP translation)."""
-    ts = ts_syslog(base_date, day, hour, minute, second)
-    dst = random.choice(WEB_SERVERS)
-    public_ip = "203.0.113.50" if dst == "172.16.1.10" else "203.0.113.51"
-    dp = random.choice(WEB_PORTS)
-
-    pri5 = asa_pri(5)
-    return f"{pri5}{ts} {ASA_HOSTNAME} %ASA-5-305011: Built static TCP translation from outside:{public_ip}/{dp} to dmz:{dst}/{dp}"
-
-
 # =============================================================================
 # INTERNAL SITE-TO-SITE TRAFFIC
 # =============================================================================
@@ -812,82 +349,12 @@ INTERNAL_SERVICES = [
     (636, "LDAPS"),    # LDAPS
 ]
 
-def get_site_ip(site: str, subnet: str = "30") -> str:
-    """Get random IP from a site's user subnet."""
-    prefix = SITE_PREFIXES.get(site, "10.10")
-    return f"{prefix}.{subnet}.{random.randint(10, 200)}"
-
-
-def asa_site_to_site(base_date: str, day: int, hour: int, minute: int, second: int) -> List[str]:
-    """Generate inter-site traffic using hub-spoke model.
-
-    BOS is the hub (70% of traffic involves BOS).
-    ATL↔AUS direct traffic is only 30% (spoke-to-spoke via VPN).
-    Most branch traffic goes BOS↔ATL or BOS↔AUS for DC/file/app access.
-    """
-    events = []
-
-    # Hub-spoke: 70% involves BOS as either src or dst
-    if random.random() < 0.70:
-        # Hub traffic: BOS ↔ ATL or BOS ↔ AUS
-        spoke = random.choices(["ATL", "AUS"], weights=[60, 40])[0]
-        if random.random() < 0.6:
-            # Spoke → Hub (branch users accessing BOS resources)
-            src_site, dst_site = spoke, "BOS"
-        else:
-            # Hub → Spoke (replication, GPO push, etc.)
-            src_site, dst_site = "BOS", spoke
-    else:
-        # Spoke-to-spoke: ATL ↔ AUS (30%)
-        if random.random() < 0.5:
-            src_site, dst_site = "ATL", "AUS"
-        else:
-            src_site, dst_site = "AUS", "ATL"
-
-    cid = next_cid()
-    src = get_site_ip(src_site)
-    sp = random.randint(49152, 65535)
-    dst = get_site_ip(dst_site, "20" if random.random() < 0.3 else "30")  # 30% server, 70% user
-    service = random.choice(INTERNAL_SERVICES)
-    dp = service[0]
-
-    # Internal traffic is typically smaller
-    bytes_val = random.randint(5000, 500000)
-    duration_secs = random.randint(1, 60)
-
-    # Fix zero-duration with bytes: impossible to transfer data in 0 seconds
-    if bytes_val > 0 and duration_secs == 0:
-        duration_secs = 1
-
-    total_start_secs = minute * 60 + second
-    total_end_secs = total_start_secs + duration_secs
-    end_min = min(59, total_end_secs // 60)
-    end_sec = total_end_secs % 60 if end_min < 59 else 59
-
-    dur_mins = duration_secs // 60
-    dur_secs = duration_secs % 60
-    dur = f"0:{dur_mins}:{dur_secs}"
-
-    start_ts = ts_syslog(base_date, day, hour, minute, second)
-    teardown_ts = ts_syslog(base_date, day, hour, end_min, end_sec)
-
-    reason = weighted_teardown_reason()
-
-    # Site-to-site VPN traffic transits ASA on inside zone (all sites terminate on inside)
-    pri6 = asa_pri(6)
-    direction = get_built_direction("inside", "inside")  # same-zone = no direction
-    events.append(f"{pri6}{start_ts} {ASA_HOSTNAME} %ASA-6-302013: Built {direction}TCP connection {cid} for inside:{src}/{sp} ({src}/{sp}) to inside:{dst}/{dp} ({dst}/{dp})")
-    events.append(f"{pri6}{teardown_ts} {ASA_HOSTNAME} %ASA-6-302014: Teardown TCP connection {cid} for inside:{src}/{sp} to inside:{dst}/{dp} duration {dur} bytes {bytes_val} {reason}")
-
-    return events
-
-
 # =============================================================================
 # ADDITIONAL EVENT TYPES
 # =============================================================================
 
 # NOTE: asa_http_inspect() removed — ASA does not log HTTP method/URI in firewall
-# syslog. Message ID 302020 is used for ICMP only (see asa_icmp_ping).
+# syslog. Message ID 302020 is used for ICMP only (see _icmp_rows).
 
 
 def asa_rate_limit(base_date: str, day: int, hour: int, minute: int, second: int) -> str:
@@ -1249,31 +716,541 @@ def asa_web_session_from_registry(base_date: str, session: Dict) -> List[str]:
     return events
 
 
+# =============================================================================
+# BATCH HOUR ENGINE (baseline traffic)
+# =============================================================================
+#
+# generate_baseline_hour() builds an hour of baseline traffic one message
+# family at a time instead of one event at a time. The hour's event-type mix
+# is drawn with a single random.choices() call; each family then draws its
+# fields as columns over tables built at import (employee IP + PAT address,
+# DC and hub-spoke site pairs, scan targets) and renders its lines from
+# template heads that already carry the hostname, message ID and direction.
+# Timestamps index a per-day table of pre-rendered syslog seconds, and the
+# PRI prefixes are rendered once. The asa_*() emitters above produce the same
+# messages one at a time and document each family's field distributions.
+
+_PRI4, _PRI5, _PRI6 = asa_pri(4), asa_pri(5), asa_pri(6)
+
+# Baseline event-type mix (percent of the non-registry events in an hour)
+BASELINE_MIX = [
+    ("web", 25),            # Web sessions (outbound TCP when the registry drives web)
+    ("tcp", 16),            # Outbound TCP sessions (half of them inbound to the DMZ)
+    ("dns", 12),            # DNS queries
+    ("dc", 10),             # DC traffic (Kerberos, LDAP, DNS, SMB)
+    ("site_to_site", 9),    # Hub-spoke site-to-site traffic
+    ("nat", 7),             # NAT translations (+30% web static NAT)
+    ("vpn", 5),             # VPN sessions
+    ("new_server", 4),      # SAP, BASTION, APP-BOS-01
+    ("app_tier", 2),        # WEB -> APP -> SQL
+    ("ssl", 3),             # SSL handshakes
+    ("icmp", 4),            # Monitoring pings
+    ("admin", 2),           # Admin commands
+    ("deny_internal", 1),   # Internal ACL denies
+]
+_MIX_KINDS = [kind for kind, _ in BASELINE_MIX]
+_MIX_CUM = list(accumulate(weight for _, weight in BASELINE_MIX))
+
+_HOUR_SECONDS = range(3600)
+_MS = [f"{ms:03d}" for ms in range(1000)]
+_EPHEMERAL_PORTS = range(49152, 65536)
+_OCTETS = range(1, 255)
+_TEARDOWN_CUM = list(accumulate(TEARDOWN_WEIGHTS))
+_DURATIONS = [f"0:{d // 60}:{d % 60}" for d in range(3600)]
+
+
+@lru_cache(maxsize=2)
+def _syslog_day_stamps(base_date: str, day: int) -> List[str]:
+    """ts_syslog() without the milliseconds for every second of a day."""
+    prefix = date_add(base_date, day).strftime("%b %d %Y ")
+    return [f"{prefix}{h:02d}:{m:02d}:{s:02d}" for h in range(24) for m in range(60) for s in range(60)]
+
+
+def _stamped(stamps: List[str], seconds: List[int]) -> List[str]:
+    """'stamp.ms' per second index, each with its own random millisecond like ts_syslog()."""
+    return [f"{stamps[s]}.{ms}" for s, ms in zip(seconds, random.choices(_MS, k=len(seconds)))]
+
+
+def _teardown_seconds(starts: List[int], durations: List[int]) -> List[int]:
+    """Teardown second in the hour; anything ending in minute 59 or later logs at 59:59."""
+    return [s + d if s + d < 3540 else 3599 for s, d in zip(starts, durations)]
+
+
+def _banded(bands: List[Tuple[int, int]], cum_weights: List[int], n: int) -> List[int]:
+    """n ints: a (low, high) band picked by weight, then uniform within it."""
+    rand = random.random
+    return [low + int(rand() * (high - low + 1))
+            for low, high in random.choices(bands, cum_weights=cum_weights, k=n)]
+
+
+def _us_ips(n: int) -> List[str]:
+    """n random addresses from the US_IP_PFX prefixes."""
+    choices = random.choices
+    return [f"{prefix}.{octet}" for prefix, octet in zip(choices(US_IP_PFX, k=n), choices(_OCTETS, k=n))]
+
+
+def _built_head(protocol: str, src_zone: str, dst_zone: str) -> str:
+    message_id = "302013" if protocol == "TCP" else "302015"
+    return (f" {ASA_HOSTNAME} %ASA-6-{message_id}: Built "
+            f"{get_built_direction(src_zone, dst_zone)}{protocol} connection ")
+
+
+_BUILT_TCP_INSIDE = _built_head("TCP", "inside", "inside")
+_BUILT_TCP_OUTBOUND = _built_head("TCP", "inside", "outside")
+_BUILT_TCP_INBOUND = _built_head("TCP", "outside", "dmz")
+_BUILT_TCP_DMZ_INSIDE = _built_head("TCP", "dmz", "inside")
+_BUILT_UDP_INSIDE = _built_head("UDP", "inside", "inside")
+_BUILT_UDP_OUTBOUND = _built_head("UDP", "inside", "outside")
+_TEARDOWN_TCP = f" {ASA_HOSTNAME} %ASA-6-302014: Teardown TCP connection "
+_TEARDOWN_UDP = f" {ASA_HOSTNAME} %ASA-6-302016: Teardown UDP connection "
+
+
+def _tcp_lines(stamps: List[str], starts: List[int], ends: List[int], durations: List[str],
+               heads: List[str], sources: List[tuple], targets: List[tuple],
+               byte_counts: List[int], reasons: List[str] = None) -> List[str]:
+    """Built + Teardown pairs for a batch of TCP connections.
+
+    sources are ("zone:ip", translated ip) and targets ("zone:ip/port",
+    "translated ip/port"); heads are _built_head() strings. Teardown reasons
+    default to the weighted_teardown_reason() mix.
+    """
+    n = len(starts)
+    if reasons is None:
+        reasons = random.choices(ASA_TEARDOWN_REASONS, cum_weights=_TEARDOWN_CUM, k=n)
+    pri, teardown = _PRI6, _TEARDOWN_TCP
+    lines = []
+    append = lines.append
+    for cid, built_ts, teardown_ts, head, (src, src_nat), (dst, dst_nat), sp, dur, bytes_val, reason in zip(
+            next_cids(n), _stamped(stamps, starts), _stamped(stamps, ends), heads, sources, targets,
+            random.choices(_EPHEMERAL_PORTS, k=n), durations, byte_counts, reasons):
+        append(f"{pri}{built_ts}{head}{cid} for {src}/{sp} ({src_nat}/{sp}) to {dst} ({dst_nat})")
+        append(f"{pri}{teardown_ts}{teardown}{cid} for {src}/{sp} to {dst} duration {dur} bytes {bytes_val} {reason}")
+    return lines
+
+
+def _udp_lines(stamps: List[str], starts: List[int], ends: List[int], durations: List[str],
+               heads: List[str], sources: List[tuple], targets: List[tuple],
+               byte_counts: List[int]) -> List[str]:
+    """Built + Teardown pairs for a batch of UDP connections (see _tcp_lines())."""
+    n = len(starts)
+    pri, teardown = _PRI6, _TEARDOWN_UDP
+    lines = []
+    append = lines.append
+    for cid, built_ts, teardown_ts, head, (src, src_nat), (dst, dst_nat), sp, dur, bytes_val in zip(
+            next_cids(n), _stamped(stamps, starts), _stamped(stamps, ends), heads, sources, targets,
+            random.choices(_EPHEMERAL_PORTS, k=n), durations, byte_counts):
+        append(f"{pri}{built_ts}{head}{cid} for {src}/{sp} ({src_nat}/{sp}) to {dst} ({dst_nat})")
+        append(f"{pri}{teardown_ts}{teardown}{cid} for {dst} to {src}/{sp} duration {dur} bytes {bytes_val}")
+    return lines
+
+
+# --- Endpoint tables: ("zone:ip", translated) sources, ("zone:ip/port", translated) targets ---
+
+_EMPLOYEE_IPS = [user.ip_address for user in USERS.values()]
+_EMPLOYEE_INSIDE = [(f"inside:{ip}", ip) for ip in _EMPLOYEE_IPS]
+_EMPLOYEE_OUTBOUND = [(f"inside:{ip}", get_pat_address(ip)) for ip in _EMPLOYEE_IPS]
+_EXTERNAL_TARGETS = [(f"outside:{ip}/{port}", f"{ip}/{port}") for ip in EXT_SERVICE_IPS for port in ASA_WEB_PORTS]
+_DMZ_TARGETS = [(f"dmz:{ip}/{port}", f"{ASA_STATIC_NAT.get(ip, ip)}/{port}")
+                for ip in WEB_SERVERS for port in WEB_PORTS]
+
+_DNS_DCS = ["10.10.20.10", "10.10.20.11", "10.20.20.10"]
+_DNS_DC_SOURCES = [(f"inside:{ip}", get_pat_address(ip)) for ip in _DNS_DCS]
+_DNS_DC_TARGETS = [(f"inside:{ip}/53", f"{ip}/53") for ip in _DNS_DCS]
+_DNS_EXTERNAL_TARGETS = [(f"outside:{ip}/53", f"{ip}/53") for ip in DNS_SERVERS]
+_DNS_DURATIONS = [1, 1, 2]  # randint(0, 2) with zero-duration bumped to 1
+
+
+def _dc_pair_table() -> Tuple[list, list]:
+    """(source "prefix.30.", DC IP) pairs: 60/25/15 BOS/ATL/AUS, ATL stays local 70%."""
+    entries = []
+    for site, share in (("BOS", 60), ("ATL", 25), ("AUS", 15)):
+        prefix = f"{SITE_PREFIXES[site]}.30."
+        local = 0.7 if site == "ATL" else 0.0
+        for dc in DC_IPS["ATL"]:
+            if local:
+                entries.append(((prefix, dc), share * local / len(DC_IPS["ATL"])))
+        for dc in DC_IPS["BOS"]:
+            entries.append(((prefix, dc), share * (1 - local) / len(DC_IPS["BOS"])))
+    return [e[0] for e in entries], list(accumulate(e[1] for e in entries))
+
+
+def _site_pair_table() -> Tuple[list, list]:
+    """(source "prefix.30.", destination "prefix.subnet.") pairs for hub-spoke traffic."""
+    entries = []
+    for spoke, spoke_share in (("ATL", 0.6), ("AUS", 0.4)):
+        entries.append((spoke, "BOS", 0.7 * spoke_share * 0.6))   # spoke -> hub
+        entries.append(("BOS", spoke, 0.7 * spoke_share * 0.4))   # hub -> spoke
+    entries.append(("ATL", "AUS", 0.15))
+    entries.append(("AUS", "ATL", 0.15))
+    pairs, weights = [], []
+    for src, dst, weight in entries:
+        for subnet, subnet_share in (("20", 0.3), ("30", 0.7)):   # 30% server, 70% user
+            pairs.append((f"{SITE_PREFIXES[src]}.30.", f"{SITE_PREFIXES[dst]}.{subnet}."))
+            weights.append(weight * subnet_share)
+    return pairs, list(accumulate(weights))
+
+
+def _new_server_table() -> Tuple[list, list]:
+    """(head, target) per NEW_SERVER_TRAFFIC server and port, servers equally likely."""
+    entries = []
+    for hostname, ports, _ in NEW_SERVER_TRAFFIC:
+        server = SERVERS.get(hostname)
+        if not server:
+            continue
+        zone = "management" if hostname.startswith("BASTION") else "inside"
+        for dp, proto in ports:
+            entries.append(((_built_head("TCP", "inside", zone), (f"{zone}:{server.ip}/{dp}", f"{server.ip}/{dp}")),
+                            1 / len(ports)))
+    return [e[0] for e in entries], list(accumulate(e[1] for e in entries))
+
+
+def _scan_target_table() -> Tuple[list, list]:
+    """"zone:ip" scan targets: 60% public IPs, 30% DMZ servers, 10% ASA outside interface."""
+    entries = [(f"outside:203.0.113.{i}", 0.6 * 0.8 / 10) for i in range(1, 11)]
+    entries += [(f"outside:{ip}", 0.6 * 0.2 / 2) for ip in ("203.0.113.50", "203.0.113.51")]
+    entries += [(f"dmz:{ip}", 0.3 / 2) for ip in ("172.16.1.10", "172.16.1.11")]
+    entries.append(("outside:203.0.113.1", 0.1))
+    return [e[0] for e in entries], list(accumulate(e[1] for e in entries))
+
+
+_DC_PAIRS, _DC_PAIRS_CUM = _dc_pair_table()
+_DC_SERVICE_CUM = list(accumulate(DC_SERVICE_WEIGHTS))
+_SITE_PAIRS, _SITE_PAIRS_CUM = _site_pair_table()
+_INTERNAL_PORTS = [port for port, _ in INTERNAL_SERVICES]
+_NEW_SERVERS, _NEW_SERVERS_CUM = _new_server_table()
+_SITE_SUBNETS = [f"{prefix}.30." for prefix in SITE_PREFIXES.values()]
+_WEB_DMZ_SOURCES = [(f"dmz:{ip}", ip) for ip in WEB_SERVERS]
+_APP_TARGETS = [(f"inside:{APP_SERVER_IP}/{dp}", f"{APP_SERVER_IP}/{dp}") for dp in (443, 8443)]
+_APP_SOURCE = (f"inside:{APP_SERVER_IP}", APP_SERVER_IP)
+_SQL_TARGET = (f"inside:{SQL_SERVER_IP}/1433", f"{SQL_SERVER_IP}/1433")
+_SCAN_TARGETS, _SCAN_TARGETS_CUM = _scan_target_table()
+
+_TCP_BYTE_BANDS = [(1000, 50000), (50000, 500000), (500000, 5000000), (5000000, 50000000)]
+_TCP_BYTE_CUM = list(accumulate([40, 35, 20, 5]))
+_WEB_BYTE_BANDS = [(1000, 50000), (50000, 500000), (500000, 2000000), (2000000, 10000000)]
+_WEB_BYTE_CUM = list(accumulate([50, 30, 15, 5]))
+
+_NAT_PUBLIC = [f"203.0.113.{i}" for i in range(1, 11)]
+_NAT_BUILT = f" {ASA_HOSTNAME} %ASA-5-305011: Built dynamic TCP translation from inside:"
+_NAT_TEARDOWN = f" {ASA_HOSTNAME} %ASA-5-305012: Teardown dynamic TCP translation from inside:"
+_WEB_NAT_TAILS = [
+    f" {ASA_HOSTNAME} %ASA-5-305011: Built static TCP translation from outside:"
+    f"{'203.0.113.50' if dst == '172.16.1.10' else '203.0.113.51'}/{dp} to dmz:{dst}/{dp}"
+    for dst in WEB_SERVERS for dp in WEB_PORTS
+]
+_VPN_GROUP = f" {ASA_HOSTNAME} %ASA-6-{{}}: Group <Remote-Workers> User <"
+_VPN_CONNECT = _VPN_GROUP.format("722022")
+_VPN_DISCONNECT = _VPN_GROUP.format("722023")
+_SSL_START = f" {ASA_HOSTNAME} %ASA-6-725001: Starting SSL handshake with client outside:"
+_SSL_DONE = f" {ASA_HOSTNAME} %ASA-6-725002: Device completed SSL handshake with client outside:"
+_ICMP_TAILS = [
+    f" {ASA_HOSTNAME} %ASA-6-302020: Built {get_built_direction('inside', 'inside')}ICMP connection for "
+    f"inside:{SERVERS['MON-ATL-01'].ip}/0 ({SERVERS['MON-ATL-01'].ip}/0) to inside:{s.ip}/0 ({s.ip}/0)"
+    for s in SERVERS.values() if s.hostname != "MON-ATL-01"
+]
+_ADMIN_TAILS = [
+    f" {ASA_HOSTNAME} %ASA-5-111008: User '{admin}' executed the '{cmd}' command"
+    for admin in ("noc-admin", "backup-svc", "monitor-svc")
+    for cmd in ("show version", "show conn count", "show cpu usage", "show memory")
+]
+_DENY_EXTERNAL = f" {ASA_HOSTNAME} %ASA-4-106023: Deny tcp src outside:"
+
+
+def _tcp_durations(byte_counts: List[int]) -> List[int]:
+    """TCP session durations: ~500 Mbps transfer time + 1-30s, +/-20% jitter."""
+    n = len(byte_counts)
+    choices = random.choices
+    durations = []
+    for bytes_val, min_duration, jitter in zip(byte_counts, choices(range(1, 31), k=n),
+                                               choices(range(-20, 21), k=n)):
+        base = bytes_val // 62500000 or 1
+        durations.append(max(1, base + min_duration + base * jitter // 100))
+    return durations
+
+
+def _web_durations(byte_counts: List[int]) -> List[int]:
+    """Web session durations: 1s per 500 KB + 1-10s."""
+    return [max(1, bytes_val // 500000 + extra)
+            for bytes_val, extra in zip(byte_counts, random.choices(range(1, 11), k=len(byte_counts)))]
+
+
+def _session_rows(stamps: List[str], head: str, sources: List[tuple], targets: List[tuple],
+                  bands: list, band_cum: list, durations_for) -> List[str]:
+    n = len(sources)
+    starts = random.choices(_HOUR_SECONDS, k=n)
+    byte_counts = _banded(bands, band_cum, n)
+    durations = durations_for(byte_counts)
+    return _tcp_lines(stamps, starts, _teardown_seconds(starts, durations),
+                      [_DURATIONS[d] for d in durations], [head] * n, sources, targets, byte_counts)
+
+
+def _web_rows(stamps: List[str], n: int) -> List[str]:
+    """302013/302014 pairs: US visitors (outside) to the DMZ web servers on 443."""
+    sources = [(f"outside:{ip}", ip) for ip in _us_ips(n)]
+    return _session_rows(stamps, _BUILT_TCP_INBOUND, sources, random.choices(_DMZ_TARGETS, k=n),
+                         _WEB_BYTE_BANDS, _WEB_BYTE_CUM, _web_durations)
+
+
+def _tcp_rows(stamps: List[str], n: int, dmz_share: float) -> List[str]:
+    """302013/302014 pairs: employees PAT'd to external services, dmz_share inbound to the DMZ instead."""
+    rand = random.random
+    inbound = sum(1 for _ in range(n) if rand() < dmz_share)
+    outbound = n - inbound
+    choices = random.choices
+    lines = _session_rows(stamps, _BUILT_TCP_OUTBOUND, choices(_EMPLOYEE_OUTBOUND, k=outbound),
+                          choices(_EXTERNAL_TARGETS, k=outbound),
+                          _TCP_BYTE_BANDS, _TCP_BYTE_CUM, _tcp_durations)
+    lines += _session_rows(stamps, _BUILT_TCP_INBOUND, [(f"outside:{ip}", ip) for ip in _us_ips(inbound)],
+                           choices(_DMZ_TARGETS, k=inbound), _TCP_BYTE_BANDS, _TCP_BYTE_CUM, _tcp_durations)
+    return lines
+
+
+def _dns_rows(stamps: List[str], n: int) -> List[str]:
+    """302015/302016 UDP/53 pairs: 70% clients -> DC DNS, 30% DCs forwarding to external DNS."""
+    rand = random.random
+    internal = sum(1 for _ in range(n) if rand() < 0.70)
+    external = n - internal
+    choices = random.choices
+    starts = choices(_HOUR_SECONDS, k=n)
+    durations = choices(_DNS_DURATIONS, k=n)
+    # The teardown wraps within the hour's last minute instead of clamping
+    ends = [s + d if s < 3540 or s % 60 + d < 60 else s + d - 60 for s, d in zip(starts, durations)]
+    return _udp_lines(stamps, starts, ends, [_DURATIONS[d] for d in durations],
+                      [_BUILT_UDP_INSIDE] * internal + [_BUILT_UDP_OUTBOUND] * external,
+                      choices(_EMPLOYEE_INSIDE, k=internal) + choices(_DNS_DC_SOURCES, k=external),
+                      choices(_DNS_DC_TARGETS, k=internal) + choices(_DNS_EXTERNAL_TARGETS, k=external),
+                      choices(range(64, 465), k=n))
+
+
+def _dc_rows(stamps: List[str], n: int) -> List[str]:
+    """Built/Teardown pairs from site user subnets to the DCs, per DC_SERVICES port and protocol."""
+    services = random.choices(DC_SERVICES, cum_weights=_DC_SERVICE_CUM, k=n)
+    return (_dc_protocol_rows(stamps, [s[0] for s in services if s[1] == "UDP"], _BUILT_UDP_INSIDE, _udp_lines)
+            + _dc_protocol_rows(stamps, [s[0] for s in services if s[1] == "TCP"], _BUILT_TCP_INSIDE, _tcp_lines))
+
+
+def _dc_protocol_rows(stamps: List[str], ports: List[int], head: str, render) -> List[str]:
+    n = len(ports)
+    choices = random.choices
+    sources, targets = [], []
+    for (prefix, dc), octet, dp in zip(choices(_DC_PAIRS, cum_weights=_DC_PAIRS_CUM, k=n),
+                                       choices(range(10, 251), k=n), ports):
+        src = f"{prefix}{octet}"
+        sources.append((f"inside:{src}", src))
+        targets.append((f"inside:{dc}/{dp}", f"{dc}/{dp}"))
+    starts = choices(_HOUR_SECONDS, k=n)
+    durations = choices(range(0, 6), k=n)
+    # Teardown time uses the raw duration; the logged duration is at least 1s
+    return render(stamps, starts, _teardown_seconds(starts, durations),
+                  [_DURATIONS[d or 1] for d in durations], [head] * n, sources, targets,
+                  choices(range(200, 50001), k=n))
+
+
+def _site_to_site_rows(stamps: List[str], n: int) -> List[str]:
+    """inside -> inside 302013/302014 pairs: hub-spoke traffic between BOS, ATL and AUS."""
+    choices = random.choices
+    octets = range(10, 201)
+    sources, targets = [], []
+    for (src_prefix, dst_prefix), src_octet, dst_octet, dp in zip(
+            choices(_SITE_PAIRS, cum_weights=_SITE_PAIRS_CUM, k=n), choices(octets, k=n),
+            choices(octets, k=n), choices(_INTERNAL_PORTS, k=n)):
+        src = f"{src_prefix}{src_octet}"
+        dst = f"{dst_prefix}{dst_octet}"
+        sources.append((f"inside:{src}", src))
+        targets.append((f"inside:{dst}/{dp}", f"{dst}/{dp}"))
+    starts = choices(_HOUR_SECONDS, k=n)
+    durations = choices(range(1, 61), k=n)
+    return _tcp_lines(stamps, starts, _teardown_seconds(starts, durations),
+                      [_DURATIONS[d] for d in durations], [_BUILT_TCP_INSIDE] * n, sources, targets,
+                      choices(range(5000, 500001), k=n))
+
+
+def _new_server_rows(stamps: List[str], n: int) -> List[str]:
+    """302013/302014 pairs: internal hosts to SAP, BASTION (management zone) and APP-BOS-01."""
+    choices = random.choices
+    sources = [(f"inside:{ip}", ip) for ip in (
+        f"{prefix}{octet}" for prefix, octet in zip(choices(_SITE_SUBNETS, k=n), choices(range(10, 251), k=n)))]
+    servers = choices(_NEW_SERVERS, cum_weights=_NEW_SERVERS_CUM, k=n)
+    starts = choices(_HOUR_SECONDS, k=n)
+    durations = choices(range(1, 31), k=n)
+    return _tcp_lines(stamps, starts, _teardown_seconds(starts, durations),
+                      [_DURATIONS[d] for d in durations], [s[0] for s in servers], sources,
+                      [s[1] for s in servers], choices(range(1000, 200001), k=n))
+
+
+def _app_tier_rows(stamps: List[str], n: int) -> List[str]:
+    """302013/302014 pairs: dmz WEB -> APP-BOS-01 and, a second later, APP -> SQL-PROD-01/1433."""
+    choices = random.choices
+    starts = choices(_HOUR_SECONDS, k=n)
+    durations = choices(range(1, 6), k=n)
+    lines = _tcp_lines(stamps, starts, _teardown_seconds(starts, durations),
+                       [_DURATIONS[d] for d in durations], [_BUILT_TCP_DMZ_INSIDE] * n,
+                       choices(_WEB_DMZ_SOURCES, k=n), choices(_APP_TARGETS, k=n),
+                       choices(range(2000, 100001), k=n), ["TCP FINs"] * n)
+    # Second leg starts one second later within the same minute
+    starts = [s if s % 60 == 59 else s + 1 for s in starts]
+    durations = choices(range(1, 4), k=n)
+    lines += _tcp_lines(stamps, starts, _teardown_seconds(starts, durations),
+                        [_DURATIONS[d] for d in durations], [_BUILT_TCP_INSIDE] * n,
+                        [_APP_SOURCE] * n, [_SQL_TARGET] * n,
+                        choices(range(500, 50001), k=n), ["TCP FINs"] * n)
+    return lines
+
+
+def _nat_rows(stamps: List[str], n: int) -> List[str]:
+    """305011/305012 dynamic PAT translations; 30% also get a 305011 static DMZ translation in the same second."""
+    choices = random.choices
+    rand = random.random
+    starts = choices(_HOUR_SECONDS, k=n)
+    pri = _PRI5
+    lines = []
+    append = lines.append
+    for ts, src, sp, nat, minutes, seconds in zip(
+            _stamped(stamps, starts), choices(_EMPLOYEE_IPS, k=n), choices(_EPHEMERAL_PORTS, k=n),
+            choices(_NAT_PUBLIC, k=n), choices(range(0, 11), k=n), choices(range(0, 60), k=n)):
+        if rand() < 0.5:
+            append(f"{pri}{ts}{_NAT_BUILT}{src}/{sp} to outside:{nat}/{sp}")
+        else:
+            append(f"{pri}{ts}{_NAT_TEARDOWN}{src}/{sp} to outside:{nat}/{sp} duration 0:{minutes}:{seconds}")
+    web = [s for s in starts if rand() < 0.3]
+    lines.extend(f"{pri}{ts}{tail}" for ts, tail in zip(
+        _stamped(stamps, web), choices(_WEB_NAT_TAILS, k=len(web))))
+    return lines
+
+
+def _vpn_rows(stamps: List[str], n: int) -> List[str]:
+    """722022 connects (67%) and 722023 disconnects for VPN users at their pool IP."""
+    choices = random.choices
+    rand = random.random
+    randint = random.randint
+    pri = _PRI6
+    lines = []
+    append = lines.append
+    for ts, username, minutes, seconds, xmt, rcv in zip(
+            _stamped(stamps, choices(_HOUR_SECONDS, k=n)), choices(VPN_USERS, k=n),
+            choices(range(0, 60), k=n), choices(range(0, 60), k=n),
+            choices(range(1000000, 20000001), k=n), choices(range(1000000, 50000001), k=n)):
+        pool_entry = VPN_POOL.get(username)
+        vpn_ip = pool_entry["vpn_ip"] if pool_entry else f"10.250.0.{randint(10, 209)}"
+        if rand() > 0.33:
+            append(f"{pri}{ts}{_VPN_CONNECT}{username}@{TENANT}> IP <{vpn_ip}> "
+                   f"TCP connection established without compression")
+        else:
+            append(f"{pri}{ts}{_VPN_DISCONNECT}{username}@{TENANT}> IP <{vpn_ip}> Session disconnected. "
+                   f"Session Type: SSL, Duration: 0:{minutes}:{seconds}, Bytes xmt: {xmt}, Bytes rcv: {rcv}")
+    return lines
+
+
+def _ssl_rows(stamps: List[str], n: int) -> List[str]:
+    """725001 handshake starts and 725002 completions from US clients."""
+    rand = random.random
+    pri = _PRI6
+    return [
+        f"{pri}{ts}{_SSL_START}{ip}/{port} for TLSv1.2 session." if rand() < 0.5
+        else f"{pri}{ts}{_SSL_DONE}{ip}/{port}"
+        for ts, ip, port in zip(_stamped(stamps, random.choices(_HOUR_SECONDS, k=n)), _us_ips(n),
+                                random.choices(_EPHEMERAL_PORTS, k=n))
+    ]
+
+
+def _fixed_rows(stamps: List[str], n: int, pri: str, tails: List[str]) -> List[str]:
+    """n lines picked uniformly from pre-rendered message tails."""
+    return [f"{pri}{ts}{tail}" for ts, tail in zip(
+        _stamped(stamps, random.choices(_HOUR_SECONDS, k=n)), random.choices(tails, k=n))]
+
+
+def _icmp_rows(stamps: List[str], n: int) -> List[str]:
+    """302020 ICMP Built events: MON-ATL-01 health checks to every other server."""
+    return _fixed_rows(stamps, n, _PRI6, _ICMP_TAILS)
+
+
+def _admin_rows(stamps: List[str], n: int) -> List[str]:
+    """111008 show commands run by service accounts."""
+    return _fixed_rows(stamps, n, _PRI5, _ADMIN_TAILS)
+
+
+def _deny_external_rows(stamps: List[str], n: int) -> List[str]:
+    """106023 denies: scanner noise against public IPs, the DMZ and the outside interface."""
+    choices = random.choices
+    pri = _PRI4
+    return [
+        f'{pri}{ts}{_DENY_EXTERNAL}{prefix}.{a}.{b}/{sport} dst {target}/{port} by access-group "{acl}" [0x0, 0x0]'
+        for ts, prefix, a, b, sport, target, port, acl in zip(
+            _stamped(stamps, choices(_HOUR_SECONDS, k=n)), choices(WORLD_IP_PREFIXES, k=n),
+            choices(_OCTETS, k=n), choices(_OCTETS, k=n), choices(range(40000, 50001), k=n),
+            choices(_SCAN_TARGETS, cum_weights=_SCAN_TARGETS_CUM, k=n),
+            choices(ASA_SCAN_PORTS, k=n), choices(ASA_EXT_ACLS, k=n))
+    ]
+
+
+def _registry_rows(day_stamps: List[str], sessions: List[Dict]) -> List[str]:
+    """asa_web_session_from_registry() for a batch of one day's registry sessions."""
+    starts, ends, durations, sources, targets, byte_counts = [], [], [], [], [], []
+    for session in sessions:
+        src = session["ip"]
+        # Clamp phantom DMZ IPs to actual web servers
+        dst = session.get("dst", "172.16.1.10")
+        if dst.startswith("172.16.1."):
+            dst = WEB_SERVERS[hash(session.get("ip", "")) % len(WEB_SERVERS)]
+        dp = session["dst_port"]
+        start_ts, end_ts = session["start_ts"], session["end_ts"]
+        # Second of the day; a session ending after midnight keeps the start day
+        start = int(start_ts[11:13]) * 3600 + int(start_ts[14:16]) * 60 + int(start_ts[17:19])
+        end = int(end_ts[11:13]) * 3600 + int(end_ts[14:16]) * 60 + int(end_ts[17:19])
+        duration = max(1, end - start)
+        starts.append(start)
+        ends.append(end)
+        durations.append(_DURATIONS[duration] if duration < 3600 else f"0:{duration // 60}:{duration % 60}")
+        sources.append((f"outside:{src}", src))
+        targets.append((f"dmz:{dst}/{dp}", f"{ASA_STATIC_NAT.get(dst, dst)}/{dp}"))
+        byte_counts.append(session.get("bytes", 5000))
+    return _tcp_lines(day_stamps, starts, ends, durations, [_BUILT_TCP_INBOUND] * len(sessions),
+                      sources, targets, byte_counts)
+
+
+# Batch builders per BASELINE_MIX kind (tcp and deny_internal are handled separately)
+_FAMILY_ROWS = {
+    "web": _web_rows,
+    "dns": _dns_rows,
+    "dc": _dc_rows,
+    "site_to_site": _site_to_site_rows,
+    "nat": _nat_rows,
+    "vpn": _vpn_rows,
+    "new_server": _new_server_rows,
+    "app_tier": _app_tier_rows,
+    "ssl": _ssl_rows,
+    "icmp": _icmp_rows,
+    "admin": _admin_rows,
+}
+
+
 def generate_baseline_hour(base_date: str, day: int, hour: int, event_count: int,
                            registry_index: Dict = None,
                            web_suppression: float = 0.0) -> List[str]:
     """Generate baseline events for one hour.
 
-    Event distribution (updated for perimeter + internal traffic):
-    - 25% Web sessions (inbound to DMZ) - NOW registry-driven for 1:1 access correlation
+    Event distribution (BASELINE_MIX, perimeter + internal traffic):
+    - 25% Web sessions (inbound to DMZ) - registry-driven for 1:1 access correlation
     - 16% Outbound TCP sessions (users browsing)
-    - 12% DNS queries (external)
+    - 12% DNS queries
     - 10% DC traffic (Kerberos, LDAP, DNS, SMB) — AD backbone
     - 9% Site-to-site traffic (hub-spoke: BOS=70%)
     - 7% NAT translations
     - 5% VPN sessions
     - 4% New server traffic (SAP, BASTION, APP-BOS-01)
-    - 2% Internal app tier traffic (WEB->APP->SQL 3-tier flow)
+    - 4% ICMP health checks (monitoring)
     - 3% SSL handshakes
-    - 3% ICMP health checks (monitoring)
-    - 2% HTTP inspection events
-    - 1% Admin commands
+    - 2% Internal app tier traffic (WEB->APP->SQL 3-tier flow)
+    - 2% Admin commands
     - 1% Internal ACL denies
 
+    The mix is drawn once per hour and each family is generated as a batch
+    (see BATCH HOUR ENGINE above).
+
     When registry_index is provided (pre-indexed by (day, hour)), web sessions
     are generated from the registry (1:1 match with access logs) instead of
-    random generation. The remaining 75% of event_count is filled with non-web
-    traffic types.
+    random generation, and the web share of the remaining events becomes
+    outbound TCP sessions.
 
     web_suppression (0.0-1.0): Fraction of external->DMZ web sessions to
     suppress during scenarios (e.g., firewall_misconfig ACL blocks all traffic).
@@ -1282,9 +1259,8 @@ def generate_baseline_hour(base_date: str, day: int, hour: int, event_count: int
     """
     events = []
 
-    # Set the suppression context so asa_tcp_session() can reduce outside->dmz
-    global _web_suppression_ctx
-    _web_suppression_ctx = web_suppression
+    day_stamps = _syslog_day_stamps(base_date, day)
+    stamps = day_stamps[hour * 3600:(hour + 1) * 3600]
 
     # --- Phase 1: Registry-driven web sessions (if available) ---
     registry_web_events = 0
@@ -1297,76 +1273,29 @@ def generate_baseline_hour(base_date: str, day: int, hour: int, event_count: int
             keep_count = max(0, int(len(hour_sessions) * (1.0 - web_suppression)))
             hour_sessions = hour_sessions[:keep_count]
 
-        for sess in hour_sessions:
-            events.extend(asa_web_session_from_registry(base_date, sess))
-            registry_web_events += 1  # Each produces 2 events (Built+Teardown)
+        events.extend(_registry_rows(day_stamps, hour_sessions))
+        registry_web_events = len(hour_sessions)  # Each produces 2 events (Built+Teardown)
 
     # --- Phase 2: Non-web baseline events ---
-    # Calculate remaining events: total minus registry web events (2 events each)
-    # The 25% web allocation is now handled by the registry, so we generate
-    # the remaining 75% of event_count as non-web traffic.
+    # Calculate remaining events: total minus registry web sessions
     remaining_events = max(0, event_count - registry_web_events)
+    mix = Counter(random.choices(_MIX_KINDS, cum_weights=_MIX_CUM, k=remaining_events))
 
-    # If no registry available, fall back to original behavior (including random web sessions)
-    use_random_web = not registry_index
+    if registry_index:
+        # Registry handles web sessions; redistribute to outbound TCP
+        mix["tcp"] += mix.pop("web", 0)
 
-    for _ in range(remaining_events):
-        minute = random.randint(0, 59)
-        second = random.randint(0, 59)
-        event_type = random.randint(1, 100)
-
-        if event_type <= 25:
-            if use_random_web:
-                # Fallback: random web sessions when no registry available
-                events.extend(asa_web_session(base_date, day, hour, minute, second))
-            else:
-                # Registry handles web sessions; redistribute to outbound TCP
-                events.extend(asa_tcp_session(base_date, day, hour, minute, second))
-        elif event_type <= 41:
-            # Outbound TCP sessions
-            events.extend(asa_tcp_session(base_date, day, hour, minute, second))
-        elif event_type <= 53:
-            # DNS queries (external)
-            events.extend(asa_dns_query(base_date, day, hour, minute, second))
-        elif event_type <= 63:
-            # DC traffic (Kerberos, LDAP, DNS, SMB)
-            events.extend(asa_dc_traffic(base_date, day, hour, minute, second))
-        elif event_type <= 72:
-            # Site-to-site traffic (hub-spoke)
-            events.extend(asa_site_to_site(base_date, day, hour, minute, second))
-        elif event_type <= 79:
-            # NAT translations
-            events.append(asa_nat(base_date, day, hour, minute, second))
-            # Also add web NAT occasionally
-            if random.random() < 0.3:
-                events.append(asa_web_nat(base_date, day, hour, minute, second))
-        elif event_type <= 84:
-            # VPN sessions
-            events.append(asa_vpn(base_date, day, hour, minute, second))
-        elif event_type <= 88:
-            # New server traffic (SAP, BASTION, APP-BOS-01)
-            events.extend(asa_new_server_traffic(base_date, day, hour, minute, second))
-        elif event_type <= 90:
-            # Internal app tier traffic (WEB->APP->SQL 3-tier flow)
-            events.extend(asa_internal_app_traffic(base_date, day, hour, minute, second))
-        elif event_type <= 93:
-            # SSL handshakes
-            events.append(asa_ssl(base_date, day, hour, minute, second))
-        elif event_type <= 97:
-            # ICMP health checks (monitoring pings) — expanded from 96 to 97
-            events.append(asa_icmp_ping(base_date, day, hour, minute, second))
-        elif event_type <= 99:
-            # Admin commands — expanded from 99 to absorb HTTP inspect removal
-            events.append(asa_admin(base_date, day, hour, minute, second))
-        else:
-            # Internal ACL denies (policy violations)
-            events.append(asa_deny_internal(base_date, day, hour, minute, second))
+    # When web_suppression is active, fewer TCP sessions go inbound to the DMZ
+    events.extend(_tcp_rows(stamps, mix.pop("tcp", 0), 0.5 * (1.0 - web_suppression)))
+    for _ in range(mix.pop("deny_internal", 0)):
+        events.append(asa_deny_internal(base_date, day, hour, random.randint(0, 59), random.randint(0, 59)))
+    for kind, count in mix.items():
+        events.extend(_FAMILY_ROWS[kind](stamps, count))
 
     # Background scan noise (scaled with traffic - more traffic = more scans)
     # Real internet-facing firewalls see ~5% background noise from scanners/bots
     scan_count = max(2, event_count // 20)  # ~5% of traffic is scan attempts
-    for _ in range(random.randint(scan_count, scan_count * 2)):
-        events.append(asa_deny_external(base_date, day, hour, random.randint(0, 59), random.randint(0, 59)))
+    events.extend(_deny_external_rows(stamps, random.randint(scan_count, scan_count * 2)))
 
     # Rate limiting and threat detection (during business hours)
     # Internet-facing firewalls see regular rate limit triggers
@@ -1390,20 +1319,38 @@ _memleak_scenario = None
 _fw_misconfig_scenario = None
 _ransomware_scenario = None
 _ddos_attack_scenario = None
+_cert_expiry_scenario = None
+_cpu_runaway_scenario = None
 _time_utils = None
 
 
-def init_scenarios(config: Config, company: Company, time_utils: TimeUtils):
-    """Initialize scenario instances."""
+def init_scenarios(config: Config, company: Company, time_utils: TimeUtils, active_scenarios: List[str]):
+    """Initialize instances of the active scenarios (the others stay None and unimported)."""
     global _exfil_scenario, _memleak_scenario, _fw_misconfig_scenario, _ransomware_scenario, _cert_expiry_scenario, _ddos_attack_scenario, _cpu_runaway_scenario, _time_utils
     _time_utils = time_utils
-    _exfil_scenario = ExfilScenario(config, company, time_utils)
-    _memleak_scenario = MemoryLeakScenario(demo_id_enabled=config.demo_id_enabled)
-    _fw_misconfig_scenario = FirewallMisconfigScenario(demo_id_enabled=config.demo_id_enabled)
-    _ransomware_scenario = RansomwareAttemptScenario(demo_id_enabled=config.demo_id_enabled)
-    _cert_expiry_scenario = CertificateExpiryScenario(demo_id_enabled=config.demo_id_enabled)
-    _ddos_attack_scenario = DdosAttackScenario(demo_id_enabled=config.demo_id_enabled)
-    _cpu_runaway_scenario = CpuRunawayScenario(demo_id_enabled=config.demo_id_enabled)
+    _exfil_scenario = _memleak_scenario = _fw_misconfig_scenario = _ransomware_scenario = None
+    _cert_expiry_scenario = _ddos_attack_scenario = _cpu_runaway_scenario = None
+    if "exfil" in active_scenarios:
+        from scenarios.security.exfil import ExfilScenario
+        _exfil_scenario = ExfilScenario(config, company, time_utils)
+    if "memory_leak" in active_scenarios:
+        from scenarios.ops.memory_leak import MemoryLeakScenario
+        _memleak_scenario = MemoryLeakScenario(demo_id_enabled=config.demo_id_enabled)
+    if "firewall_misconfig" in active_scenarios:
+        from scenarios.network.firewall_misconfig import FirewallMisconfigScenario
+        _fw_misconfig_scenario = FirewallMisconfigScenario(demo_id_enabled=config.demo_id_enabled)
+    if "ransomware_attempt" in active_scenarios:
+        from scenarios.security.ransomware_attempt import RansomwareAttemptScenario
+        _ransomware_scenario = RansomwareAttemptScenario(demo_id_enabled=config.demo_id_enabled)
+    if "certificate_expiry" in active_scenarios:
+        from scenarios.network.certificate_expiry import CertificateExpiryScenario
+        _cert_expiry_scenario = CertificateExpiryScenario(demo_id_enabled=config.demo_id_enabled)
+    if "ddos_attack" in active_scenarios:
+        from scenarios.network.ddos_attack import DdosAttackScenario
+        _ddos_attack_scenario = DdosAttackScenario(demo_id_enabled=config.demo_id_enabled)
+    if "cpu_runaway" in active_scenarios:
+        from scenarios.ops.cpu_runaway import CpuRunawayScenario
+        _cpu_runaway_scenario = CpuRunawayScenario(demo_id_enabled=config.demo_id_enabled)
 
 
 # =============================================================================
@@ -1428,7 +1375,6 @@ def generate_asa_logs(
     config = Config(start_date=start_date, days=days, scale=scale, demo_id_enabled=True)
     company = Company()
     time_utils = TimeUtils(start_date)
-    init_scenarios(config, company, time_utils)
 
     # Determine output path
     if output_file:
@@ -1440,6 +1386,7 @@ def generate_asa_logs(
 
     # Parse scenarios
     active_scenarios = expand_scenarios(scenarios)
+    init_scenarios(config, company, time_utils, active_scenarios)
     include_exfil = "exfil" in active_scenarios
     include_memory_leak = "memory_leak" in active_scenarios
     include_fw_misconfig = "firewall_misconfig" in active_scenarios
@@ -1486,6 +1433,8 @@ def generate_asa_logs(
         all_events.extend(generate_day_events(start_date, day))
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("asa", day + 1, days, hour=hour, events=len(all_events))
             # Calculate events for this hour using natural variation
             hour_events = calc_natural_events(base_events_per_peak_hour, start_date, day, hour, "firewall")
 
@@ -1550,15 +1499,14 @@ def generate_asa_logs(
     if not quiet:
         print("  [ASA] Sorting...", file=sys.stderr, end="\r")
 
-    all_events.sort()
+    with telemetry.phase("sort"):
+        all_events.sort(key=event_sort_key)
 
     if not quiet:
         print("  [ASA] Sorting... done", file=sys.stderr)
 
     # Write output
-    with open(output_path, "w") as f:
-        for event in all_events:
-            f.write(event + "\n")
+    write_events(output_path, all_events)
 
     event_count = len(all_events)
 
@@ -19,7 +19,6 @@ Field validation fixes applied:
 """
 
 import argparse
-import json
 import random
 import sys
 import uuid
@@ -35,7 +34,11 @@ from shared.company import (
     USERS, USER_KEYS, get_random_user, Company,
     _AWS_USER_AGENT_PROFILES,
 )
+from shared.output_writer import write_events
+from shared.json_templates import JsonTemplate, Slot, Raw, FragmentCache, serialize
+from shared import telemetry
 from scenarios.registry import expand_scenarios
+from scenarios.events import merge
 
 # =============================================================================
 # AWS CONFIGURATION
@@ -132,6 +135,73 @@ def _pick_human_user() -> "User":
     return USERS[username]
 
 
+# CloudTrail envelope shared by every API call event. Per-type members
+# (requestParameters, responseElements, resources, errors, demo_id) are added
+# to the event afterwards and rendered after eventCategory.
+_CLOUDTRAIL_TEMPLATE = JsonTemplate({
+    "eventVersion": "1.08",
+    "userIdentity": Slot("userIdentity", Raw),
+    "eventTime": Slot("eventTime", str),
+    "eventSource": Slot("eventSource", str),
+    "eventName": Slot("eventName", str),
+    "awsRegion": AWS_REGION,
+    "sourceIPAddress": Slot("sourceIPAddress", str),
+    "userAgent": Slot("userAgent", str),
+    "requestID": Slot("requestID", str),
+    "eventID": Slot("eventID", str),
+    "eventType": "AwsApiCall",
+    "recipientAccountId": AWS_ACCOUNT_ID,
+    "readOnly": Slot("readOnly", bool),
+    "managementEvent": Slot("managementEvent", bool),
+    "eventCategory": Slot("eventCategory", str),
+})
+
+
+def _iam_user_identity(username: str) -> Dict[str, Any]:
+    user = USERS[username]
+    return {
+        "type": "IAMUser",
+        "principalId": user.aws_principal_id,
+        "arn": f"arn:aws:iam::{AWS_ACCOUNT_ID}:user/{user.username}",
+        "accountId": AWS_ACCOUNT_ID,
+        "accessKeyId": user.aws_access_key_id,
+        "userName": user.username,
+    }
+
+
+def _assumed_role_identity(key) -> Dict[str, Any]:
+    role_name, session_name, creation_date = key
+    role_arn = f"arn:aws:iam::{AWS_ACCOUNT_ID}:role/{role_name}"
+    assumed_role_arn = f"arn:aws:sts::{AWS_ACCOUNT_ID}:assumed-role/{role_name}/{session_name}"
+    # AssumedRole principalId format: AROA... : session-name
+    role_id = f"AROA{uuid.uuid5(uuid.NAMESPACE_DNS, role_name).hex[:16].upper()}"
+    return {
+        "type": "AssumedRole",
+        "principalId": f"{role_id}:{session_name}",
+        "arn": assumed_role_arn,
+        "accountId": AWS_ACCOUNT_ID,
+        "accessKeyId": f"ASIA{uuid.uuid5(uuid.NAMESPACE_DNS, f'sts:{role_name}').hex[:16].upper()}",
+        "sessionContext": {
+            "sessionIssuer": {
+                "type": "Role",
+                "principalId": role_id,
+                "arn": role_arn,
+                "accountId": AWS_ACCOUNT_ID,
+                "userName": role_name,
+            },
+            "attributes": {
+                "creationDate": creation_date,
+                "mfaAuthenticated": "false",
+            },
+        },
+    }
+
+
+# userIdentity is constant per user and per (role, session, hour)
+_IAM_USER_IDENTITY = FragmentCache(_iam_user_identity)
+_ASSUMED_ROLE_IDENTITY = FragmentCache(_assumed_role_identity)
+
+
 def aws_iam_user_event(base_date: str, day: int, hour: int, minute: int, second: int,
                        event_name: str, event_source: str, user,
                        event_category: str = "Management") -> Dict[str, Any]:
@@ -140,31 +210,19 @@ def aws_iam_user_event(base_date: str, day: int, hour: int, minute: int, second:
     Args:
         event_category: "Management" (default) or "Data" (for S3 object operations).
     """
-    is_data = event_category == "Data"
-    return {
-        "eventVersion": "1.08",
-        "userIdentity": {
-            "type": "IAMUser",
-            "principalId": user.aws_principal_id,
-            "arn": f"arn:aws:iam::{AWS_ACCOUNT_ID}:user/{user.username}",
-            "accountId": AWS_ACCOUNT_ID,
-            "accessKeyId": user.aws_access_key_id,
-            "userName": user.username,
-        },
-        "eventTime": ts_iso(base_date, day, hour, minute, second),
-        "eventSource": event_source,
-        "eventName": event_name,
-        "awsRegion": AWS_REGION,
-        "sourceIPAddress": user.ip_address,
-        "userAgent": user.aws_user_agent,
-        "requestID": str(uuid.uuid4()),
-        "eventID": str(uuid.uuid4()),
-        "eventType": "AwsApiCall",
-        "recipientAccountId": AWS_ACCOUNT_ID,
-        "readOnly": _is_read_only(event_name),
-        "managementEvent": not is_data,
-        "eventCategory": event_category,
-    }
+    return _CLOUDTRAIL_TEMPLATE.event(
+        userIdentity=_IAM_USER_IDENTITY(user.username),
+        eventTime=ts_iso(base_date, day, hour, minute, second),
+        eventSource=event_source,
+        eventName=event_name,
+        sourceIPAddress=user.ip_address,
+        userAgent=user.aws_user_agent,
+        requestID=str(uuid.uuid4()),
+        eventID=str(uuid.uuid4()),
+        readOnly=_is_read_only(event_name),
+        managementEvent=event_category != "Data",
+        eventCategory=event_category,
+    )
 
 
 def aws_assumed_role_event(base_date: str, day: int, hour: int, minute: int, second: int,
@@ -176,48 +234,20 @@ def aws_assumed_role_event(base_date: str, day: int, hour: int, minute: int, sec
     Args:
         event_category: "Management" (default) or "Data" (for S3 object operations).
     """
-    role_arn = f"arn:aws:iam::{AWS_ACCOUNT_ID}:role/{role_name}"
-    assumed_role_arn = f"arn:aws:sts::{AWS_ACCOUNT_ID}:assumed-role/{role_name}/{session_name}"
-    # AssumedRole principalId format: AROA... : session-name
-    role_id = f"AROA{uuid.uuid5(uuid.NAMESPACE_DNS, role_name).hex[:16].upper()}"
-    is_data = event_category == "Data"
-
-    return {
-        "eventVersion": "1.08",
-        "userIdentity": {
-            "type": "AssumedRole",
-            "principalId": f"{role_id}:{session_name}",
-            "arn": assumed_role_arn,
-            "accountId": AWS_ACCOUNT_ID,
-            "accessKeyId": f"ASIA{uuid.uuid5(uuid.NAMESPACE_DNS, f'sts:{role_name}').hex[:16].upper()}",
-            "sessionContext": {
-                "sessionIssuer": {
-                    "type": "Role",
-                    "principalId": role_id,
-                    "arn": role_arn,
-                    "accountId": AWS_ACCOUNT_ID,
-                    "userName": role_name,
-                },
-                "attributes": {
-                    "creationDate": ts_iso(base_date, day, hour, 0, 0),
-                    "mfaAuthenticated": "false",
-                },
-            },
-        },
-        "eventTime": ts_iso(base_date, day, hour, minute, second),
-        "eventSource": event_source,
-        "eventName": event_name,
-        "awsRegion": AWS_REGION,
-        "sourceIPAddress": f"{event_source}",  # Service-initiated calls show the service
-        "userAgent": f"{event_source}",
-        "requestID": str(uuid.uuid4()),
-        "eventID": str(uuid.uuid4()),
-        "eventType": "AwsApiCall",
-        "recipientAccountId": AWS_ACCOUNT_ID,
-        "readOnly": _is_read_only(event_name),
-        "managementEvent": not is_data,
-        "eventCategory": event_category,
-    }
+    creation_date = ts_iso(base_date, day, hour, 0, 0)
+    return _CLOUDTRAIL_TEMPLATE.event(
+        userIdentity=_ASSUMED_ROLE_IDENTITY((role_name, session_name, creation_date)),
+        eventTime=ts_iso(base_date, day, hour, minute, second),
+        eventSource=event_source,
+        eventName=event_name,
+        sourceIPAddress=event_source,  # Service-initiated calls show the service
+        userAgent=event_source,
+        requestID=str(uuid.uuid4()),
+        eventID=str(uuid.uuid4()),
+        readOnly=_is_read_only(event_name),
+        managementEvent=event_category != "Data",
+        eventCategory=event_category,
+    )
 
 
 def aws_s3_get_object(base_date: str, day: int, hour: int) -> Dict[str, Any]:
@@ -862,6 +892,7 @@ def generate_aws_logs(
         print("=" * 70, file=sys.stderr)
 
     all_events = []
+    scenario_events = []  # ScenarioEvent records, merged in on their sort keys
 
     for day in range(days):
         if progress_callback:
@@ -871,17 +902,15 @@ def generate_aws_logs(
             print(f"  [AWS] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})...", file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("aws", day + 1, days, hour=hour,
+                                  events=len(all_events) + len(scenario_events))
             hour_events = calc_natural_events(base_events_per_peak_hour, start_date, day, hour, "cloud")
             all_events.extend(generate_baseline_hour(start_date, day, hour, hour_events, active_scenarios))
 
             # Exfil scenario AWS events (from ExfilScenario class)
             if exfil_scenario:
-                exfil_events = exfil_scenario.aws_hour(day, hour)
-                for e in exfil_events:
-                    if isinstance(e, str):
-                        all_events.append(json.loads(e))
-                    else:
-                        all_events.append(e)
+                scenario_events.extend(exfil_scenario.aws_hour(day, hour))
 
             # Exfil: attacker fetches DB credentials from Secrets Manager (Day 9, hour 10)
             if "exfil" in active_scenarios and day == 8 and hour == 10:
@@ -910,12 +939,11 @@ def generate_aws_logs(
             print(f"  [AWS] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
 
     # Sort by eventTime
-    all_events.sort(key=lambda x: x["eventTime"])
+    with telemetry.phase("sort"):
+        all_events = merge(all_events, scenario_events, key=lambda x: x["eventTime"])
 
     # Write output
-    with open(output_path, "w") as f:
-        for event in all_events:
-            f.write(json.dumps(event) + "\n")
+    write_events(output_path, all_events, serialize=serialize, encoding="utf-8")
 
     if not quiet:
         # Count scenario events and errors
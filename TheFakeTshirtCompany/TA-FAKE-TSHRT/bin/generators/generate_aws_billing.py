@@ -29,6 +29,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.config import DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path
 from shared.time_utils import date_add
 from shared.company import AWS_ACCOUNT_ID, AWS_REGION
+from shared.output_writer import open_output
+from shared import telemetry
 from scenarios.registry import expand_scenarios
 
 # =============================================================================
@@ -327,7 +329,7 @@ def generate_aws_billing_logs(
             print(f"  [Billing] Day {day + 1}/{days} ({day_str})... done", file=sys.stderr)
 
     # Write CSV output
-    with open(output_path, "w", newline="") as f:
+    with telemetry.phase("write"), open_output(output_path, newline="", header=True) as f:
         writer = csv.DictWriter(f, fieldnames=CUR_COLUMNS, quoting=csv.QUOTE_ALL)
         writer.writeheader()
         writer.writerows(all_rows)
@@ -31,6 +31,8 @@ from shared.company import (
     AWS_ACCOUNT_ID, AWS_REGION, ORG_NAME_LOWER,
     USERS, THREAT_IP,
 )
+from shared.output_writer import write_events
+from shared import telemetry
 from scenarios.registry import expand_scenarios
 
 # =============================================================================
@@ -700,12 +702,11 @@ def generate_aws_guardduty_logs(
             print(f"  [GuardDuty] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
 
     # Sort by createdAt timestamp
-    all_findings.sort(key=lambda x: x["createdAt"])
+    with telemetry.phase("sort"):
+        all_findings.sort(key=lambda x: x["createdAt"])
 
     # Write output (NDJSON)
-    with open(output_path, "w") as f:
-        for finding in all_findings:
-            f.write(json.dumps(finding) + "\n")
+    write_events(output_path, all_findings, serialize=json.dumps)
 
     if not quiet:
         exfil_count = sum(1 for f in all_findings if f.get("demo_id") == "exfil")
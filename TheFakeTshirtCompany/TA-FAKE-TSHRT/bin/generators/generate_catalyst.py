@@ -45,6 +45,8 @@ from shared.company import (
     get_random_user,
     get_mac_for_ip,
 )
+from shared.output_writer import write_events
+from shared import telemetry
 from scenarios.registry import expand_scenarios, is_scenario_active_day
 
 # =============================================================================
@@ -625,6 +627,8 @@ def generate_catalyst_logs(
                   file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("catalyst", day + 1, days, hour=hour, events=len(all_events))
             # Natural volume variation (auth-like pattern: business hours)
             hour_count = calc_natural_events(
                 base_events_per_hour, start_date, day, hour, "auth"
@@ -704,13 +708,11 @@ def generate_catalyst_logs(
                 demo_id_count += len(fw_evts)
 
     # Sort by timestamp
-    all_events.sort()
+    with telemetry.phase("sort"):
+        all_events.sort()
 
     # Write to file (strip sort prefix)
-    with open(output_path, "w") as f:
-        for ev in all_events:
-            idx = ev.index("\t")
-            f.write(ev[idx + 1:] + "\n")
+    write_events(output_path, all_events, serialize=lambda ev: ev[ev.index("\t") + 1:])
 
     if not quiet:
         print(f"  [Catalyst] Complete! {len(all_events):,} events written",
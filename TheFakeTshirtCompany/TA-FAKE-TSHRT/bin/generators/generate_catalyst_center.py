@@ -16,10 +16,10 @@ Splunk Add-on for Cisco DNA Center (Splunkbase #7858).
 """
 
 import argparse
-import hashlib
 import json
 import random
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
@@ -32,6 +32,9 @@ from shared.time_utils import (
     date_add,
     is_weekend,
 )
+from shared.output_writer import write_events
+from shared.rng import KeyedRandom, derive_key, make_key
+from shared import telemetry
 from scenarios.registry import expand_scenarios, is_scenario_active_day
 
 # =============================================================================
@@ -158,11 +161,10 @@ def _jitter(value: float, pct: float = 5.0) -> float:
     return round(value + random.uniform(-delta, delta), 1)
 
 
-def _health_score_seed(start_date: str, day: int, hour: int,
-                       device_name: str) -> int:
-    """Deterministic seed for consistent health scores."""
-    seed_str = f"{start_date}-{day}-{hour}-{device_name}"
-    return int(hashlib.md5(seed_str.encode()).hexdigest()[:8], 16)
+@lru_cache(maxsize=1024)
+def _health_key(start_date: str, day: int, hour: int, device_name: str) -> int:
+    """Deterministic key for consistent health scores (per device/site and hour)."""
+    return make_key("dnac-health", start_date, day, hour, device_name)
 
 
 # =============================================================================
@@ -174,7 +176,7 @@ def _generate_device_health(start_date: str, day: int, hour: int,
                             health_override: dict = None,
                             demo_id: str = "") -> tuple:
     """Generate device health poll for one switch at one 5-min interval."""
-    rng = random.Random(_health_score_seed(start_date, day, hour, device["name"]) + minute)
+    rng = KeyedRandom.from_key(derive_key(_health_key(start_date, day, hour, device["name"]), minute))
 
     # Baseline healthy values
     cpu_util = rng.uniform(15, 35)
@@ -247,7 +249,7 @@ def _generate_network_health(start_date: str, day: int, hour: int,
                              demo_id: str = "") -> tuple:
     """Generate network health poll for one site at one 5-min interval."""
     site = SITES[site_code]
-    rng = random.Random(_health_score_seed(start_date, day, hour, site_code) + minute)
+    rng = KeyedRandom.from_key(derive_key(_health_key(start_date, day, hour, site_code), minute))
 
     total_count = site["devices"]
     good_count = total_count
@@ -333,7 +335,7 @@ def _generate_client_health(start_date: str, day: int, hour: int,
                             demo_id: str = "") -> tuple:
     """Generate client health snapshot for a site."""
     site = SITES[site_code]
-    rng = random.Random(_health_score_seed(start_date, day, hour, site_code) + 999)
+    rng = KeyedRandom.from_key(derive_key(_health_key(start_date, day, hour, site_code), "clients"))
 
     wired = site["wired_clients"]
     wireless = site["wireless_clients"]
@@ -650,6 +652,9 @@ def generate_catalyst_center_logs(
                   file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("catalyst_center", day + 1, days, hour=hour,
+                                  events=len(device_events) + len(network_events) + len(client_events) + len(issue_events))
             # ---- Device Health (5-min polls, 3 devices) ----
             for minute in poll_minutes:
                 for device in MANAGED_DEVICES:
@@ -733,16 +738,15 @@ def generate_catalyst_center_logs(
                 demo_id_count += len(cpu_issues)
 
     # Sort by timestamp key
-    device_events.sort(key=lambda x: x[0])
-    network_events.sort(key=lambda x: x[0])
-    client_events.sort(key=lambda x: x[0])
-    issue_events.sort(key=lambda x: x[0])
+    with telemetry.phase("sort"):
+        device_events.sort(key=lambda x: x[0])
+        network_events.sort(key=lambda x: x[0])
+        client_events.sort(key=lambda x: x[0])
+        issue_events.sort(key=lambda x: x[0])
 
     # Write files
     def _write_json(path: Path, events: List[tuple]):
-        with open(path, "w") as f:
-            for _, ev in events:
-                f.write(json.dumps(ev) + "\n")
+        write_events(path, events, serialize=lambda item: json.dumps(item[1]))
 
     _write_json(device_path, device_events)
     _write_json(network_path, network_events)
@@ -30,6 +30,9 @@ from shared.company import (
     get_random_user, get_us_ip, get_world_ip, Company,
     get_user_groups, get_user_app_licenses, get_user_roles,
 )
+from shared.output_writer import write_events
+from shared.json_templates import JsonTemplate, Slot, serialize
+from shared import telemetry
 from scenarios.registry import expand_scenarios
 
 # =============================================================================
@@ -266,6 +269,93 @@ def get_mfa_details() -> Dict[str, Any]:
 # SIGN-IN EVENT GENERATORS
 # =============================================================================
 
+# Interactive sign-in (signin_success). Slots shared between the envelope and
+# properties (time/createdDateTime, correlationId/id, ...) reuse one name.
+_SIGNIN_SUCCESS_TEMPLATE = JsonTemplate({
+    "time": Slot("time", str),
+    "resourceId": f"/tenants/{TENANT_ID}/providers/Microsoft.aadiam",
+    "operationName": "Sign-in activity",
+    "category": "SignInLogs",
+    "tenantId": TENANT_ID,
+    "resultType": "0",
+    "callerIpAddress": Slot("callerIpAddress", str),
+    "correlationId": Slot("correlationId", str),
+    "identity": Slot("identity", str),
+    "Level": 4,
+    "location": Slot("location", str),
+    "properties": {
+        "id": Slot("correlationId", str),
+        "createdDateTime": Slot("time", str),
+        "userDisplayName": Slot("identity", str),
+        "userPrincipalName": Slot("userPrincipalName", str),
+        "userId": Slot("userId", str),
+        "appId": Slot("appId", str),
+        "appDisplayName": Slot("appDisplayName", str),
+        "ipAddress": Slot("callerIpAddress", str),
+        "clientAppUsed": Slot("clientAppUsed", str),
+        "conditionalAccessStatus": "success",
+        "isInteractive": True,
+        "authenticationRequirement": Slot("authenticationRequirement", str),
+        "tokenIssuerType": "AzureAD",
+        "riskLevelAggregated": "none",
+        "riskLevelDuringSignIn": "none",
+        "riskState": "none",
+        "riskDetail": "none",
+        "status": {"errorCode": 0},
+        "deviceDetail": Slot("deviceDetail"),
+        "location": {
+            "city": Slot("city", str),
+            "countryOrRegion": Slot("location", str),
+        },
+        "mfaDetail": Slot("mfaDetail"),
+        "authenticationDetails": Slot("authenticationDetails"),
+    },
+})
+
+# Service principal (non-interactive) sign-in (signin_service_principal)
+_SIGNIN_SP_TEMPLATE = JsonTemplate({
+    "time": Slot("time", str),
+    "resourceId": f"/tenants/{TENANT_ID}/providers/Microsoft.aadiam",
+    "operationName": "Sign-in activity",
+    "category": "ServicePrincipalSignInLogs",
+    "tenantId": TENANT_ID,
+    "resultType": Slot("resultType", str),
+    "callerIpAddress": Slot("callerIpAddress", str),
+    "correlationId": Slot("correlationId", str),
+    "identity": Slot("identity", str),
+    "Level": 4,
+    "location": "US",
+    "properties": {
+        "id": Slot("correlationId", str),
+        "createdDateTime": Slot("time", str),
+        "appId": Slot("appId", str),
+        "appDisplayName": Slot("identity", str),
+        "servicePrincipalId": Slot("servicePrincipalId", str),
+        "servicePrincipalName": Slot("identity", str),
+        "ipAddress": Slot("callerIpAddress", str),
+        "resourceDisplayName": Slot("resourceDisplayName", str),
+        "resourceId": Slot("resourceId", str),
+        "isInteractive": False,
+        "tokenIssuerType": "AzureAD",
+        "riskState": "none",
+        "status": {
+            "errorCode": Slot("errorCode", int),
+            "failureReason": Slot("failureReason"),
+        },
+        "location": {
+            "city": "Internal",
+            "countryOrRegion": "US",
+        },
+        "authenticationDetails": [
+            {
+                "authenticationMethod": Slot("authenticationMethod", str),
+                "succeeded": Slot("succeeded", bool),
+            }
+        ],
+    },
+})
+
+
 def signin_success(base_date: str, day: int, hour: int, minute: int = None, second: int = None,
                    active_scenarios: list = None) -> Dict[str, Any]:
     """Generate successful sign-in event with MFA details."""
@@ -294,46 +384,23 @@ def signin_success(base_date: str, day: int, hour: int, minute: int = None, seco
     if client["browser"]:
         device_detail["browser"] = client["browser"]
 
-    event = {
-        "time": ts,
-        "resourceId": f"/tenants/{TENANT_ID}/providers/Microsoft.aadiam",
-        "operationName": "Sign-in activity",
-        "category": "SignInLogs",
-        "tenantId": TENANT_ID,
-        "resultType": "0",
-        "callerIpAddress": ip,
-        "correlationId": cid,
-        "identity": user.display_name,
-        "Level": 4,
-        "location": user.country,
-        "properties": {
-            "id": cid,
-            "createdDateTime": ts,
-            "userDisplayName": user.display_name,
-            "userPrincipalName": user.email,
-            "userId": user.entra_object_id,
-            "appId": app_id,
-            "appDisplayName": app_name,
-            "ipAddress": ip,
-            "clientAppUsed": client["clientAppUsed"],
-            "conditionalAccessStatus": "success",
-            "isInteractive": True,
-            "authenticationRequirement": "multiFactorAuthentication" if random.random() < 0.70 else "singleFactorAuthentication",
-            "tokenIssuerType": "AzureAD",
-            "riskLevelAggregated": "none",
-            "riskLevelDuringSignIn": "none",
-            "riskState": "none",
-            "riskDetail": "none",
-            "status": {"errorCode": 0},
-            "deviceDetail": device_detail,
-            "location": {
-                "city": user.city,
-                "countryOrRegion": user.country
-            },
-            "mfaDetail": mfa["mfaDetail"],
-            "authenticationDetails": mfa["authenticationDetails"]
-        }
-    }
+    event = _SIGNIN_SUCCESS_TEMPLATE.event(
+        time=ts,
+        callerIpAddress=ip,
+        correlationId=cid,
+        identity=user.display_name,
+        location=user.country,
+        userPrincipalName=user.email,
+        userId=user.entra_object_id,
+        appId=app_id,
+        appDisplayName=app_name,
+        clientAppUsed=client["clientAppUsed"],
+        authenticationRequirement="multiFactorAuthentication" if random.random() < 0.70 else "singleFactorAuthentication",
+        deviceDetail=device_detail,
+        city=user.city,
+        mfaDetail=mfa["mfaDetail"],
+        authenticationDetails=mfa["authenticationDetails"],
+    )
 
     # Add demo_id for exfil scenario users
     if active_scenarios and should_tag_signin_exfil(user.username, day, active_scenarios):
@@ -755,47 +822,21 @@ def signin_service_principal(base_date: str, day: int, hour: int,
     else:
         error_code, error_msg = SP_ERRORS_BY_AUTH_METHOD[sp["authMethod"]]
 
-    event = {
-        "time": ts,
-        "resourceId": f"/tenants/{TENANT_ID}/providers/Microsoft.aadiam",
-        "operationName": "Sign-in activity",
-        "category": "ServicePrincipalSignInLogs",
-        "tenantId": TENANT_ID,
-        "resultType": str(error_code),
-        "callerIpAddress": sp["ipAddress"],
-        "correlationId": cid,
-        "identity": sp["appDisplayName"],
-        "Level": 4,
-        "location": "US",
-        "properties": {
-            "id": cid,
-            "createdDateTime": ts,
-            "appId": sp["appId"],
-            "appDisplayName": sp["appDisplayName"],
-            "servicePrincipalId": sp["servicePrincipalId"],
-            "servicePrincipalName": sp["appDisplayName"],
-            "ipAddress": sp["ipAddress"],
-            "resourceDisplayName": sp["resourceDisplayName"],
-            "resourceId": sp["resourceId"],
-            "isInteractive": False,
-            "tokenIssuerType": "AzureAD",
-            "riskState": "none",
-            "status": {
-                "errorCode": error_code,
-                "failureReason": error_msg if not success else None
-            },
-            "location": {
-                "city": "Internal",
-                "countryOrRegion": "US"
-            },
-            "authenticationDetails": [
-                {
-                    "authenticationMethod": sp["authMethod"],
-                    "succeeded": success,
-                }
-            ]
-        }
-    }
+    event = _SIGNIN_SP_TEMPLATE.event(
+        time=ts,
+        resultType=str(error_code),
+        callerIpAddress=sp["ipAddress"],
+        correlationId=cid,
+        identity=sp["appDisplayName"],
+        appId=sp["appId"],
+        servicePrincipalId=sp["servicePrincipalId"],
+        resourceDisplayName=sp["resourceDisplayName"],
+        resourceId=sp["resourceId"],
+        errorCode=error_code,
+        failureReason=error_msg if not success else None,
+        authenticationMethod=sp["authMethod"],
+        succeeded=success,
+    )
 
     if not success:
         event["resultDescription"] = error_msg
@@ -1855,6 +1896,9 @@ def generate_entraid_logs(
 
         # Sign-in events
         for hour in range(24):
+            if progress_callback:
+                progress_callback("entraid", day + 1, days, hour=hour,
+                                  events=len(signin_events) + len(audit_events) + len(risk_events))
             hour_events = calc_natural_events(signin_base, start_date, day, hour, "auth")
             signin_events.extend(generate_signin_hour(start_date, day, hour, hour_events, active_scenarios, total_days=days))
 
@@ -1889,31 +1933,15 @@ def generate_entraid_logs(
             print(f"  [Entra] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
 
     # Sort events by time (events are dicts; scenario hooks may inject strings)
-    signin_events.sort(key=_sort_key)
-    audit_events.sort(key=_sort_key)
-    risk_events.sort(key=_sort_key)
+    with telemetry.phase("sort"):
+        signin_events.sort(key=_sort_key)
+        audit_events.sort(key=_sort_key)
+        risk_events.sort(key=_sort_key)
 
     # Write output — serialize dicts to JSON at write time
-    with open(signin_path, "w") as f:
-        for event in signin_events:
-            if isinstance(event, dict):
-                f.write(json.dumps(event) + "\n")
-            else:
-                f.write(event + "\n")
-
-    with open(audit_path, "w") as f:
-        for event in audit_events:
-            if isinstance(event, dict):
-                f.write(json.dumps(event) + "\n")
-            else:
-                f.write(event + "\n")
-
-    with open(risk_path, "w") as f:
-        for event in risk_events:
-            if isinstance(event, dict):
-                f.write(json.dumps(event) + "\n")
-            else:
-                f.write(event + "\n")
+    write_events(signin_path, signin_events, serialize=serialize, encoding="utf-8")
+    write_events(audit_path, audit_events, serialize=serialize, encoding="utf-8")
+    write_events(risk_path, risk_events, serialize=serialize, encoding="utf-8")
 
     total = len(signin_events) + len(audit_events) + len(risk_events)
     file_counts = {
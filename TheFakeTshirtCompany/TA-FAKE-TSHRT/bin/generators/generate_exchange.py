@@ -42,8 +42,12 @@ from shared.company import (
     get_internal_ip, LOCATIONS,
 )
 from shared.meeting_schedule import (
-    ScheduledMeeting, _meeting_schedule, get_meetings_for_room, get_all_rooms
+    ScheduledMeeting, _meeting_schedule, get_meetings_for_room, get_all_rooms,
+    CALENDAR_INVITE_AND_RESPONSE, CALENDAR_RESPONSE,
+    calendar_emails_planned, get_calendar_emails_for_day, plan_calendar_emails,
 )
+from shared.output_writer import OrderedWriter
+from shared.rng import KeyedRandom
 from scenarios.security import ExfilScenario, RansomwareAttemptScenario, PhishingTestScenario
 from scenarios.registry import expand_scenarios
 
@@ -580,60 +584,44 @@ def calendar_response(base_date: str, day: int, hour: int) -> Dict[str, Any]:
 def generate_meeting_emails_for_day(base_date: str, day: int) -> List[Dict[str, Any]]:
     """Generate calendar invite and response emails based on Webex meeting schedule.
 
-    For each meeting in the schedule:
-    - Generate invite email from organizer to each participant (same day or day before)
-    - Generate response emails from participants (same day, AFTER invite)
+    Reads the day's bucket from the calendar email plan (see
+    plan_calendar_emails() in shared/meeting_schedule.py), which fixes each
+    meeting's invite and response days once per run:
+    - Invite email from organizer to each participant (meeting day or day before)
+    - Same-day invites: response from each participant right AFTER the invite
+    - Day-before invites: responses on the meeting day
     - Ghost meetings: invites sent but no responses (people didn't show up)
-
-    Note: For simplicity, invites are sent on meeting day or day before (realistic for
-    internal/ad-hoc meetings). Response emails are generated on meeting day.
     """
     events = []
 
-    # Iterate through all meetings in the schedule
-    for room_key, meetings in _meeting_schedule.items():
-        for meeting in meetings:
-            # Skip walk-in meetings (no calendar invite)
-            if meeting.is_walkin or meeting.is_after_hours:
+    for kind, meeting in get_calendar_emails_for_day(day):
+        for participant_email in meeting.participants:
+            if not participant_email or participant_email == meeting.organizer_email:
+                continue
+
+            if kind == CALENDAR_RESPONSE:
+                # Invite went out the day before (no timing constraint)
+                response = generate_meeting_response_event(
+                    base_date, day, meeting, participant_email
+                )
+                if response:
+                    events.append(response)
                 continue
 
-            # Calculate meeting day
-            meeting_day = (meeting.start_time - date_add(base_date, 0)).days
-
-            # Invites sent on meeting day or day before (0 or 1 day before)
-            invite_day_offset = random.choice([0, 0, 0, 1])  # 75% same day, 25% day before
-            invite_day = meeting_day - invite_day_offset
-            same_day = (invite_day == meeting_day)
-
-            # Only generate if invite_day matches current day and meeting has organizer
-            if invite_day == day and meeting.organizer_email and meeting.participants:
-                # Generate invites to all participants (excluding organizer)
-                for participant_email in meeting.participants:
-                    if participant_email and participant_email != meeting.organizer_email:
-                        invite = generate_meeting_invite_event(
-                            base_date, day, meeting, participant_email
-                        )
-                        if invite:
-                            events.append(invite)
-
-                            # Same-day invite+response: generate response AFTER invite
-                            if same_day and not meeting.is_ghost:
-                                response = generate_meeting_response_event(
-                                    base_date, day, meeting, participant_email,
-                                    after_ts=invite["Received"],
-                                )
-                                if response:
-                                    events.append(response)
-
-            # Responses for day-before invites (no timing constraint — different day)
-            if not same_day and meeting_day == day and not meeting.is_ghost and meeting.participants:
-                for participant_email in meeting.participants:
-                    if participant_email and participant_email != meeting.organizer_email:
-                        response = generate_meeting_response_event(
-                            base_date, day, meeting, participant_email
-                        )
-                        if response:
-                            events.append(response)
+            invite = generate_meeting_invite_event(
+                base_date, day, meeting, participant_email
+            )
+            if invite:
+                events.append(invite)
+
+                # Same-day invite+response: generate response AFTER invite
+                if kind == CALENDAR_INVITE_AND_RESPONSE:
+                    response = generate_meeting_response_event(
+                        base_date, day, meeting, participant_email,
+                        after_ts=invite["Received"],
+                    )
+                    if response:
+                        events.append(response)
 
     return events
 
@@ -733,6 +721,11 @@ def generate_meeting_response_event(base_date: str, day: int,
     }
 
 
+def _received(event: Dict[str, Any]) -> str:
+    """Sort key: the message's Received timestamp."""
+    return event.get("Received", "")
+
+
 def generate_baseline_hour(base_date: str, day: int, hour: int, event_count: int,
                            ooo_users: set = None) -> List[Dict[str, Any]]:
     """Generate baseline events for one hour.
@@ -852,8 +845,16 @@ def generate_exchange_logs(
         print(f"  Output: {output_path}", file=sys.stderr)
         print("=" * 70, file=sys.stderr)
 
-    all_events = []
-    scenario_events_json = []  # Scenario events come as JSON strings from exfil
+    # Events stream out in Received order as the days are generated: meeting
+    # emails and day-level scenario events are buffered until their hour is
+    # released, and a writer thread serializes and writes behind generation.
+    writer = OrderedWriter(output_path, key=_received, serialize=json.dumps)
+    generated = 0
+
+    # Calendar emails are planned once per schedule (build_meeting_schedule
+    # does it); plan here if the schedule was built some other way
+    if _meeting_schedule and not calendar_emails_planned(start_date):
+        plan_calendar_emails(start_date)
 
     # Initialize OOO users (~4% of employees per day, refreshed daily)
     all_usernames = [u.username for u in USERS.values()]
@@ -872,54 +873,46 @@ def generate_exchange_logs(
         # Generate meeting-related emails from Webex schedule (if schedule populated)
         if _meeting_schedule:
             meeting_emails = generate_meeting_emails_for_day(start_date, day)
-            all_events.extend(meeting_emails)
+            writer.add(meeting_emails)
+            generated += len(meeting_emails)
 
         # Generate day-level scenario events
+        scenario_events = []  # ScenarioEvent records
         if include_exfil and exfil_scenario:
-            scenario_events_json.extend(exfil_scenario.exchange_day(day))
+            scenario_events.extend(exfil_scenario.exchange_day(day))
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("exchange", day + 1, days, hour=hour, events=generated)
             hour_events = calc_natural_events(base_events_per_peak_hour, start_date, day, hour, "email")
             # Add per-hour variation to prevent flat overnight counts
-            hour_rng = random.Random(hash(f"exchange-hour:{start_date}:{day}:{hour}"))
-            hour_noise = hour_rng.uniform(0.80, 1.20)  # ±20% per-hour variation
+            hour_noise = KeyedRandom("exchange-hour", start_date, day, hour).uniform(0.80, 1.20)  # ±20% per-hour variation
             hour_events = max(1, int(hour_events * hour_noise))
-            all_events.extend(generate_baseline_hour(start_date, day, hour, hour_events, ooo_users))
+            hour_batch = generate_baseline_hour(start_date, day, hour, hour_events, ooo_users)
 
             # Generate hour-level scenario events
             if include_exfil and exfil_scenario:
-                scenario_events_json.extend(exfil_scenario.exchange_hour(day, hour))
+                scenario_events.extend(exfil_scenario.exchange_hour(day, hour))
 
             # Ransomware scenario - phishing email
             if include_ransomware and ransomware_scenario:
-                ransomware_events = ransomware_scenario.exchange_hour(day, hour, time_utils)
-                for event in ransomware_events:
-                    scenario_events_json.append(json.dumps(event))
+                scenario_events.extend(ransomware_scenario.exchange_hour(day, hour, time_utils))
 
             # Phishing test scenario - simulation emails and training emails
             if include_phishing_test and phishing_test_scenario:
-                pt_events = phishing_test_scenario.exchange_hour(day, hour, time_utils)
-                for event in pt_events:
-                    scenario_events_json.append(json.dumps(event))
+                scenario_events.extend(phishing_test_scenario.exchange_hour(day, hour, time_utils))
+
+            # Scenario events after the baseline, ordered on their precomputed keys
+            writer.add(hour_batch)
+            writer.add_keyed(scenario_events)
+            generated += len(hour_batch) + len(scenario_events)
+            scenario_events = []
+            writer.release(f"{date_add(start_date, day):%Y-%m-%d}T{hour:02d}")
 
         if not quiet:
             print(f"  [Exchange] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
 
-    # Parse scenario events (JSON strings) into dicts for unified sorting
-    scenario_events_parsed = []
-    for event_json in scenario_events_json:
-        scenario_events_parsed.append(json.loads(event_json))
-
-    # Merge baseline and scenario events, then sort by timestamp
-    all_events.extend(scenario_events_parsed)
-    all_events.sort(key=lambda x: x.get("Received", ""))
-
-    # Write all output to single JSON file
-    with open(output_path, "w") as f:
-        for event in all_events:
-            f.write(json.dumps(event) + "\n")
-
-    total_events = len(all_events)
+    total_events = writer.close()
 
     if not quiet:
         print(f"  [Exchange] Complete! {total_events:,} events written", file=sys.stderr)
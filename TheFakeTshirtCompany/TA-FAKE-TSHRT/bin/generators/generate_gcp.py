@@ -11,7 +11,6 @@ Scenarios: exfil (Days 7-13), cpu_runaway (Days 11-12)
 """
 
 import argparse
-import json
 import random
 import sys
 import uuid
@@ -25,7 +24,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.config import DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path, Config
 from shared.time_utils import ts_gcp, date_add, calc_natural_events, TimeUtils
 from shared.company import GCP_PROJECT, GCP_REGION, ORG_NAME_LOWER, get_internal_ip, USERS, get_random_user, Company, TENANT
+from shared.output_writer import AsyncWriter
+from shared.json_templates import JsonTemplate, Slot, Raw, FragmentCache, serialize
+from shared import telemetry
 from scenarios.registry import expand_scenarios
+from scenarios.events import merge
 
 # Log types
 LOG_TYPE_ADMIN_ACTIVITY = "activity"
@@ -155,9 +158,8 @@ def _gcp_maybe_inject_error(event: Dict[str, Any], method_name: str) -> Dict[str
     if not applicable:
         return event
 
-    error_code, error_msg = random.choice(applicable)
-    event["protoPayload"]["status"] = {"code": error_code, "message": error_msg}
-    event["protoPayload"]["authorizationInfo"][0]["granted"] = False
+    event["status"] = _GCP_STATUS(random.choice(applicable))
+    event["granted"] = False
     event["severity"] = "ERROR"
     return event
 
@@ -166,6 +168,59 @@ def _gcp_maybe_inject_error(event: Dict[str, Any], method_name: str) -> Dict[str
 # EVENT GENERATORS
 # =============================================================================
 
+def _gcp_audit_shape(payload_keys=()) -> Dict[str, Any]:
+    """AuditLog entry shape; payload_keys are extra protoPayload members (after status)."""
+    proto_payload = {
+        "@type": "type.googleapis.com/google.cloud.audit.AuditLog",
+        "serviceName": Slot("serviceName", str),
+        "methodName": Slot("methodName", str),
+        "authenticationInfo": {"principalEmail": Slot("principalEmail", str)},
+        "authorizationInfo": [
+            {
+                "permission": Slot("permission", str),
+                "resource": f"projects/{GCP_PROJECT}",
+                "granted": Slot("granted", bool),
+            }
+        ],
+        "requestMetadata": {
+            "callerIp": Slot("callerIp", str),
+            "callerSuppliedUserAgent": Slot("callerSuppliedUserAgent", str),
+        },
+        "resourceName": Slot("resourceName", str),
+        "status": Slot("status", Raw),
+    }
+    for key in payload_keys:
+        proto_payload[key] = Slot(key)
+    return {
+        "protoPayload": proto_payload,
+        "insertId": Slot("insertId", str),
+        "resource": {
+            "type": Slot("resourceType", str),
+            "labels": Slot("labels"),
+        },
+        "timestamp": Slot("timestamp", str),
+        "receiveTimestamp": Slot("receiveTimestamp", str),
+        "severity": Slot("severity", str),
+        "logName": Slot("logName", str),
+    }
+
+
+# Keyed by the extra protoPayload members (serviceData, request)
+_GCP_AUDIT_TEMPLATES = {(): JsonTemplate(_gcp_audit_shape())}
+
+# Rendered protoPayload.status objects, keyed by (code, message)
+_GCP_STATUS = FragmentCache(lambda status: {"code": status[0], "message": status[1]})
+
+
+def _with_payload(event, **payload):
+    """Re-home a base event on the template with extra protoPayload members."""
+    keys = tuple(payload)
+    template = _GCP_AUDIT_TEMPLATES.get(keys)
+    if template is None:
+        template = _GCP_AUDIT_TEMPLATES[keys] = JsonTemplate(_gcp_audit_shape(keys))
+    return template.event(**event, **payload)
+
+
 def gcp_base_event(base_date: str, day: int, hour: int, minute: int, second: int,
                    method_name: str, service_name: str, principal: str,
                    log_type: str = LOG_TYPE_ADMIN_ACTIVITY,
@@ -173,6 +228,9 @@ def gcp_base_event(base_date: str, day: int, hour: int, minute: int, second: int
                    caller_ip: str = None) -> Dict[str, Any]:
     """Create base GCP audit log structure.
 
+    Returns a templated event keyed by slot name (resourceName, labels,
+    status, callerIp, ...); add protoPayload members with _with_payload().
+
     Args:
         log_type: Either LOG_TYPE_ADMIN_ACTIVITY or LOG_TYPE_DATA_ACCESS
         resource_type: GCP resource type (gce_instance, gcs_bucket, cloud_function, bigquery_dataset)
@@ -228,36 +286,24 @@ def gcp_base_event(base_date: str, day: int, hour: int, minute: int, second: int
     else:
         resource_labels = {"project_id": GCP_PROJECT, "zone": zone}
 
-    return {
-        "protoPayload": {
-            "@type": "type.googleapis.com/google.cloud.audit.AuditLog",
-            "serviceName": service_name,
-            "methodName": method_name,
-            "authenticationInfo": {"principalEmail": principal},
-            "authorizationInfo": [
-                {
-                    "permission": permission,
-                    "resource": f"projects/{GCP_PROJECT}",
-                    "granted": True,
-                }
-            ],
-            "requestMetadata": {
-                "callerIp": caller_ip,
-                "callerSuppliedUserAgent": user_agent,
-            },
-            "resourceName": f"projects/{GCP_PROJECT}",
-            "status": {"code": 0, "message": ""},
-        },
-        "insertId": uuid.uuid4().hex[:16],
-        "resource": {
-            "type": resource_type,
-            "labels": resource_labels,
-        },
-        "timestamp": ts,
-        "receiveTimestamp": receive_ts,
-        "severity": default_severity,
-        "logName": f"projects/{GCP_PROJECT}/logs/cloudaudit.googleapis.com%2F{log_type}",
-    }
+    return _GCP_AUDIT_TEMPLATES[()].event(
+        serviceName=service_name,
+        methodName=method_name,
+        principalEmail=principal,
+        permission=permission,
+        granted=True,
+        callerIp=caller_ip,
+        callerSuppliedUserAgent=user_agent,
+        resourceName=f"projects/{GCP_PROJECT}",
+        status=_GCP_STATUS((0, "")),
+        insertId=uuid.uuid4().hex[:16],
+        resourceType=resource_type,
+        labels=resource_labels,
+        timestamp=ts,
+        receiveTimestamp=receive_ts,
+        severity=default_severity,
+        logName=f"projects/{GCP_PROJECT}/logs/cloudaudit.googleapis.com%2F{log_type}",
+    )
 
 
 def gcp_compute_list(base_date: str, day: int, hour: int) -> Dict[str, Any]:
@@ -297,8 +343,8 @@ def gcp_storage_get(base_date: str, day: int, hour: int, active_scenarios: list
     event = gcp_base_event(base_date, day, hour, minute, second,
                            "storage.objects.get", "storage.googleapis.com", principal,
                            log_type=log_type, resource_type="gcs_bucket", caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = f"projects/_/buckets/{bucket}/objects/data_{random.randint(1000, 9999)}.json"
-    event["resource"]["labels"]["bucket_name"] = bucket
+    event["resourceName"] = f"projects/_/buckets/{bucket}/objects/data_{random.randint(1000, 9999)}.json"
+    event["labels"]["bucket_name"] = bucket
 
     return _gcp_maybe_inject_error(event, "storage.objects.get")
 
@@ -318,8 +364,8 @@ def gcp_storage_create(base_date: str, day: int, hour: int, active_scenarios: li
     event = gcp_base_event(base_date, day, hour, minute, second,
                            "storage.objects.create", "storage.googleapis.com", principal,
                            resource_type="gcs_bucket", caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = f"projects/_/buckets/{bucket}/objects/upload_{random.randint(1000, 9999)}.csv"
-    event["resource"]["labels"]["bucket_name"] = bucket
+    event["resourceName"] = f"projects/_/buckets/{bucket}/objects/upload_{random.randint(1000, 9999)}.csv"
+    event["labels"]["bucket_name"] = bucket
 
     return _gcp_maybe_inject_error(event, "storage.objects.create")
 
@@ -340,7 +386,7 @@ def gcp_function_call(base_date: str, day: int, hour: int) -> Dict[str, Any]:
                            "google.cloud.functions.v1.CloudFunctionsService.CallFunction",
                            "cloudfunctions.googleapis.com", principal,
                            resource_type="cloud_function", caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = f"projects/{GCP_PROJECT}/locations/{GCP_REGION}/functions/{func}"
+    event["resourceName"] = f"projects/{GCP_PROJECT}/locations/{GCP_REGION}/functions/{func}"
     return _gcp_maybe_inject_error(event, "google.cloud.functions.v1.CloudFunctionsService.CallFunction")
 
 
@@ -361,7 +407,7 @@ def gcp_compute_start_stop(base_date: str, day: int, hour: int) -> Dict[str, Any
     event = gcp_base_event(base_date, day, hour, minute, second,
                            method, "compute.googleapis.com", principal,
                            resource_type="gce_instance", caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = f"projects/{GCP_PROJECT}/zones/{GCP_REGION}-a/instances/{instance}"
+    event["resourceName"] = f"projects/{GCP_PROJECT}/zones/{GCP_REGION}-a/instances/{instance}"
     return _gcp_maybe_inject_error(event, f"v1.compute.instances.{action}")
 
 
@@ -381,8 +427,8 @@ def gcp_iam_sa_key_create(base_date: str, day: int, hour: int) -> Dict[str, Any]
                            "google.iam.admin.v1.CreateServiceAccountKey",
                            "iam.googleapis.com", principal,
                            resource_type="service_account", caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = f"projects/{GCP_PROJECT}/serviceAccounts/{target_sa}"
-    event["resource"]["labels"]["email_id"] = target_sa
+    event["resourceName"] = f"projects/{GCP_PROJECT}/serviceAccounts/{target_sa}"
+    event["labels"]["email_id"] = target_sa
     return _gcp_maybe_inject_error(event, "iam.serviceAccounts.keys.create")
 
 
@@ -400,13 +446,13 @@ def gcp_bigquery_query(base_date: str, day: int, hour: int) -> Dict[str, Any]:
     event = gcp_base_event(base_date, day, hour, minute, second,
                            "jobservice.jobcompleted", "bigquery.googleapis.com", principal,
                            resource_type="bigquery_dataset", caller_ip=caller_ip)
-    event["protoPayload"]["serviceData"] = {
+    event = _with_payload(event, serviceData={
         "jobCompletedEvent": {
             "job": {
                 "jobStatistics": {"totalBilledBytes": str(random.randint(1000000, 100000000))},
             }
         }
-    }
+    })
     return _gcp_maybe_inject_error(event, "jobservice.jobcompleted")
 
 
@@ -430,11 +476,11 @@ def gcp_logging_write(base_date: str, day: int, hour: int) -> Dict[str, Any]:
                            "google.logging.v2.LoggingServiceV2.WriteLogEntries",
                            "logging.googleapis.com", principal,
                            resource_type="project", caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = log_name
-    event["protoPayload"]["request"] = {
+    event["resourceName"] = log_name
+    event = _with_payload(event, request={
         "logName": log_name,
         "entries": [{}] * random.randint(1, 10),
-    }
+    })
     return _gcp_maybe_inject_error(event, "google.logging.v2.LoggingServiceV2.WriteLogEntries")
 
 
@@ -454,8 +500,8 @@ def gcp_logging_list(base_date: str, day: int, hour: int) -> Dict[str, Any]:
                            "logging.googleapis.com", principal,
                            log_type=LOG_TYPE_DATA_ACCESS, resource_type="project",
                            caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = f"projects/{GCP_PROJECT}"
-    event["protoPayload"]["request"] = {
+    event["resourceName"] = f"projects/{GCP_PROJECT}"
+    event = _with_payload(event, request={
         "resourceNames": [f"projects/{GCP_PROJECT}"],
         "filter": random.choice([
             "severity>=ERROR",
@@ -464,7 +510,7 @@ def gcp_logging_list(base_date: str, day: int, hour: int) -> Dict[str, Any]:
             "timestamp>=\"2026-01-01T00:00:00Z\"",
         ]),
         "pageSize": random.choice([100, 500, 1000]),
-    }
+    })
     return _gcp_maybe_inject_error(event, "google.logging.v2.LoggingServiceV2.ListLogEntries")
 
 
@@ -484,10 +530,10 @@ def gcp_storage_delete(base_date: str, day: int, hour: int,
     event = gcp_base_event(base_date, day, hour, minute, second,
                            "storage.objects.delete", "storage.googleapis.com", principal,
                            resource_type="gcs_bucket", caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = (
+    event["resourceName"] = (
         f"projects/_/buckets/{bucket}/objects/archive_{random.randint(1000, 9999)}.json"
     )
-    event["resource"]["labels"]["bucket_name"] = bucket
+    event["labels"]["bucket_name"] = bucket
 
     return _gcp_maybe_inject_error(event, "storage.objects.delete")
 
@@ -507,8 +553,8 @@ def gcp_storage_bucket_get(base_date: str, day: int, hour: int) -> Dict[str, Any
     event = gcp_base_event(base_date, day, hour, minute, second,
                            "storage.buckets.get", "storage.googleapis.com", principal,
                            resource_type="gcs_bucket", caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = f"projects/_/buckets/{bucket}"
-    event["resource"]["labels"]["bucket_name"] = bucket
+    event["resourceName"] = f"projects/_/buckets/{bucket}"
+    event["labels"]["bucket_name"] = bucket
     return _gcp_maybe_inject_error(event, "storage.buckets.get")
 
 
@@ -530,7 +576,7 @@ def gcp_bigquery_tabledata_list(base_date: str, day: int, hour: int) -> Dict[str
                            "bigquery.googleapis.com", principal,
                            log_type=LOG_TYPE_DATA_ACCESS, resource_type="bigquery_dataset",
                            caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = (
+    event["resourceName"] = (
         f"projects/{GCP_PROJECT}/datasets/{dataset}/tables/{table}"
     )
     return _gcp_maybe_inject_error(event, "google.cloud.bigquery.v2.TableDataService.List")
@@ -552,9 +598,9 @@ def gcp_iam_set_policy(base_date: str, day: int, hour: int) -> Dict[str, Any]:
                            "google.iam.admin.v1.SetIamPolicy",
                            "iam.googleapis.com", principal,
                            resource_type="service_account", caller_ip=caller_ip)
-    event["protoPayload"]["resourceName"] = f"projects/{GCP_PROJECT}/serviceAccounts/{target_sa}"
-    event["resource"]["labels"]["email_id"] = target_sa
-    event["protoPayload"]["request"] = {
+    event["resourceName"] = f"projects/{GCP_PROJECT}/serviceAccounts/{target_sa}"
+    event["labels"]["email_id"] = target_sa
+    event = _with_payload(event, request={
         "policy": {
             "bindings": [{
                 "role": random.choice([
@@ -566,7 +612,7 @@ def gcp_iam_set_policy(base_date: str, day: int, hour: int) -> Dict[str, Any]:
                 "members": [f"serviceAccount:{target_sa}"],
             }],
         },
-    }
+    })
     return _gcp_maybe_inject_error(event, "google.iam.admin.v1.SetIamPolicy")
 
 
@@ -590,12 +636,12 @@ def gcp_logging_list_exfil(base_date: str, day: int, hour: int) -> Dict[str, Any
                            "logging.googleapis.com", mal_sa,
                            log_type=LOG_TYPE_DATA_ACCESS, resource_type="project",
                            caller_ip="185.220.101.42")
-    event["protoPayload"]["resourceName"] = f"projects/{GCP_PROJECT}"
-    event["protoPayload"]["request"] = {
+    event["resourceName"] = f"projects/{GCP_PROJECT}"
+    event = _with_payload(event, request={
         "resourceNames": [f"projects/{GCP_PROJECT}"],
         "filter": 'protoPayload.methodName="google.iam.admin.v1.CreateServiceAccountKey"',
         "pageSize": 100,
-    }
+    })
     event["demo_id"] = "exfil"
     return event
 
@@ -615,10 +661,10 @@ def gcp_bigquery_export_exfil(base_date: str, day: int, hour: int) -> Dict[str,
                            "google.cloud.bigquery.v2.TableDataService.List",
                            "bigquery.googleapis.com", mal_sa,
                            log_type=LOG_TYPE_DATA_ACCESS, resource_type="bigquery_dataset")
-    event["protoPayload"]["resourceName"] = (
+    event["resourceName"] = (
         f"projects/{GCP_PROJECT}/datasets/warehouse/tables/customer_database"
     )
-    event["protoPayload"]["requestMetadata"]["callerIp"] = "185.220.101.42"
+    event["callerIp"] = "185.220.101.42"
     event["demo_id"] = "exfil"
     return event
 
@@ -643,10 +689,10 @@ def gcp_storage_delete_exfil(base_date: str, day: int, hour: int) -> Dict[str, A
     event = gcp_base_event(base_date, day, hour, minute, second,
                            "storage.objects.delete", "storage.googleapis.com", mal_sa,
                            resource_type="gcs_bucket")
-    event["protoPayload"]["resourceName"] = (
+    event["resourceName"] = (
         f"projects/_/buckets/{ORG_NAME_LOWER}-exports/objects/{staging_file}"
     )
-    event["protoPayload"]["requestMetadata"]["callerIp"] = "185.220.101.42"
+    event["callerIp"] = "185.220.101.42"
     event["demo_id"] = "exfil"
     return event
 
@@ -666,14 +712,12 @@ def gcp_bigquery_error_cpu_runaway(base_date: str, day: int, hour: int) -> Dict[
     event = gcp_base_event(base_date, day, hour, minute, second,
                            "jobservice.jobcompleted", "bigquery.googleapis.com", principal,
                            resource_type="bigquery_dataset")
-    event["protoPayload"]["resourceName"] = (
+    event["resourceName"] = (
         f"projects/{GCP_PROJECT}/datasets/warehouse/tables/{table}"
     )
-    event["protoPayload"]["status"] = {
-        "code": 8,
-        "message": "RESOURCE_EXHAUSTED: Data source connection failed - upstream database unavailable",
-    }
-    event["protoPayload"]["serviceData"] = {
+    event["status"] = _GCP_STATUS(
+        (8, "RESOURCE_EXHAUSTED: Data source connection failed - upstream database unavailable"))
+    event = _with_payload(event, serviceData={
         "jobCompletedEvent": {
             "job": {
                 "jobStatus": {"state": "DONE", "errorResult": {
@@ -683,7 +727,7 @@ def gcp_bigquery_error_cpu_runaway(base_date: str, day: int, hour: int) -> Dict[
                 "jobStatistics": {"totalBilledBytes": "0"},
             }
         }
-    }
+    })
     event["severity"] = "ERROR"
     event["demo_id"] = "cpu_runaway"
     return event
@@ -756,7 +800,7 @@ def generate_baseline_hour(base_date: str, day: int, hour: int, event_count: int
                                    "v1.compute.instances.get", "compute.googleapis.com", principal,
                                    log_type=LOG_TYPE_DATA_ACCESS, resource_type="gce_instance",
                                    caller_ip=_caller_ip)
-            event["protoPayload"]["resourceName"] = f"projects/{GCP_PROJECT}/zones/{GCP_REGION}-a/instances/{instance}"
+            event["resourceName"] = f"projects/{GCP_PROJECT}/zones/{GCP_REGION}-a/instances/{instance}"
             events.append(_gcp_maybe_inject_error(event, "v1.compute.instances.get"))
         elif r <= 97:
             events.append(gcp_logging_write(base_date, day, hour))
@@ -819,7 +863,13 @@ def generate_gcp_logs(
         print(f"  Output: {output_path}", file=sys.stderr)
         print("=" * 70, file=sys.stderr)
 
-    all_events = []
+    # Each hour is sorted and handed to a writer thread, which serializes and
+    # writes it while the next hour is generated. Events never leave their hour.
+    out = AsyncWriter(output_path, serialize=serialize, encoding="utf-8")
+    total = 0
+    stats = {"admin": 0, "data_access": 0, "errors": 0}
+    methods = Counter()
+    scenario_counts = Counter()
 
     for day in range(days):
         if progress_callback:
@@ -829,74 +879,64 @@ def generate_gcp_logs(
             print(f"  [GCP] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})...", file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("gcp", day + 1, days, hour=hour, events=total)
+            batch = []
             # Baseline events
             hour_events = calc_natural_events(base_events_per_peak_hour, start_date, day, hour, "cloud")
-            all_events.extend(generate_baseline_hour(start_date, day, hour, hour_events, active_scenarios))
+            batch.extend(generate_baseline_hour(start_date, day, hour, hour_events, active_scenarios))
 
             # Exfil scenario events from ExfilScenario (SA key creation, storage exfil)
-            if exfil_scenario:
-                exfil_events = exfil_scenario.gcp_hour(day, hour)
-                for e in exfil_events:
-                    if isinstance(e, str):
-                        event = json.loads(e)
-                        # Remove None demo_id if present
-                        if event.get("demo_id") is None:
-                            event.pop("demo_id", None)
-                        all_events.append(event)
-                    else:
-                        all_events.append(e)
+            scenario_events = exfil_scenario.gcp_hour(day, hour) if exfil_scenario else []
 
             # ----- Scenario hooks (beyond ExfilScenario) -----
 
             # Exfil: attacker checks audit logs for detection (Day 10, 22:00)
             if "exfil" in active_scenarios and day == 9 and hour == 22:
-                all_events.append(gcp_logging_list_exfil(start_date, day, hour))
+                batch.append(gcp_logging_list_exfil(start_date, day, hour))
 
             # Exfil: BigQuery data export - second exfil channel (Day 12, 03:00)
             if "exfil" in active_scenarios and day == 11 and hour == 3:
-                all_events.append(gcp_bigquery_export_exfil(start_date, day, hour))
+                batch.append(gcp_bigquery_export_exfil(start_date, day, hour))
 
             # Exfil: attacker deletes staging files to cover tracks (Day 13, 05:00)
             if "exfil" in active_scenarios and day == 12 and hour == 5:
                 for _ in range(random.randint(2, 4)):
-                    all_events.append(gcp_storage_delete_exfil(start_date, day, hour))
+                    batch.append(gcp_storage_delete_exfil(start_date, day, hour))
 
             # CPU runaway: BigQuery pipeline errors (Days 11-12, business hours)
             if "cpu_runaway" in active_scenarios and 10 <= day <= 11 and hour in (9, 10, 11):
-                all_events.append(gcp_bigquery_error_cpu_runaway(start_date, day, hour))
+                batch.append(gcp_bigquery_error_cpu_runaway(start_date, day, hour))
+
+            with telemetry.phase("sort"):
+                batch = merge(batch, scenario_events, key=lambda x: x["timestamp"])
+            if not quiet:
+                for e in batch:
+                    log_name = e.get("logName", "")
+                    stats["admin"] += "activity" in log_name
+                    stats["data_access"] += "data_access" in log_name
+                    stats["errors"] += e.get("severity") == "ERROR"
+                    methods[e.get("methodName") or e.get("protoPayload", {}).get("methodName", "unknown")] += 1
+                    if e.get("demo_id"):
+                        scenario_counts[e["demo_id"]] += 1
+            out.put(batch)
+            total += len(batch)
 
         if not quiet:
             print(f"  [GCP] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
 
-    # Sort by timestamp
-    all_events.sort(key=lambda x: x["timestamp"])
-
-    # Write output
-    with open(output_path, "w") as f:
-        for event in all_events:
-            f.write(json.dumps(event) + "\n")
+    out.close()
 
     if not quiet:
-        # Count by log type
-        admin_count = sum(1 for e in all_events if "activity" in e.get("logName", ""))
-        data_access_count = sum(1 for e in all_events if "data_access" in e.get("logName", ""))
-        error_count = sum(1 for e in all_events if e.get("severity") == "ERROR")
-
-        # Count unique method names
-        methods = Counter(e.get("protoPayload", {}).get("methodName", "unknown") for e in all_events)
-
-        # Count scenario events
-        scenario_counts = Counter(e.get("demo_id") for e in all_events if e.get("demo_id"))
-
-        print(f"  [GCP] Complete! {len(all_events):,} events written", file=sys.stderr)
-        print(f"        admin_activity: {admin_count:,} | data_access: {data_access_count:,}", file=sys.stderr)
-        print(f"        errors: {error_count:,} ({error_count * 100 // max(len(all_events), 1)}%)"
+        print(f"  [GCP] Complete! {total:,} events written", file=sys.stderr)
+        print(f"        admin_activity: {stats['admin']:,} | data_access: {stats['data_access']:,}", file=sys.stderr)
+        print(f"        errors: {stats['errors']:,} ({stats['errors'] * 100 // max(total, 1)}%)"
               f" | methods: {len(methods)}", file=sys.stderr)
         if scenario_counts:
             scenario_str = ", ".join(f"{k}: {v}" for k, v in sorted(scenario_counts.items()))
             print(f"        scenarios: {scenario_str}", file=sys.stderr)
 
-    return len(all_events)
+    return total
 
 
 def main():
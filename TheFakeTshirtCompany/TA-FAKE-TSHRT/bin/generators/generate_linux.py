@@ -20,6 +20,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.config import Config, DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path
 from shared.time_utils import TimeUtils, ts_linux, date_add, get_hour_activity_level, is_weekend, calc_natural_events
 from shared.company import Company, LINUX_SERVERS, SERVERS, USERS, USER_KEYS, get_random_user
+from shared.output_writer import write_events
 from scenarios.security import ExfilScenario
 from scenarios.ops import MemoryLeakScenario
 from scenarios.ops.disk_filling import DiskFillingScenario
@@ -600,6 +601,9 @@ def generate_linux_logs(
             print(f"  [Linux] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})...", file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("linux", day + 1, days, hour=hour,
+                                  events=sum(map(len, all_metrics.values())) + len(auth_events))
             hour_mult = get_hour_multiplier(hour, is_wknd)
 
             # Generate at 5-minute intervals
@@ -631,18 +635,14 @@ def generate_linux_logs(
     file_counts = {}
     for metric_type, lines in all_metrics.items():
         output_path = out_dir / f"{metric_type}.log"
-        with open(output_path, "w") as f:
-            for line in lines:
-                f.write(line + "\n")
+        write_events(output_path, lines)
         rel_path = f"linux/{metric_type}.log"
         file_counts[rel_path] = len(lines)
         total_events += len(lines)
 
     # Write auth.log
     auth_path = out_dir / "auth.log"
-    with open(auth_path, "w") as f:
-        for line in auth_events:
-            f.write(line + "\n")
+    write_events(auth_path, auth_events)
     auth_count = len(auth_events)
     file_counts["linux/auth.log"] = auth_count
     total_events += auth_count
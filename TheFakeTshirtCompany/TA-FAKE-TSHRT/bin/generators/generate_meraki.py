@@ -23,9 +23,15 @@ Event types:
 import argparse
 import hashlib
 import json
+import multiprocessing
+import os
+import queue
 import random
+import shutil
 import sys
+import tempfile
 import time as time_module
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime, timedelta
@@ -48,12 +54,18 @@ from shared.meeting_schedule import (
     # Walk-in and after-hours
     should_generate_walkin, generate_walkin_meeting, get_walkins_for_hour,
     should_generate_after_hours, generate_after_hours_activity,
-    clear_walkin_schedule,
+    clear_walkin_schedule, schedule_snapshot, restore_schedule,
 )
 from scenarios.registry import expand_scenarios
 from scenarios.security import RansomwareAttemptScenario
 from scenarios.network.ddos_attack import DdosAttackScenario
 from shared.time_utils import TimeUtils
+from shared.output_writer import OrderedWriter, merge_parts, write_events
+from shared.json_templates import JsonTemplate, Slot, serialize, set_backend
+from shared.json_templates import backend as json_backend
+from shared.rng import make_key, threshold, words
+from shared import profiling
+from shared import telemetry
 
 # =============================================================================
 # MERAKI ORGANIZATION CONSTANTS
@@ -189,7 +201,7 @@ MERAKI_MS_DEVICES = {
 }
 
 # Port state tracking for change-based reporting (F6 realism audit)
-_ms_port_states = {}  # {(switch_name, port_number): last_status}
+_ms_port_states = {}  # {switch_name: connected-port bit mask (bit p-1 = port p)}
 
 
 def clear_ms_port_states():
@@ -780,6 +792,47 @@ def get_meeting_room_cameras() -> Dict[str, dict]:
 # MX FIREWALL / SD-WAN EVENTS (Dashboard API JSON)
 # =============================================================================
 
+# Templates for the highest-volume event shapes. Client enrichment, demo_id
+# and organizationId/networkName (_enrich_event) are added as extra keys.
+_MX_FIREWALL_TEMPLATE = JsonTemplate({
+    "occurredAt": Slot("occurredAt", str),
+    "networkId": Slot("networkId", str),
+    "type": "firewall",
+    "description": Slot("description", str),
+    "category": "appliance",
+    "deviceSerial": Slot("deviceSerial", str),
+    "deviceName": Slot("deviceName", str),
+    "clientMac": Slot("clientMac", str),
+    "eventData": {
+        "src": Slot("src", str),
+        "dst": Slot("dst", str),
+        "mac": Slot("clientMac", str),
+        "protocol": Slot("protocol", str),
+        "sport": Slot("sport", str),
+        "dport": Slot("dport", str),
+        "pattern": Slot("pattern", str),
+    },
+})
+
+_MX_URL_TEMPLATE = JsonTemplate({
+    "occurredAt": Slot("occurredAt", str),
+    "networkId": Slot("networkId", str),
+    "type": "url",
+    "description": Slot("description", str),
+    "category": "appliance",
+    "deviceSerial": Slot("deviceSerial", str),
+    "deviceName": Slot("deviceName", str),
+    "clientMac": Slot("clientMac", str),
+    "eventData": {
+        "src": Slot("src", str),
+        "dst": Slot("dst", str),
+        "method": Slot("method", str),
+        "url": Slot("url", str),
+        "agent": Slot("agent", str),
+    },
+})
+
+
 def mx_firewall_event(ts: str, device: str, src: str, dst: str,
                       protocol: str, sport: int, dport: int,
                       action: str = "allow", mac: str = None,
@@ -793,25 +846,20 @@ def mx_firewall_event(ts: str, device: str, src: str, dst: str,
     if pattern is None:
         pattern = "allow all" if action == "allow" else "1 all"
 
-    event = {
-        "occurredAt": ts,
-        "networkId": network_id,
-        "type": "firewall",
-        "description": f"Firewall {'allow' if action == 'allow' else 'deny'} {protocol} src={src} dst={dst}",
-        "category": "appliance",
-        "deviceSerial": _get_serial(device),
-        "deviceName": device,
-        "clientMac": mac,
-        "eventData": {
-            "src": src,
-            "dst": dst,
-            "mac": mac,
-            "protocol": protocol,
-            "sport": str(sport),
-            "dport": str(dport),
-            "pattern": pattern
-        }
-    }
+    event = _MX_FIREWALL_TEMPLATE.event(
+        occurredAt=ts,
+        networkId=network_id,
+        description=f"Firewall {'allow' if action == 'allow' else 'deny'} {protocol} src={src} dst={dst}",
+        deviceSerial=_get_serial(device),
+        deviceName=device,
+        clientMac=mac,
+        src=src,
+        dst=dst,
+        protocol=protocol,
+        sport=str(sport),
+        dport=str(dport),
+        pattern=pattern,
+    )
     # Resolve client IP from src (format "ip" or "ip:port")
     client_ip = src.split(":")[0] if ":" in src else src
     _enrich_client_event(event, client_mac=mac, client_ip=client_ip)
@@ -830,23 +878,19 @@ def mx_url_event(ts: str, device: str, src_ip: str, src_port: int,
     loc = location or MERAKI_MX_DEVICES.get(device, {}).get("location", "BOS")
     network_id = NETWORK_IDS.get(loc, "N_FakeTShirtCo_BOS")
 
-    event = {
-        "occurredAt": ts,
-        "networkId": network_id,
-        "type": "url",
-        "description": f"URL request: {method} {url}",
-        "category": "appliance",
-        "deviceSerial": _get_serial(device),
-        "deviceName": device,
-        "clientMac": mac,
-        "eventData": {
-            "src": f"{src_ip}:{src_port}",
-            "dst": f"{dst_ip}:{dst_port}",
-            "method": method,
-            "url": url,
-            "agent": agent
-        }
-    }
+    event = _MX_URL_TEMPLATE.event(
+        occurredAt=ts,
+        networkId=network_id,
+        description=f"URL request: {method} {url}",
+        deviceSerial=_get_serial(device),
+        deviceName=device,
+        clientMac=mac,
+        src=f"{src_ip}:{src_port}",
+        dst=f"{dst_ip}:{dst_port}",
+        method=method,
+        url=url,
+        agent=agent,
+    )
     _enrich_client_event(event, client_mac=mac, client_ip=src_ip)
     if demo_id:
         event["demo_id"] = demo_id
@@ -1398,6 +1442,43 @@ def device_availability_change(ts: str, device_name: str, device_serial: str,
 # MR ACCESS POINT EVENTS (Dashboard API JSON)
 # =============================================================================
 
+_MR_ASSOCIATION_TEMPLATE = JsonTemplate({
+    "occurredAt": Slot("occurredAt", str),
+    "networkId": Slot("networkId", str),
+    "type": "association",
+    "description": "802.11 association",
+    "category": "wireless",
+    "clientMac": Slot("clientMac", str),
+    "deviceSerial": Slot("deviceSerial", str),
+    "deviceName": Slot("deviceName", str),
+    "ssidNumber": Slot("ssidNumber", int),
+    "eventData": {
+        "radio": Slot("radio", str),
+        "vap": Slot("vap", str),
+        "channel": Slot("channel", str),
+        "rssi": Slot("rssi", str),
+        "aid": Slot("aid", str),
+    },
+})
+
+_MR_DISASSOCIATION_TEMPLATE = JsonTemplate({
+    "occurredAt": Slot("occurredAt", str),
+    "networkId": Slot("networkId", str),
+    "type": "disassociation",
+    "description": "802.11 disassociation",
+    "category": "wireless",
+    "clientMac": Slot("clientMac", str),
+    "deviceSerial": Slot("deviceSerial", str),
+    "deviceName": Slot("deviceName", str),
+    "eventData": {
+        "radio": Slot("radio", str),
+        "vap": Slot("vap", str),
+        "reason": Slot("reason", str),
+        "duration": Slot("duration", str),
+    },
+})
+
+
 def mr_association_event(ts: str, device: str, client_mac: str,
                          ssid: str, channel: int, rssi: int,
                          radio: int = 1, vap: int = 0, aid: int = None,
@@ -1409,24 +1490,19 @@ def mr_association_event(ts: str, device: str, client_mac: str,
     loc = location or MERAKI_MR_DEVICES.get(device, {}).get("location", "BOS")
     network_id = NETWORK_IDS.get(loc, "N_FakeTShirtCo_BOS")
 
-    event = {
-        "occurredAt": ts,
-        "networkId": network_id,
-        "type": "association",
-        "description": "802.11 association",
-        "category": "wireless",
-        "clientMac": client_mac,
-        "deviceSerial": _get_serial(device),
-        "deviceName": device,
-        "ssidNumber": vap,
-        "eventData": {
-            "radio": str(radio),
-            "vap": str(vap),
-            "channel": str(channel),
-            "rssi": str(rssi),
-            "aid": str(aid)
-        }
-    }
+    event = _MR_ASSOCIATION_TEMPLATE.event(
+        occurredAt=ts,
+        networkId=network_id,
+        clientMac=client_mac,
+        deviceSerial=_get_serial(device),
+        deviceName=device,
+        ssidNumber=vap,
+        radio=str(radio),
+        vap=str(vap),
+        channel=str(channel),
+        rssi=str(rssi),
+        aid=str(aid),
+    )
     if client_ip:
         event["clientIp"] = client_ip
     _enrich_client_event(event, client_mac=client_mac, client_ip=client_ip)
@@ -1444,22 +1520,17 @@ def mr_disassociation_event(ts: str, device: str, client_mac: str,
     loc = location or MERAKI_MR_DEVICES.get(device, {}).get("location", "BOS")
     network_id = NETWORK_IDS.get(loc, "N_FakeTShirtCo_BOS")
 
-    event = {
-        "occurredAt": ts,
-        "networkId": network_id,
-        "type": "disassociation",
-        "description": "802.11 disassociation",
-        "category": "wireless",
-        "clientMac": client_mac,
-        "deviceSerial": _get_serial(device),
-        "deviceName": device,
-        "eventData": {
-            "radio": str(radio),
-            "vap": str(vap),
-            "reason": str(reason),
-            "duration": f"{duration:.2f}"
-        }
-    }
+    event = _MR_DISASSOCIATION_TEMPLATE.event(
+        occurredAt=ts,
+        networkId=network_id,
+        clientMac=client_mac,
+        deviceSerial=_get_serial(device),
+        deviceName=device,
+        radio=str(radio),
+        vap=str(vap),
+        reason=str(reason),
+        duration=f"{duration:.2f}",
+    )
     if client_ip:
         event["clientIp"] = client_ip
     _enrich_client_event(event, client_mac=client_mac, client_ip=client_ip)
@@ -2992,14 +3063,95 @@ def generate_ms_baseline_hour(base_date: str, day: int, hour: int,
     return events
 
 
+# Share of access ports connected during / outside business hours
+_MS_CONNECTED_SHARE_BUSINESS = 0.70
+_MS_CONNECTED_SHARE_AFTER_HOURS = 0.30
+_MS_TRANSITION_SAMPLE_RATE = 0.15
+_MS_ACCESS_SPEEDS = ["100 Mbps", "1 Gbps"]
+
+
+def _ms_switch_layout(switch: str) -> Tuple[int, int, str]:
+    """(num_ports, uplink mask, uplink speed) for a switch. Bit p-1 = port p."""
+    switch_info = MERAKI_MS_DEVICES.get(switch, {})
+    num_ports = switch_info.get("ports", 48)
+    role = switch_info.get("role", "access")
+    uplink_mask = 0b1111 & ((1 << num_ports) - 1) if role in ("core", "dc_core") else 0
+    return num_ports, uplink_mask, "10 Gbps" if role == "dc_core" else "1 Gbps"
+
+
+def _ms_draw_ports(port_key: int, num_ports: int, uplink_mask: int,
+                   connected_share: float) -> Tuple[int, List]:
+    """Draw port states for a switch as a connected-port bit mask.
+
+    Port idx uses word idx of port_key's stream for its status and word
+    num_ports+idx for its speed, drawn for all ports at once.
+
+    Returns:
+        (connected mask, speed per port index)
+    """
+    status_words = words(port_key, num_ports)
+    speed_words = words(port_key, num_ports, num_ports)
+    limit = threshold(connected_share)
+    connected = uplink_mask
+    speeds = [None] * num_ports
+    for idx, word in enumerate(status_words):
+        if word < limit and not uplink_mask >> idx & 1:
+            connected |= 1 << idx
+            speeds[idx] = _MS_ACCESS_SPEEDS[speed_words[idx] >> 63]
+    return connected, speeds
+
+
+def _ms_draw_transition_ports(port_key: int, num_ports: int, uplink_mask: int,
+                              connected_share: float, prev_mask: int = None) -> Tuple[int, List, int]:
+    """Draw one transition-hour interval of port states for a switch.
+
+    Every interval of the hour reads port_key's stream from the start, one
+    word at a time: a status word per non-uplink port, a speed word when
+    connected and, when prev_mask is given, a resample word for each port
+    whose state did not change. Ports keep the previous interval's state up
+    to the first port whose draws differ, and the stream shifts from there
+    on, so port states churn within the hour as people arrive and leave.
+
+    Returns:
+        (connected mask, speed per port index, resampled-unchanged mask)
+    """
+    stream = words(port_key, 3 * num_ports)
+    limit = threshold(connected_share)
+    sample_limit = threshold(_MS_TRANSITION_SAMPLE_RATE)
+    connected = uplink_mask
+    sampled = 0
+    speeds = [None] * num_ports
+    counter = 0
+    for idx in range(num_ports):
+        bit = 1 << idx
+        if uplink_mask & bit:
+            continue
+        is_connected = stream[counter] < limit
+        counter += 1
+        if is_connected:
+            connected |= bit
+            speeds[idx] = _MS_ACCESS_SPEEDS[stream[counter] >> 63]
+            counter += 1
+        if prev_mask is not None and bool(prev_mask & bit) == is_connected:
+            if stream[counter] < sample_limit:
+                sampled |= bit
+            counter += 1
+    return connected, speeds, sampled
+
+
 def generate_ms_port_health(base_date: str, day: int, hour: int,
                             location: str, interval: int = 5) -> List[dict]:
     """Generate periodic MS switch port health metrics for one hour at a location.
 
     Uses change-based reporting: only emits events when port status changes,
     plus a full baseline snapshot at the first interval of each day. Uplinks
-    are always reported. Transitional hours (8-9, 17-18) have a higher sample
-    rate to capture employee arrival/departure patterns.
+    are always reported. Transitional hours (8-9, 17-18) draw port states
+    per interval and have a higher sample rate to capture employee
+    arrival/departure patterns.
+
+    Port state is kept per switch as a connected-port bit mask, so changed
+    ports are one XOR against the previous interval and only those ports
+    (plus uplinks and samples) are rendered as events.
 
     Output goes to a separate file with sourcetype cisco:meraki:switch:health.
     Based on Meraki Dashboard API: getDeviceSwitchPortsStatuses
@@ -3013,65 +3165,70 @@ def generate_ms_port_health(base_date: str, day: int, hour: int,
     if not switches:
         return events
 
+    is_transition = hour in (8, 9, 17, 18)
+    # Time-based activity factor: ~70% of access ports connected during
+    # business hours, ~30% after hours
+    connected_share = (_MS_CONNECTED_SHARE_BUSINESS if 8 <= hour <= 18
+                       else _MS_CONNECTED_SHARE_AFTER_HOURS)
+
+    # Keyed per switch+day+hour — outside transition hours ports stay stable
+    # within the hour and only change at hour boundaries, so each switch's
+    # port states are drawn once for the hour. Transition hours draw them
+    # every interval (see _ms_draw_transition_ports).
+    layouts = {}
+    hour_draws = {}
+    port_keys = {}
+    for switch in switches:
+        num_ports, uplink_mask, _ = layouts[switch] = _ms_switch_layout(switch)
+        port_keys[switch] = make_key("ms_port_state", switch, base_date, day, hour)
+        if not is_transition:
+            hour_draws[switch] = _ms_draw_ports(port_keys[switch], num_ports, uplink_mask, connected_share)
+
     # Generate health reports at specified interval per switch
     for minute in range(0, 60, interval):
         is_first_of_day = (hour == 0 and minute == 0)
-        is_transition = hour in (8, 9, 17, 18)
 
         for switch in switches:
             switch_info = MERAKI_MS_DEVICES.get(switch, {})
-            num_ports = switch_info.get("ports", 48)
+            num_ports, uplink_mask, uplink_speed = layouts[switch]
             loc = switch_info.get("location", "BOS")
             network_id = NETWORK_IDS.get(loc, "N_FakeTShirtCo_BOS")
             role = switch_info.get("role", "access")
 
-            # Deterministic seed per switch+day+hour — ports stay stable within
-            # the same hour and only change at hour boundaries (realistic behavior)
-            port_rng = random.Random(hash(f"port_state:{switch}:{base_date}:{day}:{hour}"))
-
             # Add small random offset within the 5-minute window
             actual_minute = minute + random.randint(0, 2)
             second = random.randint(0, 59)
             ts = ts_meraki(base_date, day, hour, actual_minute if actual_minute < 60 else 59, second)
 
-            # Time-based activity factor
-            is_business_hours = 8 <= hour <= 18
-
-            # Generate status for each port
-            for port in range(1, num_ports + 1):
-                # Determine port characteristics based on port number and switch role
-                is_uplink = port <= 4 and role in ["core", "dc_core"]
-
-                # Port status - deterministic per interval using port_rng
-                if is_uplink:
-                    # Uplinks are always connected
-                    status = "Connected"
-                    speed = "10 Gbps" if role == "dc_core" else "1 Gbps"
-                elif is_business_hours:
-                    # ~70% of access ports connected during business hours
-                    status = port_rng.choices(["Connected", "Disconnected"], weights=[70, 30])[0]
-                    speed = port_rng.choice(["100 Mbps", "1 Gbps"]) if status == "Connected" else None
-                else:
-                    # ~30% connected after hours
-                    status = port_rng.choices(["Connected", "Disconnected"], weights=[30, 70])[0]
-                    speed = port_rng.choice(["100 Mbps", "1 Gbps"]) if status == "Connected" else None
-
-                # Change-based reporting: only emit when status changes or at daily baseline
-                state_key = (switch, port)
-                prev_status = _ms_port_states.get(state_key)
-
-                should_emit = (
-                    is_first_of_day
-                    or prev_status is None
-                    or status != prev_status
-                    or is_uplink
-                    or (is_transition and port_rng.random() < 0.15)
-                )
+            # Port status for all ports as bit vectors (bit p-1 = port p)
+            prev_mask = _ms_port_states.get(switch)
+            if is_transition:
+                connected, speeds, sampled = _ms_draw_transition_ports(
+                    port_keys[switch], num_ports, uplink_mask, connected_share,
+                    None if is_first_of_day else prev_mask)
+            else:
+                connected, speeds = hour_draws[switch]
+                sampled = 0
+            _ms_port_states[switch] = connected
+
+            # Change-based reporting: changed ports, uplinks and transition-hour
+            # samples; every port at the daily baseline or when state is unknown
+            if is_first_of_day or prev_mask is None:
+                emit = (1 << num_ports) - 1
+            else:
+                emit = (connected ^ prev_mask) | uplink_mask | sampled
 
-                _ms_port_states[state_key] = status
+            serial = _get_serial(switch)
+            model = switch_info.get("model", "MS225-48")
+            floor = switch_info.get("floor", 1)
 
-                if not should_emit:
-                    continue
+            while emit:
+                low = emit & -emit
+                emit ^= low
+                idx = low.bit_length() - 1
+                port = idx + 1
+                is_uplink = bool(uplink_mask & low)
+                status = "Connected" if connected & low else "Disconnected"
 
                 # Build port status event
                 event = {
@@ -3080,10 +3237,10 @@ def generate_ms_port_health(base_date: str, day: int, hour: int,
                     "type": "port_status_health",
                     "description": f"Port {port} status: {status}",
                     "category": "switch",
-                    "deviceSerial": _get_serial(switch),
+                    "deviceSerial": serial,
                     "deviceName": switch,
-                    "deviceModel": switch_info.get("model", "MS225-48"),
-                    "floor": switch_info.get("floor", 1),
+                    "deviceModel": model,
+                    "floor": floor,
                     "role": role,
                     "eventData": {
                         "portId": str(port),
@@ -3095,7 +3252,7 @@ def generate_ms_port_health(base_date: str, day: int, hour: int,
 
                 if status == "Connected":
                     # Add connection details
-                    event["eventData"]["speed"] = speed
+                    event["eventData"]["speed"] = uplink_speed if is_uplink else speeds[idx]
                     event["eventData"]["duplex"] = "full"
 
                     # Traffic data - higher for uplinks
@@ -4220,6 +4377,284 @@ def generate_device_availability_day(base_date: str, day: int,
     return events
 
 
+# =============================================================================
+# PER-LOCATION GENERATION
+# =============================================================================
+
+# Per location scaling of baseline volume
+LOCATION_SCALE = {
+    "BOS": 1.0,   # Largest office
+    "ATL": 0.5,   # Medium office
+    "AUS": 0.4,   # Smallest office
+}
+
+# Output streams each location worker writes (one part file per stream)
+LOCATION_STREAMS = ("mx", "mr", "mr_health", "ms", "ms_health", "mv", "mt", "sensor_readings")
+
+# Streams generated at org level by the parent process (SD-WAN tunnels go to mx)
+ORG_STREAMS = ("mx", "org_security", "audit", "device_avail")
+
+# Events can be stamped before the hour that generates them (meeting room
+# doors open up to ~45 min before the hour's meetings). Buffered events more
+# than this far behind the current hour are final and get written out.
+RELEASE_LAG = timedelta(hours=2)
+
+# Progress queue of a worker process (set by _init_location_worker)
+_worker_state = {"progress": None}
+
+
+def sort_key_json(event: dict) -> str:
+    """Extract timestamp from JSON event for sorting.
+    Uses occurredAt (Dashboard API format) or ts (IDS events)."""
+    return event.get("occurredAt", event.get("ts", ""))
+
+
+def _sensor_reading_key(reading: dict) -> str:
+    return reading.get("ts", "")
+
+
+def _enriched_json(event: dict) -> str:
+    """Enrich with organizationId + networkName (required by TA dashboards) and serialize."""
+    _enrich_event(event)
+    return serialize(event)
+
+
+def _sensor_reading(event: dict) -> dict:
+    """Transform an MT sensor_reading event into TA sensorreadingshistory format.
+
+    The TA's meraki:sensorreadingshistory expects a different JSON structure
+    than the Dashboard API events.
+    """
+    trigger = event.get("trigger", {})
+    metric = trigger.get("metric", "")
+    network_id = event.get("networkId", "")
+    reading = {
+        "ts": event.get("occurredAt", ""),
+        "serial": event.get("deviceSerial", ""),
+        "organizationId": MERAKI_ORG_ID,
+        "network": {
+            "id": network_id,
+            "name": NETWORK_NAMES.get(network_id, MERAKI_ORG_NAME),
+        },
+        "metric": metric,
+    }
+    # Add metric-specific top-level data
+    if metric == "temperature":
+        reading["temperature"] = trigger.get("temperature", {})
+    elif metric == "humidity":
+        reading["humidity"] = trigger.get("humidity", {})
+    elif metric == "door":
+        reading["door"] = trigger.get("door", {})
+    elif metric == "water_leak":
+        reading["waterDetection"] = trigger.get("waterDetection", {})
+    return reading
+
+
+def _open_writers(part_dir: Path, owner: str, streams: Tuple[str, ...]) -> Dict[str, OrderedWriter]:
+    """One keyed OrderedWriter per stream, writing <part_dir>/<stream>.<owner>.part."""
+    writers = {}
+    for stream in streams:
+        if stream == "sensor_readings":
+            key, dump = _sensor_reading_key, json.dumps
+        else:
+            key, dump = sort_key_json, _enriched_json
+        writers[stream] = OrderedWriter(part_dir / f"{stream}.{owner}.part", key=key,
+                                        serialize=dump, encoding="utf-8", keyed=True)
+    return writers
+
+
+def _close_writers(writers: Dict[str, OrderedWriter]) -> Dict[str, int]:
+    """Close every writer. Returns {stream: event count}."""
+    counts = {}
+    for stream, writer in writers.items():
+        counts[stream] = writer.close()
+        if writer.late:
+            print(f"  [Meraki] Warning: {writer.late} {stream} events arrived after their "
+                  f"hour was written ({writer.path.name})", file=sys.stderr)
+    return counts
+
+
+def _release_watermark(start_date: str, day: int, hour: int) -> str:
+    """Sort key below which no event generated from (day, hour) onward can fall."""
+    return (date_add(start_date, day) + timedelta(hours=hour) - RELEASE_LAG).strftime(
+        "%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _generate_location_hour(job: dict, day: int, hour: int, is_wknd: bool,
+                            ransomware_scenario, ddos_scenario,
+                            time_utils: TimeUtils) -> Dict[str, List[dict]]:
+    """Generate one hour of one location. Returns {stream: events}."""
+    start_date = job["start_date"]
+    location = job["location"]
+    include_exfil = job["include_exfil"]
+    health_interval = job["health_interval"]
+
+    activity = get_hour_activity_level(hour, is_wknd)
+    hour_mult = activity / 100.0
+    volume = job["scale"] * LOCATION_SCALE[location] * hour_mult
+
+    # Calculate events for this hour at this location
+    mx_count = int(80 * volume)
+    mr_count = int(175 * volume)
+    ms_count = int(15 * volume)
+    mv_count = int(20 * volume)
+    mt_count = 1  # Sensors report regularly regardless of activity
+
+    # Generate baseline events - each goes to its respective list
+    mx = generate_mx_baseline_hour(start_date, day, hour, location, mx_count)
+    mr = generate_mr_baseline_hour(start_date, day, hour, location, mr_count)
+    mr_health = []
+    if job["mr_health_enabled"]:
+        mr_health = generate_mr_health_metrics(start_date, day, hour, location, health_interval)
+    ms = generate_ms_baseline_hour(start_date, day, hour, location, ms_count)
+    ms_health = []
+    if job["ms_health_enabled"]:
+        ms_health = generate_ms_port_health(start_date, day, hour, location, health_interval)
+    mv = generate_mv_baseline_hour(start_date, day, hour, location, mv_count, is_wknd=is_wknd)
+    mt = generate_mt_baseline_hour(start_date, day, hour, location, mt_count)
+
+    # Generate meeting room sensor events (correlated with Webex) - MT events
+    mt.extend(generate_meeting_room_sensors_hour(start_date, day, hour, location))
+
+    # Generate meeting room camera events (correlated with meetings) - MV events
+    mv.extend(generate_meeting_room_cameras_hour(start_date, day, hour, location))
+
+    # Generate scenario events
+    if include_exfil:
+        # IDS alerts go to MX
+        mx.extend(generate_ids_alert(start_date, day, hour, location))
+        # After-hours motion detection goes to MV
+        mv.extend(generate_after_hours_motion(start_date, day, hour, include_exfil))
+
+    # Always generate these (rare events)
+    # Rogue AP detection goes to MR
+    mr.extend(generate_rogue_ap_detection(start_date, day, hour, location))
+    # DC temp spike goes to MT
+    mt.extend(generate_dc_temp_spike(start_date, day, hour))
+
+    # Ransomware scenario - returns dict with mx and mr events (Austin only)
+    if ransomware_scenario and location == "AUS":
+        ransomware_events = ransomware_scenario.meraki_hour(day, hour, time_utils)
+        mx.extend(ransomware_events.get("mx", []))
+        mr.extend(ransomware_events.get("mr", []))
+
+    # Ransomware cross-site - BOS MX sees blocked VPN traffic from AUS
+    if ransomware_scenario and location == "BOS":
+        crosssite_events = ransomware_scenario.meraki_crosssite_hour(day, hour, time_utils)
+        mx.extend(crosssite_events.get("mx", []))
+
+    # DDoS scenario - IDS alerts and SD-WAN health degradation (Boston only)
+    if ddos_scenario and location == "BOS":
+        ddos_events = ddos_scenario.meraki_hour(day, hour, time_utils)
+        mx.extend(ddos_events.get("mx", []))
+
+    # TA-format sensor readings, derived from this hour's MT stream
+    sensor_readings = [_sensor_reading(e) for e in mt if e.get("type") == "sensor_reading"]
+
+    return {"mx": mx, "mr": mr, "mr_health": mr_health, "ms": ms, "ms_health": ms_health,
+            "mv": mv, "mt": mt, "sensor_readings": sensor_readings}
+
+
+def _run_location(job: dict, report=None) -> Dict[str, int]:
+    """Generate every hour of one location into keyed part files.
+
+    Runs in a worker process (it reseeds that process's global random from
+    the job), so a location produces the same events whichever worker runs
+    it. Each hour is written out (up to RELEASE_LAG) before the next is
+    generated, keeping memory flat.
+    report(location, day, hour, events) is called after each hour.
+
+    Returns {stream: event count}.
+    """
+    random.seed(job["seed"])
+    clear_ms_port_states()
+
+    start_date = job["start_date"]
+    location = job["location"]
+    active_scenarios = job["active_scenarios"]
+    time_utils = TimeUtils(start_date)
+    ransomware_scenario = None
+    if "ransomware_attempt" in active_scenarios:
+        ransomware_scenario = RansomwareAttemptScenario(demo_id_enabled=True)
+    ddos_scenario = None
+    if "ddos_attack" in active_scenarios:
+        ddos_scenario = DdosAttackScenario(demo_id_enabled=True)
+
+    writers = _open_writers(job["part_dir"], location, LOCATION_STREAMS)
+    events = 0
+    for day in range(job["days"]):
+        telemetry.day_tick(day + 1)
+        is_wknd = is_weekend(date_add(start_date, day))
+        for hour in range(24):
+            streams = _generate_location_hour(job, day, hour, is_wknd, ransomware_scenario,
+                                              ddos_scenario, time_utils)
+            watermark = _release_watermark(start_date, day, hour)
+            for stream, hour_events in streams.items():
+                writers[stream].add(hour_events)
+                writers[stream].release(watermark)
+                if stream != "sensor_readings":
+                    events += len(hour_events)
+            if report:
+                report(location, day, hour, events)
+    return _close_writers(writers)
+
+
+def _init_location_worker(progress_queue, json_backend: str):
+    """ProcessPoolExecutor initializer: progress queue and JSON backend of the parent."""
+    _worker_state["progress"] = progress_queue
+    set_backend(json_backend)
+
+
+def _report_worker_progress(location: str, day: int, hour: int, events: int):
+    _worker_state["progress"].put((location, day, hour, events))
+
+
+def _location_worker(job: dict) -> Dict:
+    """Worker process entry point: restore the location's meeting schedule, then run it.
+
+    Returns {"counts": {stream: events}, "telemetry": phase timings of this
+    worker, "profile": .prof path or None}. With job["profile_dir"] set
+    (main_generate.py --profile=meraki) the location runs under cProfile.
+    """
+    restore_schedule(job["schedule"])
+    telemetry.begin(f"meraki:{job['location']}")
+    profile = None
+    try:
+        if job["profile_dir"] is not None:
+            counts, profile = profiling.profile_worker(
+                job["location"], _run_location, (job, _report_worker_progress), job["profile_dir"])
+        else:
+            counts = _run_location(job, _report_worker_progress)
+    finally:
+        recorder = telemetry.end()
+    return {"counts": counts, "telemetry": recorder.to_dict(), "profile": profile}
+
+
+def _run_org(start_date: str, days: int, scale: float, active_scenarios: list,
+             part_dir: Path, report=None) -> Dict[str, int]:
+    """Generate the org-level streams (SD-WAN, org security, audit, availability)."""
+    writers = _open_writers(part_dir, "org", ORG_STREAMS)
+    for day in range(days):
+        telemetry.day_tick(day + 1)
+        is_wknd = is_weekend(date_add(start_date, day))
+
+        # Generate SD-WAN tunnel events for the day (MX events)
+        writers["mx"].add(generate_sdwan_tunnel_events(start_date, day))
+
+        # Generate device availability changes for the day (day-level)
+        writers["device_avail"].add(generate_device_availability_day(start_date, day, active_scenarios))
+
+        for hour in range(24):
+            writers["org_security"].add(generate_org_security_hour(start_date, day, hour, scale))
+            writers["audit"].add(generate_audit_hour(start_date, day, hour, is_wknd))
+            watermark = _release_watermark(start_date, day, hour)
+            for writer in writers.values():
+                writer.release(watermark)
+            if report:
+                report()
+    return _close_writers(writers)
+
+
 # =============================================================================
 # MAIN GENERATOR
 # =============================================================================
@@ -4233,6 +4668,7 @@ def generate_meraki_logs(
     health_interval: int = 15,
     mr_health_enabled: bool = True,
     ms_health_enabled: bool = True,
+    workers: int = None,
     progress_callback=None,
     quiet: bool = False,
 ) -> int:
@@ -4245,6 +4681,17 @@ def generate_meraki_logs(
         health_interval: Minutes between health metric samples (5, 10, 15, or 30)
         mr_health_enabled: Generate MR AP health metrics (default: True)
         ms_health_enabled: Generate MS port health metrics (default: True)
+        workers: Worker processes for the per-location streams (default: one
+                 per location, capped at the CPU count; 1 = one worker runs
+                 the locations in turn)
+
+    Each location (BOS, ATL, AUS) is generated in a worker process, hour by
+    hour, into per-device-type part files that are flushed as they go; the
+    org-level streams are generated meanwhile in this process. Locations
+    never run in this process: they reseed the global random module, which
+    the other generator threads of main_generate.py share. The parts are
+    then k-way merged into the final time-ordered files. Output is the same
+    for any number of workers.
 
     Writes separate JSON files for each device type:
     - meraki_mx_appliance.json - MX security appliances / SD-WAN
@@ -4283,27 +4730,10 @@ def generate_meraki_logs(
 
     # Parse scenarios
     active_scenarios = expand_scenarios(scenarios)
-    include_exfil = "exfil" in active_scenarios
-    include_ransomware = "ransomware_attempt" in active_scenarios
-    include_ddos_attack = "ddos_attack" in active_scenarios
 
-    # Initialize scenarios
-    time_utils = TimeUtils(start_date)
-    ransomware_scenario = None
-    if include_ransomware:
-        ransomware_scenario = RansomwareAttemptScenario(demo_id_enabled=True)
-
-    ddos_scenario = None
-    if include_ddos_attack:
-        ddos_scenario = DdosAttackScenario(demo_id_enabled=True)
-
-    # Base events per peak hour (scale affects volume)
-    # Per location scaling
-    location_scale = {
-        "BOS": 1.0,   # Largest office
-        "ATL": 0.5,   # Medium office
-        "AUS": 0.4,   # Smallest office
-    }
+    if workers is None:
+        workers = min(len(LOCATION_SCALE), os.cpu_count() or 1)
+    workers = max(1, min(workers, len(LOCATION_SCALE)))
 
     if not quiet:
         # Calculate estimated health events
@@ -4321,7 +4751,7 @@ def generate_meraki_logs(
         print("=" * 70, file=sys.stderr)
         print(f"  Cisco Meraki Generator - Multi-Site Edition", file=sys.stderr)
         print(f"  Start: {start_date} | Days: {days} | Scale: {scale}", file=sys.stderr)
-        print(f"  Locations: {', '.join(LOCATIONS.keys())}", file=sys.stderr)
+        print(f"  Locations: {', '.join(LOCATIONS.keys())} | Workers: {workers}", file=sys.stderr)
         print(f"  MX: {len(MERAKI_MX_DEVICES)} | MR: {len(MERAKI_MR_DEVICES)} | MS: {len(MERAKI_MS_DEVICES)}", file=sys.stderr)
         print(f"  MV: {len(MERAKI_MV_DEVICES)} | MT: {len(MERAKI_MT_DEVICES)}", file=sys.stderr)
         print(f"  Health: {health_interval}min interval ({health_str})", file=sys.stderr)
@@ -4329,120 +4759,96 @@ def generate_meraki_logs(
         print(f"  Output: {output_dir}/meraki_*.json (12 JSON files)", file=sys.stderr)
         print("=" * 70, file=sys.stderr)
 
-    # Clear port state tracking for change-based MS health reporting
-    clear_ms_port_states()
-
-    # Separate event lists per device type
-    mx_events = []         # MX firewall/SD-WAN
-    mr_events = []         # MR wireless events (associations, auth, etc.)
-    mr_health_events = []  # MR periodic AP health metrics
-    ms_events = []         # MS switch events
-    ms_health_events = []  # MS periodic port health metrics
-    mv_events = []         # MV camera
-    mt_events = []         # MT sensor
-    org_security_events = []   # Org-level security (IDS/AMP)
-    audit_events = []          # Dashboard audit log
-    device_avail_events = []   # Device availability changes
-
-    for day in range(days):
-        if progress_callback:
-            progress_callback("meraki", day + 1, days)
-        dt = date_add(start_date, day)
-        is_wknd = is_weekend(dt)
-
-        if not quiet:
-            print(f"  [Meraki] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})...", file=sys.stderr, end="\r")
-
-        # Generate SD-WAN tunnel events for the day (MX events)
-        mx_events.extend(generate_sdwan_tunnel_events(start_date, day))
-
-        # Generate device availability changes for the day (day-level)
-        device_avail_events.extend(generate_device_availability_day(start_date, day, active_scenarios))
-
-        for hour in range(24):
-            activity = get_hour_activity_level(hour, is_wknd)
-            hour_mult = activity / 100.0
-
-            for location, loc_scale in location_scale.items():
-                # Calculate events for this hour at this location
-                mx_count = int(80 * scale * loc_scale * hour_mult)
-                mr_count = int(175 * scale * loc_scale * hour_mult)
-                ms_count = int(15 * scale * loc_scale * hour_mult)
-                mv_count = int(20 * scale * loc_scale * hour_mult)
-                mt_count = 1  # Sensors report regularly regardless of activity
-
-                # Generate baseline events - each goes to its respective list
-                mx_events.extend(generate_mx_baseline_hour(start_date, day, hour, location, mx_count))
-                mr_events.extend(generate_mr_baseline_hour(start_date, day, hour, location, mr_count))
-                if mr_health_enabled:
-                    mr_health_events.extend(generate_mr_health_metrics(start_date, day, hour, location, health_interval))
-                ms_events.extend(generate_ms_baseline_hour(start_date, day, hour, location, ms_count))
-                if ms_health_enabled:
-                    ms_health_events.extend(generate_ms_port_health(start_date, day, hour, location, health_interval))
-                mv_events.extend(generate_mv_baseline_hour(start_date, day, hour, location, mv_count, is_wknd=is_wknd))
-                mt_events.extend(generate_mt_baseline_hour(start_date, day, hour, location, mt_count))
-
-                # Generate meeting room sensor events (correlated with Webex) - MT events
-                mt_events.extend(generate_meeting_room_sensors_hour(start_date, day, hour, location))
-
-                # Generate meeting room camera events (correlated with meetings) - MV events
-                mv_events.extend(generate_meeting_room_cameras_hour(start_date, day, hour, location))
-
-                # Generate scenario events
-                if include_exfil:
-                    # IDS alerts go to MX
-                    mx_events.extend(generate_ids_alert(start_date, day, hour, location))
-                    # After-hours motion detection goes to MV
-                    mv_events.extend(generate_after_hours_motion(start_date, day, hour, include_exfil))
-
-                # Always generate these (rare events)
-                # Rogue AP detection goes to MR
-                mr_events.extend(generate_rogue_ap_detection(start_date, day, hour, location))
-                # DC temp spike goes to MT
-                mt_events.extend(generate_dc_temp_spike(start_date, day, hour))
-
-                # Ransomware scenario - returns dict with mx and mr events (Austin only)
-                if include_ransomware and ransomware_scenario and location == "AUS":
-                    ransomware_events = ransomware_scenario.meraki_hour(day, hour, time_utils)
-                    mx_events.extend(ransomware_events.get("mx", []))
-                    mr_events.extend(ransomware_events.get("mr", []))
-
-                # Ransomware cross-site - BOS MX sees blocked VPN traffic from AUS
-                if include_ransomware and ransomware_scenario and location == "BOS":
-                    crosssite_events = ransomware_scenario.meraki_crosssite_hour(day, hour, time_utils)
-                    mx_events.extend(crosssite_events.get("mx", []))
-
-                # DDoS scenario - IDS alerts and SD-WAN health degradation (Boston only)
-                if include_ddos_attack and ddos_scenario and location == "BOS":
-                    ddos_events = ddos_scenario.meraki_hour(day, hour, time_utils)
-                    mx_events.extend(ddos_events.get("mx", []))
-
-            # Org-level events (not per-location)
-            org_security_events.extend(generate_org_security_hour(start_date, day, hour, scale))
-            audit_events.extend(generate_audit_hour(start_date, day, hour, is_wknd))
-
-        if not quiet:
-            print(f"  [Meraki] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
-
-    # Sort and write each device type to its file (all JSON now)
-    def sort_key_json(event: dict) -> str:
-        """Extract timestamp from JSON event for sorting.
-        Uses occurredAt (Dashboard API format) or ts (IDS events)."""
-        return event.get("occurredAt", event.get("ts", ""))
-
-    # All devices now use JSON format (Dashboard API)
-    all_events = {
-        "mx": mx_events,
-        "mr": mr_events,
-        "mr_health": mr_health_events,
-        "ms": ms_events,
-        "ms_health": ms_health_events,
-        "mv": mv_events,
-        "mt": mt_events,
-        "org_security": org_security_events,
-        "audit": audit_events,
-        "device_avail": device_avail_events,
-    }
+    part_dir = Path(tempfile.mkdtemp(prefix=".meraki_parts_", dir=output_dir))
+
+    # One job per location; seeds are drawn up front so the result does not
+    # depend on how the jobs are scheduled
+    jobs = [{
+        "location": location,
+        "seed": random.getrandbits(64),
+        "start_date": start_date,
+        "days": days,
+        "scale": scale,
+        "active_scenarios": active_scenarios,
+        "include_exfil": "exfil" in active_scenarios,
+        "health_interval": health_interval,
+        "mr_health_enabled": mr_health_enabled,
+        "ms_health_enabled": ms_health_enabled,
+        "part_dir": part_dir,
+    } for location in LOCATION_SCALE]
+
+    # Progress: hours done and events so far per location, plus the org stream
+    hours_done = {job["location"]: 0 for job in jobs}
+    loc_events = {job["location"]: 0 for job in jobs}
+    org_hours = [0]
+
+    def report():
+        if not progress_callback:
+            return
+        # Average over the locations and the org stream: with fewer workers
+        # than locations they run one after another, so the slowest one
+        # would sit at hour 0 until the last location starts
+        done = (sum(hours_done.values()) + org_hours[0]) // (len(jobs) + 1)
+        day, hour = divmod(min(done, days * 24 - 1), 24)
+        progress_callback("meraki", day + 1, days, hour=hour, events=sum(loc_events.values()))
+
+    def location_progress(location, day, hour, events):
+        hours_done[location] = day * 24 + hour + 1
+        loc_events[location] = events
+        report()
+
+    def org_progress():
+        org_hours[0] += 1
+        if not quiet and org_hours[0] % 24 == 0:
+            day = org_hours[0] // 24
+            dt = date_add(start_date, day - 1)
+            print(f"  [Meraki] Day {day}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
+        report()
+
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        progress_queue = ctx.Queue()
+        # Set when main_generate.py profiles meraki: workers profile
+        # themselves and their .prof files join the parent's report
+        profile_dir = profiling.worker_profile_dir()
+        for job in jobs:
+            job["schedule"] = schedule_snapshot(job["location"])
+            job["profile_dir"] = profile_dir
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_location_worker,
+                                 initargs=(progress_queue, json_backend())) as executor:
+            futures = [executor.submit(_location_worker, job) for job in jobs]
+            org_counts = _run_org(start_date, days, scale, active_scenarios, part_dir,
+                                  report=org_progress)
+            with telemetry.phase("wait"):
+                while not all(f.done() for f in futures):
+                    try:
+                        location_progress(*progress_queue.get(timeout=0.2))
+                    except queue.Empty:
+                        pass
+            results = [f.result() for f in futures]
+        loc_counts = [r["counts"] for r in results]
+        recorder = telemetry.current()
+        for job, r in zip(jobs, results):
+            if recorder is not None:
+                recorder.add_worker(job["location"], r["telemetry"])
+            if r["profile"]:
+                profiling.add_worker_profile(r["profile"])
+
+        # Merge part files per device type: org first, then locations in order
+        # (ties keep the order the single-process generator produced them in)
+        owners = ["org"] + [job["location"] for job in jobs]
+        counts = {}
+        for stream in dict.fromkeys(ORG_STREAMS + LOCATION_STREAMS):
+            parts = [part_dir / f"{stream}.{owner}.part" for owner in owners]
+            parts = [p for p in parts if p.exists()]
+            counts[stream] = merge_parts(output_files[stream], parts, encoding="utf-8")
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+    expected = sum(org_counts.values()) + sum(sum(c.values()) for c in loc_counts)
+    if sum(counts.values()) != expected:
+        raise RuntimeError(f"Meraki part merge wrote {sum(counts.values())} events, expected {expected}")
 
     total_events = 0
     file_counts = {}
@@ -4463,18 +4869,6 @@ def generate_meraki_logs(
         "device_avail": "network/meraki/meraki_device_availability.json",
     }
 
-    # Write all event files as JSON (one JSON object per line)
-    # Enrich every event with organizationId + networkName (required by TA dashboards)
-    for device_type, events in all_events.items():
-        events.sort(key=sort_key_json)
-        output_path = output_files[device_type]
-        with open(output_path, "w") as f:
-            for event in events:
-                _enrich_event(event)
-                f.write(json.dumps(event) + "\n")
-        file_counts[device_to_relpath[device_type]] = len(events)
-        total_events += len(events)
-
     # Write static organizations file (required for TA dashboard org dropdowns)
     org_event = {
         "id": MERAKI_ORG_ID,
@@ -4482,55 +4876,21 @@ def generate_meraki_logs(
         "url": f"https://dashboard.meraki.com/o/{MERAKI_ORG_ID}/manage/organization/overview",
         "organizationId": MERAKI_ORG_ID,
     }
-    with open(output_files["orgs"], "w") as f:
-        f.write(json.dumps(org_event) + "\n")
-    file_counts[device_to_relpath["orgs"]] = 1
-    total_events += 1
-
-    # Transform MT sensor events into TA sensorreadingshistory format
-    # The TA's meraki:sensorreadingshistory expects different JSON structure
-    sensor_readings = []
-    for event in mt_events:
-        if event.get("type") != "sensor_reading":
-            continue
-        trigger = event.get("trigger", {})
-        metric = trigger.get("metric", "")
-        network_id = event.get("networkId", "")
-        reading = {
-            "ts": event.get("occurredAt", ""),
-            "serial": event.get("deviceSerial", ""),
-            "organizationId": MERAKI_ORG_ID,
-            "network": {
-                "id": network_id,
-                "name": NETWORK_NAMES.get(network_id, MERAKI_ORG_NAME),
-            },
-            "metric": metric,
-        }
-        # Add metric-specific top-level data
-        if metric == "temperature":
-            reading["temperature"] = trigger.get("temperature", {})
-        elif metric == "humidity":
-            reading["humidity"] = trigger.get("humidity", {})
-        elif metric == "door":
-            reading["door"] = trigger.get("door", {})
-        elif metric == "water_leak":
-            reading["waterDetection"] = trigger.get("waterDetection", {})
-        sensor_readings.append(reading)
-
-    sensor_readings.sort(key=lambda e: e.get("ts", ""))
-    with open(output_files["sensor_readings"], "w") as f:
-        for reading in sensor_readings:
-            f.write(json.dumps(reading) + "\n")
-    file_counts[device_to_relpath["sensor_readings"]] = len(sensor_readings)
-    total_events += len(sensor_readings)
+    write_events(output_files["orgs"], [org_event], serialize=json.dumps)
+    counts["orgs"] = 1
+
+    for device_type in ["mx", "mr", "mr_health", "ms", "ms_health", "mv", "mt",
+                        "org_security", "audit", "device_avail",
+                        "orgs", "sensor_readings"]:
+        file_counts[device_to_relpath[device_type]] = counts[device_type]
+        total_events += counts[device_type]
 
     if not quiet:
         print(f"  [Meraki] Complete! {total_events:,} events written to 12 JSON files:", file=sys.stderr)
         for device_type in ["mx", "mr", "mr_health", "ms", "ms_health", "mv", "mt",
                             "org_security", "audit", "device_avail",
                             "orgs", "sensor_readings"]:
-            count = len(all_events[device_type]) if device_type in all_events else (1 if device_type == "orgs" else len(sensor_readings))
-            print(f"    - {output_files[device_type].name}: {count:,} events", file=sys.stderr)
+            print(f"    - {output_files[device_type].name}: {counts[device_type]:,} events", file=sys.stderr)
 
     return {"total": total_events, "files": file_counts}
 
@@ -34,6 +34,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.config import DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path, Config
 from shared.time_utils import TimeUtils
 from shared.company import Company
+from shared.output_writer import write_events
+from shared import telemetry
 from scenarios.registry import expand_scenarios
 
 
@@ -652,6 +654,8 @@ def generate_mssql_logs(
 
         # Per-hour events
         for hour in range(24):
+            if progress_callback:
+                progress_callback("mssql", day + 1, days, hour=hour, events=len(all_events))
             # Baseline
             all_events.extend(generate_checkpoint_events(base_date, day, hour))
             all_events.extend(generate_login_events(base_date, day, hour, scale))
@@ -666,12 +670,11 @@ def generate_mssql_logs(
                     base_date, day, hour, exfil_scenario))
 
     # Sort events by timestamp (extract from first 22 chars)
-    all_events.sort(key=lambda e: e[:22])
+    with telemetry.phase("sort"):
+        all_events.sort(key=lambda e: e[:22])
 
     # Write output
-    with open(output_path, "w") as f:
-        for event in all_events:
-            f.write(event + "\n")
+    write_events(output_path, all_events)
 
     total_events = len(all_events)
 
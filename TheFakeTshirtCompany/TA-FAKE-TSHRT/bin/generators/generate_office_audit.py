@@ -17,11 +17,11 @@ Splunk sourcetype: FAKE:o365:management:activity
 """
 
 import argparse
-import json
 import random
 import sys
 import uuid
 import hashlib
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 
@@ -36,6 +36,9 @@ from shared.company import (
     THREAT_IP,
     LOCATIONS,
 )
+from shared.output_writer import write_events
+from shared.json_templates import JsonTemplate, Slot, serialize
+from shared import telemetry
 from scenarios.registry import expand_scenarios, get_phase
 
 
@@ -213,6 +216,7 @@ def _weighted_choice(choices: List[Tuple[str, int]]) -> str:
     return random.choices(items, weights=weights, k=1)[0]
 
 
+@lru_cache(maxsize=None)
 def _generate_user_key(username: str) -> str:
     """Generate a deterministic numeric PUID for a user."""
     h = hashlib.md5(username.encode()).hexdigest()[:16]
@@ -238,6 +242,59 @@ def _get_channels_for_department(department: str) -> List[str]:
     return TEAMS_CHANNELS.get(department, ["General", "Random"])
 
 
+# =============================================================================
+# EVENT TEMPLATES
+# =============================================================================
+
+def _audit_template(record_type: int, workload: str, members: Dict[str, Any]) -> JsonTemplate:
+    """Audit record template: the common header followed by workload members.
+
+    Variable members are slots named after their key, so events read and
+    update like the plain record dicts (event["ClientIP"] = ...).
+    """
+    shape = {
+        "Id": Slot("Id", str),
+        "RecordType": record_type,
+        "CreationTime": Slot("CreationTime", str),
+        "Operation": Slot("Operation", str),
+        "OrganizationId": ORG_ID,
+        "UserType": 0,
+        "UserKey": Slot("UserKey", str),
+        "Workload": workload,
+        "UserId": Slot("UserId", str),
+        "ClientIP": Slot("ClientIP", str),
+        "ResultStatus": Slot("ResultStatus", str),
+    }
+    for key, value in members.items():
+        shape[key] = Slot(key, str) if value is Slot else value
+    return JsonTemplate(shape)
+
+
+_FILE_MEMBERS = {
+    "ObjectId": Slot,
+    "SiteUrl": Slot,
+    "SourceRelativeUrl": Slot,
+    "SourceFileName": Slot,
+    "SourceFileExtension": Slot,
+    "ItemType": "File",
+    "EventSource": "SharePoint",
+    "UserAgent": Slot,
+}
+
+_SHAREPOINT_TEMPLATE = _audit_template(6, "SharePoint", _FILE_MEMBERS)
+_ONEDRIVE_TEMPLATE = _audit_template(7, "OneDrive", _FILE_MEMBERS)
+_TEAMS_TEMPLATE = _audit_template(25, "MicrosoftTeams", {
+    "TeamName": Slot,
+    "ChannelName": Slot,
+    "CommunicationType": Slot,
+})
+_SHARING_TEMPLATE = _audit_template(14, "SharePoint", {  # SharePointSharingOperation
+    **_FILE_MEMBERS,
+    "TargetUserOrGroupName": Slot,
+    "TargetUserOrGroupType": "Guest",
+})
+
+
 # =============================================================================
 # EVENT GENERATORS
 # =============================================================================
@@ -261,27 +318,21 @@ def generate_sharepoint_event(start_date: str, day: int, hour: int,
     site_url = f"{SP_BASE_URL}{site['url_slug']}"
     object_id = f"{site_url}/Shared Documents/{filename}"
 
-    event = {
-        "Id": str(uuid.uuid4()),
-        "RecordType": 6,
-        "CreationTime": ts,
-        "Operation": operation,
-        "OrganizationId": ORG_ID,
-        "UserType": 0,
-        "UserKey": _generate_user_key(user.username),
-        "Workload": "SharePoint",
-        "UserId": user.email,
-        "ClientIP": user.ip_address,
-        "ResultStatus": "Succeeded",
-        "ObjectId": object_id,
-        "SiteUrl": site_url,
-        "SourceRelativeUrl": "Shared Documents",
-        "SourceFileName": filename,
-        "SourceFileExtension": ext,
-        "ItemType": "File",
-        "EventSource": "SharePoint",
-        "UserAgent": random.choice(USER_AGENTS),
-    }
+    event = _SHAREPOINT_TEMPLATE.event(
+        Id=str(uuid.uuid4()),
+        CreationTime=ts,
+        Operation=operation,
+        UserKey=_generate_user_key(user.username),
+        UserId=user.email,
+        ClientIP=user.ip_address,
+        ResultStatus="Succeeded",
+        ObjectId=object_id,
+        SiteUrl=site_url,
+        SourceRelativeUrl="Shared Documents",
+        SourceFileName=filename,
+        SourceFileExtension=ext,
+        UserAgent=random.choice(USER_AGENTS),
+    )
 
     if demo_id:
         event["demo_id"] = demo_id
@@ -311,27 +362,21 @@ def generate_onedrive_event(start_date: str, day: int, hour: int,
     onedrive_url = f"{SP_BASE_URL}/personal/{user.username.replace('.', '_')}_{ORG_NAME_LOWER}_com"
     object_id = f"{onedrive_url}/Documents/{filename}"
 
-    event = {
-        "Id": str(uuid.uuid4()),
-        "RecordType": 7,
-        "CreationTime": ts,
-        "Operation": operation,
-        "OrganizationId": ORG_ID,
-        "UserType": 0,
-        "UserKey": _generate_user_key(user.username),
-        "Workload": "OneDrive",
-        "UserId": user.email,
-        "ClientIP": user.ip_address,
-        "ResultStatus": "Succeeded",
-        "ObjectId": object_id,
-        "SiteUrl": onedrive_url,
-        "SourceRelativeUrl": "Documents",
-        "SourceFileName": filename,
-        "SourceFileExtension": ext,
-        "ItemType": "File",
-        "EventSource": "SharePoint",
-        "UserAgent": random.choice(USER_AGENTS),
-    }
+    event = _ONEDRIVE_TEMPLATE.event(
+        Id=str(uuid.uuid4()),
+        CreationTime=ts,
+        Operation=operation,
+        UserKey=_generate_user_key(user.username),
+        UserId=user.email,
+        ClientIP=user.ip_address,
+        ResultStatus="Succeeded",
+        ObjectId=object_id,
+        SiteUrl=onedrive_url,
+        SourceRelativeUrl="Documents",
+        SourceFileName=filename,
+        SourceFileExtension=ext,
+        UserAgent=random.choice(USER_AGENTS),
+    )
 
     if demo_id:
         event["demo_id"] = demo_id
@@ -360,22 +405,18 @@ def generate_teams_event(start_date: str, day: int, hour: int,
     team_name = f"{user.department} Team"
     channel_name = random.choice(channels)
 
-    event = {
-        "Id": str(uuid.uuid4()),
-        "RecordType": 25,
-        "CreationTime": ts,
-        "Operation": operation,
-        "OrganizationId": ORG_ID,
-        "UserType": 0,
-        "UserKey": _generate_user_key(user.username),
-        "Workload": "MicrosoftTeams",
-        "UserId": user.email,
-        "ClientIP": user.ip_address,
-        "ResultStatus": "Succeeded",
-        "TeamName": team_name,
-        "ChannelName": channel_name,
-        "CommunicationType": "Channel" if operation in ("MessageSent", "ChannelFileUploaded", "ChannelFileAccessed") else "OneOnOne",
-    }
+    event = _TEAMS_TEMPLATE.event(
+        Id=str(uuid.uuid4()),
+        CreationTime=ts,
+        Operation=operation,
+        UserKey=_generate_user_key(user.username),
+        UserId=user.email,
+        ClientIP=user.ip_address,
+        ResultStatus="Succeeded",
+        TeamName=team_name,
+        ChannelName=channel_name,
+        CommunicationType="Channel" if operation in ("MessageSent", "ChannelFileUploaded", "ChannelFileAccessed") else "OneOnOne",
+    )
 
     # Add Members for team management operations
     if operation in ("MemberAdded", "TeamCreated", "TeamDeleted"):
@@ -419,29 +460,22 @@ def generate_sharing_invitation(start_date: str, day: int, hour: int,
     ext_first = random.choice(["john", "jane", "mark", "lisa", "david", "sarah", "mike", "emma"])
     ext_email = f"{ext_first}@{ext_domain}"
 
-    event = {
-        "Id": str(uuid.uuid4()),
-        "RecordType": 14,  # SharePointSharingOperation
-        "CreationTime": ts,
-        "Operation": "SharingInvitationCreated",
-        "OrganizationId": ORG_ID,
-        "UserType": 0,
-        "UserKey": _generate_user_key(user.username),
-        "Workload": "SharePoint",
-        "UserId": user.email,
-        "ClientIP": user.ip_address,
-        "ResultStatus": "Succeeded",
-        "ObjectId": object_id,
-        "SiteUrl": site_url,
-        "SourceRelativeUrl": "Shared Documents",
-        "SourceFileName": filename,
-        "SourceFileExtension": ext,
-        "ItemType": "File",
-        "EventSource": "SharePoint",
-        "UserAgent": random.choice(USER_AGENTS),
-        "TargetUserOrGroupName": ext_email,
-        "TargetUserOrGroupType": "Guest",
-    }
+    event = _SHARING_TEMPLATE.event(
+        Id=str(uuid.uuid4()),
+        CreationTime=ts,
+        Operation="SharingInvitationCreated",
+        UserKey=_generate_user_key(user.username),
+        UserId=user.email,
+        ClientIP=user.ip_address,
+        ResultStatus="Succeeded",
+        ObjectId=object_id,
+        SiteUrl=site_url,
+        SourceRelativeUrl="Shared Documents",
+        SourceFileName=filename,
+        SourceFileExtension=ext,
+        UserAgent=random.choice(USER_AGENTS),
+        TargetUserOrGroupName=ext_email,
+    )
 
     if demo_id:
         event["demo_id"] = demo_id
@@ -816,6 +850,8 @@ def generate_office_audit_logs(
                   file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("office_audit", day + 1, days, hour=hour, events=len(all_events))
             # Calculate natural volume variation
             hour_count = calc_natural_events(
                 base_events_per_hour, start_date, day, hour, "cloud"
@@ -855,12 +891,11 @@ def generate_office_audit_logs(
                 demo_id_count += len(pt_events)
 
     # Sort by CreationTime
-    all_events.sort(key=lambda x: x.get("CreationTime", ""))
+    with telemetry.phase("sort"):
+        all_events.sort(key=lambda x: x.get("CreationTime", ""))
 
     # Write to file
-    with open(output_path, "w") as f:
-        for event in all_events:
-            f.write(json.dumps(event) + "\n")
+    write_events(output_path, all_events, serialize=serialize, encoding="utf-8")
 
     # Final summary
     if not quiet:
@@ -35,6 +35,8 @@ from shared.config import DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_o
 from shared.time_utils import date_add
 from shared.products import PRODUCTS, get_random_product
 from shared.company import get_customer_region
+from shared.output_writer import write_events
+from shared import telemetry
 from scenarios.registry import expand_scenarios
 from scenarios.ops.dead_letter_pricing import DeadLetterPricingScenario
 
@@ -573,7 +575,17 @@ def generate_orders(
     total_revenue_impact = 0.0
     failed_orders = {"payment_declined": 0, "fraud_detected": 0, "address_invalid": 0}
 
+    # Registry is in generation order, so report progress when the day rolls over
+    start_dt = date_add(start_date, 0)
+    last_day = -1
+
     for i, entry in enumerate(order_registry):
+        if progress_callback:
+            day = (datetime.strptime(entry["timestamp"][:10], "%Y-%m-%d") - start_dt).days
+            if day > last_day:
+                last_day = day
+                progress_callback("orders", day + 1, days)
+
         if not quiet and (i + 1) % 100 == 0:
             print(f"  [Orders] Processing {i + 1}/{len(order_registry)}...", file=sys.stderr, end="\r")
 
@@ -598,12 +610,11 @@ def generate_orders(
         total_revenue += total
 
     # Sort all events by timestamp
-    all_events.sort(key=lambda x: x["timestamp"])
+    with telemetry.phase("sort"):
+        all_events.sort(key=lambda x: x["timestamp"])
 
     # Write output
-    with open(output_path, "w") as f:
-        for event in all_events:
-            f.write(json.dumps(event) + "\n")
+    write_events(output_path, all_events, serialize=json.dumps)
 
     event_count = len(all_events)
 
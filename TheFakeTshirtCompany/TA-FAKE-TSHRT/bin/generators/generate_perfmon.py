@@ -31,6 +31,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.config import DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path
 from shared.time_utils import ts_perfmon, date_add, get_hour_activity_level, is_weekend
 from shared.company import WINDOWS_SERVERS, SERVERS, USERS, USER_KEYS, COMP_USER
+from shared.output_writer import write_events
 from scenarios.registry import expand_scenarios
 from scenarios.ops.cpu_runaway import CpuRunawayScenario
 from scenarios.network.ddos_attack import DdosAttackScenario
@@ -543,6 +544,9 @@ def generate_perfmon_logs(
             print(f"  [Perfmon] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})...", file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("perfmon", day + 1, days, hour=hour,
+                                  events=sum(map(len, all_metrics.values())))
             hour_mult = get_hour_multiplier(hour, is_wknd)
 
             # Generate at 5-minute intervals
@@ -597,9 +601,7 @@ def generate_perfmon_logs(
     file_counts = {}
     for metric_type, lines in all_metrics.items():
         output_path = out_dir / f"perfmon_{metric_type}.log"
-        with open(output_path, "w") as f:
-            for line in lines:
-                f.write(line + "\n")
+        write_events(output_path, lines)
         rel_path = f"windows/perfmon_{metric_type}.log"
         file_counts[rel_path] = len(lines)
         total_events += len(lines)
@@ -43,6 +43,8 @@ from shared.time_utils import (
 )
 from shared.company import USERS, get_users_by_department
 from shared.products import PRODUCTS
+from shared.output_writer import open_output, write_lines
+from shared import telemetry
 
 # =============================================================================
 # CONFIGURATION
@@ -920,7 +922,7 @@ def generate_sap_logs(
     doc_counter: Dict[str, int] = {}
     total_events = 0
 
-    with open(output_path, "w") as f:
+    with open_output(output_path) as f:
         for day in range(days):
             if progress_callback:
                 progress_callback("sap", day + 1, days)
@@ -932,6 +934,8 @@ def generate_sap_logs(
             day_events = []
 
             for hour in range(24):
+                if progress_callback:
+                    progress_callback("sap", day + 1, days, hour=hour, events=total_events + len(day_events))
                 # Get orders for this hour
                 hour_key = f"{day}-{hour}"
                 hour_orders = hourly_order_queues.get(hour_key, [])
@@ -972,10 +976,10 @@ def generate_sap_logs(
                 ))
 
             # Sort all events for the day by timestamp (chronological)
-            day_events.sort()
+            with telemetry.phase("sort"):
+                day_events.sort()
 
-            for event in day_events:
-                f.write(event + "\n")
+            write_lines(f, day_events)
 
             total_events += len(day_events)
 
@@ -20,6 +20,7 @@ import argparse
 import hashlib
 import random
 import sys
+from itertools import accumulate
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 
@@ -55,6 +56,8 @@ from shared.company import (
     get_random_user,
     get_us_ip,
 )
+from shared.output_writer import write_events
+from shared import telemetry
 from scenarios.registry import expand_scenarios, is_scenario_active_day
 
 # =============================================================================
@@ -797,6 +800,231 @@ def _generate_audit_event(start_date: str, day: int, hour: int,
     return f"{timestamp}\t{line}"
 
 
+# =============================================================================
+# BATCH ROW ENGINE (baseline traffic)
+# =============================================================================
+#
+# Baseline DNS, proxy and firewall rows are generated an hour at a time,
+# column by column: each random column (timestamp, user, domain, ...) is one
+# random.choices() call over a table of pre-quoted CSV chunks, and a single
+# render pass joins the columns into lines. Random fields that always occur
+# together are folded into one weighted table (user + VPN-vs-office IP,
+# domain + action + response code, URL + proxy action), so a row costs a
+# handful of list lookups instead of a dozen random calls and _csv_quote()s.
+# The column layouts are the same as the _generate_*_event() functions,
+# which are still used for scenario events and one-off overrides.
+
+# "MM:SS" for every second of an hour
+_MM_SS = [f"{minute:02d}:{second:02d}" for minute in range(60) for second in range(60)]
+
+# Share of VPN-enabled users' traffic that comes from the VPN pool (remote)
+_VPN_SHARE = 0.15
+
+
+def _hour_timestamps(start_date: str, day: int, hour: int) -> List[str]:
+    """Every 'YYYY-MM-DD HH:MM:SS' of one hour, for random.choices()."""
+    prefix = f"{date_add(start_date, day).strftime('%Y-%m-%d')} {hour:02d}:"
+    return [prefix + mm_ss for mm_ss in _MM_SS]
+
+
+def _weighted_table(entries: list) -> Tuple[list, list]:
+    """Split (value, weight) pairs into (values, cum_weights) for random.choices()."""
+    return [e[0] for e in entries], list(accumulate(e[1] for e in entries))
+
+
+def _quoted(items: list) -> Tuple[list, list]:
+    """_weighted_table() of a (value, weight) list with every value CSV-quoted."""
+    return _weighted_table([(_csv_quote(value), weight) for value, weight in items])
+
+
+def _user_source_table(render) -> Tuple[list, list]:
+    """One entry per (user, internal IP) with the IP picked as in the single-event path.
+
+    render(user, internal_ip) returns the user's pre-quoted CSV chunk(s).
+    Users are equally likely; a VPN-enabled user's weight is split between
+    the VPN pool IP (_VPN_SHARE) and the office IP.
+    """
+    entries = []
+    for key in USER_KEYS:
+        user = USERS[key]
+        if user.vpn_enabled:
+            entries.append((render(user, user.ip_address), 1 - _VPN_SHARE))
+            entries.append((render(user, user.vpn_ip), _VPN_SHARE))
+        else:
+            entries.append((render(user, user.ip_address), 1.0))
+    return _weighted_table(entries)
+
+
+def _dns_user_chunk(user, internal_ip: str) -> str:
+    most_granular, identities, _ = _get_user_identity(user)
+    return ",".join(_csv_quote(v) for v in (
+        most_granular, identities, internal_ip, TUNNEL_DEVICES[user.location]["wan_ip"]))
+
+
+def _dns_domain_table() -> Tuple[list, list]:
+    """(action, "rcode,domain,...,rule_id") chunks for the 98/1/1 common/infra/blocked mix."""
+    tail = '{rcode},{domain},{categories},"AD Users","AD Users,Internal Networks",{blocked},{rule}'
+    entries = []
+    rcode_total = sum(w for _, w in DNS_RESPONSE_CODES)
+    for domain, categories, blocked in BLOCKED_DOMAINS:
+        for rcode, weight in DNS_RESPONSE_CODES:
+            entries.append(((_csv_quote("Blocked"), tail.format(
+                rcode=_csv_quote(rcode), domain=_csv_quote(domain),
+                categories=_csv_quote(categories), blocked=_csv_quote(blocked),
+                rule=_csv_quote(DNS_POLICY_STRICT))),
+                0.01 / len(BLOCKED_DOMAINS) * weight / rcode_total))
+    for pool, share in ((INFRA_DOMAINS, 0.01), (COMMON_DOMAINS, 0.98)):
+        pool_total = sum(e[2] for e in pool)
+        for domain, categories, weight in pool:
+            entries.append(((_csv_quote("Allowed"), tail.format(
+                rcode=_csv_quote("NOERROR"), domain=_csv_quote(domain),
+                categories=_csv_quote(categories), blocked='""', rule='""')),
+                share * weight / pool_total))
+    return _weighted_table(entries)
+
+
+def _proxy_user_chunk(user, internal_ip: str) -> Tuple[str, str]:
+    """(policy identity .. external IP, identities) chunks of a proxy row."""
+    tunnel = TUNNEL_DEVICES[user.location]
+    return (",".join(_csv_quote(v) for v in (user.username, internal_ip, tunnel["wan_ip"])),
+            _csv_quote(f"{user.username},{tunnel['label']}"))
+
+
+def _proxy_url_table() -> Tuple[list, list]:
+    """(dest IP .. referer, SHA256 .. PUAs, blocked categories) chunks per URL and action."""
+    entries = []
+    action_total = sum(w for _, w in PROXY_ACTIONS)
+    url_total = sum(e[3] for e in PROXY_URLS)
+    for url, content_type, categories, url_weight in PROXY_URLS:
+        dest_ip = _get_dest_ip_for_domain(url.split("//")[1].split("/")[0])
+        content = f'{_csv_quote(_get_sha256_for_content(url))},{_csv_quote(categories)},"",""'
+        for action, action_weight in PROXY_ACTIONS:
+            head = ",".join(_csv_quote(v) for v in (dest_ip, content_type, action, url, ""))
+            blocked = _csv_quote(categories if action == "BLOCKED" else "")
+            entries.append(((head, content, blocked),
+                            url_weight / url_total * action_weight / action_total))
+    return _weighted_table(entries)
+
+
+def _amp_table() -> Tuple[list, list, set]:
+    """AMP disposition chunks; dispositions in the returned set still need a score."""
+    entries, scored = [], set()
+    for disposition, weight in AMP_DISPOSITIONS:
+        if disposition in ("Clean", "Unknown"):
+            entries.append((f'{_csv_quote(disposition)},"",""', weight))
+        else:
+            chunk = f'{_csv_quote(disposition)},"Win.Trojan.Generic",'
+            scored.add(chunk)
+            entries.append((chunk, weight))
+    values, cum_weights = _weighted_table(entries)
+    return values, cum_weights, scored
+
+
+def _fw_user_chunk(user) -> Tuple[str, str]:
+    """(origin ID .. direction, source IP) chunks of a firewall row."""
+    head = ",".join(_csv_quote(v) for v in (
+        f"[org-{ORG_LABEL.lower()}-001]", TUNNEL_DEVICES[user.location]["label"],
+        "CDFW Tunnel Device", "OUTBOUND"))
+    return head, _csv_quote(user.ip_address)
+
+
+def _fw_verdict_table() -> Tuple[list, list]:
+    """"rule_id","verdict" chunks."""
+    return _weighted_table([
+        (f'{_csv_quote(FW_RULE_DENY_ALL if verdict in ("BLOCK", "DROP") else FW_RULE_ALLOW_WEB)},'
+         f'{_csv_quote(verdict)}', weight)
+        for verdict, weight in FW_VERDICTS])
+
+
+_DNS_USERS, _DNS_USERS_CUM = _user_source_table(_dns_user_chunk)
+_DNS_DOMAINS, _DNS_DOMAINS_CUM = _dns_domain_table()
+_DNS_QUERY_TYPES, _DNS_QUERY_TYPES_CUM = _quoted(DNS_QUERY_TYPES)
+_DNS_COUNTRIES, _DNS_COUNTRIES_CUM = _quoted(DNS_DEST_COUNTRIES)
+
+_PROXY_USERS, _PROXY_USERS_CUM = _user_source_table(_proxy_user_chunk)
+_PROXY_URLS, _PROXY_URLS_CUM = _proxy_url_table()
+_PROXY_STATUS, _PROXY_STATUS_CUM = _quoted(HTTP_STATUS_CODES)
+_PROXY_METHODS, _PROXY_METHODS_CUM = _quoted(HTTP_METHODS)
+_PROXY_AGENTS = [_csv_quote(ua) for ua in USER_AGENTS]
+_PROXY_AMP, _PROXY_AMP_CUM, _PROXY_AMP_SCORED = _amp_table()
+_PROXY_REQUEST_SIZES = range(200, 5001)
+_PROXY_RESPONSE_SIZES = range(1000, 200001)
+
+_FW_USERS = [_fw_user_chunk(USERS[key]) for key in USER_KEYS]
+_FW_PROTOCOLS, _FW_PROTOCOLS_CUM = _quoted(FW_IP_PROTOCOLS)
+_FW_PORTS, _FW_PORTS_CUM = _quoted(FW_DEST_PORTS)
+_FW_DEST_IPS = [_csv_quote(ip) for ip in EXT_SERVICE_IPS]
+_FW_DCS = [_csv_quote(dc) for dc in UMBRELLA_DCS]
+_FW_VERDICTS, _FW_VERDICTS_CUM = _fw_verdict_table()
+_FW_PACKET_SIZES = range(64, 1501)
+_FW_SOURCE_PORTS = range(1024, 65536)
+
+_ORG_ID_QUOTED = _csv_quote(ORG_ID)
+
+
+def _dns_rows(timestamps: List[str], n: int) -> List[str]:
+    """n baseline DNS rows ("timestamp\\tcsv line") for one hour."""
+    choices = random.choices
+    org = _ORG_ID_QUOTED
+    return [
+        f'{ts}\t"{ts}",{user},{action},{qtype},{tail},{country},{org}'
+        for ts, user, (action, tail), qtype, country in zip(
+            choices(timestamps, k=n),
+            choices(_DNS_USERS, cum_weights=_DNS_USERS_CUM, k=n),
+            choices(_DNS_DOMAINS, cum_weights=_DNS_DOMAINS_CUM, k=n),
+            choices(_DNS_QUERY_TYPES, cum_weights=_DNS_QUERY_TYPES_CUM, k=n),
+            choices(_DNS_COUNTRIES, cum_weights=_DNS_COUNTRIES_CUM, k=n),
+        )
+    ]
+
+
+def _proxy_rows(timestamps: List[str], n: int) -> List[str]:
+    """n baseline proxy rows ("timestamp\\tcsv line") for one hour."""
+    choices = random.choices
+    randint = random.randint
+    scored = _PROXY_AMP_SCORED
+    amp = [f'{a}"{randint(50, 100)}"' if a in scored else a
+           for a in choices(_PROXY_AMP, cum_weights=_PROXY_AMP_CUM, k=n)]
+    return [
+        f'{ts}\t"{ts}",{head},{url_head},{agent},{status},"{request}","{response}",'
+        f'"{int(response * 0.95)}",{content},{amp_chunk},"AD Users",{blocked},{identities},'
+        f'"AD Users,Internal Networks",{method}'
+        for ts, (head, identities), (url_head, content, blocked), status, method, agent,
+            request, response, amp_chunk in zip(
+            choices(timestamps, k=n),
+            choices(_PROXY_USERS, cum_weights=_PROXY_USERS_CUM, k=n),
+            choices(_PROXY_URLS, cum_weights=_PROXY_URLS_CUM, k=n),
+            choices(_PROXY_STATUS, cum_weights=_PROXY_STATUS_CUM, k=n),
+            choices(_PROXY_METHODS, cum_weights=_PROXY_METHODS_CUM, k=n),
+            choices(_PROXY_AGENTS, k=n),
+            choices(_PROXY_REQUEST_SIZES, k=n),
+            choices(_PROXY_RESPONSE_SIZES, k=n),
+            amp,
+        )
+    ]
+
+
+def _firewall_rows(timestamps: List[str], n: int) -> List[str]:
+    """n baseline firewall rows ("timestamp\\tcsv line") for one hour."""
+    choices = random.choices
+    return [
+        f'{ts}\t"{ts}",{head},{protocol},"{packet}",{src_ip},"{src_port}",'
+        f'{dst_ip},{dst_port},{dc},{verdict}'
+        for ts, (head, src_ip), protocol, packet, src_port, dst_ip, dst_port, dc,
+            verdict in zip(
+            choices(timestamps, k=n),
+            choices(_FW_USERS, k=n),
+            choices(_FW_PROTOCOLS, cum_weights=_FW_PROTOCOLS_CUM, k=n),
+            choices(_FW_PACKET_SIZES, k=n),
+            choices(_FW_SOURCE_PORTS, k=n),
+            choices(_FW_DEST_IPS, k=n),
+            choices(_FW_PORTS, cum_weights=_FW_PORTS_CUM, k=n),
+            choices(_FW_DCS, k=n),
+            choices(_FW_VERDICTS, cum_weights=_FW_VERDICTS_CUM, k=n),
+        )
+    ]
+
+
 # =============================================================================
 # SCENARIO INTEGRATION
 # =============================================================================
@@ -1138,20 +1366,23 @@ def generate_secure_access_logs(
                   file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("secure_access", day + 1, days, hour=hour,
+                                  events=len(dns_events) + len(proxy_events) + len(fw_events) + len(audit_events))
+            # Baseline DNS / proxy / firewall rows, generated column-wise per hour
+            timestamps = _hour_timestamps(start_date, day, hour)
+
             # --- DNS ---
             dns_count = calc_natural_events(dns_base, start_date, day, hour, "cloud")
-            for _ in range(dns_count):
-                dns_events.append(_generate_dns_event(start_date, day, hour))
+            dns_events.extend(_dns_rows(timestamps, dns_count))
 
             # --- Proxy ---
             proxy_count = calc_natural_events(proxy_base, start_date, day, hour, "cloud")
-            for _ in range(proxy_count):
-                proxy_events.append(_generate_proxy_event(start_date, day, hour))
+            proxy_events.extend(_proxy_rows(timestamps, proxy_count))
 
             # --- Firewall ---
             fw_count = calc_natural_events(fw_base, start_date, day, hour, "firewall")
-            for _ in range(fw_count):
-                fw_events.append(_generate_firewall_event(start_date, day, hour))
+            fw_events.extend(_firewall_rows(timestamps, fw_count))
 
             # --- Audit (business hours only, ~15/day) ---
             if 8 <= hour <= 17 and not is_weekend(day_date):
@@ -1192,18 +1423,15 @@ def generate_secure_access_logs(
                 demo_id_counts["proxy"] += len(phish_proxy)
 
     # Sort all events by timestamp (tab-separated prefix)
-    dns_events.sort()
-    proxy_events.sort()
-    fw_events.sort()
-    audit_events.sort()
+    with telemetry.phase("sort"):
+        dns_events.sort()
+        proxy_events.sort()
+        fw_events.sort()
+        audit_events.sort()
 
-    # Write files (strip sort prefix)
+    # Write files (strip the "timestamp\t" sort prefix)
     def _write_csv(path: Path, events: List[str]):
-        with open(path, "w") as f:
-            for ev in events:
-                # Strip the "timestamp\t" sort prefix
-                idx = ev.index("\t")
-                f.write(ev[idx + 1:] + "\n")
+        write_events(path, events, serialize=lambda ev: ev[ev.index("\t") + 1:])
 
     _write_csv(dns_path, dns_events)
     _write_csv(proxy_path, proxy_events)
@@ -30,6 +30,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from shared.config import DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path
 from shared.time_utils import date_add
+from shared.output_writer import write_events
+from shared import telemetry
 from scenarios.registry import expand_scenarios
 from scenarios.ops.dead_letter_pricing import DeadLetterPricingScenario
 
@@ -616,7 +618,17 @@ def generate_servicebus_logs(
     all_events = []
     seq_num = 1
 
+    # Registry is in generation order, so report progress when the day rolls over
+    start_dt = date_add(start_date, 0)
+    last_day = -1
+
     for i, entry in enumerate(order_registry):
+        if progress_callback:
+            day = (datetime.strptime(entry["timestamp"][:10], "%Y-%m-%d") - start_dt).days
+            if day > last_day:
+                last_day = day
+                progress_callback("servicebus", day + 1, days)
+
         if not quiet and (i + 1) % 100 == 0:
             print(f"  [ServiceBus] Processing {i + 1}/{len(order_registry)}...", file=sys.stderr, end="\r")
 
@@ -709,7 +721,8 @@ def generate_servicebus_logs(
             print(f"  [ServiceBus] Dead letter pricing: {dlq_scenario_count} PriceUpdateFailed events", file=sys.stderr)
 
     # Sort by enqueuedTimeUtc
-    all_events.sort(key=lambda x: x["enqueuedTimeUtc"])
+    with telemetry.phase("sort"):
+        all_events.sort(key=lambda x: x["enqueuedTimeUtc"])
 
     # Reassign sequence numbers after sort so they are monotonically increasing
     # Real Azure ServiceBus assigns sequence numbers in enqueue order
@@ -717,9 +730,7 @@ def generate_servicebus_logs(
         event["sequenceNumber"] = idx + 1
 
     # Write output
-    with open(output_path, "w") as f:
-        for event in all_events:
-            f.write(json.dumps(event) + "\n")
+    write_events(output_path, all_events, serialize=json.dumps)
 
     event_count = len(all_events)
     order_count = len(order_registry)
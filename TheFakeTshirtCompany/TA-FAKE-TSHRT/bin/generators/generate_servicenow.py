@@ -31,6 +31,9 @@ from shared.company import (
     USERS, SERVERS, LOCATIONS, USER_KEYS, TENANT,
     ASA_PERIMETER, MERAKI_FIREWALLS, ALL_SERVERS,
 )
+from shared.output_writer import write_events
+from shared.records import slotted
+from shared import telemetry
 
 # =============================================================================
 # CONSTANTS
@@ -1019,6 +1022,7 @@ def get_assignment_member(group_name: str) -> Tuple[str, str]:
 # INCIDENT LIFECYCLE GENERATOR
 # =============================================================================
 
+@slotted
 @dataclass
 class Incident:
     """Represents a ServiceNow incident."""
@@ -1990,9 +1994,7 @@ def generate_servicenow_logs(
     # -------------------------------------------------------------------------
     cmdb_records = generate_cmdb_records(start_date)
 
-    with open(cmdb_path, 'w') as f:
-        for record in cmdb_records:
-            f.write(record + "\n")
+    write_events(cmdb_path, cmdb_records)
 
     if not quiet:
         print(f"  [CMDB] {len(cmdb_records)} records written to {cmdb_path}", file=sys.stderr)
@@ -2025,11 +2027,10 @@ def generate_servicenow_logs(
         scenario_events = generate_scenario_incidents(base_date, day, scenarios)
         all_incidents.extend(scenario_events)
 
-    all_incidents.sort(key=_get_timestamp)
+    with telemetry.phase("sort"):
+        all_incidents.sort(key=_get_timestamp)
 
-    with open(incident_path, 'w') as f:
-        for event in all_incidents:
-            f.write(event + "\n")
+    write_events(incident_path, all_incidents)
 
     if not quiet:
         print(f"  [Incidents] {len(all_incidents)} events written to {incident_path}", file=sys.stderr)
@@ -2058,11 +2059,10 @@ def generate_servicenow_logs(
         scenario_chg = generate_scenario_changes(base_date, day, scenarios)
         all_changes.extend(scenario_chg)
 
-    all_changes.sort(key=_get_timestamp)
+    with telemetry.phase("sort"):
+        all_changes.sort(key=_get_timestamp)
 
-    with open(change_path, 'w') as f:
-        for event in all_changes:
-            f.write(event + "\n")
+    write_events(change_path, all_changes)
 
     if not quiet:
         print(f"  [Changes] {len(all_changes)} events written to {change_path}", file=sys.stderr)
@@ -39,6 +39,7 @@ import hashlib
 import random
 import sys
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict
 
@@ -55,6 +56,8 @@ from shared.company import (
     THREAT_IP, PHISHING_DOMAIN,
     get_mac_for_ip, get_random_mac,
 )
+from shared.output_writer import write_events
+from shared import telemetry
 from scenarios.registry import expand_scenarios
 
 
@@ -551,14 +554,26 @@ _PROFILE_WEIGHTS = [p["weight"] for p in CLIENT_APP_PROFILES]
 # HELPER FUNCTIONS
 # =============================================================================
 
+# Cache bounds: seeded GUIDs repeat per logon session / process-hour, hashes
+# per executable or DLL path (client profile paths include the username)
+_GUID_CACHE_SIZE = 16384
+_HASH_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_GUID_CACHE_SIZE)
+def _seeded_guid(seed: str) -> str:
+    h = hashlib.md5(seed.encode()).hexdigest().upper()
+    return f"{{{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}}}"
+
+
 def _generate_guid(seed: str = None) -> str:
     """Generate a process GUID. If seed provided, deterministic."""
     if seed:
-        h = hashlib.md5(seed.encode()).hexdigest()
-        return f"{{{h[:8].upper()}-{h[8:12].upper()}-{h[12:16].upper()}-{h[16:20].upper()}-{h[20:32].upper()}}}"
+        return _seeded_guid(seed)
     return f"{{{random.randint(0, 0xFFFFFFFF):08X}-{random.randint(0, 0xFFFF):04X}-{random.randint(0, 0xFFFF):04X}-{random.randint(0, 0xFFFF):04X}-{random.randint(0, 0xFFFFFFFFFFFF):012X}}}"
 
 
+@lru_cache(maxsize=_HASH_CACHE_SIZE)
 def _generate_hashes(image_path: str) -> str:
     """Generate deterministic hash quartet from image path (SHA256, MD5, SHA1, IMPHASH)."""
     h = hashlib.sha256(image_path.encode()).hexdigest()
@@ -582,11 +597,15 @@ def _kv_header(event_id: int, computer: str, ts: datetime, demo_id: str = None)
         ComputerName=<fqdn>
         TaskCategory=<label>
     """
-    ts_str = ts.strftime("%m/%d/%Y %I:%M:%S %p")
-    task_cat = TASK_CATEGORIES.get(event_id, "Unknown")
+    return ts.strftime("%m/%d/%Y %I:%M:%S %p") + _kv_header_fields(event_id, computer)
+
 
+@lru_cache(maxsize=4096)
+def _kv_header_fields(event_id: int, computer: str) -> str:
+    """Constant part of the KV header for one EventCode on one host."""
+    task_cat = TASK_CATEGORIES.get(event_id, "Unknown")
     return (
-        f"{ts_str}\n"
+        f"\n"
         f"LogName=Microsoft-Windows-Sysmon/Operational\n"
         f"SourceName=Microsoft-Windows-Sysmon\n"
         f"EventCode={event_id}\n"
@@ -609,21 +628,16 @@ def _wrap_kv_event(header: str, message_label: str,
         ...
         demo_id=<scenario>   (if present)
     """
-    body = "\n".join(f"{line}" for line in message_lines)
+    body = "\n".join(message_lines)
     event = f"{header}\nMessage={message_label}\n{body}"
     # Insert demo_id after Type= line in the header
     if demo_id:
-        lines = event.split("\n")
-        result = []
-        inserted = False
-        for line in lines:
-            result.append(line)
-            if not inserted and line.startswith("Type="):
-                result.append(f"demo_id={demo_id}")
-                inserted = True
-        if not inserted:
-            result.append(f"demo_id={demo_id}")
-        event = "\n".join(result)
+        type_line = event.find("\nType=")
+        line_end = event.find("\n", type_line + 1) if type_line != -1 else -1
+        if line_end == -1:
+            event = f"{event}\ndemo_id={demo_id}"
+        else:
+            event = f"{event[:line_end]}\ndemo_id={demo_id}{event[line_end:]}"
     return event
 
 
@@ -2190,6 +2204,9 @@ def generate_sysmon_logs(
             workstations = select_sampled_workstations(day, count=20)
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("sysmon", day + 1, days, hour=hour,
+                                  events=len(all_events) + len(day_events))
             # Calculate events per server for this hour
             server_count = calc_natural_events(
                 int(SERVER_BASE_EVENTS_PER_HOUR * scale),
@@ -2240,12 +2257,11 @@ def generate_sysmon_logs(
             print(f"  Day {day:2d} ({day_name}): {len(day_events):,} events")
 
     # Sort by timestamp (extracted from first line of each KV event)
-    all_events.sort(key=_extract_timestamp)
+    with telemetry.phase("sort"):
+        all_events.sort(key=_extract_timestamp)
 
     # Write output
-    with open(output_path, "w", encoding="utf-8") as f:
-        for event in all_events:
-            f.write(event + "\n")
+    write_events(output_path, all_events, encoding="utf-8")
 
     total = len(all_events)
     if not quiet:
@@ -37,6 +37,8 @@ from shared.company import (
     MEETING_ROOMS, WEBEX_DEVICE_PROFILES, get_device_voice_ip,
 )
 from shared.meeting_schedule import _meeting_schedule
+from shared.output_writer import write_events
+from shared import telemetry
 from scenarios.registry import expand_scenarios
 
 # =============================================================================
@@ -940,32 +942,19 @@ def generate_webex_api_logs(
             print(f"  [Webex API] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
 
     # Sort by timestamp
-    all_meetings.sort(key=lambda x: x["start"])
-    all_admin_audits.sort(key=lambda x: x["created"])
-    all_security_audits.sort(key=lambda x: x["created"])
-    all_meeting_qualities.sort(key=lambda x: x["joinTime"])
-    all_call_histories.sort(key=lambda x: x["Start time"])
+    with telemetry.phase("sort"):
+        all_meetings.sort(key=lambda x: x["start"])
+        all_admin_audits.sort(key=lambda x: x["created"])
+        all_security_audits.sort(key=lambda x: x["created"])
+        all_meeting_qualities.sort(key=lambda x: x["joinTime"])
+        all_call_histories.sort(key=lambda x: x["Start time"])
 
     # Write files
-    with open(meetings_file, "w") as f:
-        for record in all_meetings:
-            f.write(json.dumps(record) + "\n")
-
-    with open(admin_audit_file, "w") as f:
-        for record in all_admin_audits:
-            f.write(json.dumps(record) + "\n")
-
-    with open(security_audit_file, "w") as f:
-        for record in all_security_audits:
-            f.write(json.dumps(record) + "\n")
-
-    with open(meeting_qualities_file, "w") as f:
-        for record in all_meeting_qualities:
-            f.write(json.dumps(record) + "\n")
-
-    with open(call_history_file, "w") as f:
-        for record in all_call_histories:
-            f.write(json.dumps(record) + "\n")
+    write_events(meetings_file, all_meetings, serialize=json.dumps)
+    write_events(admin_audit_file, all_admin_audits, serialize=json.dumps)
+    write_events(security_audit_file, all_security_audits, serialize=json.dumps)
+    write_events(meeting_qualities_file, all_meeting_qualities, serialize=json.dumps)
+    write_events(call_history_file, all_call_histories, serialize=json.dumps)
 
     total_records = (
         len(all_meetings) + len(all_admin_audits) + len(all_security_audits) +
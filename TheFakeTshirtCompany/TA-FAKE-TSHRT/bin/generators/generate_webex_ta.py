@@ -31,6 +31,8 @@ from shared.company import (
     get_device_voice_ip,
 )
 from shared.meeting_schedule import _meeting_schedule
+from shared.output_writer import write_events
+from shared import telemetry
 from scenarios.registry import expand_scenarios
 
 # =============================================================================
@@ -776,17 +778,13 @@ def generate_webex_ta_logs(
             print(f"  [Webex TA] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
 
     # Sort by timestamp
-    meeting_usage_records.sort(key=lambda x: x["meetingStartTime"])
-    attendee_records.sort(key=lambda x: x["joinTime"])
+    with telemetry.phase("sort"):
+        meeting_usage_records.sort(key=lambda x: x["meetingStartTime"])
+        attendee_records.sort(key=lambda x: x["joinTime"])
 
     # Write files
-    with open(meetingusage_file, "w") as f:
-        for record in meeting_usage_records:
-            f.write(json.dumps(record) + "\n")
-
-    with open(attendee_file, "w") as f:
-        for record in attendee_records:
-            f.write(json.dumps(record) + "\n")
+    write_events(meetingusage_file, meeting_usage_records, serialize=json.dumps)
+    write_events(attendee_file, attendee_records, serialize=json.dumps)
 
     total_records = len(meeting_usage_records) + len(attendee_records)
     file_counts = {
@@ -16,15 +16,19 @@ Scenarios:
 
 import argparse
 import random
+import struct
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from string import Formatter
+from typing import Dict, List, Optional, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from shared.config import DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE, get_output_path, Config
 from shared.time_utils import ts_winevent, date_add, calc_natural_events, TimeUtils
 from shared.company import USERS, USER_KEYS, WINDOWS_SERVERS, get_random_user, get_internal_ip, Company
+from shared.output_writer import write_events
 from scenarios.security import RansomwareAttemptScenario
 from scenarios.security.phishing_test import PhishingTestScenario
 from scenarios.registry import expand_scenarios
@@ -62,53 +66,130 @@ def get_record_number() -> int:
     return RECORD_NUMBER
 
 
-def _insert_demo_id(event: str, demo_id: str) -> str:
-    """Insert demo_id field after the Type=<xyz> line in a WinEventLog event.
+class WinEventTemplate:
+    """A multiline WinEventLog event compiled into constant chunks and slots.
 
-    Moves demo_id from the bottom of the event to just after the Type= line,
-    making it easier to spot in Splunk and consistent with field ordering.
+    `text` is the whole event as a str.format string ({computer}, {logon_id:X},
+    {{ for a literal brace). It is parsed once into the constant chunks
+    between fields; render() is generated from them and builds the event
+    with a single join, so emitting an event costs one call:
 
-    Before: ...Type=Information\\nComputerName=...\\n...demo_id=exfil\\n
-    After:  ...Type=Information\\ndemo_id=exfil\\nComputerName=...\\n...
-    """
-    if not demo_id:
-        return event
-
-    tag = f"demo_id={demo_id}\n"
+        template.render(ts=ts, computer="DC-BOS-01", record=17, demo_id="exfil")
 
-    # Find "Type=" line and insert demo_id after it
-    lines = event.split("\n")
-    result = []
-    inserted = False
-    for line in lines:
-        result.append(line)
-        if not inserted and line.startswith("Type="):
-            result.append(f"demo_id={demo_id}")
-            inserted = True
-
-    if not inserted:
-        # Fallback: append at end if no Type= line found
-        result.append(f"demo_id={demo_id}")
+    Every field is a keyword argument of render(). demo_id is optional; when
+    set, a demo_id=<value> line is placed right after the Type= line, which
+    keeps it near the top of the event in Splunk.
+    """
 
-    return "\n".join(result)
+    def __init__(self, text: str):
+        type_line = text.find("\nType=")
+        if type_line < 0:
+            raise ValueError("WinEventLog template has no Type= line")
+        cut = text.index("\n", type_line + 1) + 1
+
+        namespace = {}
+        fields = []
+        parts = []
+        for segment, after in ((text[:cut], "{dm}"), (text[cut:], "")):
+            for literal, field, spec, conversion in Formatter().parse(segment):
+                if literal:
+                    name = f"L{len(namespace)}"
+                    namespace[name] = literal
+                    parts.append(f"{{{name}}}")
+                if field is None:
+                    continue
+                if not field.isidentifier() or conversion or field in ("dm", "demo_id"):
+                    raise ValueError(f"Unsupported template field: {field!r}")
+                if field not in fields:
+                    fields.append(field)
+                parts.append(f"{{{field}:{spec}}}" if spec else f"{{{field}}}")
+            parts.append(after)
+
+        src = (
+            f"def render({', '.join(fields)}, demo_id=None):\n"
+            "    dm = f'demo_id={demo_id}\\n' if demo_id else ''\n"
+            f"    return f\"{''.join(parts)}\"\n"
+        )
+        exec(src, namespace)
+        self.text = text
+        self.fields = tuple(fields)
+        self.render = namespace["render"]
+
+
+# {EventCode: template} for every fixed-layout event this generator emits
+WINEVENT_TEMPLATES: Dict[int, WinEventTemplate] = {}
+
+
+def _event_text(log_name: str, source: str, event_code, event_type, type_str: str,
+                task_category: str, keywords: str, body: str) -> str:
+    """Standard WinEventLog header lines followed by the event body."""
+    return (f"{{ts}}\nLogName={log_name}\nSourceName={source}\nEventCode={event_code}\n"
+            f"EventType={event_type}\nType={type_str}\nComputerName={{computer}}\n"
+            f"TaskCategory={task_category}\nRecordNumber={{record}}\nKeywords={keywords}\n"
+            f"{body}")
+
+
+def _security_template(event_code: int, task_category: str, body: str,
+                       keywords: str = "Audit Success") -> WinEventTemplate:
+    return WinEventTemplate(_event_text("Security", "Microsoft-Windows-Security-Auditing",
+                                        event_code, 0, "Information", task_category,
+                                        keywords, body))
+
+
+def _system_template(source: str, event_code: int, body: str, event_type: int = 4,
+                     type_str: str = "Information") -> WinEventTemplate:
+    return WinEventTemplate(_event_text("System", source, event_code, event_type, type_str,
+                                        "None", "Classic", body))
+
+
+@lru_cache(maxsize=1024)
+def _winevent_hour(base_date: str, day: int, hour: int) -> Tuple[str, str]:
+    """ts_winevent() split around MM:SS for one hour: ("01/06/2026 10:", " AM")."""
+    ts = ts_winevent(base_date, day, hour, 0, 0)
+    return ts[:14], ts[19:]
+
+
+def _winevent_ts(base_date: str, day: int, hour: int, minute: int, second: int) -> str:
+    """Same as ts_winevent(), without parsing base_date for every event."""
+    head, tail = _winevent_hour(base_date, day, hour)
+    return f"{head}{minute:02d}:{second:02d}{tail}"
+
+
+@lru_cache(maxsize=1024)
+def _weekday(base_date: str, day: int) -> int:
+    """date_add(base_date, day).weekday(), cached (asked for every client hour)."""
+    return date_add(base_date, day).weekday()
+
+
+# Batched random draws: (low, span) ranges for _draw(), matching the
+# random.randint(low, low + span - 1) calls they replace.
+_SID_PART = (1000000000, 9000000000)
+_SID_RID = (1000, 9000)
+_LOGON_ID = (100000, 900000)
+_CLIENT_PORT = (49152, 16384)
+_PROCESS_ID = (1000, 64536)
+_GUID_PARTS = ((10000000, 90000000), (1000, 9000), (1000, 9000), (1000, 9000),
+               (100000000000, 900000000000))
+
+
+@lru_cache(maxsize=None)
+def _word_unpacker(n: int):
+    return struct.Struct(f"<{n}Q").unpack
+
+
+def _draw(*ranges: Tuple[int, int]) -> List[int]:
+    """One uniform int per (low, span) range, all from one getrandbits() call.
+
+    Each value scales a 64-bit word into its span (multiply-shift, bias below
+    span / 2**64), so an event's IDs, GUID and port cost one call into the
+    random module instead of one randint() each.
+    """
+    n = len(ranges)
+    words = _word_unpacker(n)(random.getrandbits(64 * n).to_bytes(8 * n, "little"))
+    return [low + ((word * span) >> 64) for word, (low, span) in zip(words, ranges)]
 
 
-def event_4624(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str, logon_type: int, source_ip: str) -> str:
-    """Generate successful logon event (4624)."""
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4624
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Logon
-RecordNumber={record}
-Keywords=Audit Success
+WINEVENT_TEMPLATES[4624] = _security_template(4624, "Logon", """\
 Message=An account was successfully logged on.
 
 Subject:
@@ -124,35 +205,32 @@ Logon Information:
 \tElevated Token:\t\tYes
 
 New Logon:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tSecurity ID:\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 \tAccount Name:\t\t{user}
 \tAccount Domain:\t\tFAKETSHIRTCO
-\tLogon ID:\t\t0x{random.randint(100000, 999999):X}
-\tLogon GUID:\t\t{{{random.randint(10000000, 99999999):08x}-{random.randint(1000, 9999):04x}-{random.randint(1000, 9999):04x}-{random.randint(1000, 9999):04x}-{random.randint(100000000000, 999999999999):012x}}}
+\tLogon ID:\t\t0x{logon_id:X}
+\tLogon GUID:\t\t{{{g0:08x}-{g1:04x}-{g2:04x}-{g3:04x}-{g4:012x}}}
 
 Network Information:
-\tWorkstation Name:\t{user.split('.')[0].upper()}-PC
+\tWorkstation Name:\t{workstation}
 \tSource Network Address:\t{source_ip}
-\tSource Port:\t\t{random.randint(49152, 65535)}
-"""
+\tSource Port:\t\t{port}
+""")
 
 
-def event_4625(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str, source_ip: str, reason: str) -> str:
-    """Generate failed logon event (4625)."""
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4625
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Logon
-RecordNumber={record}
-Keywords=Audit Failure
+def event_4624(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, logon_type: int, source_ip: str) -> str:
+    """Generate successful logon event (4624)."""
+    sid_a, sid_b, rid, logon_id, g0, g1, g2, g3, g4, port = _draw(
+        _SID_PART, _SID_PART, _SID_RID, _LOGON_ID, *_GUID_PARTS, _CLIENT_PORT)
+    return WINEVENT_TEMPLATES[4624].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), logon_type=logon_type, sid_a=sid_a, sid_b=sid_b,
+        rid=rid, user=user, logon_id=logon_id, g0=g0, g1=g1, g2=g2, g3=g3, g4=g4,
+        workstation=f"{user.split('.')[0].upper()}-PC", source_ip=source_ip, port=port)
+
+
+WINEVENT_TEMPLATES[4625] = _security_template(4625, "Logon", """\
 Message=An account failed to log on.
 
 Subject:
@@ -176,33 +254,29 @@ Failure Information:
 Network Information:
 \tWorkstation Name:\t-
 \tSource Network Address:\t{source_ip}
-\tSource Port:\t\t{random.randint(49152, 65535)}
-"""
+\tSource Port:\t\t{port}
+""", keywords="Audit Failure")
 
 
-def event_4672(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str) -> str:
-    """Generate special privileges assigned event (4672)."""
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4672
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Special Logon
-RecordNumber={record}
-Keywords=Audit Success
+def event_4625(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, source_ip: str, reason: str,
+               demo_id: str = None) -> str:
+    """Generate failed logon event (4625)."""
+    port, = _draw(_CLIENT_PORT)
+    return WINEVENT_TEMPLATES[4625].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), user=user, reason=reason, source_ip=source_ip,
+        port=port, demo_id=demo_id)
+
+
+WINEVENT_TEMPLATES[4672] = _security_template(4672, "Special Logon", """\
 Message=Special privileges assigned to new logon.
 
 Subject:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-500
+\tSecurity ID:\t\tS-1-5-21-{sid_a}-{sid_b}-500
 \tAccount Name:\t\t{user}
 \tAccount Domain:\t\tFAKETSHIRTCO
-\tLogon ID:\t\t0x{random.randint(100000, 999999):X}
+\tLogon ID:\t\t0x{logon_id:X}
 
 Privileges:\t\tSeSecurityPrivilege
 \t\t\tSeTakeOwnershipPrivilege
@@ -212,29 +286,32 @@ Privileges:\t\tSeSecurityPrivilege
 \t\t\tSeDebugPrivilege
 \t\t\tSeSystemEnvironmentPrivilege
 \t\t\tSeImpersonatePrivilege
-"""
+""")
 
 
-def event_1074(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, reason: str) -> str:
-    """Generate system restart event (1074)."""
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=System
-SourceName=User32
-EventCode=1074
-EventType=4
-Type=Information
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
+def event_4672(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, demo_id: str = None) -> str:
+    """Generate special privileges assigned event (4672)."""
+    sid_a, sid_b, logon_id = _draw(_SID_PART, _SID_PART, _LOGON_ID)
+    return WINEVENT_TEMPLATES[4672].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), sid_a=sid_a, sid_b=sid_b, user=user,
+        logon_id=logon_id, demo_id=demo_id)
+
+
+WINEVENT_TEMPLATES[1074] = _system_template("User32", 1074, """\
 Message=The process C:\\Windows\\system32\\winlogon.exe (SYSTEM) has initiated the restart of computer {computer} on behalf of user NT AUTHORITY\\SYSTEM for the following reason: {reason}
 \tReason Code: 0x80020003
 \tShutdown Type: restart
-"""
+""")
+
+
+def event_1074(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, reason: str) -> str:
+    """Generate system restart event (1074)."""
+    return WINEVENT_TEMPLATES[1074].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), reason=reason)
 
 
 # =============================================================================
@@ -373,177 +450,101 @@ def _dc_for_client(client) -> str:
     return random.choice(["DC-BOS-01", "DC-BOS-02"])
 
 
+WINEVENT_TEMPLATES[7036] = _system_template("Service Control Manager", 7036, """\
+Message=The {service} service entered the {state} state.
+""")
+
+
 def event_7036_service_state(ts: str, computer: str, service: str, state: str) -> str:
     """Generate service state change event (7036) - most common System event."""
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=System
-SourceName=Service Control Manager
-EventCode=7036
-EventType=4
-Type=Information
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
-Message=The {service} service entered the {state} state.
-"""
+    return WINEVENT_TEMPLATES[7036].render(ts=ts, computer=computer, record=get_record_number(),
+                                           service=service, state=state)
+
+
+WINEVENT_TEMPLATES[6005] = _system_template("EventLog", 6005, """\
+Message=The Event log service was started.
+""")
 
 
 def event_6005_eventlog_started(ts: str, computer: str) -> str:
     """Generate Event Log service started event (6005) - indicates system boot."""
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=System
-SourceName=EventLog
-EventCode=6005
-EventType=4
-Type=Information
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
-Message=The Event log service was started.
-"""
+    return WINEVENT_TEMPLATES[6005].render(ts=ts, computer=computer, record=get_record_number())
+
+
+WINEVENT_TEMPLATES[6013] = _system_template("EventLog", 6013, """\
+Message=The system uptime is {uptime_seconds} seconds.
+""")
 
 
 def event_6013_uptime(ts: str, computer: str, uptime_seconds: int) -> str:
     """Generate system uptime event (6013) - logged daily."""
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=System
-SourceName=EventLog
-EventCode=6013
-EventType=4
-Type=Information
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
-Message=The system uptime is {uptime_seconds} seconds.
-"""
+    return WINEVENT_TEMPLATES[6013].render(ts=ts, computer=computer, record=get_record_number(),
+                                           uptime_seconds=uptime_seconds)
+
+
+WINEVENT_TEMPLATES[37] = _system_template("Microsoft-Windows-Time-Service", 37, """\
+Message=The time provider NtpClient is currently receiving valid time data from {time_source}.
+""")
 
 
 def event_37_time_sync(ts: str, computer: str, time_source: str) -> str:
     """Generate time synchronization success event (37) - W32Time."""
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=System
-SourceName=Microsoft-Windows-Time-Service
-EventCode=37
-EventType=4
-Type=Information
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
-Message=The time provider NtpClient is currently receiving valid time data from {time_source}.
-"""
+    return WINEVENT_TEMPLATES[37].render(ts=ts, computer=computer, record=get_record_number(),
+                                         time_source=time_source)
 
 
-def event_10016_dcom(ts: str, computer: str, clsid: str, appname: str) -> str:
-    """Generate DCOM permission error (10016) - common noise event."""
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=System
-SourceName=Microsoft-Windows-DistributedCOM
-EventCode=10016
-EventType=3
-Type=Warning
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
+WINEVENT_TEMPLATES[10016] = _system_template("Microsoft-Windows-DistributedCOM", 10016, """\
 Message=The application-specific permission settings do not grant Local Activation permission for the COM Server application with CLSID {clsid} and APPID {clsid} to the user NT AUTHORITY\\SYSTEM SID (S-1-5-18) from address LocalHost (Using LRPC) running in the application container Unavailable SID (Unavailable). This security permission can be modified using the Component Services administrative tool.
 AppName={appname}
-"""
+""", event_type=3, type_str="Warning")
+
+
+def event_10016_dcom(ts: str, computer: str, clsid: str, appname: str) -> str:
+    """Generate DCOM permission error (10016) - common noise event."""
+    return WINEVENT_TEMPLATES[10016].render(ts=ts, computer=computer, record=get_record_number(),
+                                            clsid=clsid, appname=appname)
+
+
+WINEVENT_TEMPLATES[1014] = _system_template("Microsoft-Windows-DNS-Client", 1014, """\
+Message=Name resolution for the name {domain} timed out after none of the configured DNS servers responded.
+""", event_type=2, type_str="Warning")
 
 
 def event_1014_dns_timeout(ts: str, computer: str, domain: str) -> str:
     """Generate DNS resolution timeout event (1014)."""
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=System
-SourceName=Microsoft-Windows-DNS-Client
-EventCode=1014
-EventType=2
-Type=Warning
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
-Message=Name resolution for the name {domain} timed out after none of the configured DNS servers responded.
-"""
+    return WINEVENT_TEMPLATES[1014].render(ts=ts, computer=computer, record=get_record_number(),
+                                           domain=domain)
+
+
+WINEVENT_TEMPLATES[12] = _system_template("Microsoft-Windows-Kernel-General", 12, """\
+Message=The operating system started at system time {boot_date}.
+""")
 
 
 def event_12_kernel_boot(ts: str, computer: str) -> str:
     """Generate kernel boot event (12) - system startup."""
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=System
-SourceName=Microsoft-Windows-Kernel-General
-EventCode=12
-EventType=4
-Type=Information
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
-Message=The operating system started at system time {ts.split()[0]}.
-"""
+    return WINEVENT_TEMPLATES[12].render(ts=ts, computer=computer, record=get_record_number(),
+                                         boot_date=ts.split()[0])
+
+
+WINEVENT_TEMPLATES[6009] = _system_template("EventLog", 6009, """\
+Message=Microsoft (R) Windows (R) 10.0.17763 (Build 17763.5206).
+""")
 
 
 def event_6009_os_version(ts: str, computer: str) -> str:
     """Generate OS version event (6009) - logged at boot."""
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=System
-SourceName=EventLog
-EventCode=6009
-EventType=4
-Type=Information
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
-Message=Microsoft (R) Windows (R) 10.0.17763 (Build 17763.5206).
-"""
+    return WINEVENT_TEMPLATES[6009].render(ts=ts, computer=computer, record=get_record_number())
 
 
-def event_4688(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str, process_name: str, command_line: str,
-               demo_id: str = None) -> str:
-    """Generate process creation event (4688)."""
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-    process_id = random.randint(1000, 65535)
-    parent_process_id = random.randint(500, 5000)
-
-    event = f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4688
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Process Creation
-RecordNumber={record}
-Keywords=Audit Success
+WINEVENT_TEMPLATES[4688] = _security_template(4688, "Process Creation", """\
 Message=A new process has been created.
 
 Creator Subject:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tSecurity ID:\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 \tAccount Name:\t\t{user}
 \tAccount Domain:\t\tFAKETSHIRTCO
-\tLogon ID:\t\t0x{random.randint(100000, 999999):X}
+\tLogon ID:\t\t0x{logon_id:X}
 
 Target Subject:
 \tSecurity ID:\t\tS-1-0-0
@@ -559,224 +560,186 @@ Process Information:
 \tCreator Process ID:\t0x{parent_process_id:X}
 \tCreator Process Name:\tC:\\Windows\\System32\\cmd.exe
 \tProcess Command Line:\t{command_line}
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+""")
 
 
-def event_4634(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str, logon_type: int = 2) -> str:
-    """Generate logoff event (4634)."""
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    return f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4634
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Logoff
-RecordNumber={record}
-Keywords=Audit Success
+def event_4688(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, process_name: str, command_line: str,
+               demo_id: str = None) -> str:
+    """Generate process creation event (4688)."""
+    process_id, parent_process_id, sid_a, sid_b, rid, logon_id = _draw(
+        _PROCESS_ID, (500, 4501), _SID_PART, _SID_PART, _SID_RID, _LOGON_ID)
+    return WINEVENT_TEMPLATES[4688].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), sid_a=sid_a, sid_b=sid_b, rid=rid, user=user,
+        logon_id=logon_id, process_id=process_id, process_name=process_name,
+        parent_process_id=parent_process_id, command_line=command_line, demo_id=demo_id)
+
+
+WINEVENT_TEMPLATES[4634] = _security_template(4634, "Logoff", """\
 Message=An account was logged off.
 
 Subject:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tSecurity ID:\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 \tAccount Name:\t\t{user}
 \tAccount Domain:\t\tFAKETSHIRTCO
-\tLogon ID:\t\t0x{random.randint(100000, 999999):X}
+\tLogon ID:\t\t0x{logon_id:X}
 
 Logon Type:\t\t{logon_type}
-"""
+""")
 
 
-def event_4689(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str, process_name: str) -> str:
-    """Generate process termination event (4689)."""
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-    process_id = random.randint(1000, 65535)
-
-    return f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4689
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Process Termination
-RecordNumber={record}
-Keywords=Audit Success
+def event_4634(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, logon_type: int = 2) -> str:
+    """Generate logoff event (4634)."""
+    sid_a, sid_b, rid, logon_id = _draw(_SID_PART, _SID_PART, _SID_RID, _LOGON_ID)
+    return WINEVENT_TEMPLATES[4634].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), sid_a=sid_a, sid_b=sid_b, rid=rid, user=user,
+        logon_id=logon_id, logon_type=logon_type)
+
+
+WINEVENT_TEMPLATES[4689] = _security_template(4689, "Process Termination", """\
 Message=A process has exited.
 
 Subject:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tSecurity ID:\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 \tAccount Name:\t\t{user}
 \tAccount Domain:\t\tFAKETSHIRTCO
-\tLogon ID:\t\t0x{random.randint(100000, 999999):X}
+\tLogon ID:\t\t0x{logon_id:X}
 
 Process Information:
 \tProcess ID:\t0x{process_id:X}
 \tProcess Name:\t{process_name}
 \tExit Status:\t0x0
-"""
+""")
 
 
-def event_4728(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, admin_user: str, target_user: str, group_name: str,
-               demo_id: str = None) -> str:
-    """Generate member added to security-enabled global group event (4728)."""
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    event = f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4728
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Security Group Management
-RecordNumber={record}
-Keywords=Audit Success
+def event_4689(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, process_name: str) -> str:
+    """Generate process termination event (4689)."""
+    process_id, sid_a, sid_b, rid, logon_id = _draw(
+        _PROCESS_ID, _SID_PART, _SID_PART, _SID_RID, _LOGON_ID)
+    return WINEVENT_TEMPLATES[4689].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), sid_a=sid_a, sid_b=sid_b, rid=rid, user=user,
+        logon_id=logon_id, process_id=process_id, process_name=process_name)
+
+
+WINEVENT_TEMPLATES[4728] = _security_template(4728, "Security Group Management", """\
 Message=A member was added to a security-enabled global group.
 
 Subject:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-500
+\tSecurity ID:\t\tS-1-5-21-{admin_sid_a}-{admin_sid_b}-500
 \tAccount Name:\t\t{admin_user}
 \tAccount Domain:\t\tFAKETSHIRTCO
-\tLogon ID:\t\t0x{random.randint(100000, 999999):X}
+\tLogon ID:\t\t0x{logon_id:X}
 
 Member:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tSecurity ID:\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 \tAccount Name:\t\tCN={target_user},CN=Users,DC=faketshirtco,DC=com
 
 Group:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-512
+\tSecurity ID:\t\tS-1-5-21-{group_sid_a}-{group_sid_b}-512
 \tGroup Name:\t\t{group_name}
 \tGroup Domain:\t\tFAKETSHIRTCO
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+""")
 
 
-def event_4769(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str, service_name: str, source_ip: str,
+def event_4728(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, admin_user: str, target_user: str, group_name: str,
                demo_id: str = None) -> str:
-    """Generate Kerberos service ticket requested event (4769)."""
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    event = f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4769
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Kerberos Service Ticket Operations
-RecordNumber={record}
-Keywords=Audit Success
+    """Generate member added to security-enabled global group event (4728)."""
+    admin_sid_a, admin_sid_b, logon_id, sid_a, sid_b, rid, group_sid_a, group_sid_b = _draw(
+        _SID_PART, _SID_PART, _LOGON_ID, _SID_PART, _SID_PART, _SID_RID, _SID_PART, _SID_PART)
+    return WINEVENT_TEMPLATES[4728].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), admin_sid_a=admin_sid_a, admin_sid_b=admin_sid_b,
+        admin_user=admin_user, logon_id=logon_id, sid_a=sid_a, sid_b=sid_b, rid=rid,
+        target_user=target_user, group_sid_a=group_sid_a, group_sid_b=group_sid_b,
+        group_name=group_name, demo_id=demo_id)
+
+
+WINEVENT_TEMPLATES[4769] = _security_template(4769, "Kerberos Service Ticket Operations", """\
 Message=A Kerberos service ticket was requested.
 
 Account Information:
 \tAccount Name:\t\t{user}@FAKETSHIRTCO.COM
 \tAccount Domain:\t\tFAKETSHIRTCO.COM
-\tLogon GUID:\t\t{{{random.randint(10000000, 99999999):08x}-{random.randint(1000, 9999):04x}-{random.randint(1000, 9999):04x}-{random.randint(1000, 9999):04x}-{random.randint(100000000000, 999999999999):012x}}}
+\tLogon GUID:\t\t{{{g0:08x}-{g1:04x}-{g2:04x}-{g3:04x}-{g4:012x}}}
 
 Service Information:
 \tService Name:\t\t{service_name}
-\tService ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tService ID:\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 
 Network Information:
 \tClient Address:\t\t::ffff:{source_ip}
-\tClient Port:\t\t{random.randint(49152, 65535)}
+\tClient Port:\t\t{port}
 
 Additional Information:
 \tTicket Options:\t\t0x40810000
 \tTicket Encryption Type:\t0x12
 \tFailure Code:\t\t0x0
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+""")
 
 
-def event_4724(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, admin_user: str, target_user: str,
+def event_4769(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, service_name: str, source_ip: str,
                demo_id: str = None) -> str:
-    """Generate password reset attempt event (4724).
+    """Generate Kerberos service ticket requested event (4769)."""
+    g0, g1, g2, g3, g4, sid_a, sid_b, rid, port = _draw(
+        *_GUID_PARTS, _SID_PART, _SID_PART, _SID_RID, _CLIENT_PORT)
+    return WINEVENT_TEMPLATES[4769].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), user=user, g0=g0, g1=g1, g2=g2, g3=g3, g4=g4,
+        service_name=service_name, sid_a=sid_a, sid_b=sid_b, rid=rid,
+        source_ip=source_ip, port=port, demo_id=demo_id)
 
-    An attempt was made to reset an account's password.
-    Logged on domain controllers when an admin resets a user password.
-    """
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    event = f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4724
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=User Account Management
-RecordNumber={record}
-Keywords=Audit Success
+
+WINEVENT_TEMPLATES[4724] = _security_template(4724, "User Account Management", """\
 Message=An attempt was made to reset an account's password.
 
 Subject:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-500
+\tSecurity ID:\t\tS-1-5-21-{admin_sid_a}-{admin_sid_b}-500
 \tAccount Name:\t\t{admin_user}
 \tAccount Domain:\t\tFAKETSHIRTCO
-\tLogon ID:\t\t0x{random.randint(100000, 999999):X}
+\tLogon ID:\t\t0x{logon_id:X}
 
 Target Account:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tSecurity ID:\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 \tAccount Name:\t\t{target_user}
 \tAccount Domain:\t\tFAKETSHIRTCO
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+""")
 
 
-def event_4738(base_date: str, day: int, hour: int, minute: int, second: int,
+def event_4724(base_date: str, day: int, hour: int, minute: int, second: int,
                computer: str, admin_user: str, target_user: str,
-               changed_attributes: str = "PasswordLastSet",
                demo_id: str = None) -> str:
-    """Generate user account changed event (4738).
+    """Generate password reset attempt event (4724).
 
-    A user account was changed. Logged when account properties are modified,
-    including password changes triggered by admin reset.
+    An attempt was made to reset an account's password.
+    Logged on domain controllers when an admin resets a user password.
     """
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    event = f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4738
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=User Account Management
-RecordNumber={record}
-Keywords=Audit Success
+    admin_sid_a, admin_sid_b, logon_id, sid_a, sid_b, rid = _draw(
+        _SID_PART, _SID_PART, _LOGON_ID, _SID_PART, _SID_PART, _SID_RID)
+    return WINEVENT_TEMPLATES[4724].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), admin_sid_a=admin_sid_a, admin_sid_b=admin_sid_b,
+        admin_user=admin_user, logon_id=logon_id, sid_a=sid_a, sid_b=sid_b, rid=rid,
+        target_user=target_user, demo_id=demo_id)
+
+
+WINEVENT_TEMPLATES[4738] = _security_template(4738, "User Account Management", """\
 Message=A user account was changed.
 
 Subject:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-500
+\tSecurity ID:\t\tS-1-5-21-{admin_sid_a}-{admin_sid_b}-500
 \tAccount Name:\t\t{admin_user}
 \tAccount Domain:\t\tFAKETSHIRTCO
-\tLogon ID:\t\t0x{random.randint(100000, 999999):X}
+\tLogon ID:\t\t0x{logon_id:X}
 
 Target Account:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tSecurity ID:\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 \tAccount Name:\t\t{target_user}
 \tAccount Domain:\t\tFAKETSHIRTCO
 
@@ -799,10 +762,25 @@ Changed Attributes:
 \tUser Parameters:\t-
 \tSID History:\t\t-
 \tLogon Hours:\t\t-
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+""")
+
+
+def event_4738(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, admin_user: str, target_user: str,
+               changed_attributes: str = "PasswordLastSet",
+               demo_id: str = None) -> str:
+    """Generate user account changed event (4738).
+
+    A user account was changed. Logged when account properties are modified,
+    including password changes triggered by admin reset.
+    """
+    admin_sid_a, admin_sid_b, logon_id, sid_a, sid_b, rid = _draw(
+        _SID_PART, _SID_PART, _LOGON_ID, _SID_PART, _SID_PART, _SID_RID)
+    return WINEVENT_TEMPLATES[4738].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), admin_sid_a=admin_sid_a, admin_sid_b=admin_sid_b,
+        admin_user=admin_user, logon_id=logon_id, sid_a=sid_a, sid_b=sid_b, rid=rid,
+        target_user=target_user, demo_id=demo_id)
 
 
 # =============================================================================
@@ -820,26 +798,7 @@ SCHEDULED_TASK_TEMPLATES = [
 ]
 
 
-def event_4740(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str, caller_computer: str,
-               demo_id: str = None) -> str:
-    """Generate account lockout event (4740).
-
-    Key for: Password spray detection, brute force detection.
-    """
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    event = f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4740
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=User Account Management
-RecordNumber={record}
-Keywords=Audit Success
+WINEVENT_TEMPLATES[4740] = _security_template(4740, "User Account Management", """\
 Message=A user account was locked out.
 
 Subject:
@@ -849,179 +808,169 @@ Subject:
 \tLogon ID:\t\t0x3E7
 
 Account That Was Locked Out:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tSecurity ID:\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 \tAccount Name:\t\t{user}
 
 Additional Information:
 \tCaller Computer Name:\t{caller_computer}
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+""")
 
 
-def event_4768(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str, source_ip: str,
-               result_code: str = "0x0",
+def event_4740(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, caller_computer: str,
                demo_id: str = None) -> str:
-    """Generate Kerberos TGT request event (4768).
+    """Generate account lockout event (4740).
 
-    Key for: Kerberoasting baseline, AS-REP roasting detection.
-    result_code: 0x0=success, 0x6=unknown principal, 0x12=disabled,
-                 0x17=expired, 0x18=pre-auth failed.
+    Key for: Password spray detection, brute force detection.
     """
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    keywords = "Audit Success" if result_code == "0x0" else "Audit Failure"
-    ticket_options = random.choice(["0x40810010", "0x50800000", "0x40810000"])
-    encryption = random.choice(["0x12", "0x17"])  # AES256, RC4
-
-    event = f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4768
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Kerberos Authentication Service
-RecordNumber={record}
-Keywords={keywords}
+    sid_a, sid_b, rid = _draw(_SID_PART, _SID_PART, _SID_RID)
+    return WINEVENT_TEMPLATES[4740].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), sid_a=sid_a, sid_b=sid_b, rid=rid, user=user,
+        caller_computer=caller_computer, demo_id=demo_id)
+
+
+# TGT request options and encryption types (AES256, RC4) for EID 4768
+_TGT_TICKET_OPTIONS = ("0x40810010", "0x50800000", "0x40810000")
+_TGT_ENCRYPTION_TYPES = ("0x12", "0x17")
+
+WINEVENT_TEMPLATES[4768] = _security_template(4768, "Kerberos Authentication Service", """\
 Message=A Kerberos authentication ticket (TGT) was requested.
 
 Account Information:
 \tAccount Name:\t\t{user}
 \tSupplied Realm Name:\tFAKETSHIRTCO.COM
-\tUser ID:\t\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tUser ID:\t\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 
 Service Information:
 \tService Name:\t\tkrbtgt
-\tService ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-502
+\tService ID:\t\tS-1-5-21-{krbtgt_sid_a}-{krbtgt_sid_b}-502
 
 Network Information:
 \tClient Address:\t\t::ffff:{source_ip}
-\tClient Port:\t\t{random.randint(49152, 65535)}
+\tClient Port:\t\t{port}
 
 Additional Information:
 \tTicket Options:\t\t{ticket_options}
 \tResult Code:\t\t{result_code}
 \tTicket Encryption Type:\t{encryption}
 \tPre-Authentication Type:\t15
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+""", keywords="{keywords}")
 
 
-def event_4776(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str, workstation: str,
-               error_code: str = "0x0",
+def event_4768(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, source_ip: str,
+               result_code: str = "0x0",
                demo_id: str = None) -> str:
-    """Generate NTLM credential validation event (4776).
+    """Generate Kerberos TGT request event (4768).
 
-    Key for: NTLM relay detection, pass-the-hash detection.
-    error_code: 0x0=success, 0xC000006A=bad password,
-                0xC0000064=unknown user, 0xC0000234=locked out.
+    Key for: Kerberoasting baseline, AS-REP roasting detection.
+    result_code: 0x0=success, 0x6=unknown principal, 0x12=disabled,
+                 0x17=expired, 0x18=pre-auth failed.
     """
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    keywords = "Audit Success" if error_code == "0x0" else "Audit Failure"
-
-    event = f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4776
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Credential Validation
-RecordNumber={record}
-Keywords={keywords}
+    options, encryption, sid_a, sid_b, rid, krbtgt_sid_a, krbtgt_sid_b, port = _draw(
+        (0, len(_TGT_TICKET_OPTIONS)), (0, len(_TGT_ENCRYPTION_TYPES)),
+        _SID_PART, _SID_PART, _SID_RID, _SID_PART, _SID_PART, _CLIENT_PORT)
+    return WINEVENT_TEMPLATES[4768].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(),
+        keywords="Audit Success" if result_code == "0x0" else "Audit Failure",
+        user=user, sid_a=sid_a, sid_b=sid_b, rid=rid, krbtgt_sid_a=krbtgt_sid_a,
+        krbtgt_sid_b=krbtgt_sid_b, source_ip=source_ip, port=port,
+        ticket_options=_TGT_TICKET_OPTIONS[options], result_code=result_code,
+        encryption=_TGT_ENCRYPTION_TYPES[encryption], demo_id=demo_id)
+
+
+WINEVENT_TEMPLATES[4776] = _security_template(4776, "Credential Validation", """\
 Message=The computer attempted to validate the credentials for an account.
 
 Authentication Package:\tMICROSOFT_AUTHENTICATION_PACKAGE_V1_0
 Logon Account:\t{user}
 Source Workstation:\t{workstation}
 Error Code:\t{error_code}
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+""", keywords="{keywords}")
 
 
-def event_4698(base_date: str, day: int, hour: int, minute: int, second: int,
-               computer: str, user: str, task_name: str, task_content: str,
+def event_4776(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, workstation: str,
+               error_code: str = "0x0",
                demo_id: str = None) -> str:
-    """Generate scheduled task created event (4698).
+    """Generate NTLM credential validation event (4776).
 
-    Key for: Persistence detection (attacker-created tasks).
+    Key for: NTLM relay detection, pass-the-hash detection.
+    error_code: 0x0=success, 0xC000006A=bad password,
+                0xC0000064=unknown user, 0xC0000234=locked out.
     """
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    event = f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode=4698
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Other Object Access Events
-RecordNumber={record}
-Keywords=Audit Success
+    return WINEVENT_TEMPLATES[4776].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(),
+        keywords="Audit Success" if error_code == "0x0" else "Audit Failure",
+        user=user, workstation=workstation, error_code=error_code, demo_id=demo_id)
+
+
+WINEVENT_TEMPLATES[4698] = _security_template(4698, "Other Object Access Events", """\
 Message=A scheduled task was created.
 
 Subject:
-\tSecurity ID:\t\tS-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}
+\tSecurity ID:\t\tS-1-5-21-{sid_a}-{sid_b}-{rid}
 \tAccount Name:\t\t{user}
 \tAccount Domain:\t\tFAKETSHIRTCO
-\tLogon ID:\t\t0x{random.randint(100000, 999999):X}
+\tLogon ID:\t\t0x{logon_id:X}
 
 Task Information:
 \tTask Name:\t\t{task_name}
 \tTask Content:\t\t{task_content}
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+""")
+
+
+def event_4698(base_date: str, day: int, hour: int, minute: int, second: int,
+               computer: str, user: str, task_name: str, task_content: str,
+               demo_id: str = None) -> str:
+    """Generate scheduled task created event (4698).
+
+    Key for: Persistence detection (attacker-created tasks).
+    """
+    sid_a, sid_b, rid, logon_id = _draw(_SID_PART, _SID_PART, _SID_RID, _LOGON_ID)
+    return WINEVENT_TEMPLATES[4698].render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), computer=computer,
+        record=get_record_number(), sid_a=sid_a, sid_b=sid_b, rid=rid, user=user,
+        logon_id=logon_id, task_name=task_name, task_content=task_content,
+        demo_id=demo_id)
 
 
 # =============================================================================
 # APPLICATION EVENT TEMPLATES
 # =============================================================================
 
+# Application log level -> (EventType, Type)
+_APPLICATION_LEVELS = {
+    "Information": ("0", "Information"),
+    "Warning": ("2", "Warning"),
+    "Error": ("1", "Error"),
+    "Critical": ("1", "Error"),
+}
+
+# Generic layouts with a variable EventCode (not in WINEVENT_TEMPLATES)
+_APPLICATION_TEMPLATE = WinEventTemplate(_event_text(
+    "Application", "{source}", "{event_id}", "{event_type}", "{type_str}",
+    "None", "Classic", "Message={message}\n"))
+
+_DEFENDER_TEMPLATE = WinEventTemplate(_event_text(
+    "Microsoft-Windows-Windows Defender/Operational", "Microsoft-Windows-Windows Defender",
+    "{event_id}", 0, "{type_str}", "None", "Classic", "Message={message}\n"))
+
+_SECURITY_OTHER_TEMPLATE = _security_template("{event_id}", "Other", "Message={message}\n")
+
+
 def event_application(base_date: str, day: int, hour: int, minute: int, second: int,
                       computer: str, source: str, event_id: int, level: str,
                       message: str, demo_id: str = None) -> str:
     """Generate generic Application log event."""
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    # Map level to EventType
-    level_map = {
-        "Information": ("0", "Information"),
-        "Warning": ("2", "Warning"),
-        "Error": ("1", "Error"),
-        "Critical": ("1", "Error"),
-    }
-    event_type, type_str = level_map.get(level, ("0", "Information"))
-
-    event = f"""{ts}
-LogName=Application
-SourceName={source}
-EventCode={event_id}
-EventType={event_type}
-Type={type_str}
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
-Message={message}
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+    event_type, type_str = _APPLICATION_LEVELS.get(level, ("0", "Information"))
+    return _APPLICATION_TEMPLATE.render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), source=source,
+        event_id=event_id, event_type=event_type, type_str=type_str, computer=computer,
+        record=get_record_number(), message=message, demo_id=demo_id)
 
 
 def event_sql_server(base_date: str, day: int, hour: int, minute: int, second: int,
@@ -1147,7 +1096,7 @@ def generate_baseline_system_hour(base_date: str, day: int, hour: int, event_cou
     for _ in range(event_count):
         minute = random.randint(0, 59)
         second = random.randint(0, 59)
-        ts = ts_winevent(base_date, day, hour, minute, second)
+        ts = _winevent_ts(base_date, day, hour, minute, second)
         computer = random.choice(servers)
 
         # Weighted event selection
@@ -1227,21 +1176,21 @@ def generate_day0_boot_events(base_date: str) -> List[str]:
         boot_minute = random.randint(0, 30)
         boot_second = random.randint(0, 50)  # Max 50 to allow +5 seconds offset
 
-        ts = ts_winevent(base_date, 0, boot_hour, boot_minute, boot_second)
+        ts = _winevent_ts(base_date, 0, boot_hour, boot_minute, boot_second)
 
         # Kernel boot (Event 12)
         events.append(event_12_kernel_boot(ts, computer))
 
         # OS version (Event 6009) - a few seconds later
-        ts = ts_winevent(base_date, 0, boot_hour, boot_minute, boot_second + 2)
+        ts = _winevent_ts(base_date, 0, boot_hour, boot_minute, boot_second + 2)
         events.append(event_6009_os_version(ts, computer))
 
         # Event Log started (Event 6005) - a few more seconds
-        ts = ts_winevent(base_date, 0, boot_hour, boot_minute, boot_second + 5)
+        ts = _winevent_ts(base_date, 0, boot_hour, boot_minute, boot_second + 5)
         events.append(event_6005_eventlog_started(ts, computer))
 
         # Time sync (Event 37) - after network is up
-        ts = ts_winevent(base_date, 0, boot_hour, boot_minute + 1, random.randint(0, 30))
+        ts = _winevent_ts(base_date, 0, boot_hour, boot_minute + 1, random.randint(0, 30))
         if "DC-" in computer:
             time_source = random.choice(["time.windows.com", "time.nist.gov"])
         else:
@@ -1256,7 +1205,7 @@ def generate_day0_boot_events(base_date: str) -> List[str]:
             service_second = random.randint(0, 59)
             if service_minute >= 60:
                 service_minute = 59
-            ts = ts_winevent(base_date, 0, boot_hour, service_minute, service_second)
+            ts = _winevent_ts(base_date, 0, boot_hour, service_minute, service_second)
             events.append(event_7036_service_state(ts, computer, service, "running"))
 
     return events
@@ -1474,24 +1423,10 @@ def event_defender(base_date: str, day: int, hour: int, minute: int, second: int
     Uses LogName=Microsoft-Windows-Windows Defender/Operational to match
     real Windows Defender event log channel.
     """
-    ts = ts_winevent(base_date, day, hour, minute, second)
-    record = get_record_number()
-
-    event = f"""{ts}
-LogName=Microsoft-Windows-Windows Defender/Operational
-SourceName=Microsoft-Windows-Windows Defender
-EventCode={event_id}
-EventType=0
-Type={event_type_str}
-ComputerName={computer}
-TaskCategory=None
-RecordNumber={record}
-Keywords=Classic
-Message={message}
-"""
-    if demo_id:
-        event = _insert_demo_id(event, demo_id)
-    return event
+    return _DEFENDER_TEMPLATE.render(
+        ts=_winevent_ts(base_date, day, hour, minute, second), event_id=event_id,
+        type_str=event_type_str, computer=computer, record=get_record_number(),
+        message=message, demo_id=demo_id)
 
 
 def generate_baseline_defender_events(base_date: str, day: int, hour: int) -> List[str]:
@@ -1596,8 +1531,7 @@ def generate_client_logon(base_date: str, day: int, hour: int, client) -> list:
     The logon is recorded on the client machine, but the auth happens at the DC.
     """
     events = []
-    dt = date_add(base_date, day)
-    is_weekend = dt.weekday() >= 5
+    is_weekend = _weekday(base_date, day) >= 5
 
     # No logon on weekends for most users (10% chance for overtime workers)
     if is_weekend and random.random() > 0.10:
@@ -1633,8 +1567,7 @@ def generate_client_logoff(base_date: str, day: int, hour: int, client) -> list:
     Called during evening hours (17-18) - one logoff per workday.
     """
     events = []
-    dt = date_add(base_date, day)
-    is_weekend = dt.weekday() >= 5
+    is_weekend = _weekday(base_date, day) >= 5
 
     if is_weekend:
         return events
@@ -1673,8 +1606,7 @@ def generate_client_network_logons(base_date: str, day: int, hour: int, client)
     if hour < 8 or hour > 17:
         return events
 
-    dt = date_add(base_date, day)
-    if dt.weekday() >= 5:
+    if _weekday(base_date, day) >= 5:
         return events
 
     # 20% chance per hour during business hours (~2 per day)
@@ -1706,8 +1638,7 @@ def generate_client_process_events(base_date: str, day: int, hour: int, client,
     if hour < 7 or hour > 18:
         return events
 
-    dt = date_add(base_date, day)
-    is_weekend = dt.weekday() >= 5
+    is_weekend = _weekday(base_date, day) >= 5
     if is_weekend:
         return events
 
@@ -1756,8 +1687,7 @@ def generate_client_service_events(base_date: str, day: int, hour: int, client)
     events = []
 
     # Services run 24/7 but more active during work hours
-    dt = date_add(base_date, day)
-    is_work_hour = 7 <= hour <= 18 and dt.weekday() < 5
+    is_work_hour = 7 <= hour <= 18 and _weekday(base_date, day) < 5
 
     # ~30% chance per hour during work hours, ~5% off-hours
     # Results in about 4-5 service events per workday
@@ -1767,7 +1697,7 @@ def generate_client_service_events(base_date: str, day: int, hour: int, client)
 
     minute = random.randint(0, 59)
     second = random.randint(0, 59)
-    ts = ts_winevent(base_date, day, hour, minute, second)
+    ts = _winevent_ts(base_date, day, hour, minute, second)
     computer = client.device_name
     service = random.choice(CLIENT_SERVICES)
     state = random.choice(["running", "stopped"])
@@ -1790,19 +1720,18 @@ def generate_client_system_events(base_date: str, day: int, hour: int, client) -
     if random.random() < 0.25:
         minute = random.randint(0, 59)
         second = random.randint(0, 59)
-        ts = ts_winevent(base_date, day, hour, minute, second)
+        ts = _winevent_ts(base_date, day, hour, minute, second)
         dc = _dc_for_client(client)
         events.append(event_37_time_sync(
             ts, computer, f"{dc}.theFakeTshirtCompany.com"
         ))
 
     # DCOM permission error (event 10016) ~10% chance during work hours
-    dt = date_add(base_date, day)
-    is_work_hour = 8 <= hour <= 17 and dt.weekday() < 5
+    is_work_hour = 8 <= hour <= 17 and _weekday(base_date, day) < 5
     if is_work_hour and random.random() < 0.10:
         minute = random.randint(0, 59)
         second = random.randint(0, 59)
-        ts = ts_winevent(base_date, day, hour, minute, second)
+        ts = _winevent_ts(base_date, day, hour, minute, second)
         clsid, appname = random.choice(DCOM_COMPONENTS)
         events.append(event_10016_dcom(ts, computer, clsid, appname))
 
@@ -1810,7 +1739,7 @@ def generate_client_system_events(base_date: str, day: int, hour: int, client) -
     if random.random() < 0.03:
         minute = random.randint(0, 59)
         second = random.randint(0, 59)
-        ts = ts_winevent(base_date, day, hour, minute, second)
+        ts = _winevent_ts(base_date, day, hour, minute, second)
         domain = random.choice([
             "wpad.theFakeTshirtCompany.com",
             "isatap.theFakeTshirtCompany.com",
@@ -1829,8 +1758,7 @@ def generate_client_failed_logon(base_date: str, day: int, hour: int, client) ->
     """
     events = []
 
-    dt = date_add(base_date, day)
-    is_work_hour = 7 <= hour <= 18 and dt.weekday() < 5
+    is_work_hour = 7 <= hour <= 18 and _weekday(base_date, day) < 5
     if not is_work_hour:
         return events
 
@@ -1867,8 +1795,7 @@ def generate_client_special_logon(base_date: str, day: int, hour: int, client) -
     if client.department not in ("IT", "Engineering"):
         return events
 
-    dt = date_add(base_date, day)
-    is_work_hour = 8 <= hour <= 17 and dt.weekday() < 5
+    is_work_hour = 8 <= hour <= 17 and _weekday(base_date, day) < 5
     if not is_work_hour:
         return events
 
@@ -1895,8 +1822,7 @@ def generate_client_app_events(base_date: str, day: int, hour: int, client) -> l
     """
     events = []
 
-    dt = date_add(base_date, day)
-    is_work_hour = 8 <= hour <= 17 and dt.weekday() < 5
+    is_work_hour = 8 <= hour <= 17 and _weekday(base_date, day) < 5
     if not is_work_hour:
         return events
 
@@ -2057,6 +1983,9 @@ def generate_wineventlog(
             print(f"  [WinEvent] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})...", file=sys.stderr, end="\r")
 
         for hour in range(24):
+            if progress_callback:
+                progress_callback("wineventlog", day + 1, days, hour=hour,
+                                  events=len(security_events) + len(system_events) + len(application_events))
             # Calculate logon count using natural variation
             logon_count = calc_natural_events(base_logons_per_peak_hour, start_date, day, hour, "windows")
 
@@ -2133,17 +2062,9 @@ def generate_wineventlog(
             print(f"  [WinEvent] Day {day + 1}/{days} ({dt.strftime('%Y-%m-%d')})... done", file=sys.stderr)
 
     # Write output
-    with open(security_path, "w") as f:
-        for event in security_events:
-            f.write(event + "\n")
-
-    with open(system_path, "w") as f:
-        for event in system_events:
-            f.write(event + "\n")
-
-    with open(application_path, "w") as f:
-        for event in application_events:
-            f.write(event + "\n")
+    write_events(security_path, security_events)
+    write_events(system_path, system_events)
+    write_events(application_path, application_events)
 
     total = len(security_events) + len(system_events) + len(application_events)
     file_counts = {
@@ -2180,17 +2101,12 @@ def format_scenario_event(base_date: str, day: int, hour: int, event_dict: dict,
                           event_dict.get("logon_type", 3),
                           event_dict.get("source_ip", "10.10.30.50"))
     elif event_id == 4625:
-        event = event_4625(base_date, day, hour, minute, second, computer, user,
+        return event_4625(base_date, day, hour, minute, second, computer, user,
                           event_dict.get("source_ip", "10.10.30.50"),
-                          event_dict.get("reason", "Unknown user name or bad password."))
-        if demo_id:
-            event = _insert_demo_id(event, demo_id)
-        return event
+                          event_dict.get("reason", "Unknown user name or bad password."),
+                          demo_id)
     elif event_id == 4672:
-        event = event_4672(base_date, day, hour, minute, second, computer, user)
-        if demo_id:
-            event = _insert_demo_id(event, demo_id)
-        return event
+        return event_4672(base_date, day, hour, minute, second, computer, user, demo_id)
     elif event_id == 4688:
         return event_4688(base_date, day, hour, minute, second, computer, user,
                           event_dict.get("process_name", "cmd.exe"),
@@ -2236,23 +2152,10 @@ def format_scenario_event(base_date: str, day: int, hour: int, event_dict: dict,
                           demo_id)
     else:
         # Generic security event
-        ts = ts_winevent(base_date, day, hour, minute, second)
-        record = get_record_number()
-        event = f"""{ts}
-LogName=Security
-SourceName=Microsoft-Windows-Security-Auditing
-EventCode={event_id}
-EventType=0
-Type=Information
-ComputerName={computer}
-TaskCategory=Other
-RecordNumber={record}
-Keywords=Audit Success
-Message={event_dict.get('message', 'Security event')}
-"""
-        if demo_id:
-            event = _insert_demo_id(event, demo_id)
-        return event
+        return _SECURITY_OTHER_TEMPLATE.render(
+            ts=_winevent_ts(base_date, day, hour, minute, second), event_id=event_id,
+            computer=computer, record=get_record_number(),
+            message=event_dict.get("message", "Security event"), demo_id=demo_id)
 
 
 def main():
@@ -10,10 +10,16 @@ Usage:
 """
 
 import argparse
+import gzip
+import importlib
+import json
 import os
+import queue
+import signal
 import sys
 import time
 import threading
+from collections.abc import Mapping
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Callable
@@ -35,113 +41,424 @@ else:
 # =============================================================================
 
 _progress_lock = threading.Lock()
-_progress = {}          # {name: {"day": N, "days": N, "status": str, "start": float}}
-_progress_stop = False  # Signal to stop the display thread
+_progress = {}          # {name: {"day", "days", "hour", "events", "status", "start", "est_events", ...}}
+_progress_queue = queue.SimpleQueue()  # (name, day, days, hour, events, t) from generator threads
+_progress_active = False  # True while a progress thread is consuming _progress_queue
+_progress_stop = False  # Signal to stop the progress thread
 _progress_pause = threading.Event()  # Set when main thread is printing completion output
 
+# Minimum seconds between redraws when progress events arrive quickly
+_PROGRESS_REDRAW = 0.2
 
-def _report_progress(name, day, days):
-    """Called by generators to report current day progress (thread-safe)."""
+
+def _report_progress(name, day, days, hour=None, events=None):
+    """Called by generators to report progress (thread-safe, never blocks).
+
+    Generators call this once per day and, where they loop over hours, once
+    per hour with the number of events generated so far. Only a queue put
+    happens here; the display thread owns the _progress state. The queue
+    needs only put()/get(), so a multiprocessing queue can stand in if
+    generators run in worker processes.
+    """
+    if _progress_active:
+        _progress_queue.put((name, day, days, hour, events, time.time()))
+
+
+def _apply_progress(item):
+    """Fold one progress event into _progress (display thread only)."""
+    name, day, days, hour, events, t = item
     with _progress_lock:
-        if name in _progress:
-            _progress[name]["day"] = day
+        p = _progress.get(name)
+        if p is None:
+            return
+        if p["start"] is None:
+            p["start"] = t
+        p["day"] = day
+        p["days"] = days
+        p["hour"] = hour if hour is not None else 0
+        if events is not None:
+            p["events"] = events
+            p["events_t"] = t
+
+
+def _gen_rate_eta(p, now):
+    """Return (fraction done, events/sec, ETA seconds or None) for one generator."""
+    if p["status"] in ("done", "failed"):
+        return 1.0, 0.0, 0.0
+    if p["start"] is None or p["day"] == 0:
+        return 0.0, 0.0, None
+    total_hours = max(p["days"] * 24, 1)
+    fraction = min(((p["day"] - 1) * 24 + p["hour"]) / total_hours, 1.0)
+
+    eps = 0.0
+    if p["events"] and p["events_t"] and p["events_t"] > p["start"]:
+        eps = p["events"] / (p["events_t"] - p["start"])
+
+    # Throughput-based: project total events from the hours done so far (or
+    # the pre-run estimate before the first hour completes) at the live rate
+    eta = None
+    if eps > 0 and fraction > 0:
+        projected = p["events"] / fraction
+        eta = max(projected - p["events"], 0) / eps
+    elif eps > 0 and p["est_events"]:
+        eta = max(p["est_events"] - p["events"], 0) / eps
+    elif fraction > 0:
+        elapsed = now - p["start"]
+        eta = elapsed * (1 - fraction) / fraction
+    return fraction, eps, eta
+
+
+def _fmt_eps(eps):
+    if eps >= 1_000_000:
+        return f"{eps / 1_000_000:.1f}M/s"
+    if eps >= 1_000:
+        return f"{eps / 1_000:.0f}K/s"
+    return f"{eps:.0f}/s"
+
+
+def _fmt_bytes(n):
+    if n >= 1 << 30:
+        return f"{n / (1 << 30):.2f} GB"
+    if n >= 1 << 20:
+        return f"{n / (1 << 20):.1f} MB"
+    return f"{n / 1024:.0f} KB"
+
+
+def _fmt_eta(seconds):
+    if seconds is None:
+        return "--"
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    return f"{seconds / 60:.0f}m{seconds % 60:02.0f}s"
+
+
+def _progress_summary(snapshot, now, phase_start):
+    """Per-generator and overall progress for one phase snapshot.
+
+    Overall progress weights each generator's fraction by its estimated
+    runtime; the phase ETA extrapolates the elapsed time from it. Generators
+    that have not started their day loop yet are reported as "queued".
+    """
+    weight_total = 0.0
+    weighted_done = 0.0
+    total_eps = 0.0
+    generators = {}
+    for name, p in sorted(snapshot.items()):
+        fraction, eps, eta = _gen_rate_eta(p, now)
+        weight = p["est_seconds"] or 1.0
+        weight_total += weight
+        weighted_done += weight * fraction
+        status = p["status"]
+        if status == "running":
+            if p["day"] == 0:
+                status = "queued"
+            else:
+                total_eps += eps
+        generators[name] = {
+            "status": status, "day": p["day"], "days": p["days"], "hour": p["hour"],
+            "events": p["events"], "fraction": round(fraction, 4),
+            "events_per_sec": round(eps),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+        }
+
+    overall = weighted_done / weight_total if weight_total else 0.0
+    overall_eta = None
+    if overall > 0:
+        overall_eta = (now - phase_start) * (1 - overall) / overall
+    return {"fraction": overall, "events_per_sec": total_eps, "eta_seconds": overall_eta,
+            "generators": generators}
 
 
-def _progress_display_thread(phase_total):
-    """Background thread that refreshes a compact progress line every 0.5s."""
-    global _progress_stop
+def _progress_display_thread(phase_total, show=True):
+    """Background thread that redraws a compact progress line.
+
+    Wakes on progress events (throttled to _PROGRESS_REDRAW) and at least
+    every 0.5s so the ETA keeps moving while generators are between ticks.
+    With --progress-file it also rewrites the progress file; show=False
+    keeps the terminal quiet and only does that.
+    """
+    phase_start = time.time()
+    last_draw = 0.0
+    last_dump = 0.0
     while not _progress_stop:
-        # If main thread is printing completion output, skip this cycle
-        if _progress_pause.is_set():
-            time.sleep(0.1)
+        try:
+            item = _progress_queue.get(timeout=0.5)
+        except queue.Empty:
+            item = None
+        while item is not None:
+            _apply_progress(item)
+            try:
+                item = _progress_queue.get_nowait()
+            except queue.Empty:
+                item = None
+
+        # If main thread is printing completion output, skip this redraw
+        now = time.time()
+        draw = show and not _progress_pause.is_set() and now - last_draw >= _PROGRESS_REDRAW
+        dump = _progress_file is not None and now - last_dump >= _PROGRESS_FILE_INTERVAL
+        if not draw and not dump:
             continue
 
         with _progress_lock:
-            running = [(n, p) for n, p in _progress.items() if p["status"] == "running"]
-            done_count = sum(1 for p in _progress.values() if p["status"] == "done")
-
-        if running:
-            # Show only generators that have started their day loop (day > 0)
-            active = [(n, p) for n, p in running if p["day"] > 0]
-            queued = len(running) - len(active)
-            parts = []
-            for name, p in sorted(active):
-                parts.append(f"{name} {p['day']}/{p['days']}")
-            status = f"  {_C_DIM}[{done_count}/{phase_total}]{_C_RESET} "
-            if parts:
-                status += f" {_C_DIM}|{_C_RESET} ".join(parts)
-            if queued > 0:
-                status += f"  {_C_DIM}(+{queued} queued){_C_RESET}"
-            print(f"\r{status: <120}", end="", flush=True)
-
-        time.sleep(0.5)
+            snapshot = {n: dict(p) for n, p in _progress.items()}
+        summary = _progress_summary(snapshot, now, phase_start)
+        if dump:
+            last_dump = now
+            _write_progress_file("running", summary)
+        if not draw:
+            continue
+        last_draw = now
+
+        generators = summary["generators"]
+        if not any(g["status"] in ("running", "queued") for g in generators.values()):
+            continue
+        done_count = sum(1 for g in generators.values() if g["status"] in ("done", "failed"))
+
+        # Show only generators that have started their day loop (day > 0)
+        parts = []
+        for name, g in generators.items():
+            if g["status"] == "running":
+                hour = f" {g['hour']:02d}h" if g["hour"] else ""
+                rate = f" {_fmt_eps(g['events_per_sec'])}" if g["events_per_sec"] else ""
+                parts.append(f"{name} {g['day']}/{g['days']}{hour}{rate} ~{_fmt_eta(g['eta_seconds'])}")
+
+        queued = sum(1 for g in generators.values() if g["status"] == "queued")
+        status = (f"  {_C_DIM}[{done_count}/{phase_total}]{_C_RESET} "
+                  f"{_fmt_eps(summary['events_per_sec'])} ETA {_fmt_eta(summary['eta_seconds'])}")
+        if parts:
+            status += f" {_C_DIM}|{_C_RESET} " + f" {_C_DIM}|{_C_RESET} ".join(parts)
+        if queued > 0:
+            status += f"  {_C_DIM}(+{queued} queued){_C_RESET}"
+        print(f"\r{status: <120}", end="", flush=True)
+
+
+# =============================================================================
+# PROGRESS FILE (--progress-file)
+# =============================================================================
+# A JSON snapshot of the whole run for callers that poll instead of watching
+# the terminal (the REST job manager in generate_logs.py). It is replaced
+# atomically: at most every _PROGRESS_FILE_INTERVAL seconds while generators
+# run, at phase boundaries, and once more with the final state.
+
+_PROGRESS_FILE_INTERVAL = 1.0
+
+_progress_file = None  # Path from --progress-file (None = disabled)
+_progress_run = {}     # {"started", "sources", "weights", "est_events", "est_seconds", "phase", "finished", "summary"}
+_progress_cancelled = False  # Set by the SIGTERM handler; later "running" writes are dropped
+
+
+def _init_progress_file(path, sources, weights, est_events, est_seconds):
+    """Enable the progress file and write the initial "running" state."""
+    global _progress_file
+    _progress_file = Path(path)
+    _progress_file.parent.mkdir(parents=True, exist_ok=True)
+    _progress_run.update(
+        started=time.time(), sources=list(sources), weights=weights,
+        est_events=est_events, est_seconds=est_seconds,
+        phase=None, finished={}, summary=None,
+    )
+    _write_progress_file("running")
+
+
+def _set_progress_phase(phase):
+    if _progress_file is not None:
+        _progress_run["phase"] = phase
+        _progress_run["summary"] = None
+        _write_progress_file("running")
+
+
+def _record_finished(result):
+    """Keep a finished generator's final count for the progress file."""
+    if _progress_file is None:
+        return
+    duration = result["duration"]
+    count = result.get("count", 0)
+    entry = {
+        "status": "done" if result["success"] else "failed",
+        "events": count,
+        "fraction": 1.0,
+        "duration_seconds": round(duration, 1),
+        "events_per_sec": round(count / duration) if duration > 0 else 0,
+    }
+    if not result["success"]:
+        entry["error"] = result.get("error", "")
+    _progress_run["finished"][result["name"]] = entry
+
+
+def _write_progress_file(state, summary=None, writer="", **extra):
+    """Replace the progress file with the run's current state.
+
+    summary is the running phase's _progress_summary(); generators outside
+    it are either finished (final counts) or "pending" (a later phase).
+    Overall fraction and ETA weight generators by their estimated runtime.
+    writer tags the temp file, for writers that can interrupt another write
+    on the same thread (the SIGTERM handler). No-op without --progress-file.
+    """
+    if _progress_file is None or (_progress_cancelled and state != "cancelled"):
+        return
+    run = _progress_run
+    if summary is not None:
+        run["summary"] = summary
+    summary = run["summary"]
+    current = summary["generators"] if summary else {}
+    now = time.time()
+
+    generators = {}
+    weight_total = 0.0
+    weighted_done = 0.0
+    events = 0
+    for name in run["sources"]:
+        g = run["finished"].get(name) or current.get(name) or {"status": "pending", "fraction": 0.0}
+        generators[name] = g
+        weight = run["weights"].get(name) or 1.0
+        weight_total += weight
+        weighted_done += weight * g["fraction"]
+        events += g.get("events", 0)
+
+    elapsed = now - run["started"]
+    fraction = weighted_done / weight_total if weight_total else 0.0
+    if fraction >= 1.0:
+        eta = 0.0
+    elif fraction > 0:
+        eta = elapsed * (1 - fraction) / fraction
+    else:
+        eta = max(run["est_seconds"] - elapsed, 0.0)
+    if state == "running" and summary:
+        eps = summary["events_per_sec"]
+    else:
+        eps = events / elapsed if elapsed > 0 else 0.0
+
+    doc = {
+        "state": state,
+        "pid": os.getpid(),
+        "phase": run["phase"],
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(run["started"])),
+        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(now)),
+        "elapsed_seconds": round(elapsed, 1),
+        "fraction": round(fraction, 4),
+        "events": events,
+        "events_per_sec": round(eps),
+        "eta_seconds": round(eta, 1),
+        "est_events": run["est_events"],
+        "est_seconds": round(run["est_seconds"], 1),
+        "generators": generators,
+        **extra,
+    }
+    # One temp file per writer: the display thread and the main thread
+    # (phase boundaries) may write at the same time, and the SIGTERM handler
+    # runs on the main thread, possibly in the middle of one of its writes
+    tmp = _progress_file.with_name(
+        f"{_progress_file.name}.{os.getpid()}.{threading.get_ident()}{writer}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(doc, f, indent=2)
+    os.replace(tmp, _progress_file)
+
+
+def _on_terminate(signum, frame):
+    """SIGTERM with --progress-file: record the cancellation and exit now.
+
+    Generator threads cannot be interrupted, so a clean shutdown would run
+    them to completion. Files written so far stay in output/tmp/.
+    """
+    global _progress_cancelled
+    _progress_cancelled = True
+    try:
+        _write_progress_file("cancelled", writer=".signal")
+    finally:
+        os._exit(128 + signum)
 
 
 from shared.config import (
     DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE,
     OUTPUT_BASE, OUTPUT_BASE_PRODUCTION, GENERATOR_OUTPUT_FILES,
-    set_output_base,
+    set_output_base, move_output_to_production, promote_generator_output,
+    remove_empty_staging_dirs,
 )
-
-# Import generators
-from generators.generate_asa import generate_asa_logs
-from generators.generate_aws import generate_aws_logs
-from generators.generate_gcp import generate_gcp_logs
-from generators.generate_entraid import generate_entraid_logs
-from generators.generate_exchange import generate_exchange_logs
-from generators.generate_access import generate_access_logs
-from generators.generate_wineventlog import generate_wineventlog
-from generators.generate_linux import generate_linux_logs
-from generators.generate_perfmon import generate_perfmon_logs
-from generators.generate_orders import generate_orders
-from generators.generate_servicebus import generate_servicebus_logs
-from generators.generate_meraki import generate_meraki_logs
-from generators.generate_webex_ta import generate_webex_ta_logs
-from generators.generate_webex_api import generate_webex_api_logs
-from generators.generate_mssql import generate_mssql_logs
-from generators.generate_sysmon import generate_sysmon_logs
-from generators.generate_servicenow import generate_servicenow_logs
-from generators.generate_office_audit import generate_office_audit_logs
-from generators.generate_sap import generate_sap_logs
-from generators.generate_secure_access import generate_secure_access_logs
-from generators.generate_catalyst import generate_catalyst_logs
-from generators.generate_aci import generate_aci_logs
-from generators.generate_catalyst_center import generate_catalyst_center_logs
-from generators.generate_aws_guardduty import generate_aws_guardduty_logs
-from generators.generate_aws_billing import generate_aws_billing_logs
+from shared import config as _config
+from shared import run_history
+from shared import json_templates
+from shared import output_writer
+from shared import telemetry
+from shared.syslog_sink import STREAMS as SYSLOG_STREAMS, SyslogSink
+from shared.profiling import profile_call, profile_lock
 
 # =============================================================================
 # GENERATOR REGISTRY
 # =============================================================================
 
-GENERATORS: Dict[str, Callable] = {
-    "asa": generate_asa_logs,
-    "aws": generate_aws_logs,
-    "gcp": generate_gcp_logs,
-    "entraid": generate_entraid_logs,
-    "exchange": generate_exchange_logs,
-    "access": generate_access_logs,
-    "wineventlog": generate_wineventlog,
-    "linux": generate_linux_logs,
-    "perfmon": generate_perfmon_logs,
-    "orders": generate_orders,
-    "servicebus": generate_servicebus_logs,
-    "meraki": generate_meraki_logs,
-    "webex_ta": generate_webex_ta_logs,
-    "webex_api": generate_webex_api_logs,
-    "mssql": generate_mssql_logs,
-    "sysmon": generate_sysmon_logs,
-    "servicenow": generate_servicenow_logs,
-    "office_audit": generate_office_audit_logs,
-    "sap": generate_sap_logs,
-    "secure_access": generate_secure_access_logs,
-    "catalyst": generate_catalyst_logs,
-    "aci": generate_aci_logs,
-    "catalyst_center": generate_catalyst_center_logs,
-    "aws_guardduty": generate_aws_guardduty_logs,
-    "aws_billing": generate_aws_billing_logs,
+# {name: "module:function"}. A generator module is imported the first time
+# GENERATORS[name] is looked up, so --help, --tui and single-source runs only
+# pay for the generators (and scenario modules) they actually use.
+GENERATOR_MODULES: Dict[str, str] = {
+    "asa": "generators.generate_asa:generate_asa_logs",
+    "aws": "generators.generate_aws:generate_aws_logs",
+    "gcp": "generators.generate_gcp:generate_gcp_logs",
+    "entraid": "generators.generate_entraid:generate_entraid_logs",
+    "exchange": "generators.generate_exchange:generate_exchange_logs",
+    "access": "generators.generate_access:generate_access_logs",
+    "wineventlog": "generators.generate_wineventlog:generate_wineventlog",
+    "linux": "generators.generate_linux:generate_linux_logs",
+    "perfmon": "generators.generate_perfmon:generate_perfmon_logs",
+    "orders": "generators.generate_orders:generate_orders",
+    "servicebus": "generators.generate_servicebus:generate_servicebus_logs",
+    "meraki": "generators.generate_meraki:generate_meraki_logs",
+    "webex_ta": "generators.generate_webex_ta:generate_webex_ta_logs",
+    "webex_api": "generators.generate_webex_api:generate_webex_api_logs",
+    "mssql": "generators.generate_mssql:generate_mssql_logs",
+    "sysmon": "generators.generate_sysmon:generate_sysmon_logs",
+    "servicenow": "generators.generate_servicenow:generate_servicenow_logs",
+    "office_audit": "generators.generate_office_audit:generate_office_audit_logs",
+    "sap": "generators.generate_sap:generate_sap_logs",
+    "secure_access": "generators.generate_secure_access:generate_secure_access_logs",
+    "catalyst": "generators.generate_catalyst:generate_catalyst_logs",
+    "aci": "generators.generate_aci:generate_aci_logs",
+    "catalyst_center": "generators.generate_catalyst_center:generate_catalyst_center_logs",
+    "aws_guardduty": "generators.generate_aws_guardduty:generate_aws_guardduty_logs",
+    "aws_billing": "generators.generate_aws_billing:generate_aws_billing_logs",
+}
+
+# Keyword arguments a generator takes beyond the common set (start_date, days,
+# scale, scenarios, quiet, progress_callback); values come from the CLI options
+GENERATOR_KWARGS: Dict[str, List[str]] = {
+    "perfmon": ["num_clients", "client_interval", "full_metrics"],
+    "access": ["orders_per_day"],
+    "wineventlog": ["num_clients"],
+    "sysmon": ["num_clients"],
+    "meraki": ["health_interval", "mr_health_enabled", "ms_health_enabled", "workers"],
 }
 
+
+class _LazyGenerators(Mapping):
+    """Read-only {name: generator function} that imports on lookup.
+
+    Iteration, len() and "in" only use the registry, so listing sources or
+    validating --sources never imports a generator.
+    """
+
+    def __init__(self, modules: Dict[str, str]):
+        self._modules = modules
+        self._loaded: Dict[str, Callable] = {}
+
+    def __getitem__(self, name: str) -> Callable:
+        func = self._loaded.get(name)
+        if func is None:
+            module_name, func_name = self._modules[name].split(":")
+            func = getattr(importlib.import_module(module_name), func_name)
+            self._loaded[name] = func
+        return func
+
+    def __iter__(self):
+        return iter(self._modules)
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def __contains__(self, name) -> bool:
+        return name in self._modules
+
+
+GENERATORS: Mapping = _LazyGenerators(GENERATOR_MODULES)
+
 # Width for aligning generator name column in output (longest name + 1)
 _GEN_NAME_WIDTH = max(len(n) for n in GENERATORS) + 1
 
@@ -249,85 +566,104 @@ _THROUGHPUT_EPS = {
 }
 
 
+def _table_events(gen, days, scale, orders_per_day, num_clients, client_interval,
+                  full_metrics, health_interval, mr_health, ms_health):
+    """Estimate events for one generator from the calibrated tables."""
+    base_per_day = _EVENTS_PER_DAY.get(gen, 1_000)
+    est = base_per_day * days * scale
+
+    # Generator-specific scaling
+    if gen == "access" and orders_per_day:
+        est = base_per_day * (orders_per_day / 224) * days * scale
+
+    elif gen == "orders":
+        if orders_per_day:
+            est = base_per_day * (orders_per_day / 224) * days * scale
+        # else use default base_per_day * days * scale
+
+    elif gen == "servicebus":
+        if orders_per_day:
+            est = base_per_day * (orders_per_day / 224) * days * scale
+
+    elif gen == "sap":
+        if orders_per_day:
+            # SAP has baseline + order-proportional events
+            # At 224 orders/day: ~2319/day. Order lifecycle is ~3 events/order.
+            baseline_per_day = 2_319 - (224 * 3)  # ~1647
+            order_events = (orders_per_day * 3)
+            est = (baseline_per_day + order_events) * days * scale
+
+    elif gen == "asa":
+        if orders_per_day:
+            # ASA traffic partly driven by web traffic volume
+            # ~38K/day at 224 orders. Web-driven portion is ~10%
+            web_ratio = orders_per_day / 224
+            est = base_per_day * (0.9 + 0.1 * web_ratio) * days * scale
+
+    elif gen == "wineventlog":
+        # WinEventLog: calibrated base is servers-only (434/day)
+        # Each client workstation adds ~37 events/day (14-day average)
+        client_events = max(0, num_clients) * 37
+        est = (base_per_day + client_events) * days * scale
+
+    elif gen == "sysmon":
+        # Sysmon base: 2,304/day (servers + 20 sampled workstations)
+        # With --clients>0: server-only base (~990/day) + ~18 events/client/day
+        if num_clients > 0:
+            server_base = 990
+            client_events = num_clients * 18
+            est = (server_base + client_events) * days * scale
+        # else: use default base_per_day (2,304) which includes legacy 20 samples
+
+    elif gen == "perfmon":
+        # Perfmon: calibrated base includes servers + 5 default clients
+        # Extra clients add ~340/day (no full-metrics) or ~610/day (full-metrics)
+        # Scales linearly with 1/client_interval (default 30-min)
+        interval_factor = 30 / max(client_interval or 30, 1)
+        extra = max(0, num_clients - 5)
+        if full_metrics:
+            est = (base_per_day + 6_000 + extra * 610) * interval_factor * days * scale
+        else:
+            est = (base_per_day + extra * 340) * interval_factor * days * scale
+
+    elif gen == "meraki":
+        # Meraki = event-driven base (12,348/day) + health polling
+        # Health at 15-min: MR=3,456/day, MS=42,240/day
+        # Scales linearly with 15/interval (e.g., 5-min = 3x)
+        hi = health_interval or 15
+        health_factor = 15 / max(hi, 1)
+        event_base = 12_348
+        mr_health_day = int(3_456 * health_factor) if mr_health else 0
+        ms_health_day = int(42_240 * health_factor) if ms_health else 0
+        est = (event_base + mr_health_day + ms_health_day) * days * scale
+
+    return est
+
+
 def _estimate_run(sources, days, scale, orders_per_day, num_clients,
                   client_interval, full_metrics, health_interval,
-                  mr_health, ms_health, parallel):
+                  mr_health, ms_health, parallel, model=None):
     """Estimate total events and execution time before running generators.
 
+    Uses coefficients fitted from output/run_history.jsonl when available
+    (see shared/run_history.py) and the tables above for anything without
+    history.
+
     Returns (total_events, estimated_seconds, per_gen_events).
     """
+    if model is None:
+        model = run_history.load_model()
+    settings = {
+        "orders_per_day": orders_per_day, "num_clients": num_clients,
+        "client_interval": client_interval, "full_metrics": full_metrics,
+        "health_interval": health_interval, "mr_health": mr_health, "ms_health": ms_health,
+    }
     per_gen = {}
 
     for gen in sources:
-        base_per_day = _EVENTS_PER_DAY.get(gen, 1_000)
-        est = base_per_day * days * scale
-
-        # Generator-specific scaling
-        if gen == "access" and orders_per_day:
-            est = base_per_day * (orders_per_day / 224) * days * scale
-
-        elif gen == "orders":
-            if orders_per_day:
-                est = base_per_day * (orders_per_day / 224) * days * scale
-            # else use default base_per_day * days * scale
-
-        elif gen == "servicebus":
-            if orders_per_day:
-                est = base_per_day * (orders_per_day / 224) * days * scale
-
-        elif gen == "sap":
-            if orders_per_day:
-                # SAP has baseline + order-proportional events
-                # At 224 orders/day: ~2319/day. Order lifecycle is ~3 events/order.
-                baseline_per_day = 2_319 - (224 * 3)  # ~1647
-                order_events = (orders_per_day * 3)
-                est = (baseline_per_day + order_events) * days * scale
-
-        elif gen == "asa":
-            if orders_per_day:
-                # ASA traffic partly driven by web traffic volume
-                # ~38K/day at 224 orders. Web-driven portion is ~10%
-                web_ratio = orders_per_day / 224
-                est = base_per_day * (0.9 + 0.1 * web_ratio) * days * scale
-
-        elif gen == "wineventlog":
-            # WinEventLog: calibrated base is servers-only (434/day)
-            # Each client workstation adds ~37 events/day (14-day average)
-            client_events = max(0, num_clients) * 37
-            est = (base_per_day + client_events) * days * scale
-
-        elif gen == "sysmon":
-            # Sysmon base: 2,304/day (servers + 20 sampled workstations)
-            # With --clients>0: server-only base (~990/day) + ~18 events/client/day
-            if num_clients > 0:
-                server_base = 990
-                client_events = num_clients * 18
-                est = (server_base + client_events) * days * scale
-            # else: use default base_per_day (2,304) which includes legacy 20 samples
-
-        elif gen == "perfmon":
-            # Perfmon: calibrated base includes servers + 5 default clients
-            # Extra clients add ~340/day (no full-metrics) or ~610/day (full-metrics)
-            # Scales linearly with 1/client_interval (default 30-min)
-            interval_factor = 30 / max(client_interval or 30, 1)
-            extra = max(0, num_clients - 5)
-            if full_metrics:
-                est = (base_per_day + 6_000 + extra * 610) * interval_factor * days * scale
-            else:
-                est = (base_per_day + extra * 340) * interval_factor * days * scale
-
-        elif gen == "meraki":
-            # Meraki = event-driven base (12,348/day) + health polling
-            # Health at 15-min: MR=3,456/day, MS=42,240/day
-            # Scales linearly with 15/interval (e.g., 5-min = 3x)
-            hi = health_interval or 15
-            health_factor = 15 / max(hi, 1)
-            event_base = 12_348
-            mr_health_day = int(3_456 * health_factor) if mr_health else 0
-            ms_health_day = int(42_240 * health_factor) if ms_health else 0
-            est = (event_base + mr_health_day + ms_health_day) * days * scale
-
-        per_gen[gen] = int(est)
+        est = _table_events(gen, days, scale, **settings)
+        fitted = model.events(gen, days, scale, settings, est)
+        per_gen[gen] = int(fitted if fitted is not None else est)
 
     total_events = sum(per_gen.values())
 
@@ -335,26 +671,38 @@ def _estimate_run(sources, days, scale, orders_per_day, num_clients,
     phase1 = [g for g in sources if g not in GENERATOR_DEPENDENCIES]
     phase2 = [g for g in sources if g in GENERATOR_DEPENDENCIES]
 
-    def _phase_time(phase_gens):
-        if not phase_gens:
+    # Parallel threads are slower than single-thread due to GIL contention
+    # and disk I/O pressure; measured from history when available
+    contention = model.contention(parallel) or 1.8
+
+    est_seconds = _schedule_seconds(
+        [_estimate_gen_seconds(g, per_gen.get(g, 0), model) for g in phase1],
+        [_estimate_gen_seconds(g, per_gen.get(g, 0), model) for g in phase2],
+        parallel, contention)
+
+    return total_events, est_seconds, per_gen
+
+
+def _schedule_seconds(phase1_times, phase2_times, parallel, contention=1.0):
+    """Simulate parallel execution of two phases from single-thread seconds."""
+    def _phase_time(gen_times):
+        if not gen_times:
             return 0.0
-        gen_times = []
-        for g in phase_gens:
-            events = per_gen.get(g, 0)
-            throughput = _THROUGHPUT_EPS.get(g, 50_000)
-            gen_times.append(events / max(throughput, 1))
-        gen_times.sort(reverse=True)
+        gen_times = sorted(gen_times, reverse=True)
         if len(gen_times) <= 1 or parallel <= 1:
             return sum(gen_times)
         # Longest generator + remaining distributed across (workers - 1)
-        # Apply GIL/IO contention factor: parallel threads are ~2x slower than
-        # single-thread due to Python GIL contention and disk I/O pressure
-        contention = 1.8
         return gen_times[0] * contention + sum(gen_times[1:]) * contention / max(1, parallel - 1)
 
-    est_seconds = _phase_time(phase1) + _phase_time(phase2)
+    return _phase_time(phase1_times) + _phase_time(phase2_times)
 
-    return total_events, est_seconds, per_gen
+
+def _estimate_gen_seconds(gen, events, model=None):
+    """Single-thread seconds for one generator (history throughput, else table)."""
+    throughput = model.throughput(gen) if model else None
+    if throughput is None:
+        throughput = _THROUGHPUT_EPS.get(gen, 50_000)
+    return events / max(throughput, 1)
 
 
 def parse_sources(sources_str: str) -> List[str]:
@@ -384,9 +732,12 @@ def _get_file_col_width(output_label: str) -> int:
     global _FILE_COL_WIDTH
     if _FILE_COL_WIDTH == 0:
         max_len = 0
+        suffix = output_writer.COMPRESS_SUFFIX.get(output_writer.compression(), "")
+        if output_writer.rotation():
+            suffix += ".* (999 files)"
         for files in GENERATOR_OUTPUT_FILES.values():
             for f in files:
-                path_len = len(f"{output_label}/{f}")
+                path_len = len(f"{output_label}/{f}{suffix}")
                 if path_len > max_len:
                     max_len = path_len
         _FILE_COL_WIDTH = max_len + 3  # +3 for comfortable spacing before count
@@ -407,29 +758,70 @@ def _print_file_counts(result: Dict, output_base: Path, output_label: str):
 
     prefix = f"       {_C_DIM}->{_C_RESET} {_C_DIM}{output_label}/"
     for f in files:
-        file_path = output_base / f
-        display_path = f"{output_label}/{f}"
+        paths = _output_files(output_base / f)
+        if len(paths) > 1:
+            name = f"{f}.* ({len(paths)} files)"
+        else:
+            name = str((paths[0] if paths else output_base / f).relative_to(output_base))
+        display_path = f"{output_label}/{name}"
         padding = " " * max(col_width - len(display_path), 1)
-        if file_path.exists():
+        if paths:
             if f in file_counts:
                 count = file_counts[f]
+            elif any(p.suffix == ".zst" for p in paths):
+                print(f"{prefix}{name}{_C_RESET}{padding}{_C_DIM}{'(zstd)':>12}{_C_RESET}")
+                continue
             else:
-                count = sum(1 for _ in open(file_path))
-            print(f"{prefix}{f}{_C_RESET}{padding}{_C_CYAN}{count:>12,}{_C_RESET}")
+                count = 0
+                for file_path in paths:
+                    with (gzip.open(file_path, "rt") if file_path.suffix == ".gz" else open(file_path)) as fh:
+                        count += sum(1 for _ in fh)
+            print(f"{prefix}{name}{_C_RESET}{padding}{_C_CYAN}{count:>12,}{_C_RESET}")
         else:
             print(f"{prefix}{f}{_C_RESET}{padding}{_C_DIM}{'(not found)':>12}{_C_RESET}")
 
 
-def run_generator(name: str, func: Callable, **kwargs) -> Dict:
+def run_generator(name: str, func: Callable, profile_dir: Path = None,
+                  profile_top: int = 30, **kwargs) -> Dict:
     """Run a single generator and return results.
 
     Generators may return:
       - int: total event count (single-file generators)
       - dict: {"total": N, "files": {"rel/path": count, ...}} (multi-file generators)
+
+    If profile_dir is set the generator runs under cProfile and its
+    .prof/.txt reports are written there (see shared/profiling.py).
+    Profiled generators run one at a time; the wait for the profiler is
+    not part of the generator's duration.
     """
+    if profile_dir is not None:
+        with profile_lock():
+            return _run_generator(name, func, profile_dir, profile_top, kwargs)
+    return _run_generator(name, func, None, profile_top, kwargs)
+
+
+def _run_generator(name: str, func: Callable, profile_dir: Path, profile_top: int,
+                   kwargs: Dict) -> Dict:
     start_time = time.time()
+    recorder = telemetry.begin(name)
+
+    # Day ticks drive the per-day telemetry split; day and hour ticks are
+    # forwarded to the live progress display when one is active.
+    callback = kwargs.get("progress_callback")
+
+    def _on_progress(gen_name, day, days, hour=None, events=None):
+        if hour is None:
+            recorder.day_tick(day)
+        if callback:
+            callback(gen_name, day, days, hour=hour, events=events)
+
+    kwargs = {**kwargs, "progress_callback": _on_progress}
+    profile_paths = None
     try:
-        result = func(**kwargs)
+        if profile_dir is not None:
+            result, profile_paths = profile_call(name, func, kwargs, profile_dir, profile_top)
+        else:
+            result = func(**kwargs)
         duration = time.time() - start_time
         if isinstance(result, dict):
             count = result.get("total", 0)
@@ -443,6 +835,10 @@ def run_generator(name: str, func: Callable, **kwargs) -> Dict:
             "count": count,
             "file_counts": file_counts,
             "duration": duration,
+            "bytes_written": _output_bytes(name),
+            "compression": _generator_compression(name),
+            "telemetry": _finish_telemetry(),
+            "profile": profile_paths,
         }
     except Exception as e:
         duration = time.time() - start_time
@@ -451,9 +847,144 @@ def run_generator(name: str, func: Callable, **kwargs) -> Dict:
             "success": False,
             "error": str(e),
             "duration": duration,
+            "telemetry": _finish_telemetry(),
         }
 
 
+def _finish_telemetry() -> Dict:
+    """Close this thread's recorder and attach memory readings.
+
+    Memory figures are process-wide (hence the process_ prefix): with
+    --parallel > 1 they include every generator running at the same time.
+    """
+    recorder = telemetry.end()
+    data = recorder.to_dict() if recorder else {}
+    data["process_peak_rss_mb"] = telemetry.peak_rss_mb()
+    data["process_tracemalloc_peak_mb"] = telemetry.tracemalloc_peak_mb()
+    return data
+
+
+def _output_files(path: Path) -> List[Path]:
+    """Files on disk for an output path: compressed and rotated files included."""
+    files = [p for p in output_writer.written_files(path) if p.exists()]
+    if not files and path.exists():
+        files = [path]   # written without open_output() (access registries)
+    return files
+
+
+def _output_bytes(name: str) -> int:
+    """Total size on disk of a generator's output files in the current output base."""
+    return sum(p.stat().st_size
+               for rel_path in GENERATOR_OUTPUT_FILES.get(name, [])
+               for p in _output_files(_config.OUTPUT_BASE / rel_path))
+
+
+def _generator_compression(name: str) -> Dict:
+    """Uncompressed/compressed bytes and compress seconds of a generator's files (--compress)."""
+    if output_writer.compression() is None:
+        return None
+    stats = output_writer.compression_stats()
+    totals = {"raw_bytes": 0, "compressed_bytes": 0, "seconds": 0.0}
+    for rel_path in GENERATOR_OUTPUT_FILES.get(name, []):
+        for path in output_writer.written_files(_config.OUTPUT_BASE / rel_path):
+            s = stats.get(str(path))
+            if s:
+                for key in totals:
+                    totals[key] += s[key]
+    totals["seconds"] = round(totals["seconds"], 3)
+    return totals
+
+
+def _compression_totals(results: List[Dict]) -> Dict:
+    """Run-level compression summary for the manifest and the banner."""
+    raw = sum((r.get("compression") or {}).get("raw_bytes", 0) for r in results)
+    compressed = sum((r.get("compression") or {}).get("compressed_bytes", 0) for r in results)
+    return {
+        "method": output_writer.compression(),
+        "raw_bytes": raw,
+        "compressed_bytes": compressed,
+        "ratio": round(raw / compressed, 2) if compressed else None,
+        "seconds": round(sum((r.get("compression") or {}).get("seconds", 0.0) for r in results), 3),
+    }
+
+
+def _write_run_manifest(path: Path, args, results: List[Dict], total_time: float,
+                        move_result: Dict = None, syslog: Dict = None) -> Path:
+    """Write run_manifest.json describing where the run spent its time.
+
+    Per generator: phase wall/CPU seconds (setup, generate, sort, serialize,
+    write, move), per-day generate timings, events/sec, bytes written and
+    the process's memory peaks when it finished (process_*, not per generator). Generators with worker processes also
+    list each worker's timings; their CPU time is included in the phases.
+    """
+    move_timings = (move_result or {}).get("timings", {})
+    generators = {}
+    for r in sorted(results, key=lambda r: r["name"]):
+        data = r.get("telemetry", {})
+        phases = dict(data.get("phases", {}))
+        if r["name"] in move_timings:
+            phases["move"] = {"wall": round(move_timings[r["name"]], 4), "cpu": None}
+        entry = {
+            "success": r["success"],
+            "events": r.get("count", 0),
+            "duration_seconds": round(r["duration"], 3),
+            "events_per_sec": round(r.get("count", 0) / r["duration"]) if r["duration"] > 0 else 0,
+            "bytes_written": r.get("bytes_written", 0),
+            "wall_seconds": data.get("wall_seconds"),
+            "cpu_seconds": data.get("cpu_seconds"),
+            "process_peak_rss_mb": data.get("process_peak_rss_mb"),
+            "process_tracemalloc_peak_mb": data.get("process_tracemalloc_peak_mb"),
+            "phases": phases,
+            "days": data.get("days", []),
+        }
+        if data.get("workers"):
+            entry["workers"] = data["workers"]
+        if r.get("compression"):
+            entry["compression"] = r["compression"]
+        if r.get("profile"):
+            entry["profile"] = r["profile"]
+        if not r["success"]:
+            entry["error"] = r.get("error", "")
+        generators[r["name"]] = entry
+
+    total_events = sum(r.get("count", 0) for r in results if r["success"])
+    manifest = {
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "args": {
+            "sources": sorted(r["name"] for r in results),
+            "start_date": args.start_date,
+            "days": args.days,
+            "scale": args.scale,
+            "scenarios": args.scenarios,
+            "parallel": args.parallel,
+            "test": args.test,
+            "promote": args.promote,
+            "orders_per_day": args.orders_per_day,
+            "clients": args.clients,
+            "json_backend": json_templates.backend(),
+            "compress": args.compress,
+            "rotate": output_writer.rotation(),
+            "syslog": args.syslog,
+            "write_queue": args.write_queue,
+            "fsync": args.fsync,
+        },
+        "total_events": total_events,
+        "total_seconds": round(total_time, 3),
+        "events_per_sec": round(total_events / total_time) if total_time > 0 else 0,
+        "bytes_written": sum(g["bytes_written"] for g in generators.values()),
+        "peak_rss_mb": telemetry.peak_rss_mb(),
+        "tracemalloc_peak_mb": telemetry.tracemalloc_peak_mb(),
+        "memory_scope": "process",
+        "compression": _compression_totals(results) if output_writer.compression() else None,
+        "syslog": syslog,
+        "generators": generators,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate coordinated Splunk demo logs",
@@ -569,6 +1100,13 @@ Output Directories:
                         help="Scenarios: none, all, attack, ops, network, or individual names (exfil, ransomware_attempt, memory_leak, cpu_runaway, disk_filling, dead_letter_pricing, firewall_misconfig, certificate_expiry, ddos_attack)")
     parser.add_argument("--parallel", type=int, default=4, help="Number of parallel generators")
     parser.add_argument("--quiet", "-q", action="store_true", help="Suppress progress output")
+    parser.add_argument("--promote", choices=["end", "incremental"], default="end",
+                        help="When to move files from output/tmp/ to output/: end = after the whole "
+                             "run, only if every generator succeeded (default); incremental = each "
+                             "generator's files as soon as it succeeds")
+    parser.add_argument("--progress-file", default=None, metavar="PATH",
+                        help="Keep a JSON progress snapshot (per-generator events/sec and ETA) "
+                             "at PATH while running; works with --quiet")
     parser.add_argument("--show-files", action="store_true",
                         help="Show output file paths instead of generator names in progress")
 
@@ -594,9 +1132,72 @@ Output Directories:
                         help="Disable MR wireless AP health metrics (~3.5K events/day)")
     parser.add_argument("--no-ms-health", action="store_true",
                         help="Disable MS switch port health metrics (~42K events/day)")
+    parser.add_argument("--meraki-workers", type=int, default=None, metavar="N",
+                        help="Worker processes for Meraki's per-location streams "
+                             "(default: one per location, up to the CPU count)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Trace Python heap with tracemalloc for run_manifest.json (slower)")
+    parser.add_argument("--profile", default=None, metavar="SOURCES",
+                        help="Run these sources/groups under cProfile; writes <output>/profiles/<name>.prof + .txt")
+    parser.add_argument("--profile-top", type=int, default=30,
+                        help="Functions per section in the --profile text report (default: 30)")
+    parser.add_argument("--json-backend", choices=json_templates.BACKENDS, default="json",
+                        help="JSON encoder for JSON sources: json (stdlib, default), orjson "
+                             "(compact output, needs orjson installed) or auto")
+    parser.add_argument("--compress", choices=output_writer.COMPRESSORS, default="none",
+                        help="Write output files compressed: gzip (<file>.gz, read directly by "
+                             "Splunk monitor inputs) or zstd (<file>.zst, needs zstandard or "
+                             "Python 3.14+; not read by monitor inputs). Default: none")
+    parser.add_argument("--compress-level", type=int, default=None, metavar="N",
+                        help="Compression level (default: gzip 6, zstd 3)")
+    parser.add_argument("--rotate-mb", type=float, default=0, metavar="MB",
+                        help="Split each output file into <file>.NNN segments of about MB "
+                             "(uncompressed) each, for parallel ingestion (default: 0 = off)")
+    parser.add_argument("--rotate-by", choices=["none", "day"], default="none",
+                        help="day: one <file>.<YYYY-MM-DD> segment per event day "
+                             "(<file>.<YYYY-MM-DD>.NNN with --rotate-mb). Default: none")
+    parser.add_argument("--write-queue", type=int, default=output_writer.DEFAULT_WRITE_QUEUE, metavar="N",
+                        help="Events a generator may hand to its writer thread before it waits "
+                             f"(default: {output_writer.DEFAULT_WRITE_QUEUE}; 0 = write on the generator thread)")
+    parser.add_argument("--fsync", choices=output_writer.FSYNC_POLICIES, default="none",
+                        help="close: fsync each output file when it is closed (default: none)")
+    parser.add_argument("--syslog", default=None, metavar="URL",
+                        help="Also send syslog-format streams to a receiver: udp://host[:port] "
+                             "or tcp://host[:port] (default port 514)")
+    parser.add_argument("--syslog-sources", default=",".join(SYSLOG_STREAMS), metavar="SOURCES",
+                        help=f"Sources sent with --syslog (default: {','.join(SYSLOG_STREAMS)})")
+    parser.add_argument("--syslog-framing", choices=["lf", "octet"], default="lf",
+                        help="TCP framing: lf (newline) or octet (RFC 6587 octet counting)")
+    parser.add_argument("--syslog-eps", type=float, default=0, metavar="N",
+                        help="Events/sec ceiling for --syslog (default: 0 = unpaced)")
+    parser.add_argument("--syslog-backlog", type=int, default=1_000_000, metavar="N",
+                        help="Messages queued for --syslog; when full, a generator writing its "
+                             "finished file waits for room (default: 1000000)")
+    parser.add_argument("--syslog-wait", type=float, default=30.0, metavar="SECONDS",
+                        help="How long a writer waits with the --syslog backlog full and no "
+                             "messages going out before it drops (default: 30; 0 = drop at once)")
 
     args = parser.parse_args()
 
+    if args.trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+
+    try:
+        json_templates.set_backend(args.json_backend)
+        output_writer.set_compression(args.compress, args.compress_level)
+        output_writer.set_rotation(args.rotate_mb, args.rotate_by, args.start_date)
+        output_writer.set_write_queue(args.write_queue)
+        output_writer.set_fsync(args.fsync)
+        syslog_sink = None
+        if args.syslog:
+            syslog_sink = SyslogSink(args.syslog, framing=args.syslog_framing,
+                                     eps=args.syslog_eps, backlog=args.syslog_backlog,
+                                     wait=args.syslog_wait)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
     # Smart scenario filtering: skip scenarios that start beyond --days
     from scenarios.registry import expand_scenarios, filter_scenarios_by_days
     requested_scenarios = expand_scenarios(args.scenarios)
@@ -664,6 +1265,45 @@ Output Directories:
     phase1_sources = list(dict.fromkeys(phase1_sources))
     phase2_sources = list(dict.fromkeys(phase2_sources))
 
+    # Pre-run estimation (fitted from run history when available). Drives the
+    # banner's "Estimated" line and longest-first scheduling within a phase.
+    all_sources = phase1_sources + phase2_sources
+
+    syslog_files = []
+    if syslog_sink is not None:
+        syslog_sources = [s.strip() for s in args.syslog_sources.split(",") if s.strip()]
+        unknown = [s for s in syslog_sources if s not in SYSLOG_STREAMS]
+        if unknown:
+            print(f"Error: --syslog-sources: no syslog stream for {', '.join(unknown)} "
+                  f"(choose from {', '.join(SYSLOG_STREAMS)})", file=sys.stderr)
+            sys.exit(1)
+        syslog_files = syslog_sink.attach([s for s in syslog_sources if s in all_sources])
+    est_settings = {
+        "orders_per_day": args.orders_per_day,
+        "num_clients": args.clients,
+        "client_interval": args.client_interval,
+        "full_metrics": args.full_metrics,
+        "health_interval": args.meraki_health_interval,
+        "mr_health": not args.no_meraki_health and not args.no_mr_health,
+        "ms_health": not args.no_meraki_health and not args.no_ms_health,
+    }
+    history_model = run_history.load_model()
+    est_events, est_seconds, est_per_gen = _estimate_run(
+        sources=all_sources,
+        days=args.days,
+        scale=args.scale,
+        parallel=args.parallel,
+        model=history_model,
+        **est_settings,
+    )
+
+    if args.progress_file:
+        _init_progress_file(
+            args.progress_file, all_sources,
+            {g: _estimate_gen_seconds(g, est_per_gen.get(g, 0), history_model) for g in all_sources},
+            est_events, est_seconds)
+        signal.signal(signal.SIGTERM, _on_terminate)
+
     # Print banner
     if not args.quiet:
         mode_label = "TEST (output/tmp/ only)" if args.test else "PRODUCTION (tmp/ → output/)"
@@ -681,24 +1321,9 @@ Output Directories:
         else:
             print(f"  Sources:     {', '.join(phase1_sources)}")
         print(f"  Output:      {current_output_base}/")
-
-        # Pre-run estimation
-        all_sources = phase1_sources + phase2_sources
-        mr_health = not args.no_meraki_health and not args.no_mr_health
-        ms_health = not args.no_meraki_health and not args.no_ms_health
-        est_events, est_seconds, _ = _estimate_run(
-            sources=all_sources,
-            days=args.days,
-            scale=args.scale,
-            orders_per_day=args.orders_per_day,
-            num_clients=args.clients,
-            client_interval=args.client_interval,
-            full_metrics=args.full_metrics,
-            health_interval=args.meraki_health_interval,
-            mr_health=mr_health,
-            ms_health=ms_health,
-            parallel=args.parallel,
-        )
+        if syslog_sink is not None:
+            pacing = f", max {args.syslog_eps:,.0f} events/sec" if args.syslog_eps else ""
+            print(f"  Syslog:      {args.syslog} ({', '.join(syslog_files) or 'no syslog sources selected'}{pacing})")
 
         # Format event count
         if est_events >= 1_000_000:
@@ -746,45 +1371,30 @@ Output Directories:
         "scale": args.scale,
         "scenarios": args.scenarios,
         "quiet": True,  # Always quiet for parallel execution
-        "progress_callback": _report_progress if not args.quiet else None,
+        "progress_callback": _report_progress if not args.quiet or args.progress_file else None,
     }
 
-    # Perfmon-specific kwargs
-    perfmon_kwargs = {
-        **base_kwargs,
+    # Generator-specific kwargs; each generator gets the ones listed for it
+    # in GENERATOR_KWARGS
+    extra_kwargs = {
         "num_clients": args.clients,
         "client_interval": args.client_interval,
         "full_metrics": args.full_metrics,
-    }
-
-    # Access-specific kwargs
-    access_kwargs = {
-        **base_kwargs,
         "orders_per_day": args.orders_per_day,
-    }
-
-    # WinEventLog-specific kwargs
-    wineventlog_kwargs = {
-        **base_kwargs,
-        "num_clients": args.clients,
-    }
-
-    # Sysmon-specific kwargs
-    sysmon_kwargs = {
-        **base_kwargs,
-        "num_clients": args.clients,
-    }
-
-    # Meraki-specific kwargs
-    mr_health = not args.no_meraki_health and not args.no_mr_health
-    ms_health = not args.no_meraki_health and not args.no_ms_health
-    meraki_kwargs = {
-        **base_kwargs,
         "health_interval": args.meraki_health_interval,
-        "mr_health_enabled": mr_health,
-        "ms_health_enabled": ms_health,
+        "mr_health_enabled": not args.no_meraki_health and not args.no_mr_health,
+        "ms_health_enabled": not args.no_meraki_health and not args.no_ms_health,
+        "workers": args.meraki_workers,
     }
 
+    # Pre-processing: bring the company snapshot up to date once, so parallel
+    # generators and Meraki worker processes load it instead of deriving it
+    from shared import company_snapshot
+    snapshot = company_snapshot.build()
+    if snapshot["built"] and not args.quiet:
+        print(f"  Building company snapshot... {_C_GREEN}✓{_C_RESET} {snapshot['users']} users, "
+              f"{snapshot['servers']} servers {_C_DIM}({snapshot['seconds'] * 1000:.0f} ms){_C_RESET}")
+
     # Pre-processing: build shared meeting schedule if any consumer is in the run list
     SCHEDULE_CONSUMERS = {"meraki", "exchange", "webex_ta", "webex_api"}
     all_generators = phase1_sources + phase2_sources
@@ -808,44 +1418,86 @@ Output Directories:
     start_time = time.time()
     results = []
 
+    # Profiling: --profile accepts the same source/group names as --sources
+    profile_sources = set(parse_sources(args.profile)) if args.profile else set()
+    profile_dir = current_output_base / "profiles"
+
+    # Incremental promotion: each generator's files move to output/ as soon
+    # as it succeeds, so ingestion overlaps the rest of the run and a failed
+    # source only keeps its own files in output/tmp/. Generators whose staged
+    # files feed phase 2 (access's registries) wait until phase 2 is done.
+    promote_each = args.promote == "incremental" and not args.test
+    feeders = {d for g in phase2_sources for d in GENERATOR_DEPENDENCIES.get(g, [])}
+    deferred_promotions = []
+    move_result = {"moved": [], "skipped": [], "errors": [], "timings": {}} if promote_each else None
+
+    def promote_finished(result: Dict):
+        if not promote_each or not result["success"]:
+            return
+        if result["name"] in feeders:
+            deferred_promotions.append(result["name"])
+        else:
+            promote_generator_output(result["name"], move_result)
+
     def get_kwargs_for_generator(name: str) -> dict:
-        """Get the appropriate kwargs for a generator."""
-        if name == "perfmon":
-            return perfmon_kwargs
-        if name == "wineventlog":
-            return wineventlog_kwargs
-        if name == "sysmon":
-            return sysmon_kwargs
-        if name == "access":
-            return access_kwargs
-        if name == "meraki":
-            return meraki_kwargs
-        return base_kwargs
+        """Get the appropriate kwargs for a generator (plus profiling options)."""
+        kwargs = _generator_kwargs(name)
+        if name in profile_sources:
+            kwargs = {**kwargs, "profile_dir": profile_dir, "profile_top": args.profile_top}
+        return kwargs
+
+    def _generator_kwargs(name: str) -> dict:
+        return {**base_kwargs, **{k: extra_kwargs[k] for k in GENERATOR_KWARGS.get(name, [])}}
 
     def run_phase(phase_sources: List[str], phase_name: str = None):
         """Run a phase of generators."""
-        global _progress_stop
+        global _progress_stop, _progress_active
         phase_results = []
 
         if phase_name and not args.quiet:
             print(f"\n  === {phase_name} ===")
-
-        if args.parallel > 1 and len(phase_sources) > 1:
+        _set_progress_phase(phase_name or "Generating")
+
+        parallel = args.parallel > 1 and len(phase_sources) > 1
+        # The progress line is drawn for parallel runs; --progress-file is
+        # kept up to date for any run, --quiet included
+        show_progress = parallel and not args.quiet
+        display_thread = None
+        if show_progress or _progress_file is not None:
             # Register generators in progress tracker and start display thread
-            display_thread = None
-            if not args.quiet:
-                with _progress_lock:
-                    _progress.clear()
-                    for name in phase_sources:
-                        _progress[name] = {
-                            "day": 0, "days": args.days,
-                            "status": "running", "start": time.time(),
-                        }
-                _progress_stop = False
-                _progress_pause.clear()
-                display_thread = threading.Thread(
-                    target=_progress_display_thread, args=(len(phase_sources),), daemon=True)
-                display_thread.start()
+            with _progress_lock:
+                _progress.clear()
+                for name in phase_sources:
+                    _progress[name] = {
+                        "day": 0, "days": args.days, "hour": 0,
+                        "events": 0, "events_t": None,
+                        "status": "running", "start": None,
+                        "est_events": est_per_gen.get(name),
+                        "est_seconds": _estimate_gen_seconds(
+                            name, est_per_gen.get(name, 0), history_model),
+                    }
+            _progress_stop = False
+            _progress_active = True
+            _progress_pause.clear()
+            display_thread = threading.Thread(
+                target=_progress_display_thread, args=(len(phase_sources), show_progress),
+                daemon=True)
+            display_thread.start()
+
+        def _finished(result):
+            phase_results.append(result)
+            # Mark as finished in progress tracker
+            with _progress_lock:
+                if result["name"] in _progress:
+                    _progress[result["name"]]["status"] = "done" if result["success"] else "failed"
+            _record_finished(result)
+            promote_finished(result)
+
+        if parallel:
+            # Longest-first, so the slowest generator isn't the last one started
+            phase_sources = sorted(
+                phase_sources,
+                key=lambda g: -_estimate_gen_seconds(g, est_per_gen.get(g, 0), history_model))
 
             # Parallel execution
             with ThreadPoolExecutor(max_workers=args.parallel) as executor:
@@ -858,12 +1510,7 @@ Output Directories:
 
                 for future in as_completed(futures):
                     result = future.result()
-                    phase_results.append(result)
-
-                    # Mark as done in progress tracker
-                    with _progress_lock:
-                        if result["name"] in _progress:
-                            _progress[result["name"]]["status"] = "done"
+                    _finished(result)
 
                     if not args.quiet:
                         # Pause display thread to prevent interleaving with file paths
@@ -882,12 +1529,6 @@ Output Directories:
                         # Resume display thread
                         _progress_pause.clear()
 
-            # Stop display thread
-            if display_thread:
-                _progress_stop = True
-                display_thread.join(timeout=2)
-                print(f"\r{' ' * 120}\r", end="", flush=True)
-
         else:
             # Sequential execution
             for name in phase_sources:
@@ -896,7 +1537,7 @@ Output Directories:
                 if not args.quiet:
                     print(f"  Running {name}...", end="", flush=True)
                 result = run_generator(name, func, **kwargs)
-                phase_results.append(result)
+                _finished(result)
                 if not args.quiet:
                     count = result.get("count", 0)
                     if result["success"]:
@@ -906,6 +1547,14 @@ Output Directories:
                     if args.show_files:
                         _print_file_counts(result, current_output_base, output_label)
 
+        # Stop display thread
+        if display_thread:
+            _progress_stop = True
+            _progress_active = False
+            display_thread.join(timeout=2)
+            if show_progress:
+                print(f"\r{' ' * 120}\r", end="", flush=True)
+
         return phase_results
 
     # Phase 1: Run independent generators (including access which creates order_registry.json)
@@ -917,40 +1566,85 @@ Output Directories:
     if phase2_sources:
         results.extend(run_phase(phase2_sources, "Phase 2: Dependent generators (using order_registry.json)"))
 
+    # Send what the syslog sender still has queued
+    if syslog_sink is not None:
+        if not args.quiet and syslog_sink.backlog():
+            print()
+            print(f"  Sending {syslog_sink.backlog():,} queued syslog messages to {args.syslog}...")
+        _set_progress_phase("Sending syslog backlog")
+        syslog_sink.close()
+
     # Summary
     total_time = time.time() - start_time
     total_events = sum(r.get("count", 0) for r in results if r["success"])
     successful = sum(1 for r in results if r["success"])
     failed = sum(1 for r in results if not r["success"])
 
-    # Move files to production (output/) if not in test mode and all generators succeeded
-    move_result = None
-    if not args.test and failed == 0:
+    # Move files to production (output/) if not in test mode and all generators
+    # succeeded; with --promote=incremental most of them already are
+    if promote_each:
+        for name in deferred_promotions:
+            promote_generator_output(name, move_result)
+        remove_empty_staging_dirs()
+        if not args.quiet:
+            print()
+            print(f"  Promoted {len(move_result['moved'])} files to output/ as generators finished")
+    elif not args.test and failed == 0:
         if not args.quiet:
             print()
             print("  Moving files to output/ for Splunk ingestion...")
-        from shared.config import move_output_to_production
+        _set_progress_phase("Moving files to output/")
         move_result = move_output_to_production(quiet=args.quiet)
         if not args.quiet:
             print(f"  Moved {len(move_result['moved'])} files to output/")
-            if move_result['skipped']:
-                print(f"  Skipped {len(move_result['skipped'])} files (not generated)")
-            if move_result['errors']:
-                for err in move_result['errors']:
-                    print(f"  ERROR: {err}", file=sys.stderr)
-    elif not args.test and failed > 0:
+    if move_result is not None and not args.quiet:
+        if move_result['skipped']:
+            print(f"  Skipped {len(move_result['skipped'])} files (not generated)")
+        if move_result['errors']:
+            for err in move_result['errors']:
+                print(f"  ERROR: {err}", file=sys.stderr)
+    if not args.test and failed > 0:
         if not args.quiet:
-            print()
-            print(f"  WARNING: {failed} generator(s) failed — files remain in output/tmp/")
+            if not promote_each:
+                print()
+            print(f"  WARNING: {failed} generator(s) failed — their files remain in output/tmp/")
 
     # Determine output location for summary
     if not args.test and failed == 0:
         output_summary = "output/ (ready for Splunk)"
     elif args.test:
         output_summary = "output/tmp/ (test mode)"
+    elif promote_each:
+        output_summary = f"output/ ({successful} sources), failed sources left in output/tmp/"
     else:
         output_summary = "output/tmp/ (not moved due to errors)"
 
+    # Feed the estimator. Profiled/traced runs are slower than normal, so skip them.
+    if failed == 0 and not profile_sources and not args.trace_memory:
+        records = []
+        for r in results:
+            data = r.get("telemetry", {})
+            records.append(run_history.make_record(
+                r["name"], args.days, args.scale, est_settings, r.get("count", 0),
+                wall=data.get("wall_seconds", r["duration"]), cpu=data.get("cpu_seconds", 0),
+                parallel=args.parallel,
+                table_events=int(_table_events(r["name"], args.days, args.scale, **est_settings))))
+        # Run-level record: actual wall time vs the uncontended schedule of
+        # the measured CPU times -> fitted contention factor
+        cpu_by_gen = {r["name"]: r.get("telemetry", {}).get("cpu_seconds", 0) for r in results}
+        records.append(run_history.make_run_record(
+            wall=total_time, parallel=args.parallel,
+            base=_schedule_seconds([cpu_by_gen.get(g, 0) for g in phase1_sources],
+                                   [cpu_by_gen.get(g, 0) for g in phase2_sources],
+                                   args.parallel)))
+        run_history.append_records(records)
+
+    # Run manifest lives next to the files it describes
+    manifest_base = OUTPUT_BASE_PRODUCTION if move_result is not None else current_output_base
+    manifest_path = _write_run_manifest(
+        manifest_base / "run_manifest.json", args, results, total_time, move_result,
+        syslog=syslog_sink.stats() if syslog_sink is not None else None)
+
     if not args.quiet:
         print()
         print("=" * 70)
@@ -958,10 +1652,43 @@ Output Directories:
         print(f"  Total Events:  {_C_YELLOW}{total_events:,}{_C_RESET}")
         print(f"  Total Time:    {total_time:.1f}s")
         print(f"  Generators:    {_C_GREEN}{successful} successful{_C_RESET}, {failed} failed")
+        for result in results:
+            if not result["success"]:
+                print(f"    [✗] {result['name']:{_GEN_NAME_WIDTH}} {result.get('error', 'Unknown error')}")
         print(f"  Throughput:    {total_events / total_time:,.0f} events/sec")
+        if output_writer.compression():
+            comp = _compression_totals(results)
+            ratio = f"{comp['ratio']:.1f}x" if comp["ratio"] else "--"
+            print(f"  Compression:   {comp['method']} {_fmt_bytes(comp['raw_bytes'])} -> "
+                  f"{_fmt_bytes(comp['compressed_bytes'])} ({ratio}), "
+                  f"{comp['seconds']:.1f}s compressing on background threads")
+        if output_writer.rotation():
+            segments = sum(len(output_writer.written_files(_config.OUTPUT_BASE / f))
+                           for r in results if r["success"]
+                           for f in GENERATOR_OUTPUT_FILES.get(r["name"], []))
+            rotate = output_writer.rotation()
+            rule = " + ".join(filter(None, ["per day" if rotate["by"] == "day" else "",
+                                            f"{rotate['mb']:g} MB" if rotate["mb"] else ""]))
+            print(f"  Rotation:      {segments:,} files ({rule})")
+        if syslog_sink is not None:
+            sent = syslog_sink.stats()
+            print(f"  Syslog:        {sent['sent']:,} sent to {sent['target']} "
+                  f"({sent['events_per_sec']:,}/s), {sent['dropped']:,} dropped, "
+                  f"{sent['errors']} send errors, peak backlog {sent['peak_backlog']:,}"
+                  + (f", writers waited {sent['wait_seconds']:.1f}s" if sent["wait_seconds"] else ""))
         print(f"  Output:        {output_summary}")
+        print(f"  Manifest:      {manifest_path.relative_to(OUTPUT_BASE_PRODUCTION.parent)}")
+        if profile_sources:
+            profiled = sorted(r["name"] for r in results if r.get("profile"))
+            print(f"  Profiles:      {profile_dir.relative_to(OUTPUT_BASE_PRODUCTION.parent)}/ "
+                  f"({', '.join(profiled) or 'none'})")
         print("=" * 70)
 
+    _write_progress_file(
+        "done" if failed == 0 else "failed",
+        total_events=total_events, output=output_summary,
+        manifest=str(manifest_path))
+
     # Print failures
     for result in results:
         if not result["success"]:
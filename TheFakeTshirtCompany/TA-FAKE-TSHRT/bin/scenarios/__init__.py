@@ -1,5 +1,6 @@
 # Scenarios Package
 # Provides scenario definitions for attack, ops, and network scenarios
+import importlib
 
 from .registry import (
     ALL_SCENARIOS, ALL_SOURCES, IMPLEMENTED_SCENARIOS,
@@ -9,10 +10,23 @@ from .registry import (
     expand_scenarios, get_required_sources, source_needed_for_scenarios
 )
 
-# Import from subpackages
-from .security import ExfilScenario
-from .ops import CpuRunawayScenario, MemoryLeakScenario
-from .network import FirewallMisconfigScenario
+# Scenario classes load on first use, so "from scenarios.registry import ..."
+# does not import every scenario module
+_LAZY_CLASSES = {
+    'ExfilScenario': '.security',
+    'CpuRunawayScenario': '.ops',
+    'MemoryLeakScenario': '.ops',
+    'FirewallMisconfigScenario': '.network',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        value = getattr(importlib.import_module(_LAZY_CLASSES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'ALL_SCENARIOS', 'ALL_SOURCES', 'IMPLEMENTED_SCENARIOS',
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Scenario event contract.
+
+Scenario hour/day methods that feed JSON generators (AWS, GCP, Exchange)
+return ScenarioEvent records instead of pre-serialized JSON strings:
+
+    ScenarioEvent(sort_key="2026-01-09T02:14:07Z", record={...})
+
+`record` is the event dict exactly as it should be written. `sort_key` is
+the value the consuming generator sorts on (eventTime, timestamp, Received),
+computed once by the scenario. Generators never read it back out of the
+record: AWS and GCP merge() scenario events into their sorted events on
+sort_key, and Exchange hands them to OrderedWriter.add_keyed() as
+(key, event) pairs. Each event is serialized exactly once, on the write path.
+"""
+
+import heapq
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple
+
+
+class ScenarioEvent(NamedTuple):
+    """One structured scenario event plus its precomputed sort key."""
+    sort_key: str
+    record: Dict[str, Any]
+
+
+def keyed(events: Iterable[Dict[str, Any]], field: str) -> List[ScenarioEvent]:
+    """Wrap event dicts as ScenarioEvents keyed on `field` (order is kept)."""
+    return [ScenarioEvent(event.get(field, ""), event) for event in events]
+
+
+def merge(events: List[Dict[str, Any]], scenario_events: Iterable[ScenarioEvent],
+          key: Callable) -> List[Dict[str, Any]]:
+    """Sort `events` on `key` and merge in scenario events on their sort_key.
+
+    Scenario events are ordered by their precomputed key, never by `key`.
+    Equal keys keep the generator's own events first.
+    """
+    events.sort(key=key)
+    scenario = sorted(scenario_events, key=_sort_key)
+    if not scenario:
+        return events
+    merged = heapq.merge(((key(event), event) for event in events), scenario, key=_sort_key)
+    return [event for _, event in merged]
+
+
+_sort_key = itemgetter(0)
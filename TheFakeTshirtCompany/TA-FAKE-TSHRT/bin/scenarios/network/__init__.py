@@ -1,4 +1,22 @@
 # Network scenarios (firewall, routing issues, DDoS)
-from .firewall_misconfig import FirewallMisconfigScenario, FirewallMisconfigConfig
-from .certificate_expiry import CertificateExpiryScenario, CertificateExpiryConfig
-from .ddos_attack import DdosAttackScenario, DdosAttackConfig
+#
+# Classes load on first use ("from scenarios.network import X" still works),
+# so importing one scenario module does not import its siblings.
+import importlib
+
+_LAZY_CLASSES = {
+    'FirewallMisconfigScenario': '.firewall_misconfig',
+    'FirewallMisconfigConfig': '.firewall_misconfig',
+    'CertificateExpiryScenario': '.certificate_expiry',
+    'CertificateExpiryConfig': '.certificate_expiry',
+    'DdosAttackScenario': '.ddos_attack',
+    'DdosAttackConfig': '.ddos_attack',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        value = getattr(importlib.import_module(_LAZY_CLASSES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,22 @@
 # Ops scenarios (operational issues)
-from .cpu_runaway import CpuRunawayScenario, CpuRunawayConfig
-from .memory_leak import MemoryLeakScenario, MemoryLeakConfig
-from .dead_letter_pricing import DeadLetterPricingScenario, DeadLetterPricingConfig
+#
+# Classes load on first use ("from scenarios.ops import X" still works),
+# so importing one scenario module does not import its siblings.
+import importlib
+
+_LAZY_CLASSES = {
+    'CpuRunawayScenario': '.cpu_runaway',
+    'CpuRunawayConfig': '.cpu_runaway',
+    'MemoryLeakScenario': '.memory_leak',
+    'MemoryLeakConfig': '.memory_leak',
+    'DeadLetterPricingScenario': '.dead_letter_pricing',
+    'DeadLetterPricingConfig': '.dead_letter_pricing',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        value = getattr(importlib.import_module(_LAZY_CLASSES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
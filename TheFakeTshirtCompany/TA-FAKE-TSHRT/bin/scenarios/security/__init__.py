@@ -1,4 +1,22 @@
 # Security scenarios (attack scenarios)
-from .exfil import ExfilScenario, ExfilConfig
-from .ransomware_attempt import RansomwareAttemptScenario, RansomwareAttemptConfig
-from .phishing_test import PhishingTestScenario, PhishingTestConfig
+#
+# Classes load on first use ("from scenarios.security import X" still works),
+# so importing one scenario module does not import its siblings.
+import importlib
+
+_LAZY_CLASSES = {
+    'ExfilScenario': '.exfil',
+    'ExfilConfig': '.exfil',
+    'RansomwareAttemptScenario': '.ransomware_attempt',
+    'RansomwareAttemptConfig': '.ransomware_attempt',
+    'PhishingTestScenario': '.phishing_test',
+    'PhishingTestConfig': '.phishing_test',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        value = getattr(importlib.import_module(_LAZY_CLASSES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -29,6 +29,7 @@ from shared.config import Config, next_cid
 from shared.company import Company, ASA_NAT_POOL, ASA_STATIC_NAT
 from shared.time_utils import TimeUtils
 from scenarios.registry import get_phase
+from scenarios.events import ScenarioEvent, keyed
 
 
 @dataclass
@@ -501,11 +502,11 @@ class ExfilScenario:
     # AWS EVENTS
     # =========================================================================
 
-    def aws_create_user(self, day: int) -> str:
+    def aws_create_user(self, day: int) -> dict:
         """Create malicious IAM user."""
         ts = self.time_utils.ts_iso(day, 10, 45, 22)
 
-        return json.dumps({
+        return {
             "eventVersion": "1.08",
             "userIdentity": {
                 "type": "IAMUser",
@@ -537,13 +538,13 @@ class ExfilScenario:
             "recipientAccountId": self.cfg.aws_account_id,
             "eventCategory": "Management",
             "demo_id": self.cfg.demo_id if self.config.demo_id_enabled else None,
-        })
+        }
 
-    def aws_attach_policy(self, day: int) -> str:
+    def aws_attach_policy(self, day: int) -> dict:
         """Attach admin policy to malicious user."""
         ts = self.time_utils.ts_iso(day, 10, 46, 15)
 
-        return json.dumps({
+        return {
             "eventVersion": "1.08",
             "userIdentity": {
                 "type": "IAMUser",
@@ -572,14 +573,14 @@ class ExfilScenario:
             "recipientAccountId": self.cfg.aws_account_id,
             "eventCategory": "Management",
             "demo_id": self.cfg.demo_id if self.config.demo_id_enabled else None,
-        })
+        }
 
-    def aws_s3_exfil(self, day: int, hour: int) -> str:
+    def aws_s3_exfil(self, day: int, hour: int) -> dict:
         """S3 GetObject from sensitive bucket."""
         ts = self.time_utils.ts_iso(day, hour, random.randint(0, 59), random.randint(0, 59))
         file = random.choice(self.aws_sens_files)
 
-        return json.dumps({
+        return {
             "eventVersion": "1.08",
             "userIdentity": {
                 "type": "IAMUser",
@@ -612,10 +613,10 @@ class ExfilScenario:
                 "ARN": f"arn:aws:s3:::{self.cfg.aws_bucket_sensitive}/{file}"
             }],
             "demo_id": self.cfg.demo_id if self.config.demo_id_enabled else None,
-        })
+        }
 
-    def aws_hour(self, day: int, hour: int) -> List[str]:
-        """Generate all AWS exfil events for a specific hour.
+    def aws_hour(self, day: int, hour: int) -> List[ScenarioEvent]:
+        """Generate all AWS exfil events for a specific hour (keyed by eventTime).
 
         Timeline (0-indexed days):
         - Day 8 (persistence phase start): Create backdoor IAM user + attach admin policy
@@ -641,7 +642,7 @@ class ExfilScenario:
                 for _ in range(count):
                     events.append(self.aws_s3_exfil(day, hour))
 
-        return events
+        return keyed(events, "eventTime")
 
     # =========================================================================
     # GCP EVENTS
@@ -659,11 +660,11 @@ class ExfilScenario:
         from datetime import timedelta
         return (dt + timedelta(microseconds=delay_us)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
 
-    def gcp_create_sa_key(self, day: int) -> str:
+    def gcp_create_sa_key(self, day: int) -> dict:
         """Create service account key."""
         ts = self.time_utils.ts_gcp(day, 11, 0, 0)
 
-        return json.dumps({
+        return {
             "protoPayload": {
                 "@type": "type.googleapis.com/google.cloud.audit.AuditLog",
                 "serviceName": "iam.googleapis.com",
@@ -690,14 +691,14 @@ class ExfilScenario:
             "severity": "NOTICE",
             "demo_id": self.cfg.demo_id if self.config.demo_id_enabled else None,
             "logName": f"projects/{self.cfg.gcp_project}/logs/cloudaudit.googleapis.com%2Factivity"
-        })
+        }
 
-    def gcp_create_service_account(self, day: int) -> str:
+    def gcp_create_service_account(self, day: int) -> dict:
         """Create a malicious service account (persistence mechanism)."""
         ts = self.time_utils.ts_gcp(day, 10, 0, 0)
         sa_email = f"{self.cfg.gcp_mal_sa}@{self.cfg.gcp_project}.iam.gserviceaccount.com"
 
-        return json.dumps({
+        return {
             "protoPayload": {
                 "@type": "type.googleapis.com/google.cloud.audit.AuditLog",
                 "serviceName": "iam.googleapis.com",
@@ -735,14 +736,14 @@ class ExfilScenario:
             "severity": "NOTICE",
             "demo_id": self.cfg.demo_id if self.config.demo_id_enabled else None,
             "logName": f"projects/{self.cfg.gcp_project}/logs/cloudaudit.googleapis.com%2Factivity"
-        })
+        }
 
-    def gcp_set_iam_policy(self, day: int) -> str:
+    def gcp_set_iam_policy(self, day: int) -> dict:
         """Grant elevated IAM permissions to the malicious service account."""
         ts = self.time_utils.ts_gcp(day, 10, 5, 0)
         sa_email = f"{self.cfg.gcp_mal_sa}@{self.cfg.gcp_project}.iam.gserviceaccount.com"
 
-        return json.dumps({
+        return {
             "protoPayload": {
                 "@type": "type.googleapis.com/google.cloud.audit.AuditLog",
                 "serviceName": "cloudresourcemanager.googleapis.com",
@@ -785,13 +786,13 @@ class ExfilScenario:
             "severity": "NOTICE",
             "demo_id": self.cfg.demo_id if self.config.demo_id_enabled else None,
             "logName": f"projects/{self.cfg.gcp_project}/logs/cloudaudit.googleapis.com%2Factivity"
-        })
+        }
 
-    def gcp_get_bucket_iam(self, day: int) -> str:
+    def gcp_get_bucket_iam(self, day: int) -> dict:
         """Get bucket IAM policy (reconnaissance for accessible data)."""
         ts = self.time_utils.ts_gcp(day, 14, random.randint(0, 59), random.randint(0, 59))
 
-        return json.dumps({
+        return {
             "protoPayload": {
                 "@type": "type.googleapis.com/google.cloud.audit.AuditLog",
                 "serviceName": "storage.googleapis.com",
@@ -819,14 +820,14 @@ class ExfilScenario:
             "severity": "INFO",
             "demo_id": self.cfg.demo_id if self.config.demo_id_enabled else None,
             "logName": f"projects/{self.cfg.gcp_project}/logs/cloudaudit.googleapis.com%2Fdata_access"
-        })
+        }
 
-    def gcp_storage_list(self, day: int, hour: int) -> str:
+    def gcp_storage_list(self, day: int, hour: int) -> dict:
         """List objects in sensitive bucket (discovery before exfiltration)."""
         ts = self.time_utils.ts_gcp(day, hour, random.randint(0, 30), random.randint(0, 59))
         sa_email = f"{self.cfg.gcp_mal_sa}@{self.cfg.gcp_project}.iam.gserviceaccount.com"
 
-        return json.dumps({
+        return {
             "protoPayload": {
                 "@type": "type.googleapis.com/google.cloud.audit.AuditLog",
                 "serviceName": "storage.googleapis.com",
@@ -854,14 +855,14 @@ class ExfilScenario:
             "severity": "INFO",
             "demo_id": self.cfg.demo_id if self.config.demo_id_enabled else None,
             "logName": f"projects/{self.cfg.gcp_project}/logs/cloudaudit.googleapis.com%2Fdata_access"
-        })
+        }
 
-    def gcp_storage_exfil(self, day: int, hour: int) -> str:
+    def gcp_storage_exfil(self, day: int, hour: int) -> dict:
         """Get object from sensitive bucket."""
         ts = self.time_utils.ts_gcp(day, hour, random.randint(0, 59), random.randint(0, 59))
         file = random.choice(self.gcp_sens_files)
 
-        return json.dumps({
+        return {
             "protoPayload": {
                 "@type": "type.googleapis.com/google.cloud.audit.AuditLog",
                 "serviceName": "storage.googleapis.com",
@@ -889,10 +890,10 @@ class ExfilScenario:
             "severity": "INFO",
             "demo_id": self.cfg.demo_id if self.config.demo_id_enabled else None,
             "logName": f"projects/{self.cfg.gcp_project}/logs/cloudaudit.googleapis.com%2Fdata_access"
-        })
+        }
 
-    def gcp_hour(self, day: int, hour: int) -> List[str]:
-        """Generate all GCP exfil events for a specific hour.
+    def gcp_hour(self, day: int, hour: int) -> List[ScenarioEvent]:
+        """Generate all GCP exfil events for a specific hour (keyed by timestamp).
 
         Timeline (0-indexed days):
         - Day 7 (lateral movement): Recon - check bucket IAM policies
@@ -933,7 +934,12 @@ class ExfilScenario:
                 for _ in range(count):
                     events.append(self.gcp_storage_exfil(day, hour))
 
-        return events
+        # GCP audit entries omit demo_id entirely when it is disabled
+        for event in events:
+            if event["demo_id"] is None:
+                del event["demo_id"]
+
+        return keyed(events, "timestamp")
 
     # =========================================================================
     # ENTRA ID EVENTS
@@ -1523,7 +1529,7 @@ class ExfilScenario:
     # EXCHANGE EVENTS
     # =========================================================================
 
-    def exchange_phishing_sent(self, day: int, hour: int = 16, minute: int = 42) -> List[str]:
+    def exchange_phishing_sent(self, day: int, hour: int = 16, minute: int = 42) -> List[dict]:
         """Generate phishing email sent to Jessica Brown."""
         ts = self.time_utils.ts_iso(day, hour, minute, random.randint(0, 59))
         msg_id = f"<{self.cfg.phishing_mail_id}@{self.cfg.phishing_domain}>"
@@ -1552,9 +1558,9 @@ class ExfilScenario:
         if self.config.demo_id_enabled:
             event["demo_id"] = self.cfg.demo_id
 
-        return [json.dumps(event)]
+        return [event]
 
-    def exchange_phishing_spray(self, day: int, hour: int = 16) -> List[str]:
+    def exchange_phishing_spray(self, day: int, hour: int = 16) -> List[dict]:
         """Generate spray phishing emails to other users (camouflage)."""
         events = []
         spray_count = random.randint(5, 8)
@@ -1590,11 +1596,11 @@ class ExfilScenario:
             if self.config.demo_id_enabled:
                 event["demo_id"] = self.cfg.demo_id
 
-            events.append(json.dumps(event))
+            events.append(event)
 
         return events
 
-    def exchange_link_click(self, day: int, hour: int = 9, minute: int = 14) -> List[str]:
+    def exchange_link_click(self, day: int, hour: int = 9, minute: int = 14) -> List[dict]:
         """Generate Safe Links click event (Jessica clicks phishing link)."""
         ts = self.time_utils.ts_iso(day, hour, minute, random.randint(0, 59))
 
@@ -1618,9 +1624,9 @@ class ExfilScenario:
         if self.config.demo_id_enabled:
             event["demo_id"] = self.cfg.demo_id
 
-        return [json.dumps(event)]
+        return [event]
 
-    def exchange_mailbox_access(self, day: int, hour: int = 22) -> List[str]:
+    def exchange_mailbox_access(self, day: int, hour: int = 22) -> List[dict]:
         """Generate suspicious mailbox access from threat IP."""
         ts = self.time_utils.ts_iso(day, hour, random.randint(15, 45), random.randint(0, 59))
 
@@ -1641,9 +1647,9 @@ class ExfilScenario:
         if self.config.demo_id_enabled:
             event["demo_id"] = self.cfg.demo_id
 
-        return [json.dumps(event)]
+        return [event]
 
-    def exchange_forwarding_rule(self, day: int, hour: int = 22, minute: int = 45) -> List[str]:
+    def exchange_forwarding_rule(self, day: int, hour: int = 22, minute: int = 45) -> List[dict]:
         """Generate inbox forwarding rule creation (persistence)."""
         ts = self.time_utils.ts_iso(day, hour, minute, random.randint(0, 59))
 
@@ -1664,9 +1670,9 @@ class ExfilScenario:
         if self.config.demo_id_enabled:
             event["demo_id"] = self.cfg.demo_id
 
-        return [json.dumps(event)]
+        return [event]
 
-    def exchange_mailbox_search(self, day: int, hour: int = 23) -> List[str]:
+    def exchange_mailbox_search(self, day: int, hour: int = 23) -> List[dict]:
         """Generate mailbox search queries from attacker."""
         events = []
         search_terms = ["password", "admin", "credentials", "vpn", "azure", "aws"]
@@ -1690,11 +1696,11 @@ class ExfilScenario:
             if self.config.demo_id_enabled:
                 event["demo_id"] = self.cfg.demo_id
 
-            events.append(json.dumps(event))
+            events.append(event)
 
         return events
 
-    def exchange_password_reset(self, day: int, hour: int = 10, minute: int = 15) -> List[str]:
+    def exchange_password_reset(self, day: int, hour: int = 10, minute: int = 15) -> List[dict]:
         """Generate password reset notification to Alex."""
         ts = self.time_utils.ts_iso(day, hour, minute, random.randint(0, 59))
 
@@ -1715,9 +1721,9 @@ class ExfilScenario:
         if self.config.demo_id_enabled:
             event["demo_id"] = self.cfg.demo_id
 
-        return [json.dumps(event)]
+        return [event]
 
-    def exchange_credential_email(self, day: int, hour: int = 10, minute: int = 18) -> List[str]:
+    def exchange_credential_email(self, day: int, hour: int = 10, minute: int = 18) -> List[dict]:
         """Generate credential delivery email from Jessica to Alex."""
         ts = self.time_utils.ts_iso(day, hour, minute, random.randint(0, 59))
 
@@ -1738,9 +1744,9 @@ class ExfilScenario:
         if self.config.demo_id_enabled:
             event["demo_id"] = self.cfg.demo_id
 
-        return [json.dumps(event)]
+        return [event]
 
-    def exchange_forwarded_mail(self, day: int, hour: int, count: int = 2) -> List[str]:
+    def exchange_forwarded_mail(self, day: int, hour: int, count: int = 2) -> List[dict]:
         """Generate forwarded emails to external address (ongoing exfil)."""
         events = []
 
@@ -1773,11 +1779,11 @@ class ExfilScenario:
             if self.config.demo_id_enabled:
                 event["demo_id"] = self.cfg.demo_id
 
-            events.append(json.dumps(event))
+            events.append(event)
 
         return events
 
-    def exchange_rule_removed(self, day: int, hour: int = 14, minute: int = 30) -> List[str]:
+    def exchange_rule_removed(self, day: int, hour: int = 14, minute: int = 30) -> List[dict]:
         """Generate incident response - forwarding rule removed."""
         ts = self.time_utils.ts_iso(day, hour, minute, random.randint(0, 59))
 
@@ -1798,9 +1804,9 @@ class ExfilScenario:
         if self.config.demo_id_enabled:
             event["demo_id"] = self.cfg.demo_id
 
-        return [json.dumps(event)]
+        return [event]
 
-    def exchange_security_alert(self, day: int, hour: int = 14, minute: int = 45) -> List[str]:
+    def exchange_security_alert(self, day: int, hour: int = 14, minute: int = 45) -> List[dict]:
         """Generate security alert email to Jessica."""
         ts = self.time_utils.ts_iso(day, hour, minute, random.randint(0, 59))
 
@@ -1821,10 +1827,10 @@ class ExfilScenario:
         if self.config.demo_id_enabled:
             event["demo_id"] = self.cfg.demo_id
 
-        return [json.dumps(event)]
+        return [event]
 
-    def exchange_day(self, day: int) -> List[str]:
-        """Generate all Exchange exfil events for a specific day.
+    def exchange_day(self, day: int) -> List[ScenarioEvent]:
+        """Generate all Exchange exfil events for a specific day (keyed by Received).
 
         Timeline aligned with attack phases:
             Day 0 (Recon): Phishing email sent + spray
@@ -1859,9 +1865,9 @@ class ExfilScenario:
             events.extend(self.exchange_rule_removed(day, 14, 30))
             events.extend(self.exchange_security_alert(day, 14, 45))
 
-        return events
+        return keyed(events, "Received")
 
-    def exchange_hour(self, day: int, hour: int) -> List[str]:
+    def exchange_hour(self, day: int, hour: int) -> List[ScenarioEvent]:
         """Generate Exchange exfil events for a specific hour.
 
         Note: Forwarding mail generation is handled entirely by exchange_day()
@@ -37,6 +37,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.company import USERS, USER_KEYS, TENANT, TENANT_ID, LOCATIONS
+from shared.rng import KeyedRandom
+from scenarios.events import ScenarioEvent, keyed
 
 
 # =============================================================================
@@ -115,7 +117,7 @@ class PhishingTestScenario:
         Uses a deterministic seed so the same employees are selected every run.
         This ensures correlation across generators.
         """
-        rng = random.Random(hash("phishing_test_2026") % (2**31))
+        rng = KeyedRandom("phishing_test_2026")
 
         # Get all employees grouped by location
         employees_by_loc = {"BOS": [], "ATL": [], "AUS": []}
@@ -192,8 +194,8 @@ class PhishingTestScenario:
     # EXCHANGE EVENTS
     # -------------------------------------------------------------------------
 
-    def exchange_hour(self, day: int, hour: int, time_utils) -> List[dict]:
-        """Generate Exchange message trace events for phishing test.
+    def exchange_hour(self, day: int, hour: int, time_utils) -> List[ScenarioEvent]:
+        """Generate Exchange message trace events for phishing test (keyed by Received).
 
         Day 20 (campaign launch): Simulation emails sent to all employees in waves
         Day 22 (results): Training assignment emails to clickers
@@ -265,7 +267,7 @@ class PhishingTestScenario:
                 event.update(self._demo_json())
                 events.append(event)
 
-        return events
+        return keyed(events, "Received")
 
     def exchange_day(self, day: int) -> List[str]:
         """Day-level exchange events (not needed -- all hour-based)."""
@@ -382,7 +384,7 @@ class PhishingTestScenario:
         if not self.is_active(day):
             return events
 
-        rng = random.Random(hash(f"phishing_winevent_{day}_{hour}") % (2**31))
+        rng = KeyedRandom("phishing_winevent", day, hour)
 
         for username, click_day, click_hour, click_minute in self.clickers:
             if day != click_day or hour != click_hour:
@@ -450,7 +452,7 @@ Process Information:
         This is used by the inlined _phishing_test_events_for_hour() function
         in generate_office_audit.py to ensure consistent participant selection.
         """
-        rng = random.Random(hash("phishing_test_2026") % (2**31))
+        rng = KeyedRandom("phishing_test_2026")
         cfg = PhishingTestConfig()
 
         employees_by_loc = {"BOS": [], "ATL": [], "AUS": []}
@@ -24,6 +24,7 @@ import hashlib
 
 from shared.config import next_cid
 from shared.company import ASA_NAT_POOL
+from scenarios.events import ScenarioEvent, keyed
 
 
 @dataclass
@@ -261,9 +262,9 @@ class RansomwareAttemptScenario:
     # EXCHANGE EVENTS - Phishing email
     # =========================================================================
 
-    def exchange_hour(self, day: int, hour: int, time_utils) -> List[dict]:
+    def exchange_hour(self, day: int, hour: int, time_utils) -> List[ScenarioEvent]:
         """
-        Generate Exchange events for ransomware scenario.
+        Generate Exchange events for ransomware scenario (keyed by Received).
 
         Events:
         - Phishing email with malicious attachment received
@@ -307,7 +308,7 @@ class RansomwareAttemptScenario:
         event.update(self._demo_json())
         events.append(event)
 
-        return events
+        return keyed(events, "Received")
 
     # =========================================================================
     # WINEVENTLOG EVENTS - Process execution, AV detection
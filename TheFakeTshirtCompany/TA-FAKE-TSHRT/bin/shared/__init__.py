@@ -1,5 +1,23 @@
 # Shared modules package
-from .config import *
-from .company import *
-from .products import *
-from .time_utils import *
+#
+# Names from config, company, products and time_utils are still available as
+# "from shared import X", but their modules load on first use: importing one
+# submodule (shared.config, shared.telemetry, ...) no longer pulls in the
+# company roster and product catalog.
+import importlib
+import importlib.util
+
+_STAR_MODULES = ("config", "company", "products", "time_utils")
+
+
+def __getattr__(name):
+    # "from shared import telemetry" asks for the attribute before importing
+    # the submodule; let the import system handle submodules
+    if not name.startswith("_") and importlib.util.find_spec(f"{__name__}.{name}") is None:
+        for module_name in _STAR_MODULES:
+            module = importlib.import_module(f".{module_name}", __name__)
+            if hasattr(module, name):
+                value = getattr(module, name)
+                globals()[name] = value
+                return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
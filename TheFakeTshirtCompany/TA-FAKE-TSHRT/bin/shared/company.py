@@ -14,6 +14,7 @@ import hashlib
 import random
 import uuid
 from dataclasses import dataclass, field
+from itertools import accumulate
 from typing import List, Dict, Optional
 
 # =============================================================================
@@ -181,6 +182,12 @@ BROWSE_REGION_WEIGHTS = {
 _BROWSE_REGIONS = list(BROWSE_REGION_WEIGHTS.keys())
 _BROWSE_WEIGHTS = list(BROWSE_REGION_WEIGHTS.values())
 
+# Same distribution flattened to /24 prefixes, for get_visitor_ips()
+_BROWSE_PREFIXES = [p for region in _BROWSE_REGIONS for p in CUSTOMER_IP_POOLS[region]]
+_BROWSE_PREFIX_CUM = list(accumulate(
+    BROWSE_REGION_WEIGHTS[region] / len(CUSTOMER_IP_POOLS[region])
+    for region in _BROWSE_REGIONS for _ in CUSTOMER_IP_POOLS[region]))
+
 # External service IPs
 EXT_SERVICE_IPS = [
     "13.107.42.14",      # Microsoft 365
@@ -555,36 +562,38 @@ class User:
         """Get the user's office IP address."""
         return self.ip_address
 
+    # Derived identity values come from the snapshot built by
+    # _derive_user_identity() (see DERIVED IDENTITIES below)
+
     @property
     def entra_object_id(self) -> str:
         """Deterministic Entra ID Object ID (uuid5-based)."""
-        return _generate_entra_object_id(self.username)
+        return _user_identity(self)["entra_object_id"]
 
     @property
     def entra_device_id(self) -> str:
         """Deterministic Entra ID Device ID (uuid5-based)."""
-        return _generate_entra_device_id(self.device_name)
+        return _user_identity(self)["entra_device_id"]
 
     @property
     def aws_principal_id(self) -> str:
         """Deterministic AWS principalId (AIDA + 16 chars)."""
-        return _generate_aws_principal_id(self.username)
+        return _user_identity(self)["aws_principal_id"]
 
     @property
     def aws_access_key_id(self) -> str:
         """Deterministic AWS accessKeyId (AKIA + 16 chars)."""
-        return _generate_aws_access_key_id(self.username)
+        return _user_identity(self)["aws_access_key_id"]
 
     @property
     def aws_user_agent(self) -> str:
         """Deterministic AWS user agent string for this user."""
-        profile = _get_aws_user_agent_profile(self.username)
-        return _AWS_USER_AGENT_PROFILES[profile]
+        return _user_identity(self)["aws_user_agent"]
 
     @property
     def mac_address(self) -> str:
         """Deterministic MAC address for this user's workstation (uuid5-based)."""
-        return _generate_mac_address(self.device_name, _WORKSTATION_OUIS)
+        return _user_identity(self)["mac_address"]
 
     @property
     def vpn_ip(self) -> str:
@@ -594,9 +603,7 @@ class User:
         across all generators so ASA VPN sessions and Secure Access logs
         can be correlated by VPN IP.
         """
-        h = hashlib.sha256(f"vpn:{self.username}".encode()).digest()
-        last_octet = (h[0] << 8 | h[1]) % 200 + 10  # 10-209
-        return f"10.250.0.{last_octet}"
+        return _user_identity(self)["vpn_ip"]
 
     @property
     def department_id(self) -> int:
@@ -608,49 +615,33 @@ class User:
     @property
     def webex_profile(self) -> dict:
         """Deterministic primary Webex client profile (clientType + OS + hardware)."""
-        h = int(hashlib.sha256(f"webex-profile:{self.username}".encode()).hexdigest()[:8], 16)
-        weights = [p["weight"] for p in WEBEX_CLIENT_PROFILES]
-        total = sum(weights)
-        pick = h % total
-        cumulative = 0
-        for p in WEBEX_CLIENT_PROFILES:
-            cumulative += p["weight"]
-            if pick < cumulative:
-                return p
-        return WEBEX_CLIENT_PROFILES[0]
+        return WEBEX_CLIENT_PROFILES[_user_identity(self)["webex_profile"]]
 
     @property
     def webex_hardware(self) -> str:
         """Deterministic hardware type from the user's Webex profile."""
-        h = int(hashlib.sha256(f"hw:{self.username}".encode()).hexdigest()[:8], 16)
-        return self.webex_profile["hardwareTypes"][h % len(self.webex_profile["hardwareTypes"])]
+        return _user_identity(self)["webex_hardware"]
 
     @property
     def webex_camera(self) -> str:
         """Deterministic camera from the user's Webex profile."""
-        h = int(hashlib.sha256(f"cam:{self.username}".encode()).hexdigest()[:8], 16)
-        return self.webex_profile["cameras"][h % len(self.webex_profile["cameras"])]
+        return _user_identity(self)["webex_camera"]
 
     @property
     def webex_os_version(self) -> str:
         """Deterministic OS version from the user's Webex profile."""
-        h = int(hashlib.sha256(f"osver:{self.username}".encode()).hexdigest()[:8], 16)
-        return self.webex_profile["osVersions"][h % len(self.webex_profile["osVersions"])]
+        return _user_identity(self)["webex_os_version"]
 
     @property
     def webex_network(self) -> str:
         """Deterministic network type from the user's Webex profile."""
-        h = int(hashlib.sha256(f"net:{self.username}".encode()).hexdigest()[:8], 16)
-        return self.webex_profile["networkTypes"][h % len(self.webex_profile["networkTypes"])]
+        return _user_identity(self)["webex_network"]
 
     @property
     def webex_secondary_profile(self):
         """Mobile secondary device for ~15% of meetings (None if primary is already mobile)."""
-        if self.webex_profile["osType"] in ("iOS", "Android"):
-            return None
-        h = int(hashlib.sha256(f"secondary:{self.username}".encode()).hexdigest()[:8], 16)
-        mobile = [p for p in WEBEX_CLIENT_PROFILES if p["osType"] in ("iOS", "Android")]
-        return mobile[h % len(mobile)] if mobile else None
+        index = _user_identity(self)["webex_secondary_profile"]
+        return WEBEX_CLIENT_PROFILES[index] if index is not None else None
 
 
 @dataclass
@@ -669,7 +660,7 @@ class Server:
     @property
     def mac_address(self) -> str:
         """Deterministic MAC address for this server (uuid5-based, Intel OUI)."""
-        return _generate_mac_address(self.hostname, _SERVER_OUIS)
+        return _server_identity(self)["mac_address"]
 
 
 # =============================================================================
@@ -1026,6 +1017,99 @@ WINDOWS_SERVERS = [h for h, s in SERVERS.items() if s.os == "windows"]
 LINUX_SERVERS = [h for h, s in SERVERS.items() if s.os == "linux"]
 ALL_SERVERS = list(SERVERS.keys())
 
+
+# =============================================================================
+# DERIVED IDENTITIES
+# =============================================================================
+# Entra/AWS IDs, MACs, VPN IPs and Webex device picks are SHA-256/uuid5
+# hashes of the username, device name or hostname. They are derived once per
+# version of this file and kept in a snapshot (shared/company_snapshot.py),
+# so the User/Server properties are dict lookups and worker processes load
+# them instead of hashing the roster again.
+
+def _hash_pick(key: str, choices: list):
+    """Deterministic choice from a list by the first 8 hex digits of SHA-256(key)."""
+    h = int(hashlib.sha256(key.encode()).hexdigest()[:8], 16)
+    return choices[h % len(choices)]
+
+
+def _derive_user_identity(user: User) -> dict:
+    """All hash-derived values of one user (see the User properties)."""
+    username = user.username
+
+    h = hashlib.sha256(f"vpn:{username}".encode()).digest()
+    vpn_last_octet = (h[0] << 8 | h[1]) % 200 + 10  # 10-209
+
+    h = int(hashlib.sha256(f"webex-profile:{username}".encode()).hexdigest()[:8], 16)
+    pick = h % sum(p["weight"] for p in WEBEX_CLIENT_PROFILES)
+    profile_index = 0
+    cumulative = 0
+    for i, p in enumerate(WEBEX_CLIENT_PROFILES):
+        cumulative += p["weight"]
+        if pick < cumulative:
+            profile_index = i
+            break
+    profile = WEBEX_CLIENT_PROFILES[profile_index]
+
+    # Mobile secondary device, unless the primary already is one
+    secondary_index = None
+    if profile["osType"] not in ("iOS", "Android"):
+        mobile = [i for i, p in enumerate(WEBEX_CLIENT_PROFILES) if p["osType"] in ("iOS", "Android")]
+        if mobile:
+            secondary_index = _hash_pick(f"secondary:{username}", mobile)
+
+    return {
+        "entra_object_id": _generate_entra_object_id(username),
+        "entra_device_id": _generate_entra_device_id(user.device_name),
+        "aws_principal_id": _generate_aws_principal_id(username),
+        "aws_access_key_id": _generate_aws_access_key_id(username),
+        "aws_user_agent": _AWS_USER_AGENT_PROFILES[_get_aws_user_agent_profile(username)],
+        "mac_address": _generate_mac_address(user.device_name, _WORKSTATION_OUIS),
+        "vpn_ip": f"10.250.0.{vpn_last_octet}",
+        "webex_profile": profile_index,
+        "webex_hardware": _hash_pick(f"hw:{username}", profile["hardwareTypes"]),
+        "webex_camera": _hash_pick(f"cam:{username}", profile["cameras"]),
+        "webex_os_version": _hash_pick(f"osver:{username}", profile["osVersions"]),
+        "webex_network": _hash_pick(f"net:{username}", profile["networkTypes"]),
+        "webex_secondary_profile": secondary_index,
+    }
+
+
+def _derive_server_identity(server: Server) -> dict:
+    """All hash-derived values of one server."""
+    return {"mac_address": _generate_mac_address(server.hostname, _SERVER_OUIS)}
+
+
+def derive_identities() -> dict:
+    """Hash-derived values of every user and server (the snapshot contents)."""
+    return {
+        "users": {username: _derive_user_identity(user) for username, user in USERS.items()},
+        "servers": {hostname: _derive_server_identity(server) for hostname, server in SERVERS.items()},
+    }
+
+
+_IDENTITIES = None
+
+
+def _identities() -> dict:
+    """Snapshot of derive_identities(), loaded (or built) on first use."""
+    global _IDENTITIES
+    if _IDENTITIES is None:
+        from shared import company_snapshot
+        _IDENTITIES = company_snapshot.load(derive_identities)
+    return _IDENTITIES
+
+
+def _user_identity(user: User) -> dict:
+    identity = _identities()["users"].get(user.username)
+    # Users built outside USERS are not in the snapshot
+    return identity if identity is not None else _derive_user_identity(user)
+
+
+def _server_identity(server: Server) -> dict:
+    identity = _identities()["servers"].get(server.hostname)
+    return identity if identity is not None else _derive_server_identity(server)
+
 # =============================================================================
 # FIREWALL ARCHITECTURE
 # =============================================================================
@@ -1957,6 +2041,13 @@ def get_visitor_ip() -> str:
     return f"{prefix}.{random.randint(1, 254)}"
 
 
+def get_visitor_ips(count: int) -> List[str]:
+    """Draw `count` visitor IPs at once (same distribution as get_visitor_ip())."""
+    rand = random.random
+    prefixes = random.choices(_BROWSE_PREFIXES, cum_weights=_BROWSE_PREFIX_CUM, k=count)
+    return [f"{prefix}.{int(rand() * 254) + 1}" for prefix in prefixes]
+
+
 def get_users_by_location(location: str) -> List[User]:
     """Get all users at a specific location."""
     return _USERS_BY_LOCATION.get(location, [])
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Precomputed company snapshot: the hash-derived identity values of every user
+and server (Entra object/device IDs, AWS principal and access key IDs, AWS
+user agent, workstation and server MACs, VPN IPs, Webex device picks).
+
+company.py derives these with SHA-256/uuid5. Instead of doing that in every
+process (and, before, on every property access), derive_identities() runs
+once per version of company.py and the result is pickled to
+output/.cache/company_snapshot.pickle. Later processes, including the
+Meraki worker processes, load the file in well under a millisecond.
+
+The snapshot is keyed by SNAPSHOT_VERSION and the SHA-256 of company.py, so
+editing the roster or the derivation code rebuilds it on next use. A
+missing, stale or unreadable snapshot is never an error: the values are
+derived in memory and the file is rewritten if the directory is writable.
+
+Usage:
+    python3 shared/company_snapshot.py            # build (or confirm) the snapshot
+    python3 shared/company_snapshot.py --rebuild  # build even if current
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.config import OUTPUT_BASE_PRODUCTION
+
+# Bump when the snapshot layout or derive_identities() output changes shape
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_PATH = OUTPUT_BASE_PRODUCTION / ".cache" / "company_snapshot.pickle"
+COMPANY_SOURCE = Path(__file__).parent / "company.py"
+
+
+def source_key(source: Path = COMPANY_SOURCE) -> str:
+    """Snapshot key: format version plus the SHA-256 of company.py."""
+    digest = hashlib.sha256(source.read_bytes()).hexdigest()
+    return f"v{SNAPSHOT_VERSION}:{digest}"
+
+
+def read(key: str, path: Path = SNAPSHOT_PATH) -> Optional[Dict]:
+    """Snapshot data if the file exists and matches key, else None."""
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated, from another Python version, or not ours: rebuild
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("key") != key:
+        return None
+    return snapshot["data"]
+
+
+def write(data: Dict, key: str, path: Path = SNAPSHOT_PATH) -> bool:
+    """Write the snapshot atomically; False if the directory is not writable."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump({"key": key, "created": time.time(), "data": data}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def load(build: Callable[[], Dict], path: Path = SNAPSHOT_PATH) -> Dict:
+    """Current snapshot data, building and saving it first if needed."""
+    key = source_key()
+    data = read(key, path)
+    if data is None:
+        data = build()
+        write(data, key, path)
+    return data
+
+
+def build(rebuild: bool = False, path: Path = SNAPSHOT_PATH) -> Dict:
+    """Build step: make sure the snapshot on disk is current.
+
+    Returns {"path", "built", "users", "servers", "seconds"}; "built" is
+    False when the existing snapshot was already current.
+    """
+    from shared import company
+
+    start = time.perf_counter()
+    key = source_key()
+    data = None if rebuild else read(key, path)
+    built = data is None
+    if built:
+        data = company.derive_identities()
+        if not write(data, key, path):
+            path = None
+    company._IDENTITIES = data
+    return {"path": str(path) if path else None, "built": built,
+            "users": len(data["users"]), "servers": len(data["servers"]),
+            "seconds": time.perf_counter() - start}
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the precomputed company snapshot")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild even if the snapshot is current")
+    args = parser.parse_args()
+
+    result = build(rebuild=args.rebuild)
+    state = "built" if result["built"] else "current"
+    where = result["path"] or "(not written: output directory is read-only)"
+    print(f"Company snapshot {state}: {result['users']} users, {result['servers']} servers "
+          f"in {result['seconds'] * 1000:.1f} ms -> {where}")
+
+
+if __name__ == "__main__":
+    main()
@@ -320,51 +320,89 @@ def set_output_base(base_path: Path):
     }
 
 
-def move_output_to_production(quiet: bool = False) -> dict:
-    """Move generated files from output/tmp/ to output/ for Splunk ingestion.
-
-    Always generates to output/tmp/ first (safe staging area), then moves
-    completed files atomically to output/ where Splunk's inputs.conf monitors.
-    Uses shutil.move() which calls os.rename() on same filesystem (atomic on POSIX).
-
-    Returns:
-        dict with keys:
-            moved   - list of relative paths successfully moved
-            skipped - list of relative paths not found in staging
-            errors  - list of error message strings
+def _production_files() -> dict:
+    """{generator: [relative paths]} of the files promoted to output/."""
+    files_by_generator = {name: list(files) for name, files in GENERATOR_OUTPUT_FILES.items()}
+    # order_registry.json is monitored by Splunk but not in GENERATOR_OUTPUT_FILES.
+    # It is written by access, so it is promoted (and its move time billed) there.
+    all_files = [f for files in files_by_generator.values() for f in files]
+    if "web/order_registry.json" not in all_files:
+        files_by_generator.setdefault("access", []).append("web/order_registry.json")
+    return files_by_generator
+
+
+def _output_variants(path: Path) -> list:
+    """Files written for an output path: the file itself, <file>.gz / .zst
+    (--compress) and <file>.<segment>[.gz] (--rotate-mb / --rotate-by), sorted."""
+    if not path.parent.is_dir():
+        return []
+    prefix = path.name + "."
+    return sorted(p for p in path.parent.iterdir()
+                  if p.is_file() and (p.name == path.name or p.name.startswith(prefix)))
+
+
+def _new_move_result() -> dict:
+    return {"moved": [], "skipped": [], "errors": [], "timings": {}}
+
+
+def promote_generator_output(name: str, result: dict = None) -> dict:
+    """Move one generator's files from output/tmp/ to output/.
+
+    Each file is renamed into place (os.rename via shutil.move, atomic on
+    the same filesystem), so Splunk never sees a partial file. Compressed
+    output (<file>.gz / .zst from --compress) and rotated segments are moved
+    under their own names, and `moved` lists the names actually moved.
+    Variants of the same file left in output/ by an earlier run (other
+    segments, another compression) are removed, as a plain overwrite would
+    replace them. Used for
+    incremental promotion as each generator finishes; pass `result` to
+    accumulate several generators into one move_output_to_production()-
+    style dict. Empty staging directories are left alone because other
+    generators may still be writing into them.
     """
     import shutil
     import os
+    import time
 
     staging_base = OUTPUT_BASE_PRODUCTION / "tmp"
     production_base = OUTPUT_BASE_PRODUCTION
+    if result is None:
+        result = _new_move_result()
 
-    # Build complete file list from GENERATOR_OUTPUT_FILES + order_registry.json
-    all_files = []
-    for files in GENERATOR_OUTPUT_FILES.values():
-        all_files.extend(files)
-    # order_registry.json is monitored by Splunk but not in GENERATOR_OUTPUT_FILES
-    if "web/order_registry.json" not in all_files:
-        all_files.append("web/order_registry.json")
-
-    result = {"moved": [], "skipped": [], "errors": []}
-
-    for rel_path in all_files:
-        src = staging_base / rel_path
-        dest = production_base / rel_path
-
-        if not src.exists():
+    move_start = time.perf_counter()
+    for rel_path in _production_files().get(name, []):
+        staged = _output_variants(staging_base / rel_path)
+        if not staged:
             result["skipped"].append(rel_path)
             continue
 
-        try:
-            os.makedirs(dest.parent, exist_ok=True)
-            shutil.move(str(src), str(dest))
-            result["moved"].append(rel_path)
-        except Exception as e:
-            result["errors"].append(f"{rel_path}: {e}")
+        rel_dir = Path(rel_path).parent
+        names = {src.name for src in staged}
+        for old in _output_variants(production_base / rel_path):
+            if old.name not in names:
+                try:
+                    old.unlink()
+                except OSError as e:
+                    result["errors"].append(f"{rel_dir / old.name}: {e}")
+
+        for src in staged:
+            path = str(rel_dir / src.name)
+            dest = production_base / path
+            try:
+                os.makedirs(dest.parent, exist_ok=True)
+                shutil.move(str(src), str(dest))
+                result["moved"].append(path)
+            except Exception as e:
+                result["errors"].append(f"{path}: {e}")
+    result["timings"][name] = result["timings"].get(name, 0.0) + time.perf_counter() - move_start
+    return result
+
 
-    # Clean up empty subdirectories in staging (but keep staging_base itself)
+def remove_empty_staging_dirs():
+    """Remove empty subdirectories of output/tmp/ (but keep output/tmp/ itself)."""
+    import os
+
+    staging_base = OUTPUT_BASE_PRODUCTION / "tmp"
     if staging_base.exists():
         for dirpath, dirnames, filenames in os.walk(str(staging_base), topdown=False):
             dirpath = Path(dirpath)
@@ -374,6 +412,25 @@ def move_output_to_production(quiet: bool = False) -> dict:
                 except OSError:
                     pass
 
+
+def move_output_to_production(quiet: bool = False) -> dict:
+    """Move generated files from output/tmp/ to output/ for Splunk ingestion.
+
+    Always generates to output/tmp/ first (safe staging area), then moves
+    completed files atomically to output/ where Splunk's inputs.conf monitors.
+    Uses shutil.move() which calls os.rename() on same filesystem (atomic on POSIX).
+
+    Returns:
+        dict with keys:
+            moved   - list of relative paths successfully moved
+            skipped - list of relative paths not found in staging
+            errors  - list of error message strings
+            timings - {generator: seconds} spent moving that generator's files
+    """
+    result = _new_move_result()
+    for name in _production_files():
+        promote_generator_output(name, result)
+    remove_empty_staging_dirs()
     return result
 
 
@@ -421,6 +478,14 @@ def next_cid() -> int:
     return 1000000 + (_cid_counter % 9000000)
 
 
+def next_cids(count: int) -> list:
+    """Return the next `count` ASA connection IDs (same as count next_cid() calls)."""
+    global _cid_counter
+    start = _cid_counter
+    _cid_counter += count
+    return [1000000 + (n % 9000000) for n in range(start + 1, start + count + 1)]
+
+
 def reset_cid_allocator():
     """Reset the CID allocator for testing purposes only."""
     global _cid_counter, _cid_initialized
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Precompiled JSON templates for fixed-shape events.
+
+Most JSON sources (CloudTrail, Entra ID sign-ins, Meraki Dashboard, GCP
+audit, Office 365 audit) emit the same nested shape for every event of a
+type: the keys, nesting and most values are constant, and only a handful of
+leaves change. Building that shape as nested dicts and running json.dumps on
+it for every event redoes the constant work each time.
+
+A JsonTemplate compiles the shape once into a JSON skeleton with slots for
+the variable leaves, plus a generated render function that splices the
+encoded slot values into the skeleton:
+
+    SIGNIN = JsonTemplate({
+        "time": Slot("time", str),
+        "operationName": "Sign-in activity",              # constant, baked in
+        "properties": {"id": Slot("id", str), "status": {"errorCode": 0}},
+    })
+
+    event = SIGNIN.event(time=ts, id=cid)   # TemplatedEvent (a dict)
+    event["demo_id"] = "exfil"              # extra keys are appended
+    line = serialize(event)                 # == dumps(full nested event)
+
+A TemplatedEvent is a dict holding only the slot values (keyed by slot name)
+plus any keys added afterwards, so generators can still sort on it, read
+top-level slots and tag it with demo_id. Constant members exist only in the
+skeleton. Keys added after creation are rendered after the template's last
+member, in insertion order - the same place json.dumps would put them.
+
+Slot types pick the encoder: str (C string escaper), int, bool, Raw (a
+pre-rendered JSON fragment, inserted verbatim) or None for anything else
+(dispatch on the value's type at render time).
+
+JSON backend
+------------
+dumps() and the skeletons use the stdlib json module by default. When orjson
+is installed, set_backend("orjson") (main_generate.py --json-backend) switches
+to it; its output is compact (no spaces after ':' and ','), which every
+props.conf TIME_PREFIX for the templated sourcetypes accepts. "auto" picks
+orjson when available. Templates recompile lazily after a backend switch.
+"""
+
+import json
+from json.encoder import encode_basestring, encode_basestring_ascii
+from typing import Any, Callable, Dict, Hashable, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+BACKENDS = ("json", "orjson", "auto")
+
+_state = {"name": "json", "generation": 0}
+
+
+def _make_stdlib_dumps():
+    """json.dumps with the C encoder built once (json.dumps builds one per call).
+
+    Falls back to json.dumps if the C accelerator is missing or its
+    signature differs on this Python version.
+    """
+    try:
+        from json.encoder import c_make_encoder
+        encoder = c_make_encoder(None, json.JSONEncoder().default, encode_basestring_ascii,
+                                 None, ": ", ", ", False, False, True)
+        probe = {"a": [1, 2.5, None, True, "caf\u00e9\n"], "b": {}}
+        if "".join(encoder(probe, 0)) == json.dumps(probe):
+            return lambda obj: "".join(encoder(obj, 0))
+    except (ImportError, TypeError):
+        pass
+    return json.dumps
+
+
+_stdlib_dumps = _make_stdlib_dumps()
+
+
+def _orjson_dumps(obj) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Per-backend: (dumps, string encoder, item separator, key separator)
+_BACKEND_IMPL = {
+    "json": (_stdlib_dumps, encode_basestring_ascii, ", ", ": "),
+    "orjson": (_orjson_dumps, encode_basestring, ",", ":"),
+}
+
+dumps = _stdlib_dumps
+_encode_str = encode_basestring_ascii
+
+
+def set_backend(name: str) -> str:
+    """Select the JSON backend ("json", "orjson" or "auto"). Returns the active name."""
+    global dumps, _encode_str
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name} (choose from {', '.join(BACKENDS)})")
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name == "orjson" and orjson is None:
+        raise ValueError("JSON backend 'orjson' requested but orjson is not installed")
+    if name != _state["name"]:
+        dumps, _encode_str = _BACKEND_IMPL[name][:2]
+        _state["name"] = name
+        _state["generation"] += 1
+    return name
+
+
+def backend() -> str:
+    """Name of the active JSON backend."""
+    return _state["name"]
+
+
+# =============================================================================
+# SLOT VALUES
+# =============================================================================
+
+class Raw(str):
+    """A pre-rendered JSON fragment, inserted into a slot verbatim."""
+    __slots__ = ()
+
+
+def fragment(obj) -> Raw:
+    """Render a sub-object once for reuse as a Raw slot value.
+
+    The fragment uses the backend active at call time; use FragmentCache for
+    fragments kept across calls.
+    """
+    return Raw(dumps(obj))
+
+
+class FragmentCache:
+    """Raw fragments built on first use per key, dropped on a backend switch.
+
+        identity = FragmentCache(lambda username: {"type": "IAMUser", ...})
+        event = TEMPLATE.event(userIdentity=identity(user.username), ...)
+    """
+
+    def __init__(self, build: Callable[[Hashable], Any]):
+        self._build = build
+        self._cache: Dict[Hashable, Raw] = {}
+        self._generation = _state["generation"]
+
+    def __call__(self, key: Hashable) -> Raw:
+        if self._generation != _state["generation"]:
+            self._cache = {}
+            self._generation = _state["generation"]
+        frag = self._cache.get(key)
+        if frag is None:
+            frag = self._cache[key] = Raw(dumps(self._build(key)))
+        return frag
+
+
+def encode_value(value) -> str:
+    """Encode one slot value as JSON (type-dispatched, backend-aware)."""
+    cls = value.__class__
+    if cls is str:
+        return _encode_str(value)
+    if cls is Raw:
+        return value
+    if cls is bool:
+        return "true" if value else "false"
+    if cls is int:
+        return int.__repr__(value)
+    if value is None:
+        return "null"
+    if cls is float:
+        return float.__repr__(value)
+    return dumps(value)
+
+
+class Slot:
+    """Placeholder for a variable leaf in a template shape.
+
+    Args:
+        name: Key of the value in the TemplatedEvent (may repeat in a shape)
+        kind: str, int, bool, Raw, or None (any JSON value)
+    """
+    __slots__ = ("name", "kind")
+
+    def __init__(self, name: str, kind: Optional[type] = None):
+        if kind not in (str, int, bool, Raw, None):
+            raise TypeError(f"Unsupported slot kind for {name}: {kind}")
+        self.name = name
+        self.kind = kind
+
+
+class TemplatedEvent(dict):
+    """Slot values for one event plus the template that renders it."""
+    __slots__ = ("template",)
+
+
+# =============================================================================
+# TEMPLATES
+# =============================================================================
+
+class JsonTemplate:
+    """A fixed event shape compiled to a JSON skeleton with value slots."""
+
+    def __init__(self, shape: Dict[str, Any]):
+        if not isinstance(shape, dict) or not shape:
+            raise TypeError("Template shape must be a non-empty dict")
+        self.shape = shape
+        self._slots = []        # Slot objects in document order
+        self._marked = self._mark(shape)
+        self.names = tuple(dict.fromkeys(s.name for s in self._slots))
+        self._name_set = frozenset(self.names)
+        self._generation = None
+        self._render = None
+
+    def _mark(self, node):
+        """Copy of the shape with each Slot replaced by a unique marker string."""
+        if isinstance(node, Slot):
+            self._slots.append(node)
+            return f"@@slot{len(self._slots) - 1}@@"
+        if isinstance(node, dict):
+            return {k: self._mark(v) for k, v in node.items()}
+        if isinstance(node, (list, tuple)):
+            return [self._mark(v) for v in node]
+        return node
+
+    def _compile(self):
+        """Render the skeleton with the active backend and build render()."""
+        item_sep, key_sep = _BACKEND_IMPL[_state["name"]][2:]
+        skeleton = dumps(self._marked)
+        literals = []
+        for i in range(len(self._slots)):
+            marker = _encode_str(f"@@slot{i}@@")
+            head, found, skeleton = skeleton.partition(marker)
+            if not found or marker in skeleton:
+                raise ValueError(f"Template marker for slot {self._slots[i].name} is not unique")
+            literals.append(head)
+        # The outer object's closing brace is added after any extra keys
+        literals.append(skeleton[:-1])
+
+        namespace = {
+            "S": _encode_str, "V": encode_value,
+            "B": ("false", "true").__getitem__, "I": int.__repr__,
+            "X": self._extras, "N": len(self._name_set),
+        }
+        parts = []
+        for i, slot in enumerate(self._slots):
+            namespace[f"L{i}"] = literals[i]
+            value = f"v[{slot.name!r}]"
+            encoder = {str: "S({})", int: "I({})", bool: "B({})", Raw: "{}"}.get(slot.kind, "V({})")
+            parts += [f"L{i}", encoder.format(value)]
+        namespace["LT"] = literals[-1]
+        parts.append("LT")
+        src = (
+            "def render(v):\n"
+            f"    s = ''.join(({', '.join(parts)},))\n"
+            "    if len(v) > N:\n"
+            "        s += X(v)\n"
+            "    return s + '}'\n"
+        )
+        exec(src, namespace)
+        self._item_sep, self._key_sep = item_sep, key_sep
+        self._extra_keys = {}   # extra key -> rendered '<sep>"key"<sep>' prefix
+        self._render = namespace["render"]
+        self._generation = _state["generation"]
+
+    def _extras(self, values: Dict) -> str:
+        """Render keys added to an event after creation."""
+        names, keys = self._name_set, self._extra_keys
+        out = []
+        for k, v in values.items():
+            if k in names:
+                continue
+            prefix = keys.get(k)
+            if prefix is None:
+                prefix = keys[k] = f"{self._item_sep}{_encode_str(k)}{self._key_sep}"
+            out.append(prefix)
+            out.append(encode_value(v))
+        return "".join(out)
+
+    def event(self, **values) -> TemplatedEvent:
+        """Create an event from slot values (every slot name must be given)."""
+        if len(values) != len(self.names):
+            missing = self._name_set.difference(values)
+            raise TypeError(f"Template slots missing: {', '.join(sorted(missing))}" if missing
+                            else f"Unknown slots: {', '.join(sorted(set(values) - self._name_set))}")
+        event = TemplatedEvent(values)
+        event.template = self
+        return event
+
+    def render(self, values: Dict) -> str:
+        """Render slot values (plus extra keys) to one JSON line."""
+        if self._generation != _state["generation"]:
+            self._compile()
+        return self._render(values)
+
+
+def serialize(event) -> str:
+    """write_events() serializer: templated events, plain dicts, or pre-rendered strings."""
+    if event.__class__ is TemplatedEvent:
+        return event.template.render(event)
+    if isinstance(event, str):
+        return event
+    return dumps(event)
@@ -20,9 +20,11 @@ import random
 import uuid
 
 from shared.config import DEFAULT_START_DATE, DEFAULT_DAYS, DEFAULT_SCALE
+from shared.records import slotted
 from shared.time_utils import date_add, is_weekend
 
 
+@slotted
 @dataclass
 class ScheduledMeeting:
     """Represents a scheduled meeting with timing information."""
@@ -47,6 +49,7 @@ class ScheduledMeeting:
     participants: List[str] = field(default_factory=list)  # List of participant emails
 
 
+@slotted
 @dataclass
 class RecurringMeetingTemplate:
     """Template for a recurring meeting with fixed organizer and participants."""
@@ -705,6 +708,11 @@ _meeting_schedule: Dict[str, List[ScheduledMeeting]] = {}
 # Walk-in meetings - populated by Meraki generator (no Webex events)
 _walkin_schedule: Dict[str, List[ScheduledMeeting]] = {}
 
+# Exchange calendar emails - {day: [(kind, meeting)]}, populated once per
+# schedule by plan_calendar_emails(), read by get_calendar_emails_for_day()
+_calendar_email_plan: Dict[int, List[Tuple[str, ScheduledMeeting]]] = {}
+_calendar_plan_start: Optional[str] = None
+
 # After-hours activity - specific days and times
 AFTER_HOURS_CONFIG = {
     "days": [2, 6],  # Day 3 and 7 (0-indexed)
@@ -722,7 +730,31 @@ def clear_schedule():
     Note: Use .clear() instead of assigning new dict to preserve references
     in other modules that imported _meeting_schedule.
     """
+    global _calendar_plan_start
     _meeting_schedule.clear()
+    _calendar_email_plan.clear()
+    _calendar_plan_start = None
+
+
+def schedule_snapshot(location_code: str = None) -> Tuple[dict, dict]:
+    """Copy of the meeting and walk-in schedules, optionally one location's rooms.
+
+    Used to hand the schedule to a generator running in a worker process,
+    which starts without it; see restore_schedule().
+    """
+    prefix = f"{location_code}:" if location_code else ""
+    meetings = {k: list(v) for k, v in _meeting_schedule.items() if k.startswith(prefix)}
+    walkins = {k: list(v) for k, v in _walkin_schedule.items() if k.startswith(prefix)}
+    return meetings, walkins
+
+
+def restore_schedule(snapshot: Tuple[dict, dict]):
+    """Replace the meeting and walk-in schedules with a schedule_snapshot()."""
+    meetings, walkins = snapshot
+    clear_schedule()
+    _meeting_schedule.update(meetings)
+    _walkin_schedule.clear()
+    _walkin_schedule.update(walkins)
 
 
 def add_meeting(meeting: ScheduledMeeting):
@@ -1144,6 +1176,63 @@ def get_schedule_stats() -> dict:
     }
 
 
+# =============================================================================
+# CALENDAR EMAIL PLAN (Exchange invites and responses)
+# =============================================================================
+
+# Plan entry kinds: invites with same-day responses, invites whose responses
+# come the next day (the meeting day), and those meeting-day responses
+CALENDAR_INVITE = "invite"
+CALENDAR_INVITE_AND_RESPONSE = "invite+response"
+CALENDAR_RESPONSE = "response"
+
+
+def plan_calendar_emails(start_date: str) -> int:
+    """Assign every booked meeting its invite and response days, once.
+
+    Invites go out on the meeting day (75%) or the day before (25%).
+    Same-day invites get their responses right after them; day-before
+    invites get theirs on the meeting day. Ghost meetings get invites only,
+    and walk-ins and after-hours activity have no calendar invite at all.
+    Entries are bucketed by day offset from start_date, so the Exchange
+    generator reads one day with get_calendar_emails_for_day().
+
+    Returns the number of plan entries.
+    """
+    global _calendar_plan_start
+    _calendar_email_plan.clear()
+    base = date_add(start_date, 0)
+    planned = 0
+    for meetings in _meeting_schedule.values():
+        for meeting in meetings:
+            if meeting.is_walkin or meeting.is_after_hours or not meeting.participants:
+                continue
+            meeting_day = (meeting.start_time - base).days
+            same_day = random.choice([0, 0, 0, 1]) == 0  # 75% same day, 25% day before
+            if meeting.organizer_email:
+                if same_day:
+                    kind = CALENDAR_INVITE if meeting.is_ghost else CALENDAR_INVITE_AND_RESPONSE
+                    _calendar_email_plan.setdefault(meeting_day, []).append((kind, meeting))
+                else:
+                    _calendar_email_plan.setdefault(meeting_day - 1, []).append((CALENDAR_INVITE, meeting))
+                planned += 1
+            if not same_day and not meeting.is_ghost:
+                _calendar_email_plan.setdefault(meeting_day, []).append((CALENDAR_RESPONSE, meeting))
+                planned += 1
+    _calendar_plan_start = start_date
+    return planned
+
+
+def calendar_emails_planned(start_date: str) -> bool:
+    """True if plan_calendar_emails() has run for the current schedule and start date."""
+    return _calendar_plan_start == start_date
+
+
+def get_calendar_emails_for_day(day: int) -> List[Tuple[str, ScheduledMeeting]]:
+    """(kind, meeting) plan entries whose emails are sent on this day offset."""
+    return _calendar_email_plan.get(day, [])
+
+
 # =============================================================================
 # BUILD MEETING SCHEDULE (main entry point — replaces generate_webex_logs)
 # =============================================================================
@@ -1158,8 +1247,9 @@ def build_meeting_schedule(
     """Build the shared meeting schedule for all collaboration generators.
 
     Populates _meeting_schedule with recurring meetings, ad-hoc meetings,
-    walk-ins, and after-hours activity. Must run before any consumer
-    generator (exchange, meraki, webex_ta, webex_api).
+    walk-ins, and after-hours activity, then plans the Exchange calendar
+    emails for it. Must run before any consumer generator (exchange,
+    meraki, webex_ta, webex_api).
 
     Returns total number of scheduled meetings.
     """
@@ -1361,6 +1451,8 @@ def build_meeting_schedule(
                         add_meeting(after_hours)
                         total_meetings += 1
 
+    plan_calendar_emails(start_date)
+
     if not quiet:
         stats = get_schedule_stats()
         import sys
@@ -0,0 +1,902 @@
+#!/usr/bin/env python3
+"""
+Shared output writer for all generators.
+
+Every generator ends the same way: sort the in-memory events, turn each one
+into a line (json.dumps for dicts, as-is for strings) and write one line per
+event. write_events() does that in fixed-size chunks so the serialize and
+write phases can be timed separately by shared.telemetry.
+
+Usage:
+    from shared.output_writer import write_events, write_lines, json_line
+
+    write_events(output_path, all_events, serialize=json.dumps)   # dict events
+    write_events(output_path, all_events)                         # str events
+    write_events(output_path, mixed_events, serialize=json_line)  # dict or str
+    write_lines(open_file, day_events)                            # streaming
+
+Generators that emit hour by hour can stream instead of sorting at the end:
+an OrderedWriter buffers events until release(watermark) says nothing older
+than the watermark can still arrive, then writes that part in key order.
+Keyed part files from several OrderedWriters (e.g. one per worker process)
+are combined with merge_parts():
+
+    writer = OrderedWriter(part_path, key=lambda e: e["ts"], serialize=json.dumps, keyed=True)
+    writer.add(hour_events)
+    writer.release("2026-01-05T09:00:00")   # everything before 09:00 is final
+    writer.close()
+    merge_parts(output_path, [part_a, part_b])
+
+With set_compression("gzip") (main_generate.py --compress) every output file
+opened through open_output() -- write_events(), OrderedWriter, merge_parts()
+-- is written compressed as <path>.gz (or .zst). Blocks are compressed on a
+shared thread pool while the generator keeps producing events.
+
+With set_rotation() (--rotate-mb / --rotate-by=day) the same files are split
+into time-ordered segments, <path>.<YYYY-MM-DD>[.NNN] or <path>.NNN, so
+several ingestion pipelines can read one source in parallel. written_files()
+lists the files actually written for an output path.
+
+add_tap(name, fn) hands every batch of lines written to a file of that name
+to fn(lines, final) as well, e.g. shared.syslog_sink forwarding them to a
+receiver. final is True when the file is written from events that are
+already generated (write_events(), merge_parts()).
+
+AsyncWriter moves serialization and writing onto a writer thread: the
+generator put()s each finished hour and goes on generating while the
+previous one is written. OrderedWriter writes through one as well. Pending
+batches are capped by set_write_queue() (backpressure), and set_fsync("close")
+fsyncs every output file as it is closed.
+"""
+
+import gzip
+import heapq
+import io
+import json
+import locale
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from shared import telemetry
+
+# Lines serialized per chunk before handing them to the file
+CHUNK_LINES = 10_000
+
+# Output compression: --compress choices, file suffixes and default levels
+COMPRESSORS = ("none", "gzip", "zstd")
+COMPRESS_SUFFIX = {"gzip": ".gz", "zstd": ".zst"}
+COMPRESS_LEVEL = {"gzip": 6, "zstd": 3}
+
+# Uncompressed bytes per independently compressed block
+BLOCK_BYTES = 4 << 20
+
+
+def json_line(event) -> str:
+    """Serialize a dict event to JSON; pass pre-rendered strings through."""
+    if isinstance(event, dict):
+        return json.dumps(event)
+    return event
+
+
+def write_lines(f, events: Iterable, serialize: Optional[Callable] = None) -> int:
+    """Serialize events into an already-open text file. Returns the line count.
+
+    Used directly by generators that stream one day at a time into a file
+    they keep open (e.g. SAP); write_events() wraps it for the common case.
+    """
+    if isinstance(f, (RotatingWriter, TapWriter)):
+        return f.write_lines(events, serialize)
+    count = 0
+    chunk = []
+    append = chunk.append
+    it = iter(events)
+    while True:
+        with telemetry.phase("serialize"):
+            chunk.clear()
+            if serialize is None:
+                for event in it:
+                    append(event)
+                    append("\n")
+                    if len(chunk) >= CHUNK_LINES * 2:
+                        break
+            else:
+                for event in it:
+                    append(serialize(event))
+                    append("\n")
+                    if len(chunk) >= CHUNK_LINES * 2:
+                        break
+        if not chunk:
+            break
+        count += len(chunk) // 2
+        with telemetry.phase("write"):
+            f.write("".join(chunk))
+    return count
+
+
+def write_events(path: Path, events: Iterable,
+                 serialize: Optional[Callable] = None,
+                 encoding: Optional[str] = None) -> int:
+    """Write events as newline-terminated lines. Returns the number of lines.
+
+    Args:
+        path: Output file path (gets the compression suffix with --compress)
+        events: Iterable of events (already sorted)
+        serialize: Callable turning one event into a line (None = event is a str)
+        encoding: File encoding (None = platform default, like open())
+    """
+    with open_output(path, encoding=encoding, final=True) as f:
+        return write_lines(f, events, serialize)
+
+
+# =============================================================================
+# ORDERED STREAMING
+# =============================================================================
+
+class OrderedWriter:
+    """Write events in sort-key order while they are still being generated.
+
+    Events are serialized as they are added, so the buffer holds compact
+    (key, line) pairs rather than event dicts. release() is called with a
+    watermark: all buffered lines whose key sorts before it are written
+    (stable sort, like events.sort(key=key)) and dropped from memory. An
+    event added after a watermark it sorts before is still written, at the
+    next release, and counted in `late`.
+
+    With keyed=True every line is prefixed with its sort key and a tab, the
+    part-file format merge_parts() reads. Part files are never compressed.
+    """
+
+    def __init__(self, path: Path, key: Callable, serialize: Optional[Callable] = None,
+                 encoding: Optional[str] = None, keyed: bool = False):
+        self.path = path
+        self.count = 0
+        self.late = 0
+        self._key = key
+        self._serialize = serialize
+        self._keyed = keyed
+        self._buffer: List = []
+        self._watermark = None
+        if keyed:
+            self._out = AsyncWriter(path, file=open(path, "w", encoding=encoding))
+        else:
+            self._out = AsyncWriter(path, encoding=encoding)
+
+    def add(self, events: Iterable):
+        key = self._key
+        serialize = self._serialize
+        with telemetry.phase("serialize"):
+            if serialize is None:
+                self._buffer.extend([(key(event), event) for event in events])
+            else:
+                self._buffer.extend([(key(event), serialize(event)) for event in events])
+
+    def add_keyed(self, items: Iterable[Tuple[str, object]]):
+        """Add (sort key, event) pairs whose keys are already computed.
+
+        Takes ScenarioEvents as they are; the key function is not called.
+        """
+        serialize = self._serialize
+        with telemetry.phase("serialize"):
+            if serialize is None:
+                self._buffer.extend([(k, event) for k, event in items])
+            else:
+                self._buffer.extend([(k, serialize(event)) for k, event in items])
+
+    def release(self, watermark: str):
+        """Write every buffered event whose key is below `watermark`."""
+        ready, pending = [], []
+        for item in self._buffer:
+            if item[0] < watermark:
+                ready.append(item)
+            else:
+                pending.append(item)
+        self._buffer = pending
+        self._write(ready)
+        if self._watermark is None or watermark > self._watermark:
+            self._watermark = watermark
+
+    def close(self) -> int:
+        """Write what is left and close the file. Returns the line count."""
+        self._write(self._buffer)
+        self._buffer = []
+        self._out.close()
+        return self.count
+
+    def _write(self, ready: List):
+        if not ready:
+            return
+        with telemetry.phase("sort"):
+            ready.sort(key=_first)
+        if self._watermark is not None and ready[0][0] < self._watermark:
+            self.late += sum(1 for k, _ in ready if k < self._watermark)
+        if self._keyed:
+            lines = [f"{k}\t{line}" for k, line in ready]
+        else:
+            lines = [line for _, line in ready]
+        self._out.put(lines)
+        self.count += len(lines)
+
+
+def _first(item):
+    return item[0]
+
+
+def _part_key(line: str) -> str:
+    return line[:line.index("\t")]
+
+
+def merge_parts(path: Path, parts: List[Path], encoding: Optional[str] = None,
+                remove: bool = True) -> int:
+    """Merge keyed part files (OrderedWriter keyed=True) into one output file.
+
+    Lines are merged by key with heapq.merge, so memory use does not depend
+    on file size; equal keys keep the order of `parts`. The key prefixes are
+    dropped. Returns the number of lines written.
+    """
+    files = [open(part, encoding=encoding) for part in parts]
+    try:
+        merged = heapq.merge(*files, key=_part_key)
+        with open_output(path, encoding=encoding, final=True) as out:
+            count = write_lines(out, (line[line.index("\t") + 1:-1] for line in merged))
+    finally:
+        for f in files:
+            f.close()
+    if remove:
+        for part in parts:
+            os.remove(part)
+    return count
+
+
+# =============================================================================
+# COMPRESSED OUTPUT
+# =============================================================================
+
+_compression = None       # None, "gzip" or "zstd"
+_compress_level = None
+_compress_workers = None
+_pool = None
+_pool_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict] = {}  # {path: {"raw_bytes", "compressed_bytes", "seconds"}}
+_written_lock = threading.Lock()
+_written: Dict[str, List[str]] = {}  # {output path: [files written for it]}
+
+
+def _zstd_compressor():
+    """Return compress(data, level) from zstandard or compression.zstd, or None."""
+    try:
+        import zstandard
+        return lambda data, level: zstandard.ZstdCompressor(level=level).compress(data)
+    except ImportError:
+        pass
+    try:
+        from compression import zstd   # Python 3.14+
+        return lambda data, level: zstd.compress(data, level=level)
+    except ImportError:
+        return None
+
+
+def set_compression(name: str = "none", level: Optional[int] = None,
+                    workers: Optional[int] = None):
+    """Select output compression for every file opened by open_output().
+
+    Args:
+        name: "none", "gzip" or "zstd" (zstd needs the zstandard package
+              or Python 3.14+)
+        level: Compression level (default: COMPRESS_LEVEL[name])
+        workers: Compression threads (default: CPU count)
+
+    Raises:
+        ValueError: unknown name, or zstd requested but unavailable
+    """
+    global _compression, _compress_level, _compress_workers
+    if name not in COMPRESSORS:
+        raise ValueError(f"Unknown compression '{name}' (choose from {', '.join(COMPRESSORS)})")
+    if name == "zstd" and _zstd_compressor() is None:
+        raise ValueError("--compress=zstd needs the zstandard package "
+                         "(pip install zstandard) or Python 3.14+")
+    _compression = None if name == "none" else name
+    _compress_level = level if level is not None else COMPRESS_LEVEL.get(name)
+    _compress_workers = workers or os.cpu_count() or 2
+
+
+def compression() -> Optional[str]:
+    """Active compression ("gzip", "zstd") or None."""
+    return _compression
+
+
+def compressed_path(path: Path) -> Path:
+    """Path open_output() actually writes for `path` (suffix added when compressing)."""
+    if _compression is None:
+        return Path(path)
+    return Path(str(path) + COMPRESS_SUFFIX[_compression])
+
+
+def compression_stats() -> Dict[str, Dict]:
+    """{written path: {"raw_bytes", "compressed_bytes", "seconds"}} for closed files."""
+    with _stats_lock:
+        return {path: dict(s) for path, s in _stats.items()}
+
+
+def open_output(path: Path, encoding: Optional[str] = None, newline: Optional[str] = None,
+                header: bool = False, final: bool = False):
+    """Open an output file for writing text.
+
+    Plain, block-compressed with --compress, split into segments with
+    --rotate-mb / --rotate-by. header=True marks the first write() (e.g. a
+    CSV header row) to be repeated at the top of every segment. final=True
+    tells taps the whole file is written in one go after generation.
+    """
+    with _written_lock:
+        _written[str(path)] = []
+    if _rotate_bytes or _rotate_by_day:
+        f = RotatingWriter(path, encoding=encoding, newline=newline, header=header)
+    else:
+        f = _open_file(path, str(path), encoding=encoding, newline=newline)
+    tap = _taps.get(Path(path).name)
+    return TapWriter(f, tap, final) if tap else f
+
+
+def written_files(path: Path) -> List[Path]:
+    """Files written for an output path opened with open_output(), in time order."""
+    with _written_lock:
+        return [Path(p) for p in _written.get(str(path), [])]
+
+
+def _open_file(path: Path, logical: str, encoding: Optional[str] = None,
+               newline: Optional[str] = None):
+    """Open one physical file (compressed if enabled) and record it under `logical`."""
+    actual = compressed_path(path)
+    with _written_lock:
+        _written.setdefault(logical, []).append(str(actual))
+    if _compression is None:
+        if _fsync_on_close:
+            return _SyncedTextFile(open(path, "wb"), encoding=encoding, newline=newline)
+        return open(path, "w", encoding=encoding, newline=newline)
+    return BlockCompressedWriter(actual, _compression, _compress_level, encoding=encoding)
+
+
+def _compress_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=_compress_workers,
+                                       thread_name_prefix="compress")
+        return _pool
+
+
+def _compress_block(method: str, level: int, data: bytes):
+    start = time.perf_counter()
+    if method == "gzip":
+        block = gzip.compress(data, compresslevel=level, mtime=0)
+    else:
+        block = _zstd_compressor()(data, level)
+    return block, time.perf_counter() - start
+
+
+class BlockCompressedWriter:
+    """Text file that compresses in independent blocks on a thread pool.
+
+    write() collects text until BLOCK_BYTES, then the block is encoded and
+    handed to the shared compression pool. Each block becomes its own gzip
+    member (or zstd frame); concatenated in order they form one valid
+    .gz/.zst file that gunzip, zstd -d and Splunk read as a single stream.
+    zlib and zstd release the GIL, so blocks compress on other cores while
+    the generator keeps running. At most two blocks per pool thread are in
+    flight per file, which bounds memory. Text is written as given: no
+    newline translation, as with open(..., newline="").
+    """
+
+    def __init__(self, path: Path, method: str, level: int, encoding: Optional[str] = None):
+        self.path = Path(path)
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.seconds = 0.0
+        self._method = method
+        self._level = level
+        self._encoding = encoding or locale.getpreferredencoding(False)
+        self._parts: List[str] = []
+        self._size = 0
+        self._pending = deque()
+        self._max_pending = 2 * (_compress_workers or 1)
+        self._file = open(path, "wb")
+        self.closed = False
+
+    def write(self, text: str) -> int:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= BLOCK_BYTES:
+            self._submit()
+        return len(text)
+
+    def writelines(self, lines: Iterable[str]):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        """Blocks are only written when full or on close(); nothing to do."""
+
+    def close(self):
+        if self.closed:
+            return
+        if self._parts:
+            self._submit()
+        while self._pending:
+            self._write_next()
+        if _fsync_on_close:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self.closed = True
+        with _stats_lock:
+            _stats[str(self.path)] = {"raw_bytes": self.raw_bytes,
+                                      "compressed_bytes": self.compressed_bytes,
+                                      "seconds": self.seconds}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _submit(self):
+        data = "".join(self._parts).encode(self._encoding)
+        self._parts = []
+        self._size = 0
+        self.raw_bytes += len(data)
+        self._pending.append(_compress_pool().submit(_compress_block, self._method, self._level, data))
+        while len(self._pending) > self._max_pending:
+            self._write_next()
+
+    def _write_next(self):
+        block, seconds = self._pending.popleft().result()
+        self._file.write(block)
+        self.compressed_bytes += len(block)
+        self.seconds += seconds
+
+
+# =============================================================================
+# ROTATION
+# =============================================================================
+
+_rotate_bytes = 0        # Segment size limit in (uncompressed) characters, 0 = off
+_rotate_by_day = False
+_rotate_year = None      # Year for syslog timestamps that carry none
+_rotate_first_day = ""   # Run start date; earlier dates are not event times
+
+_MONTHS = {m: i for i, m in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)}
+
+# First date in a line, in the timestamp formats the generators write:
+# ISO (JSON, CSV, key=value), MM/DD/YYYY (Windows), DD/Mon/YYYY (Apache),
+# and syslog "Mon DD [YYYY]" (ASA, Catalyst, Linux auth)
+_DAY_RE = re.compile(
+    r"(20\d\d)-(\d\d)-(\d\d)"
+    r"|(\d\d)/(\d\d)/(20\d\d)"
+    r"|(\d\d)/([A-Z][a-z]{2})/(20\d\d)"
+    r"|\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) +(\d{1,2}) (?:(20\d\d) )?"
+)
+
+
+def set_rotation(rotate_mb: float = 0, by: str = "none", start_date: Optional[str] = None):
+    """Split every file opened by open_output() into segments.
+
+    Args:
+        rotate_mb: Start a new segment once one holds this many MB of
+                   (uncompressed) text; 0 = no size limit
+        by: "day" = one segment (or numbered set) per event day, "none"
+        start_date: Run start date (YYYY-MM-DD); gives the year for syslog
+                    timestamps that have none, and earlier dates in a line
+                    (e.g. an instance launchTime) are not taken as its day
+
+    Raises:
+        ValueError: negative size or unknown `by`
+    """
+    global _rotate_bytes, _rotate_by_day, _rotate_year, _rotate_first_day
+    if rotate_mb < 0:
+        raise ValueError("--rotate-mb must be positive")
+    if by not in ("none", "day"):
+        raise ValueError(f"Unknown rotation '{by}' (choose from none, day)")
+    _rotate_bytes = int(rotate_mb * (1 << 20))
+    _rotate_by_day = by == "day"
+    _rotate_year = int(start_date[:4]) if start_date else None
+    _rotate_first_day = start_date or ""
+
+
+def rotation() -> Optional[Dict]:
+    """Active rotation settings ({"mb", "by"}), or None if files are not rotated."""
+    if not (_rotate_bytes or _rotate_by_day):
+        return None
+    return {"mb": _rotate_bytes / (1 << 20) if _rotate_bytes else 0,
+            "by": "day" if _rotate_by_day else "none"}
+
+
+def line_day(line: str, year: Optional[int] = None, since: str = "") -> Optional[str]:
+    """YYYY-MM-DD of the first date in a line on or after `since`, or None.
+
+    `year` is used for syslog timestamps without one (Linux auth.log).
+    """
+    for m in _DAY_RE.finditer(line):
+        g = m.groups()
+        if g[0]:
+            day = f"{g[0]}-{g[1]}-{g[2]}"
+        elif g[3]:
+            day = f"{g[5]}-{g[3]}-{g[4]}"
+        elif g[6]:
+            day = f"{g[8]}-{_MONTHS.get(g[7], 0):02d}-{g[6]}"
+        elif g[11] or year:
+            day = f"{g[11] or year}-{_MONTHS[g[9]]:02d}-{int(g[10]):02d}"
+        else:
+            continue
+        if day >= since:
+            return day
+    return None
+
+
+class RotatingWriter:
+    """Text output split into time-ordered segments.
+
+    Segments are named <path>.<YYYY-MM-DD> (--rotate-by=day), <path>.NNN
+    (--rotate-mb) or <path>.<YYYY-MM-DD>.NNN (both), plus the compression
+    suffix, so they sort in time order and match the <file>* monitor
+    stanzas. Each segment is compressed independently.
+
+    write_lines() routes whole events (multi-line Windows events included),
+    so no event is split across segments. Events are written in order; an
+    event whose day is older than the current segment's (an out-of-order
+    line) stays in the current segment, so segment days never go back.
+    The day is the first date in the event on or after the run start date;
+    events without one stay in the current segment too.
+    """
+
+    def __init__(self, path: Path, encoding: Optional[str] = None,
+                 newline: Optional[str] = None, header: bool = False):
+        self.path = Path(path)
+        self._encoding = encoding
+        self._newline = newline
+        self._header = None if header else ""
+        self._file = None
+        self._day = None
+        self._year = _rotate_year
+        self._part = 1
+        self._size = 0
+        self.closed = False
+
+    def write_lines(self, events: Iterable, serialize: Optional[Callable] = None) -> int:
+        count = 0
+        it = iter(events)
+        while True:
+            with telemetry.phase("serialize"):
+                if serialize is None:
+                    lines = list(islice(it, CHUNK_LINES))
+                else:
+                    lines = [serialize(event) for event in islice(it, CHUNK_LINES)]
+            if not lines:
+                break
+            count += len(lines)
+            with telemetry.phase("write"):
+                start = 0
+                for i, line in enumerate(lines):
+                    label = self._next_segment(line, len(line) + 1)
+                    if label:
+                        if i > start:
+                            self._segment().write("\n".join(lines[start:i]) + "\n")
+                            start = i
+                        self._begin(label, len(line) + 1)
+                self._segment().write("\n".join(lines[start:]) + "\n")
+        return count
+
+    def write(self, text: str) -> int:
+        if self._header is None:
+            # First write of a header=True file: repeated in every segment
+            self._header = text
+            return len(text)
+        label = self._next_segment(text, len(text))
+        if label:
+            self._begin(label, len(text))
+        self._segment().write(text)
+        return len(text)
+
+    def writelines(self, lines: Iterable[str]):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        if self._file is None and self._header:
+            self._segment()   # header-only output still gets its file
+        self._close_segment()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _next_segment(self, line: str, size: int) -> Optional[Tuple[str, int]]:
+        """Account for one event; the (day, number) of the segment it must start, or None.
+
+        On a new segment the caller writes everything before the event to
+        the current one, then calls _begin(). Numbers restart at 1 each day.
+        """
+        day, part = self._day, self._part
+        if _rotate_by_day:
+            found = line_day(line, self._year, _rotate_first_day)
+            if found is not None and (day is None or found > day):
+                self._year = int(found[:4])
+                day, part = found, 1
+        if (day, part) == (self._day, self._part) and _rotate_bytes \
+                and self._size and self._size + size > _rotate_bytes:
+            part += 1
+        if (day, part) == (self._day, self._part) or self._size == 0:
+            # Same segment, or nothing written yet: the event names the first one
+            self._day, self._part = day, part
+            self._size += size
+            return None
+        return day, part
+
+    def _begin(self, label: Tuple[str, int], size: int):
+        """Close the current segment; the next write opens `label`."""
+        self._close_segment()
+        self._day, self._part = label
+        self._size = size
+
+    def _segment(self):
+        """The open segment file, opened on first use."""
+        if self._file is None:
+            parts = []
+            if _rotate_by_day and self._day:
+                parts.append(self._day)
+            if _rotate_bytes:
+                parts.append(f"{self._part:03d}")
+            name = ".".join([self.path.name] + parts)
+            self._file = _open_file(self.path.with_name(name), str(self.path),
+                                    encoding=self._encoding, newline=self._newline)
+            if self._header:
+                self._file.write(self._header)
+        return self._file
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# =============================================================================
+# TAPS
+# =============================================================================
+
+_taps: Dict[str, Callable[[List[str], bool], None]] = {}  # {file name: fn(lines, final)}
+
+
+def add_tap(name: str, fn: Callable[[List[str], bool], None]):
+    """Also pass every batch of lines written to files named `name` to fn(lines, final).
+
+    fn runs on the writing thread. While events are still being generated
+    (final False) it must not block: queue and return. For final writes it
+    may wait a bounded time, which holds back the rest of the file.
+    """
+    _taps[name] = fn
+
+
+def clear_taps():
+    _taps.clear()
+
+
+class TapWriter:
+    """Output file wrapper that hands each batch of serialized lines to a tap."""
+
+    def __init__(self, f, tap: Callable[[List[str], bool], None], final: bool = False):
+        self._file = f
+        self._tap = tap
+        self._final = final
+
+    def write_lines(self, events: Iterable, serialize: Optional[Callable] = None) -> int:
+        count = 0
+        it = iter(events)
+        while True:
+            with telemetry.phase("serialize"):
+                if serialize is None:
+                    lines = list(islice(it, CHUNK_LINES))
+                else:
+                    lines = [serialize(event) for event in islice(it, CHUNK_LINES)]
+            if not lines:
+                break
+            self._tap(lines, self._final)
+            count += write_lines(self._file, lines)
+        return count
+
+    def write(self, text: str) -> int:
+        self._tap(text.splitlines(), self._final)
+        return self._file.write(text)
+
+    def writelines(self, lines: Iterable[str]):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =============================================================================
+# ASYNC WRITING
+# =============================================================================
+
+DEFAULT_WRITE_QUEUE = 200_000
+_write_queue = DEFAULT_WRITE_QUEUE   # Events queued for a writer thread before put() waits; 0 = inline
+_fsync_on_close = False
+
+FSYNC_POLICIES = ("none", "close")
+
+
+def set_write_queue(events: int):
+    """Cap the events AsyncWriters hold for their writer thread (0 = write inline)."""
+    global _write_queue
+    if events < 0:
+        raise ValueError("--write-queue must be 0 or more")
+    _write_queue = events
+
+
+def set_fsync(policy: str):
+    """'close': fsync every output file when it is closed; 'none': leave it to the OS."""
+    global _fsync_on_close
+    if policy not in FSYNC_POLICIES:
+        raise ValueError(f"Unknown fsync policy '{policy}' (choose from {', '.join(FSYNC_POLICIES)})")
+    _fsync_on_close = policy == "close"
+
+
+class _SyncedTextFile(io.TextIOWrapper):
+    """Text file that is fsynced before it closes (--fsync=close)."""
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+            os.fsync(self.fileno())
+        super().close()
+
+
+class AsyncWriter:
+    """Serialize and write batches of events on a writer thread.
+
+    put(events) hands a batch -- typically one hour, already in order -- to
+    a background thread that serializes and writes it through write_lines()
+    (compression, rotation and taps included) while the generator goes on
+    with the next hour. A batch must not be modified after put().
+
+    Batches waiting for the writer are capped at set_write_queue() events:
+    put() blocks beyond that, so a slow disk bounds memory instead of growing
+    it. Time a generator spends blocked is billed to its "write" phase. The
+    writer thread records its own serialize/write time, and close() merges
+    it into the recorder of the generator that created the writer (see
+    telemetry.add_worker()). With set_write_queue(0) put() writes inline on
+    the caller's thread.
+
+    An error on the writer thread is re-raised by the next put() or close().
+
+    Args:
+        path: Output path, opened with open_output() unless `file` is given
+        serialize: Event -> line, applied on the writer thread (None = str events)
+        encoding: Output encoding
+        file: Already open file to write to instead (closed by close())
+    """
+
+    def __init__(self, path: Path, serialize: Optional[Callable] = None,
+                 encoding: Optional[str] = None, file=None):
+        self.path = path
+        self.count = 0
+        self._serialize = serialize
+        self._file = file if file is not None else open_output(path, encoding=encoding)
+        self._limit = _write_queue
+        self._batches = deque()
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._closing = False
+        self._error = None
+        self._thread = None
+        # Recorder of the generator creating the writer; the thread bills its own
+        self._owner = telemetry.current()
+        self._telemetry = None
+        if self._limit:
+            self._thread = threading.Thread(target=self._run, name=f"writer-{Path(path).name}",
+                                            daemon=True)
+            self._thread.start()
+
+    def put(self, events: List):
+        """Queue a batch for the writer thread; blocks while the queue is full."""
+        if not events:
+            return
+        if self._thread is None:
+            self.count += write_lines(self._file, events, self._serialize)
+            return
+        with self._cond:
+            if self._pending >= self._limit and self._error is None:
+                with telemetry.phase("write"):
+                    while self._pending >= self._limit and self._error is None:
+                        self._cond.wait()
+            if self._error is not None:
+                raise self._error
+            self._batches.append(events)
+            self._pending += len(events)
+            self._cond.notify_all()
+
+    def close(self) -> int:
+        """Write everything queued, close the file. Returns the line count."""
+        if self._thread is not None:
+            with self._cond:
+                self._closing = True
+                self._cond.notify_all()
+            with telemetry.phase("write"):
+                self._thread.join()
+            if self._owner is not None and self._telemetry is not None:
+                self._owner.add_worker(self._thread.name, self._telemetry.to_dict())
+            self._thread = None
+        self._file.close()
+        if self._error is not None:
+            raise self._error
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        if self._owner is None:
+            self._write_batches()
+            return
+        telemetry.begin(self._owner.name, phase="wait")
+        try:
+            self._write_batches()
+        finally:
+            self._telemetry = telemetry.end()
+
+    def _write_batches(self):
+        while True:
+            with self._cond:
+                while not self._batches and not self._closing:
+                    self._cond.wait()
+                if not self._batches:
+                    return
+                events = self._batches[0]
+            try:
+                written = write_lines(self._file, events, self._serialize)
+            except Exception as e:
+                with self._cond:
+                    self._error = e
+                    self._batches.clear()
+                    self._pending = 0
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                # Popped only once written, so the cap covers the batch in flight
+                self._batches.popleft()
+                self._pending -= len(events)
+                self.count += written
+                self._cond.notify_all()
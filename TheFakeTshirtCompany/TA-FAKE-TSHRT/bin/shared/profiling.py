@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-generator profiling for main_generate.py --profile.
+
+Wraps a single generator call in cProfile and writes two files per generator:
+
+    <profile_dir>/<name>.prof   - raw pstats dump (snakeviz, pstats, gprof2dot)
+    <profile_dir>/<name>.txt    - top-N hot functions by cumulative and own time
+
+cProfile hooks only the thread that calls enable(), so the profile of a
+generator contains the frames of the thread that runs it. Profiled
+generators take turns (profile_call holds a process-wide lock): two active
+profilers in one process would mix their frames, and on Python 3.12+ they
+compete for the single sys.monitoring profiler slot, so the second enable()
+raises. Unprofiled generators still run in parallel around them.
+
+Generators that hand work to worker processes (Meraki) profile it with the
+process hooks below: worker_profile_dir() tells the generator where workers
+should write, each worker runs its job through profile_worker(), and the
+parent passes the returned path to add_worker_profile(). The worker
+profiles stay on disk as <name>.workers/<label>.prof and are merged into
+<name>.prof and <name>.txt with pstats.Stats.add().
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Functions listed per section of the text report
+DEFAULT_TOP_N = 30
+
+# One profiled generator at a time per process (see module docstring)
+_profile_lock = threading.RLock()
+
+# Worker profile hooks of the generator being profiled on this thread
+_local = threading.local()
+
+
+def profile_lock() -> threading.RLock:
+    """Lock held while a generator runs under profile_call().
+
+    Reentrant: callers that time the generator can take it first, so the
+    wait for another profiled generator is not counted as generator time.
+    """
+    return _profile_lock
+
+
+def profile_call(name: str, func: Callable, kwargs: Dict, profile_dir: Path,
+                 top_n: int = DEFAULT_TOP_N) -> Tuple[object, Dict[str, str]]:
+    """Run func(**kwargs) under cProfile and write its reports.
+
+    Waits for any other profiled generator in this process to finish first.
+
+    Args:
+        name: Generator name (used for file names)
+        func: Generator function
+        kwargs: Keyword arguments for func
+        profile_dir: Directory for the .prof and .txt files
+        top_n: Number of functions per section in the text report
+
+    Returns:
+        (func result, {"prof": path, "report": path[, "workers": [paths]]})
+    """
+    with _profile_lock:
+        _local.worker_dir = profile_dir / f"{name}.workers"
+        _local.worker_profiles = []
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = func(**kwargs)
+        finally:
+            profiler.disable()
+            worker_profiles = _local.worker_profiles
+            _local.worker_dir = None
+            _local.worker_profiles = None
+            paths = _write_reports(name, profiler, worker_profiles, profile_dir, top_n)
+    return result, paths
+
+
+# =============================================================================
+# WORKER PROCESS HOOKS
+# =============================================================================
+
+def worker_profile_dir() -> Optional[Path]:
+    """Where worker processes should write profiles, or None when not profiling.
+
+    Only set on the thread running a generator under profile_call().
+    """
+    return getattr(_local, "worker_dir", None)
+
+
+def profile_worker(label: str, func: Callable, args: Tuple, profile_dir: Path) -> Tuple[object, str]:
+    """Run func(*args) under cProfile inside a worker process.
+
+    Writes <profile_dir>/<label>.prof and returns (func result, path); the
+    parent hands the path to add_worker_profile().
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = func(*args)
+    finally:
+        profiler.disable()
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    path = profile_dir / f"{label}.prof"
+    profiler.dump_stats(str(path))
+    return result, str(path)
+
+
+def add_worker_profile(path: str):
+    """Merge a worker's .prof into the report of the generator on this thread."""
+    profiles = getattr(_local, "worker_profiles", None)
+    if profiles is not None:
+        profiles.append(path)
+
+
+def _write_reports(name: str, profiler: cProfile.Profile, worker_profiles: List[str],
+                   profile_dir: Path, top_n: int) -> Dict[str, str]:
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    prof_path = profile_dir / f"{name}.prof"
+    report_path = profile_dir / f"{name}.txt"
+
+    buf = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buf)
+    if worker_profiles:
+        stats.add(*worker_profiles)
+    stats.dump_stats(str(prof_path))
+
+    stats.strip_dirs()
+    buf.write(f"Profile: {name}\n")
+    if worker_profiles:
+        buf.write(f"Includes {len(worker_profiles)} worker process profile(s)\n")
+    buf.write("=" * 70 + "\n")
+    buf.write(f"Top {top_n} by cumulative time\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+    buf.write("=" * 70 + "\n")
+    buf.write(f"Top {top_n} by own time\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top_n)
+    report_path.write_text(buf.getvalue())
+
+    paths = {"prof": str(prof_path), "report": str(report_path)}
+    if worker_profiles:
+        paths["workers"] = list(worker_profiles)
+    return paths
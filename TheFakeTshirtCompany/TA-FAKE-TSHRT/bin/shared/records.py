@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Compact record types.
+
+Records that a run holds by the thousands (scheduled meetings, incidents)
+are dataclasses. A regular instance carries a per-instance __dict__; a
+class with __slots__ stores its fields in fixed slots instead, which is
+about half the size. dataclass(slots=True) needs Python 3.10, so slotted()
+does the same thing for the 3.8+ interpreters Splunk ships:
+
+    @slotted
+    @dataclass
+    class ScheduledMeeting:
+        room: str
+        participants: List[str] = field(default_factory=list)
+
+Slotted instances behave like the plain dataclass (init, repr, eq,
+dataclasses.fields/asdict, pickling) except that no attributes outside the
+declared fields can be added.
+"""
+
+import dataclasses
+
+
+def slotted(cls):
+    """Rebuild a dataclass with __slots__ for its fields (dataclass(slots=True) for 3.8+)."""
+    if "__slots__" in cls.__dict__:
+        return cls
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        # Field defaults live on the class; they would clash with the slots.
+        # The generated __init__ keeps its own copy of each default.
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Counter-based keyed random numbers.
+
+Several generators need values that are a pure function of "who and when"
+(a device's health at a 5-minute poll, a switch's port states for an hour,
+an hour's volume noise) so they come out the same regardless of how much
+of the global random stream was consumed before. Building and seeding a
+Mersenne Twister per sample for that costs far more than the draw itself,
+and seeding it from hash(str) changes with PYTHONHASHSEED.
+
+This module derives a 64-bit key from the identifying parts and turns
+(key, counter) into 64-bit words by hashing (key, counter // 8) with BLAKE2b
+(Philox-style: one C call yields a block of eight words). There is no
+generator state and nothing to seed:
+
+    k = make_key("ms_port_state", switch, base_date, day, hour)
+    status = words(k, num_ports)          # one draw per port, all at once
+
+    rng = KeyedRandom("exchange-hour", start_date, day, hour)
+    noise = rng.uniform(0.80, 1.20)       # random.Random-style, counter += 1
+
+    poll = KeyedRandom.from_key(derive_key(k, minute))   # cheap sub-stream
+
+Keys are stable across processes and Python versions: strings go through
+BLAKE2b (cached) and ints are mixed with the SplitMix64 finalizer. Streams
+for different purposes must use different leading labels.
+"""
+
+import hashlib
+import struct
+from bisect import bisect
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, List, Sequence
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15   # SplitMix64 increment (2^64 / golden ratio)
+_TO_UNIT = 1.0 / (1 << 53)
+_BLOCK = 8                     # words per BLAKE2b digest (64 bytes)
+
+_pack_counter = struct.Struct("<QQ").pack
+_unpack_block = struct.Struct("<8Q").unpack
+
+
+def mix64(z: int) -> int:
+    """SplitMix64 finalizer: a 64-bit bijection with good avalanche."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+@lru_cache(maxsize=4096)
+def _text_key(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+def derive_key(k: int, *parts: Any) -> int:
+    """Extend key k with more parts: derive_key(make_key(a), b) == make_key(a, b)."""
+    for part in parts:
+        value = part if part.__class__ is int else _text_key(str(part))
+        k = mix64(((k + _GOLDEN) & _MASK64) ^ (value & _MASK64))
+    return k
+
+
+def make_key(*parts: Any) -> int:
+    """64-bit key for a tuple of ints/strings (order-sensitive, PYTHONHASHSEED-free)."""
+    return derive_key(0, *parts)
+
+
+def _block(k: int, index: int) -> tuple:
+    """Words index*8 .. index*8+7 of the stream for key k."""
+    return _unpack_block(hashlib.blake2b(_pack_counter(k, index), digest_size=64).digest())
+
+
+def u64(k: int, counter: int) -> int:
+    """The counter-th 64-bit word of the stream for key k."""
+    return _block(k, counter >> 3)[counter & 7]
+
+
+def words(k: int, n: int, start: int = 0) -> List[int]:
+    """Words start .. start+n-1 of the stream for key k."""
+    first, last = start >> 3, (start + n - 1) >> 3
+    out = []
+    for index in range(first, last + 1):
+        out.extend(_block(k, index))
+    offset = start - first * _BLOCK
+    return out[offset:offset + n]
+
+
+def uniform01(k: int, counter: int) -> float:
+    """Float in [0, 1) with 53 random bits."""
+    return (u64(k, counter) >> 11) * _TO_UNIT
+
+
+def randbelow(k: int, counter: int, n: int) -> int:
+    """Int in [0, n) by multiply-shift (bias < n / 2^64)."""
+    return (u64(k, counter) * n) >> 64
+
+
+def threshold(p: float) -> int:
+    """Word limit for probability p: word < threshold(p) happens with probability p."""
+    return int(p * (1 << 64))
+
+
+class KeyedRandom:
+    """random.Random-style methods over a keyed counter stream.
+
+    Each draw consumes the next word; two instances built from the same
+    parts produce the same values. Only the methods the generators use are
+    provided.
+    """
+    __slots__ = ("key", "_index", "_words")
+
+    def __init__(self, *parts: Any):
+        self.key = make_key(*parts)
+        self._index = 0
+        self._words = []
+
+    @classmethod
+    def from_key(cls, k: int) -> "KeyedRandom":
+        """Stream for an already derived key."""
+        stream = cls.__new__(cls)
+        stream.key = k
+        stream._index = 0
+        stream._words = []
+        return stream
+
+    def _next(self) -> int:
+        words = self._words
+        if not words:
+            # Next block, reversed so pop() yields it in counter order
+            words.extend(reversed(_block(self.key, self._index)))
+            self._index += 1
+        return words.pop()
+
+    def random(self) -> float:
+        return (self._next() >> 11) * _TO_UNIT
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * ((self._next() >> 11) * _TO_UNIT)
+
+    def randint(self, a: int, b: int) -> int:
+        return a + ((self._next() * (b - a + 1)) >> 64)
+
+    def choice(self, seq: Sequence):
+        return seq[(self._next() * len(seq)) >> 64]
+
+    def choices(self, population: Sequence, weights: Sequence = None, k: int = 1) -> List:
+        if weights is None:
+            return [self.choice(population) for _ in range(k)]
+        cum_weights = list(accumulate(weights))
+        total = cum_weights[-1] + 0.0
+        hi = len(population) - 1
+        return [population[bisect(cum_weights, self.random() * total, 0, hi)] for _ in range(k)]
+
+    def sample(self, population: Sequence, k: int) -> List:
+        pool = list(population)
+        n = len(pool)
+        if not 0 <= k <= n:
+            raise ValueError("Sample larger than population or is negative")
+        for i in range(k):
+            j = i + ((self._next() * (n - i)) >> 64)
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
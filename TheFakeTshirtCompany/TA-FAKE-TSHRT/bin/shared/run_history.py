@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Run history for the self-calibrating run estimator.
+
+Every completed main_generate.py run appends one record per generator to
+output/run_history.jsonl:
+
+    {"gen": "perfmon", "days": 14, "scale": 1.0, "key": [5, 30, false],
+     "events": 528864, "wall": 2.1, "cpu": 1.8, "parallel": 4,
+     "table_events": 528864, "ts": "2026-01-05T10:00:00"}
+
+`key` holds the run settings that change that generator's volume (see
+HISTORY_KEYS). `table_events` is what the hard-coded tables in
+main_generate predicted for the same settings. One extra record per run
+({"gen": "_run", ...}) stores the run's wall time next to the schedule
+simulated from the generators' CPU times without contention.
+
+RunHistoryModel fits the estimator from those records:
+
+    events      exact key match -> median events/day/scale of recent runs
+                other settings  -> table estimate x median(actual / table)
+    throughput  median events per CPU-second (single-thread equivalent)
+    contention  median run wall time / uncontended schedule, per --parallel
+
+Anything without history falls back to the tables.
+"""
+
+import json
+import os
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from shared.config import OUTPUT_BASE_PRODUCTION
+
+HISTORY_PATH = OUTPUT_BASE_PRODUCTION / "run_history.jsonl"
+
+# Records kept on disk (oldest dropped first)
+MAX_RECORDS = 2000
+
+# Most recent records per generator used for fitting
+RECENT_RUNS = 10
+
+# Run settings that change each generator's volume (names match _estimate_run)
+HISTORY_KEYS: Dict[str, Tuple[str, ...]] = {
+    "perfmon":     ("num_clients", "client_interval", "full_metrics"),
+    "wineventlog": ("num_clients",),
+    "sysmon":      ("num_clients",),
+    "meraki":      ("health_interval", "mr_health", "ms_health"),
+    "access":      ("orders_per_day",),
+    "orders":      ("orders_per_day",),
+    "servicebus":  ("orders_per_day",),
+    "sap":         ("orders_per_day",),
+    "asa":         ("orders_per_day",),
+}
+
+# Default order volume (orders_per_day=None means this)
+DEFAULT_ORDERS_PER_DAY = 224
+
+# `gen` value of run-level records
+RUN_RECORD = "_run"
+
+
+def history_key(gen: str, settings: Dict) -> List:
+    """Settings that identify comparable runs for a generator."""
+    key = []
+    for name in HISTORY_KEYS.get(gen, ()):
+        value = settings.get(name)
+        if name == "orders_per_day" and not value:
+            value = DEFAULT_ORDERS_PER_DAY
+        key.append(value)
+    return key
+
+
+# =============================================================================
+# PERSISTENCE
+# =============================================================================
+
+_cache = {"path": None, "mtime": None, "records": []}
+
+
+def load_history(path: Path = HISTORY_PATH) -> List[Dict]:
+    """Read history records (cached until the file changes)."""
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return []
+    if _cache["path"] == path and _cache["mtime"] == mtime:
+        return _cache["records"]
+
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # Partially written line from an interrupted run
+    _cache.update(path=path, mtime=mtime, records=records)
+    return records
+
+
+def append_records(records: List[Dict], path: Path = HISTORY_PATH):
+    """Append run records, trimming the file to MAX_RECORDS."""
+    if not records:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    existing = load_history(path)
+    if len(existing) + len(records) > MAX_RECORDS:
+        keep = (existing + records)[-MAX_RECORDS:]
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            f.writelines(json.dumps(r) + "\n" for r in keep)
+        os.replace(tmp, path)
+    else:
+        with open(path, "a") as f:
+            f.writelines(json.dumps(r) + "\n" for r in records)
+
+
+def make_record(gen: str, days: int, scale: float, settings: Dict, events: int,
+                wall: float, cpu: float, parallel: int, table_events: int) -> Dict:
+    return {
+        "gen": gen,
+        "days": days,
+        "scale": scale,
+        "key": history_key(gen, settings),
+        "events": events,
+        "wall": round(wall, 4),
+        "cpu": round(cpu, 4),
+        "parallel": parallel,
+        "table_events": table_events,
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def make_run_record(wall: float, parallel: int, base: float) -> Dict:
+    return {
+        "gen": RUN_RECORD,
+        "wall": round(wall, 4),
+        "base": round(base, 4),
+        "parallel": parallel,
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+class RunHistoryModel:
+    """Estimator coefficients fitted from run history."""
+
+    def __init__(self, records: List[Dict]):
+        self.by_gen: Dict[str, List[Dict]] = defaultdict(list)
+        self.runs: List[Dict] = []
+        for r in records:
+            if r.get("gen") == RUN_RECORD:
+                if r.get("base", 0) > 0:
+                    self.runs.append(r)
+            elif r.get("events", 0) > 0 and r.get("days", 0) > 0 and r.get("scale", 0) > 0:
+                self.by_gen[r["gen"]].append(r)
+
+    def __bool__(self):
+        return bool(self.by_gen)
+
+    def events(self, gen: str, days: int, scale: float, settings: Dict,
+               table_events: float) -> Optional[float]:
+        """Estimated events for a run, or None if there is no history."""
+        recs = self.by_gen.get(gen)
+        if not recs:
+            return None
+
+        key = history_key(gen, settings)
+        exact = [r for r in recs if r["key"] == key][-RECENT_RUNS:]
+        if exact:
+            per_day = statistics.median(r["events"] / (r["days"] * r["scale"]) for r in exact)
+            return per_day * days * scale
+
+        # Different settings: keep the table's shape, correct its level
+        ratios = [r["events"] / r["table_events"] for r in recs[-RECENT_RUNS:] if r.get("table_events")]
+        if ratios:
+            return table_events * statistics.median(ratios)
+        return None
+
+    def contention(self, parallel: int) -> Optional[float]:
+        """Slowdown of parallel runs vs their uncontended schedule, or None."""
+        same = [r for r in self.runs if r["parallel"] == parallel][-RECENT_RUNS:]
+        runs = same or [r for r in self.runs if r["parallel"] > 1][-RECENT_RUNS:]
+        if not runs:
+            return None
+        return statistics.median(r["wall"] / r["base"] for r in runs)
+
+    def throughput(self, gen: str) -> Optional[float]:
+        """Single-thread events/sec (events per CPU second), or None."""
+        rates = [r["events"] / r["cpu"] for r in self.by_gen.get(gen, [])[-RECENT_RUNS:]
+                 if r.get("cpu", 0) > 0]
+        return statistics.median(rates) if rates else None
+
+
+def load_model(path: Path = HISTORY_PATH) -> RunHistoryModel:
+    return RunHistoryModel(load_history(path))
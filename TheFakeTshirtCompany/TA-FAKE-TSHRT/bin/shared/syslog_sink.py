@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Network syslog output for the syslog-format generators.
+
+A SyslogSink sends the lines a generator writes to a syslog receiver over
+UDP or TCP, in addition to the output file. attach() hooks it into
+output_writer, so the generators themselves are unchanged:
+
+    sink = SyslogSink("udp://127.0.0.1:514", eps=20000)
+    sink.attach(["asa", "linux"])
+    ... run generators ...
+    sink.close()            # drains the backlog, then stops
+    sink.stats()            # {"sent", "dropped", "errors", "backlog", ...}
+
+Lines go into a bounded backlog and a sender thread drains it in batches,
+paced by a token bucket when an events/sec ceiling is set. While events are
+still being generated the writer never waits on the network: lines that do
+not fit in the backlog are dropped and counted. The syslog generators write
+their whole sorted file at the end of the run (a final write), which can be
+far more than the backlog holds, so there a full backlog holds the writer
+back instead (backpressure): it waits for the sender to make room, and only
+drops lines once the sender has made no room for `wait` seconds or the
+receiver is failing.
+
+Streams (source -> output files sent, and how each line is framed):
+    asa       cisco_asa.log               as written ("<PRI>Jan 05 2026 ...")
+    catalyst  cisco_catalyst_syslog.log   as written ("<PRI>seq: host: ...")
+    linux     auth.log                    "<86>" + line (authpriv.info, RFC 3164)
+    aci       cisco_aci_*.json            RFC 5424 around the APIC JSON record,
+                                          timestamped with its "created" time
+
+TCP framing (RFC 6587): "lf" ends each message with a newline, "octet"
+prefixes it with its length ("<len> <msg>"). UDP sends one message per
+datagram.
+"""
+
+import re
+import socket
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from shared import output_writer
+from shared import telemetry
+
+DEFAULT_PORT = 514
+FRAMINGS = ("lf", "octet")
+UDP_MAX_BYTES = 65507
+
+# Authpriv (10) * 8 + info (6): Linux auth.log lines carry no PRI
+AUTH_PRI = 86
+
+# APIC node that sends the ACI stream, and local7 (23) PRIs by APIC severity
+ACI_HOST = "APIC-BOS-01"
+_ACI_PRI = {"critical": 186, "major": 187, "minor": 188, "warning": 188,
+            "info": 190, "cleared": 190}
+_ACI_CREATED_RE = re.compile(r'"created": "([^"]+)"')
+_ACI_SEVERITY_RE = re.compile(r'"severity": "([a-z]+)"')
+
+
+def format_raw(line: str) -> str:
+    """Lines that already are syslog messages (ASA, Catalyst)."""
+    return line
+
+
+def format_auth(line: str) -> str:
+    """Linux auth.log: "Jan  1 00:00:01 host prog[pid]: msg" plus a PRI."""
+    return f"<{AUTH_PRI}>{line}"
+
+
+def format_aci(line: str) -> str:
+    """APIC JSON record as an RFC 5424 message at the record's created time."""
+    created = _ACI_CREATED_RE.search(line)
+    severity = _ACI_SEVERITY_RE.search(line)
+    pri = _ACI_PRI.get(severity.group(1), 190) if severity else 190
+    timestamp = created.group(1) if created else "-"
+    return f"<{pri}>1 {timestamp} {ACI_HOST} aci - - - {line}"
+
+
+# {source: {output file name: formatter}}
+STREAMS: Dict[str, Dict[str, Callable[[str], str]]] = {
+    "asa": {"cisco_asa.log": format_raw},
+    "catalyst": {"cisco_catalyst_syslog.log": format_raw},
+    "aci": {"cisco_aci_fault.json": format_aci,
+            "cisco_aci_event.json": format_aci,
+            "cisco_aci_audit.json": format_aci},
+    "linux": {"auth.log": format_auth},
+}
+
+
+class TokenBucket:
+    """Events/sec ceiling: take(n) sleeps until n tokens are available.
+
+    The bucket holds at most one second of tokens, so a quiet period allows
+    a burst of up to `rate` events, never more.
+    """
+
+    def __init__(self, rate: float, stop: threading.Event):
+        self.rate = rate
+        self.capacity = rate
+        self.tokens = rate
+        self._last = time.monotonic()
+        self._stop = stop
+
+    def take(self, n: int):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self.tokens >= n:
+                self.tokens -= n
+                return
+            # stop.wait() instead of sleep() so close(timeout) is not held up
+            if self._stop.wait((n - self.tokens) / self.rate):
+                return
+
+
+class SyslogSink:
+    """Send output lines to a syslog receiver from a background thread.
+
+    Args:
+        url: "udp://host[:port]" or "tcp://host[:port]" (default port 514)
+        framing: TCP framing, "lf" or "octet" (ignored for UDP)
+        eps: Events/sec ceiling, 0 = as fast as the receiver takes them
+        batch: Messages per send (one sendall() per batch over TCP)
+        backlog: Lines held for the sender before new ones are dropped
+        wait: Seconds a final write waits for the sender to make room in a
+              full backlog before dropping lines (0 = drop at once)
+
+    Raises:
+        ValueError: bad URL, framing or limits
+    """
+
+    def __init__(self, url: str, framing: str = "lf", eps: float = 0,
+                 batch: int = 500, backlog: int = 1_000_000, wait: float = 30.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ("udp", "tcp") or not parts.hostname:
+            raise ValueError(f"Syslog target must be udp://host[:port] or tcp://host[:port], got '{url}'")
+        if framing not in FRAMINGS:
+            raise ValueError(f"Unknown syslog framing '{framing}' (choose from {', '.join(FRAMINGS)})")
+        if eps < 0 or batch < 1 or backlog < 1 or wait < 0:
+            raise ValueError("Syslog eps, batch, backlog and wait must be positive")
+        self.url = url
+        self.protocol = parts.scheme
+        self.address = (parts.hostname, parts.port or DEFAULT_PORT)
+        self.framing = framing
+        self.eps = eps
+        # With a ceiling, send ~10 batches/sec so pacing stays smooth
+        self.batch = min(batch, max(1, int(eps / 10))) if eps else batch
+        self.max_backlog = backlog
+        self.wait = wait
+
+        self._chunks = deque()       # (formatter, [lines]) in arrival order
+        self._backlog = 0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._closing = False
+        self._healthy = True         # False from a send error until the next successful send
+        self._sock = None
+        self._counters = {"sent": 0, "dropped": 0, "errors": 0, "bytes": 0, "peak_backlog": 0,
+                          "wait_seconds": 0.0}
+        self._started = time.monotonic()
+        self._finished = None
+        self._thread = threading.Thread(target=self._run, name="syslog-sink", daemon=True)
+        self._thread.start()
+
+    # -------------------------------------------------------------------------
+    # Producer side (generator threads)
+    # -------------------------------------------------------------------------
+
+    def attach(self, sources: List[str]) -> List[str]:
+        """Tee the output files of these sources into the sink; returns the files tapped."""
+        tapped = []
+        for source in sources:
+            for name, formatter in STREAMS.get(source, {}).items():
+                output_writer.add_tap(name, lambda lines, final, f=formatter:
+                                      self.send(lines, f, self.wait if final else 0))
+                tapped.append(name)
+        return tapped
+
+    def send(self, lines: List[str], formatter: Callable[[str], str] = format_raw,
+             wait: float = 0):
+        """Queue lines for sending.
+
+        With wait = 0 this never blocks and lines beyond the backlog are
+        dropped. Otherwise a full backlog holds the caller until the sender
+        makes room, dropping the rest only after `wait` seconds without room
+        or while the receiver is failing.
+        """
+        deadline = None
+        with self._cond:
+            while lines and not self._closing:
+                room = self.max_backlog - self._backlog
+                if room > 0:
+                    self._queue(formatter, lines[:room])
+                    lines = lines[room:]
+                    deadline = None
+                    continue
+                if not wait or not self._healthy or self._stop.is_set():
+                    break
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + wait
+                if now >= deadline:
+                    break
+                with telemetry.phase("wait"):
+                    self._cond.wait(deadline - now)
+                self._counters["wait_seconds"] += time.monotonic() - now
+            if lines and not self._closing:
+                self._counters["dropped"] += len(lines)
+
+    def _queue(self, formatter: Callable[[str], str], lines: List[str]):
+        """Append lines to the backlog (caller holds the lock)."""
+        self._chunks.append((formatter, lines))
+        self._backlog += len(lines)
+        if self._backlog > self._counters["peak_backlog"]:
+            self._counters["peak_backlog"] = self._backlog
+        self._cond.notify_all()
+
+    def backlog(self) -> int:
+        with self._cond:
+            return self._backlog
+
+    def stats(self) -> Dict:
+        """Counters for the summary and run_manifest.json."""
+        with self._cond:
+            stats = dict(self._counters, backlog=self._backlog)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        seconds = (self._finished or time.monotonic()) - self._started
+        stats.update(target=self.url, framing=self.framing if self.protocol == "tcp" else None,
+                     eps_limit=self.eps or None, seconds=round(seconds, 3),
+                     events_per_sec=round(stats["sent"] / seconds) if seconds > 0 else 0)
+        return stats
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop accepting lines, send the backlog (up to `timeout` seconds), stop.
+
+        Lines still queued when the timeout expires, or after a send error
+        while draining, are counted as dropped.
+        """
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self._stop.set()
+            with self._cond:
+                self._cond.notify_all()
+            self._thread.join()
+        self._finished = time.monotonic()
+
+    # -------------------------------------------------------------------------
+    # Sender thread
+    # -------------------------------------------------------------------------
+
+    def _next_batch(self) -> Optional[List[str]]:
+        """Up to `batch` formatted messages; None once closed and drained (or stopped)."""
+        with self._cond:
+            while not self._chunks and not self._closing and not self._stop.is_set():
+                self._cond.wait()
+            if self._stop.is_set() or (not self._chunks and self._closing):
+                return None
+            batch = []
+            while self._chunks and len(batch) < self.batch:
+                formatter, lines = self._chunks[0]
+                take = self.batch - len(batch)
+                if len(lines) > take:
+                    self._chunks[0] = (formatter, lines[take:])
+                    lines = lines[:take]
+                else:
+                    self._chunks.popleft()
+                batch.extend(map(formatter, lines))
+            self._backlog -= len(batch)
+            # Wake writers waiting for room
+            self._cond.notify_all()
+            return batch
+
+    def _run(self):
+        bucket = TokenBucket(self.eps, self._stop) if self.eps else None
+        backoff = 0.5
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            if bucket is not None:
+                bucket.take(len(batch))
+            try:
+                sent = self._send(batch)
+                backoff = 0.5
+            except OSError:
+                # Receiver gone (TCP reset, unreachable): drop this batch,
+                # back off and reconnect on the next one. When closing, give
+                # up on the rest instead of retrying through the backlog.
+                self._disconnect()
+                with self._cond:
+                    self._healthy = False
+                    self._counters["errors"] += 1
+                    self._counters["dropped"] += len(batch)
+                    # Waiting writers drop instead of waiting on a dead receiver
+                    self._cond.notify_all()
+                    if self._closing:
+                        break
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 5.0)
+                continue
+            with self._cond:
+                self._healthy = True
+                self._counters["sent"] += len(batch)
+                self._counters["bytes"] += sent
+        with self._cond:
+            # Anything left after a stop() never made it out
+            self._counters["dropped"] += self._backlog
+            self._backlog = 0
+            self._chunks.clear()
+        self._disconnect()
+
+    def _send(self, batch: List[str]) -> int:
+        messages = [m.encode("utf-8", "replace") for m in batch]
+        if self.protocol == "udp":
+            if self._sock is None:
+                self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self._sock.connect(self.address)
+            sent = 0
+            for message in messages:
+                self._sock.send(message[:UDP_MAX_BYTES])
+                sent += min(len(message), UDP_MAX_BYTES)
+            return sent
+        if self._sock is None:
+            self._sock = socket.create_connection(self.address, timeout=10)
+        if self.framing == "octet":
+            payload = b"".join(b"%d %s" % (len(m), m) for m in messages)
+        else:
+            payload = b"\n".join(messages) + b"\n"
+        self._sock.sendall(payload)
+        return len(payload)
+
+    def _disconnect(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Run telemetry for the generator orchestrator.
+
+Records where each generator spends its time so a slow source can be
+diagnosed without hand-editing code. main_generate.run_generator() opens a
+recorder per generator (one per worker thread) and the generator lifecycle
+is split into phases:
+
+    setup      - imports, scenario init, registry loading (until day 1 starts)
+    generate   - per-day event generation (split by progress_callback ticks)
+    sort       - timestamp sort of the in-memory event lists
+    serialize  - json.dumps / line formatting at write time
+    write      - file I/O
+    wait       - waiting for worker processes (Meraki) or for --syslog backlog room
+    move       - promotion from output/tmp/ to output/ (recorded by main)
+
+Wall time uses time.perf_counter(); CPU time uses time.thread_time() so that
+parallel generators in the ThreadPoolExecutor don't bill each other.
+
+Generators don't need to know about any of this. Phases are switched by
+shared.output_writer.write_events() and by wrapping sorts in phase("sort");
+when no recorder is active (standalone CLI runs) every hook is a no-op.
+
+Generators that run work in worker processes (Meraki) start a recorder in
+each worker and pass its to_dict() back with the result. add_worker() on the
+parent's recorder merges it in: the worker's CPU time is added to the
+matching phases, days and cpu_seconds, and its wall times are listed per
+worker under "workers". Wall time is not summed, because workers run
+concurrently with the parent.
+
+Writer threads (output_writer.AsyncWriter) are billed the same way: each
+one records its own serialize/write time and, when the writer is closed,
+is merged into the recorder of the generator that opened it as
+"writer-<file name>". Time a writer spends waiting for the next batch is
+its "wait" phase, which costs no CPU.
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    import resource  # POSIX only
+except ImportError:  # pragma: no cover - Windows Splunk hosts
+    resource = None
+
+import tracemalloc
+
+# Phase order used when rendering the manifest
+PHASES = ("setup", "generate", "sort", "serialize", "write", "wait", "move")
+
+_local = threading.local()
+
+
+def _now():
+    return time.perf_counter(), time.thread_time()
+
+
+class GeneratorTelemetry:
+    """Phase timings for a single generator run (owned by one thread)."""
+
+    def __init__(self, name: str, phase: str = "setup"):
+        self.name = name
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.days: Dict[int, Dict[str, float]] = {}
+        self._segment = (phase, None)
+        self._wall0, self._cpu0 = _now()
+        self._start_wall = self._wall0
+        self._start_cpu = self._cpu0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.workers: Dict[str, Dict] = {}
+
+    def _close_segment(self):
+        wall, cpu = _now()
+        d_wall = wall - self._wall0
+        d_cpu = cpu - self._cpu0
+        phase, day = self._segment
+        bucket = self.phases.setdefault(phase, {"wall": 0.0, "cpu": 0.0})
+        bucket["wall"] += d_wall
+        bucket["cpu"] += d_cpu
+        if day is not None:
+            day_bucket = self.days.setdefault(day, {"wall": 0.0, "cpu": 0.0})
+            day_bucket["wall"] += d_wall
+            day_bucket["cpu"] += d_cpu
+        self._wall0, self._cpu0 = wall, cpu
+
+    def switch(self, phase: str, day: Optional[int] = None):
+        """Close the running segment and start timing a new one."""
+        self._close_segment()
+        self._segment = (phase, day)
+
+    def day_tick(self, day: int):
+        """Mark the start of generation for a 1-indexed day."""
+        self.switch("generate", day)
+
+    def add_worker(self, label: str, data: Dict):
+        """Merge the to_dict() of a worker process or writer thread recorder into this one.
+
+        A label that is already taken gets a "#2", "#3", ... suffix.
+        """
+        unique, n = label, 1
+        while unique in self.workers:
+            n += 1
+            unique = f"{label}#{n}"
+        self.workers[unique] = data
+
+    def finish(self):
+        self._close_segment()
+        wall, cpu = _now()
+        self.wall = wall - self._start_wall
+        self.cpu = cpu - self._start_cpu
+
+    def to_dict(self) -> Dict:
+        order = [p for p in PHASES if p in self.phases]
+        order += [p for p in self.phases if p not in PHASES]
+        phases = {
+            p: {"wall": round(self.phases[p]["wall"], 4), "cpu": round(self.phases[p]["cpu"], 4)}
+            for p in order
+        }
+        days = {day: {"wall": round(v["wall"], 4), "cpu": round(v["cpu"], 4)}
+                for day, v in self.days.items()}
+        cpu = self.cpu
+        for worker in self.workers.values():
+            cpu += worker["cpu_seconds"]
+            for p, v in worker["phases"].items():
+                bucket = phases.setdefault(p, {"wall": 0.0, "cpu": 0.0})
+                bucket["cpu"] = round(bucket["cpu"] + v["cpu"], 4)
+            for d in worker["days"]:
+                bucket = days.setdefault(d["day"], {"wall": 0.0, "cpu": 0.0})
+                bucket["cpu"] = round(bucket["cpu"] + d["cpu"], 4)
+        data = {
+            "wall_seconds": round(self.wall, 4),
+            "cpu_seconds": round(cpu, 4),
+            "phases": phases,
+            "days": [{"day": day, **v} for day, v in sorted(days.items())],
+        }
+        if self.workers:
+            data["workers"] = {label: {"wall_seconds": w["wall_seconds"],
+                                       "cpu_seconds": w["cpu_seconds"],
+                                       "phases": w["phases"]}
+                               for label, w in self.workers.items()}
+        return data
+
+
+# =============================================================================
+# THREAD-LOCAL RECORDER
+# =============================================================================
+
+def begin(name: str, phase: str = "setup") -> GeneratorTelemetry:
+    """Start recording for the generator running on this thread, in `phase`."""
+    recorder = GeneratorTelemetry(name, phase)
+    _local.current = recorder
+    return recorder
+
+
+def end() -> Optional[GeneratorTelemetry]:
+    """Stop recording on this thread and return the finished recorder."""
+    recorder = getattr(_local, "current", None)
+    _local.current = None
+    if recorder is not None:
+        recorder.finish()
+    return recorder
+
+
+def current() -> Optional[GeneratorTelemetry]:
+    return getattr(_local, "current", None)
+
+
+def day_tick(day: int):
+    recorder = getattr(_local, "current", None)
+    if recorder is not None:
+        recorder.day_tick(day)
+
+
+@contextmanager
+def phase(name: str):
+    """Time a block as `name`, then resume whatever segment was running."""
+    recorder = getattr(_local, "current", None)
+    if recorder is None:
+        yield
+        return
+    previous = recorder._segment
+    recorder.switch(name)
+    try:
+        yield
+    finally:
+        recorder.switch(*previous)
+
+
+# =============================================================================
+# MEMORY
+# =============================================================================
+
+def peak_rss_mb() -> Optional[float]:
+    """Process-wide peak resident set size in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+def tracemalloc_peak_mb(reset: bool = False) -> Optional[float]:
+    """Peak traced Python heap in MB since the last reset (None if not tracing)."""
+    if not tracemalloc.is_tracing():
+        return None
+    _, peak = tracemalloc.get_traced_memory()
+    if reset:
+        tracemalloc.reset_peak()
+    return round(peak / (1024 * 1024), 1)